@@ -55,6 +55,13 @@ n3) Get the accumulated gradient stats and clear the accumulator. This step can
    4.5) For Sparse handler, we also consider the gain for when the examples go
         the left child and when the examples go to the right child and pick the
         default direction that yields the most gain.
+
+BinnedDenseSplitHandler skips the quantile computation altogether for dense
+columns whose bucket boundaries are known ahead of training, e.g. computed once
+over a sample of the data. The column can then also be given as bucket ids,
+quantized once and cached with the dataset. Each step it sums the gradients and
+hessians of the batch per (partition, bucket), so that the stats accumulator
+receives one histogram entry per non-empty bucket instead of one per example.
 """
 
 from __future__ import absolute_import
@@ -513,6 +520,225 @@ def _make_sparse_split(
   return are_splits_ready, partition_ids, gains, split_infos
 
 
+class BinnedDenseSplitHandler(base_split_handler.BaseSplitHandler):
+  """Finds the best inequality splits on a dense column with fixed buckets."""
+
+  def __init__(self,
+               dense_float_column,
+               bucket_boundaries,
+               l1_regularization,
+               l2_regularization,
+               tree_complexity_regularization,
+               min_node_weight,
+               feature_column_group_id,
+               gradient_shape,
+               hessian_shape,
+               multiclass_strategy,
+               dense_bucket_ids=None,
+               init_stamp_token=0,
+               loss_uses_sum_reduction=False,
+               weak_learner_type=learner_pb2.LearnerConfig.NORMAL_DECISION_TREE,
+               name=None):
+    """Initialize the internal state for this split handler.
+
+    Args:
+      dense_float_column: A `Tensor` column associated with this handler.
+      bucket_boundaries: A sorted list of floats. Bucket `i` holds the values in
+        `(bucket_boundaries[i - 1], bucket_boundaries[i]]`, and the last bucket
+        also holds all larger values.
+      l1_regularization: L1 regularization applied for this split handler.
+      l2_regularization: L2 regularization applied for this split handler.
+      tree_complexity_regularization: Tree complexity regularization applied
+          for this split handler.
+      min_node_weight: Minimum sum of weights of examples in each partition to
+          be considered for splitting.
+      feature_column_group_id: Feature column group index.
+      gradient_shape: A TensorShape, containing shape of gradients.
+      hessian_shape: A TensorShape, containing shape of hessians.
+      multiclass_strategy: Strategy describing how to treat multiclass problems.
+      dense_bucket_ids: An optional integer `Tensor` with the bucket id of each
+        value of `dense_float_column`, if the column was already bucketized.
+      init_stamp_token: A tensor containing an scalar for initial stamp of the
+         stamped objects.
+      loss_uses_sum_reduction: A scalar boolean tensor that specifies whether
+          SUM or MEAN reduction was used for the loss.
+      weak_learner_type: Specifies the type of weak learner to use.
+      name: An optional handler name.
+
+    Raises:
+      ValueError: If `bucket_boundaries` is empty or not sorted.
+    """
+    super(BinnedDenseSplitHandler, self).__init__(
+        name=name,
+        l1_regularization=l1_regularization,
+        l2_regularization=l2_regularization,
+        tree_complexity_regularization=tree_complexity_regularization,
+        min_node_weight=min_node_weight,
+        feature_column_group_id=feature_column_group_id,
+        gradient_shape=gradient_shape,
+        hessian_shape=hessian_shape,
+        multiclass_strategy=multiclass_strategy,
+        loss_uses_sum_reduction=loss_uses_sum_reduction)
+    bucket_boundaries = list(bucket_boundaries)
+    if not bucket_boundaries:
+      raise ValueError("bucket_boundaries must not be empty.")
+    if bucket_boundaries != sorted(bucket_boundaries):
+      raise ValueError(
+          "bucket_boundaries must be sorted, got %s." % bucket_boundaries)
+    self._num_buckets = len(bucket_boundaries)
+    self._bucket_boundaries = constant_op.constant(
+        bucket_boundaries, dtype=dtypes.float32, name="bucket_boundaries")
+    self._dense_float_column = dense_float_column
+    self._dense_bucket_ids = dense_bucket_ids
+    self._weak_learner_type = weak_learner_type
+    self._stats_accumulator = stats_accumulator_ops.StatsAccumulator(
+        init_stamp_token,
+        gradient_shape,
+        hessian_shape,
+        name="StatsAccumulator/{}".format(self._name))
+
+  def _bucket_ids(self):
+    """Returns the int64 bucket id of each example."""
+    if self._dense_bucket_ids is not None:
+      return math_ops.to_int64(array_ops.reshape(self._dense_bucket_ids, [-1]))
+    # The same buckets as quantile_ops.quantiles: the first boundary that is
+    # not smaller than the value, or the last one.
+    bucket_ids = array_ops.searchsorted(
+        array_ops.expand_dims(self._bucket_boundaries, 0),
+        array_ops.reshape(self._dense_float_column, [1, -1]),
+        side="left",
+        out_type=dtypes.int64)
+    return math_ops.minimum(
+        array_ops.reshape(bucket_ids, [-1]), self._num_buckets - 1)
+
+  def update_stats(self, stamp_token, example_partition_ids, gradients,
+                   hessians, empty_gradients, empty_hessians, weights,
+                   is_active, scheduled_reads):
+    """Updates the state for binned dense split handler.
+
+    Args:
+      stamp_token: An int32 scalar tensor containing the current stamp token.
+      example_partition_ids: A dense tensor, containing an int32 for each
+        example which is the partition id that the example ends up in.
+      gradients: A dense tensor of gradients.
+      hessians: A dense tensor of hessians.
+      empty_gradients: A dense empty tensor of the same shape (for dimensions >
+        0) as gradients.
+      empty_hessians: A dense empty tensor of the same shape (for dimensions >
+        0) as hessians.
+      weights: A dense float32 tensor with a weight for each example.
+      is_active: A boolean tensor that says if this handler is active or not.
+          One value for the current layer and one value for the next layer.
+      scheduled_reads: List of results from the scheduled reads.
+
+    Returns:
+      The op that updates the stats for this handler.
+    """
+    # The buckets are fixed, so there are no quantile summaries to update.
+    del weights, scheduled_reads
+
+    def not_active_inputs():
+      return (constant_op.constant([], dtype=dtypes.int32),
+              constant_op.constant([[]], dtype=dtypes.int64, shape=[1, 2]),
+              empty_gradients, empty_hessians)
+
+    def active_inputs():
+      """Sums the gradients and hessians per (partition, bucket)."""
+      num_buckets = self._num_buckets
+      keys = (math_ops.to_int64(example_partition_ids) * num_buckets +
+              self._bucket_ids())
+      unique_keys, mapped_keys = array_ops.unique(keys)
+      num_keys = array_ops.size(unique_keys)
+      # Since unsorted_segment_sum can be numerically unstable, use 64bit
+      # operation.
+      histogram_gradients = math_ops.cast(
+          math_ops.unsorted_segment_sum(
+              math_ops.cast(gradients, dtypes.float64), mapped_keys, num_keys),
+          dtypes.float32)
+      histogram_hessians = math_ops.cast(
+          math_ops.unsorted_segment_sum(
+              math_ops.cast(hessians, dtypes.float64), mapped_keys, num_keys),
+          dtypes.float32)
+      partition_ids = math_ops.to_int32(unique_keys // num_buckets)
+      bucket_ids = unique_keys % num_buckets
+      feature_ids = array_ops.stack(
+          [bucket_ids, array_ops.zeros_like(bucket_ids)], axis=1)
+      return (partition_ids, feature_ids, histogram_gradients,
+              histogram_hessians)
+
+    name = _PATTERN.sub("", self._name)
+    with ops.name_scope(name, "BinnedDenseSplitHandler"):
+      example_partition_ids, feature_ids, gradients, hessians = (
+          control_flow_ops.cond(is_active[0], active_inputs,
+                                not_active_inputs))
+      update_stats = self._stats_accumulator.schedule_add(
+          example_partition_ids, feature_ids, gradients, hessians)
+      return control_flow_ops.no_op(), [update_stats]
+
+  def reset(self, stamp_token, next_stamp_token):
+    return self._stats_accumulator.flush(stamp_token, next_stamp_token)
+
+  def make_splits(self, stamp_token, next_stamp_token, class_id):
+    """Create the best split using the accumulated stats and flush the state."""
+    if (self._gradient_shape == tensor_shape.scalar() and
+        self._hessian_shape == tensor_shape.scalar()):
+      handler = make_binned_dense_split_scalar
+    else:
+      handler = make_binned_dense_split_tensor
+
+    are_splits_ready, partition_ids, gains, split_infos = (
+        handler(self._stats_accumulator.resource_handle,
+                self._bucket_boundaries, stamp_token, next_stamp_token,
+                self._multiclass_strategy, class_id,
+                self._feature_column_group_id, self._l1_regularization,
+                self._l2_regularization, self._tree_complexity_regularization,
+                self._min_node_weight, self._loss_uses_sum_reduction,
+                self._weak_learner_type))
+    return are_splits_ready, partition_ids, gains, split_infos
+
+
+def _make_binned_dense_split(stats_accumulator_handle, bucket_boundaries,
+                             stamp_token, next_stamp_token, multiclass_strategy,
+                             class_id, feature_column_id, l1_regularization,
+                             l2_regularization, tree_complexity_regularization,
+                             min_node_weight, is_multi_dimentional,
+                             loss_uses_sum_reduction, weak_learner_type):
+  """Function that builds splits for a dense column with fixed buckets."""
+  if is_multi_dimentional:
+    num_minibatches, partition_ids, bucket_ids, gradients, hessians = (
+        gen_stats_accumulator_ops.stats_accumulator_tensor_flush(
+            stats_accumulator_handle, stamp_token, next_stamp_token))
+  else:
+    num_minibatches, partition_ids, bucket_ids, gradients, hessians = (
+        gen_stats_accumulator_ops.stats_accumulator_scalar_flush(
+            stats_accumulator_handle, stamp_token, next_stamp_token))
+  # For sum_reduction, we don't need to divide by number of minibatches.
+  num_minibatches = control_flow_ops.cond(loss_uses_sum_reduction,
+                                          lambda: math_ops.to_int64(1),
+                                          lambda: num_minibatches)
+  # The buckets are always ready; put stats accumulator flushing in the
+  # dependency path.
+  with ops.control_dependencies([partition_ids]):
+    are_splits_ready = array_ops.identity(constant_op.constant(True))
+  partition_ids, gains, split_infos = (
+      split_handler_ops.build_dense_inequality_splits(
+          num_minibatches=num_minibatches,
+          bucket_boundaries=bucket_boundaries,
+          partition_ids=partition_ids,
+          bucket_ids=bucket_ids,
+          gradients=gradients,
+          hessians=hessians,
+          class_id=class_id,
+          feature_column_group_id=feature_column_id,
+          l1_regularization=l1_regularization,
+          l2_regularization=l2_regularization,
+          tree_complexity_regularization=tree_complexity_regularization,
+          min_node_weight=min_node_weight,
+          multiclass_strategy=multiclass_strategy,
+          weak_learner_type=weak_learner_type))
+  return are_splits_ready, partition_ids, gains, split_infos
+
+
 def _specialize_make_split_dense(func, is_multi_dimentional):
   """Builds a specialized version of the function."""
 
@@ -589,6 +815,45 @@ make_sparse_split_tensor = _specialize_make_split_sparse(
     _make_sparse_split, is_multi_dimentional=True)
 
 
+def _specialize_make_split_binned_dense(func, is_multi_dimentional):
+  """Builds a specialized version of the function."""
+
+  @function.Defun(
+      dtypes.resource,
+      dtypes.float32,
+      dtypes.int64,
+      dtypes.int64,
+      dtypes.int32,
+      dtypes.int32,
+      dtypes.int32,
+      dtypes.float32,
+      dtypes.float32,
+      dtypes.float32,
+      dtypes.float32,
+      dtypes.bool,
+      dtypes.int32,
+      noinline=True)
+  def f(stats_accumulator_handle, bucket_boundaries, stamp_token,
+        next_stamp_token, multiclass_strategy, class_id, feature_column_id,
+        l1_regularization, l2_regularization, tree_complexity_regularization,
+        min_node_weight, loss_uses_sum_reduction, weak_learner_type):
+    """Function that builds splits for a dense column with fixed buckets."""
+    return func(stats_accumulator_handle, bucket_boundaries, stamp_token,
+                next_stamp_token, multiclass_strategy, class_id,
+                feature_column_id, l1_regularization, l2_regularization,
+                tree_complexity_regularization, min_node_weight,
+                is_multi_dimentional, loss_uses_sum_reduction,
+                weak_learner_type)
+
+  return f
+
+
+make_binned_dense_split_scalar = _specialize_make_split_binned_dense(
+    _make_binned_dense_split, is_multi_dimentional=False)
+make_binned_dense_split_tensor = _specialize_make_split_binned_dense(
+    _make_binned_dense_split, is_multi_dimentional=True)
+
+
 @function.Defun(
     dtypes.bool,
     dtypes.bool,
@@ -1720,5 +1720,121 @@ class SparseSplitHandlerTest(test_util.TensorFlowTestCase):
     self.assertAllClose(0.58, split_node.split.threshold)
 
 
+class BinnedDenseSplitHandlerTest(test_util.TensorFlowTestCase):
+
+  def _generateFeatureSplitCandidates(self, dense_column, dense_bucket_ids):
+    with self.cached_session() as sess:
+      gradients = array_ops.constant([0.2, -0.5, 1.2, 4.0])
+      hessians = array_ops.constant([0.12, 0.07, 0.2, 0.13])
+      partition_ids = array_ops.constant([0, 0, 0, 1], dtype=dtypes.int32)
+      class_id = -1
+
+      gradient_shape = tensor_shape.scalar()
+      hessian_shape = tensor_shape.scalar()
+      split_handler = ordinal_split_handler.BinnedDenseSplitHandler(
+          l1_regularization=0.1,
+          l2_regularization=1.,
+          tree_complexity_regularization=0.,
+          min_node_weight=0.,
+          feature_column_group_id=0,
+          dense_float_column=dense_column,
+          bucket_boundaries=[0.3, 0.52],
+          dense_bucket_ids=dense_bucket_ids,
+          init_stamp_token=0,
+          gradient_shape=gradient_shape,
+          hessian_shape=hessian_shape,
+          multiclass_strategy=learner_pb2.LearnerConfig.TREE_PER_CLASS)
+      resources.initialize_resources(resources.shared_resources()).run()
+
+      empty_gradients, empty_hessians = get_empty_tensors(
+          gradient_shape, hessian_shape)
+      example_weights = array_ops.ones([4, 1], dtypes.float32)
+
+      update_1 = split_handler.update_stats_sync(
+          0,
+          partition_ids,
+          gradients,
+          hessians,
+          empty_gradients,
+          empty_hessians,
+          example_weights,
+          is_active=array_ops.constant([True, True]))
+      with ops.control_dependencies([update_1]):
+        are_splits_ready, partitions, gains, splits = (
+            split_handler.make_splits(np.int64(0), np.int64(1), class_id))
+        are_splits_ready, partitions, gains, splits = (
+            sess.run([are_splits_ready, partitions, gains, splits]))
+
+    # The buckets are fixed, so splits are ready after the first update.
+    self.assertTrue(are_splits_ready)
+    self.assertAllEqual([0, 1], partitions)
+
+    # The same candidates as DenseSplitHandlerTest finds with the quantile
+    # buckets [0.3, 0.52].
+    # -(1.2 - 0.1) / (0.2 + 1)
+    expected_left_weight = -0.91666
+    # expected_left_weight * -(1.2 - 0.1)
+    expected_left_gain = 1.0083333333333331
+    # (-0.5 + 0.2 + 0.1) / (0.19 + 1)
+    expected_right_weight = 0.1680672
+    # expected_right_weight * -(-0.5 + 0.2 + 0.1))
+    expected_right_gain = 0.033613445378151252
+    # (0.2 + -0.5 + 1.2 - 0.1) ** 2 / (0.12 + 0.07 + 0.2 + 1)
+    expected_bias_gain = 0.46043165467625885
+
+    split_info = split_info_pb2.SplitInfo()
+    split_info.ParseFromString(splits[0])
+    split_node = split_info.split_node.dense_float_binary_split
+    self.assertAllClose(
+        expected_left_gain + expected_right_gain - expected_bias_gain, gains[0],
+        0.00001)
+    self.assertAllClose([expected_left_weight],
+                        split_info.left_child.vector.value, 0.00001)
+    self.assertAllClose([expected_right_weight],
+                        split_info.right_child.vector.value, 0.00001)
+    self.assertEqual(0, split_node.feature_column)
+    self.assertAllClose(0.3, split_node.threshold, 0.00001)
+
+    # There's only one active bucket in partition 1, so zero gain is expected.
+    split_info = split_info_pb2.SplitInfo()
+    split_info.ParseFromString(splits[1])
+    split_node = split_info.split_node.dense_float_binary_split
+    self.assertAllClose(0.0, gains[1], 0.00001)
+    # (-4 + 0.1) / (0.13 + 1)
+    self.assertAllClose([-3.4513274336283186],
+                        split_info.left_child.vector.value, 0.00001)
+    self.assertAllClose(0.52, split_node.threshold, 0.00001)
+
+  def testGenerateFeatureSplitCandidates(self):
+    # The data looks like the following:
+    # Example |  Gradients    | Partition | Bucket |
+    # i0      |  (0.2, 0.12)  | 0         | 1      |
+    # i1      |  (-0.5, 0.07) | 0         | 1      |
+    # i2      |  (1.2, 0.2)   | 0         | 0      |
+    # i3      |  (4.0, 0.13)  | 1         | 1      |
+    self._generateFeatureSplitCandidates(
+        array_ops.constant([0.52, 0.52, 0.3, 0.52]), dense_bucket_ids=None)
+
+  def testGenerateFeatureSplitCandidatesBucketized(self):
+    self._generateFeatureSplitCandidates(
+        array_ops.constant([0.52, 0.52, 0.3, 0.52]),
+        dense_bucket_ids=array_ops.constant([1, 1, 0, 1], dtype=dtypes.uint8))
+
+  def testInvalidBucketBoundaries(self):
+    for bucket_boundaries in ([], [0.5, 0.2]):
+      with self.assertRaisesRegexp(ValueError, "bucket_boundaries"):
+        ordinal_split_handler.BinnedDenseSplitHandler(
+            l1_regularization=0.,
+            l2_regularization=1.,
+            tree_complexity_regularization=0.,
+            min_node_weight=0.,
+            feature_column_group_id=0,
+            dense_float_column=array_ops.constant([0.]),
+            bucket_boundaries=bucket_boundaries,
+            gradient_shape=tensor_shape.scalar(),
+            hessian_shape=tensor_shape.scalar(),
+            multiclass_strategy=learner_pb2.LearnerConfig.TREE_PER_CLASS)
+
+
 if __name__ == "__main__":
   googletest.main()
@@ -268,6 +268,37 @@ def extract_features(features, feature_columns, use_core_columns):
           sparse_int_shapes)
 
 
+def bucketize_dense_feature(values, bucket_boundaries):
+  """Quantizes a dense float feature into bucket ids.
+
+  Bucket `i` holds the values in `(bucket_boundaries[i - 1],
+  bucket_boundaries[i]]`, and the last bucket also holds all larger values, as
+  for the buckets built by the quantile accumulators. The result can be cached
+  with the dataset and fed to `GradientBoostedDecisionTreeModel` in place of
+  the float values, along with the same `dense_bucket_boundaries`.
+
+  Args:
+    values: A float32 `Tensor` with the feature values.
+    bucket_boundaries: A sorted list of floats.
+
+  Returns:
+    A `Tensor` of the same shape as `values` with the bucket ids, as uint8 if
+    there are at most 256 buckets and as int32 otherwise.
+  """
+  values = ops.convert_to_tensor(values, dtype=dtypes.float32)
+  bucket_ids = array_ops.searchsorted(
+      array_ops.expand_dims(
+          constant_op.constant(bucket_boundaries, dtype=dtypes.float32), 0),
+      array_ops.reshape(values, [1, -1]),
+      side="left")
+  bucket_ids = array_ops.reshape(
+      math_ops.minimum(bucket_ids, len(bucket_boundaries) - 1),
+      array_ops.shape(values))
+  if len(bucket_boundaries) <= 256:
+    return math_ops.cast(bucket_ids, dtypes.uint8)
+  return bucket_ids
+
+
 def _dropout_params(mode, ensemble_stats):
   """Returns parameters relevant for dropout.
 
@@ -305,7 +336,8 @@ class GradientBoostedDecisionTreeModel(object):
                use_core_columns=False,
                output_leaf_index=False,
                output_leaf_index_modes=None,
-               num_quantiles=100):
+               num_quantiles=100,
+               dense_bucket_boundaries=None):
     """Construct a new GradientBoostedDecisionTreeModel function.
 
     Args:
@@ -329,6 +361,14 @@ class GradientBoostedDecisionTreeModel(object):
         dictates when leaf indices will be outputted. By default, leaf indices
         are only outputted in INFER mode.
       num_quantiles: Number of quantiles to build for numeric feature values.
+      dense_bucket_boundaries: An optional dict from dense float feature names
+        to sorted lists of bucket boundaries, e.g. computed once over a sample
+        of the data. Splits on these features are found from histograms over
+        the fixed buckets, without building quantiles during training. The
+        columns of a multi-dimensional float feature `name` are named
+        `name_0`, `name_1`, ... and each need their own entry. The features
+        may also be given as integer bucket ids, such as the cached results
+        of `bucketize_dense_feature`; they must then be one-dimensional.
 
     Raises:
       ValueError: if inputs are not valid.
@@ -425,6 +465,23 @@ class GradientBoostedDecisionTreeModel(object):
         name="finalized_trees")
     if not features:
       raise ValueError("Features dictionary must be specified.")
+    self._dense_bucket_boundaries = dense_bucket_boundaries or {}
+    self._dense_bucket_ids = {}
+    features = copy.copy(features)
+    for name, bucket_boundaries in self._dense_bucket_boundaries.items():
+      tensor = features.get(name)
+      if not isinstance(tensor, ops.Tensor) or not tensor.dtype.is_integer:
+        continue
+      if len(tensor.shape) > 1 and tensor.shape[1] != 1:
+        raise ValueError(
+            "Bucketized feature %s must be one-dimensional, got shape %s." %
+            (name, tensor.shape))
+      self._dense_bucket_ids[name] = tensor
+      # Predictions compare feature values with bucket boundaries, so each
+      # bucket is represented by its upper boundary.
+      features[name] = array_ops.gather(
+          constant_op.constant(bucket_boundaries, dtype=dtypes.float32),
+          math_ops.to_int32(tensor))
     (fc_names, dense_floats, sparse_float_indices, sparse_float_values,
      sparse_float_shapes, sparse_int_indices,
      sparse_int_values, sparse_int_shapes) = extract_features(
@@ -433,6 +490,13 @@ class GradientBoostedDecisionTreeModel(object):
         .OBLIVIOUS_DECISION_TREE and sparse_float_indices):
       raise ValueError("Oblivious trees don't handle sparse float features yet."
                       )
+    unknown_bucketized_names = (
+        set(self._dense_bucket_boundaries) - set(fc_names[:len(dense_floats)]))
+    if unknown_bucketized_names:
+      raise ValueError(
+          "dense_bucket_boundaries has features %s that are not dense float "
+          "feature columns: %s." %
+          (sorted(unknown_bucketized_names), fc_names[:len(dense_floats)]))
 
     logging.info("Active Feature Columns: " + str(fc_names))
     logging.info("Learner config: " + str(learner_config))
@@ -715,25 +779,50 @@ class GradientBoostedDecisionTreeModel(object):
       # Create handlers for dense float columns
       for dense_float_column_idx in range(len(self._dense_floats)):
         fc_name = self._fc_names[fc_name_idx]
-        handlers.append(
-            ordinal_split_handler.DenseSplitHandler(
-                l1_regularization=l1_regularization,
-                l2_regularization=l2_regularization,
-                tree_complexity_regularization=tree_complexity_regularization,
-                min_node_weight=min_node_weight,
-                feature_column_group_id=constant_op.constant(
-                    dense_float_column_idx),
-                epsilon=epsilon,
-                num_quantiles=num_quantiles,
-                dense_float_column=self._dense_floats[dense_float_column_idx],
-                name=fc_name,
-                gradient_shape=self._gradient_shape,
-                hessian_shape=self._hessian_shape,
-                multiclass_strategy=strategy_tensor,
-                init_stamp_token=init_stamp_token,
-                loss_uses_sum_reduction=loss_uses_sum_reduction,
-                weak_learner_type=weak_learner_type,
-            ))
+        if fc_name in self._dense_bucket_boundaries:
+          handlers.append(
+              ordinal_split_handler.BinnedDenseSplitHandler(
+                  l1_regularization=l1_regularization,
+                  l2_regularization=l2_regularization,
+                  tree_complexity_regularization=(
+                      tree_complexity_regularization),
+                  min_node_weight=min_node_weight,
+                  feature_column_group_id=constant_op.constant(
+                      dense_float_column_idx),
+                  bucket_boundaries=self._dense_bucket_boundaries[fc_name],
+                  dense_float_column=self._dense_floats[
+                      dense_float_column_idx],
+                  dense_bucket_ids=self._dense_bucket_ids.get(fc_name),
+                  name=fc_name,
+                  gradient_shape=self._gradient_shape,
+                  hessian_shape=self._hessian_shape,
+                  multiclass_strategy=strategy_tensor,
+                  init_stamp_token=init_stamp_token,
+                  loss_uses_sum_reduction=loss_uses_sum_reduction,
+                  weak_learner_type=weak_learner_type,
+              ))
+        else:
+          handlers.append(
+              ordinal_split_handler.DenseSplitHandler(
+                  l1_regularization=l1_regularization,
+                  l2_regularization=l2_regularization,
+                  tree_complexity_regularization=(
+                      tree_complexity_regularization),
+                  min_node_weight=min_node_weight,
+                  feature_column_group_id=constant_op.constant(
+                      dense_float_column_idx),
+                  epsilon=epsilon,
+                  num_quantiles=num_quantiles,
+                  dense_float_column=self._dense_floats[
+                      dense_float_column_idx],
+                  name=fc_name,
+                  gradient_shape=self._gradient_shape,
+                  hessian_shape=self._hessian_shape,
+                  multiclass_strategy=strategy_tensor,
+                  init_stamp_token=init_stamp_token,
+                  loss_uses_sum_reduction=loss_uses_sum_reduction,
+                  weak_learner_type=weak_learner_type,
+              ))
         fc_name_idx += 1
 
       # Create handlers for sparse float columns.
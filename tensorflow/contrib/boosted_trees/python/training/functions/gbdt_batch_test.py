@@ -315,6 +315,133 @@ class GbdtTest(test_util.TensorFlowTestCase):
           }"""
       self.assertProtoEquals(expected_tree, output.trees[0])
 
+  def testTrainFnChiefBucketizedFeatures(self):
+    """Tests the train function with fixed buckets for a dense feature."""
+    with self.cached_session():
+      ensemble_handle = model_ops.tree_ensemble_variable(
+          stamp_token=0, tree_ensemble_config="", name="tree_ensemble")
+      learner_config = learner_pb2.LearnerConfig()
+      learner_config.learning_rate_tuner.fixed.learning_rate = 0.1
+      learner_config.num_classes = 2
+      learner_config.regularization.l1 = 0
+      learner_config.regularization.l2 = 0
+      learner_config.constraints.max_tree_depth = 1
+      learner_config.constraints.min_node_weight = 0
+      bucket_boundaries = [0.5, 2.0]
+      features = {}
+      features["dense_float"] = gbdt_batch.bucketize_dense_feature(
+          [[0.], [1.], [0.], [1.]], bucket_boundaries)
+      self.assertEqual(dtypes.uint8, features["dense_float"].dtype)
+
+      gbdt_model = gbdt_batch.GradientBoostedDecisionTreeModel(
+          is_chief=True,
+          num_ps_replicas=0,
+          center_bias=False,
+          ensemble_handle=ensemble_handle,
+          examples_per_layer=1,
+          learner_config=learner_config,
+          logits_dimension=1,
+          features=features,
+          dense_bucket_boundaries={"dense_float": bucket_boundaries})
+
+      predictions = array_ops.constant(
+          [[0.0], [1.0], [0.0], [2.0]], dtype=dtypes.float32)
+      partition_ids = array_ops.zeros([4], dtypes.int32)
+      ensemble_stamp = variables.VariableV1(
+          initial_value=0,
+          name="ensemble_stamp",
+          trainable=False,
+          dtype=dtypes.int64)
+
+      predictions_dict = {
+          "predictions": predictions,
+          "predictions_no_dropout": predictions,
+          "partition_ids": partition_ids,
+          "ensemble_stamp": ensemble_stamp,
+          "num_trees": 12,
+      }
+
+      labels = array_ops.ones([4, 1], dtypes.float32)
+      weights = array_ops.ones([4, 1], dtypes.float32)
+      # Create train op.
+      train_op = gbdt_model.train(
+          loss=math_ops.reduce_mean(
+              _squared_loss(labels, weights, predictions)),
+          predictions_dict=predictions_dict,
+          labels=labels)
+      variables.global_variables_initializer().run()
+      resources.initialize_resources(resources.shared_resources()).run()
+
+      # With fixed buckets, there is no need to wait for quantiles, so the
+      # split is chosen on the first run.
+      train_op.run()
+      stamp_token, serialized = model_ops.tree_ensemble_serialize(
+          ensemble_handle)
+      output = tree_config_pb2.DecisionTreeEnsembleConfig()
+      output.ParseFromString(serialized.eval())
+      self.assertEquals(len(output.trees), 1)
+      self.assertAllClose(output.tree_weights, [0.1])
+      self.assertEquals(stamp_token.eval(), 1)
+      # Bucket 0 has gradients -0.5 and -0.5, bucket 1 has 0 and 0.5, and all
+      # hessians are 0.5.
+      expected_tree = """
+          nodes {
+            dense_float_binary_split {
+              threshold: 0.5
+              left_id: 1
+              right_id: 2
+            }
+            node_metadata {
+              gain: 1.125
+            }
+          }
+          nodes {
+            leaf {
+              vector {
+                value: 1.0
+              }
+            }
+          }
+          nodes {
+            leaf {
+              vector {
+                value: -0.5
+              }
+            }
+          }"""
+      self.assertProtoEquals(expected_tree, output.trees[0])
+
+  def testUnknownBucketizedFeature(self):
+    with self.cached_session():
+      ensemble_handle = model_ops.tree_ensemble_variable(
+          stamp_token=0, tree_ensemble_config="", name="tree_ensemble")
+      learner_config = learner_pb2.LearnerConfig()
+      learner_config.num_classes = 2
+      features = {"dense_float": array_ops.zeros([4, 2], dtypes.float32)}
+      for name in ("dense_flaot", "dense_float"):
+        with self.assertRaisesRegexp(ValueError, "dense_bucket_boundaries"):
+          gbdt_batch.GradientBoostedDecisionTreeModel(
+              is_chief=True,
+              num_ps_replicas=0,
+              center_bias=False,
+              ensemble_handle=ensemble_handle,
+              examples_per_layer=1,
+              learner_config=learner_config,
+              logits_dimension=1,
+              features=features,
+              dense_bucket_boundaries={name: [0.5]})
+      # The columns of a multi-dimensional feature are bucketized by name.
+      gbdt_batch.GradientBoostedDecisionTreeModel(
+          is_chief=True,
+          num_ps_replicas=0,
+          center_bias=False,
+          ensemble_handle=ensemble_handle,
+          examples_per_layer=1,
+          learner_config=learner_config,
+          logits_dimension=1,
+          features=features,
+          dense_bucket_boundaries={"dense_float_0": [0.5]})
+
   def testObliviousDecisionTreeAsWeakLearner(self):
     with self.cached_session():
       ensemble_handle = model_ops.tree_ensemble_variable(
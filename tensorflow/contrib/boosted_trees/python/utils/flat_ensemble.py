@@ -0,0 +1,244 @@
+# Copyright 2018 The TensorFlow Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""A compact array layout of tree ensembles for low latency prediction.
+
+`prediction_ops.gradient_trees_prediction` walks the `TreeNode` protos of every
+tree for every example. `FlatEnsemble` exports a trained ensemble once into a
+struct of arrays, with the nodes of all trees numbered consecutively:
+
+  * `feature_columns[i]`, `thresholds[i]`: the split of node `i`, going left if
+    `dense_float_features[feature_columns[i]] <= thresholds[i]`.
+  * `children[2 * i]`, `children[2 * i + 1]`: the left and right child of
+    node `i`. Leaves are their own children.
+  * `nan_right[i]`: whether NaN values go right at node `i`. They do for dense
+    float splits and go left for oblivious splits, as in the prediction ops.
+  * `leaf_values[i]`: the prediction of leaf `i`, scaled by the tree weight.
+  * `roots[t]`: the root node of tree `t`.
+
+Prediction then moves all (example, tree) pairs one level down per step with a
+few gathers, and sums the leaf values reached after `max_depth` steps.
+
+Only dense float splits are supported, including oblivious trees, which are
+exported as complete binary trees.
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import numpy as np
+
+from tensorflow.contrib.boosted_trees.proto import tree_config_pb2
+from tensorflow.python.framework import constant_op
+from tensorflow.python.framework import ops
+from tensorflow.python.ops import array_ops
+from tensorflow.python.ops import control_flow_ops
+from tensorflow.python.ops import math_ops
+
+
+class FlatEnsemble(object):
+  """A tree ensemble exported into flat arrays."""
+
+  def __init__(self,
+               tree_ensemble_config,
+               prediction_vector_size,
+               only_finalized_trees=False,
+               center_bias=False):
+    """Exports a tree ensemble.
+
+    Args:
+      tree_ensemble_config: A `DecisionTreeEnsembleConfig` proto, or its
+        serialization, e.g. as returned by `model_ops.tree_ensemble_serialize`.
+      prediction_vector_size: The size of the predictions, i.e. the number of
+        classes, minus one when predicting with `reduce_dim`.
+      only_finalized_trees: Whether to skip trees that are not finalized, as
+        the prediction ops do for the `WHOLE_TREE` growing mode.
+      center_bias: Whether the first tree is the bias, which is kept even if it
+        is not finalized.
+
+    Raises:
+      ValueError: If a tree has a split on other than a dense float feature.
+    """
+    if not isinstance(tree_ensemble_config,
+                      tree_config_pb2.DecisionTreeEnsembleConfig):
+      serialized = tree_ensemble_config
+      tree_ensemble_config = tree_config_pb2.DecisionTreeEnsembleConfig()
+      tree_ensemble_config.ParseFromString(serialized)
+    self._prediction_vector_size = prediction_vector_size
+    feature_columns = []
+    thresholds = []
+    children = []
+    nan_right = []
+    leaf_values = []
+    roots = []
+    self._max_depth = 0
+    for tree_idx, tree in enumerate(tree_ensemble_config.trees):
+      if (only_finalized_trees and not (center_bias and tree_idx == 0) and
+          tree_ensemble_config.tree_metadata and
+          not tree_ensemble_config.tree_metadata[tree_idx].is_finalized):
+        continue
+      if not tree.nodes:
+        continue
+      weight = tree_ensemble_config.tree_weights[tree_idx]
+      if tree.nodes[0].HasField("oblivious_dense_float_binary_split"):
+        nodes = self._unfold_oblivious_tree(tree)
+      else:
+        nodes = self._tree_nodes(tree)
+      offset = len(feature_columns)
+      roots.append(offset)
+      for (feature_column, threshold, left_id, right_id, node_nan_right, leaf,
+           depth) in nodes:
+        feature_columns.append(feature_column)
+        thresholds.append(threshold)
+        children.extend([offset + left_id, offset + right_id])
+        nan_right.append(node_nan_right)
+        leaf_values.append(weight * self._leaf_values(leaf))
+        self._max_depth = max(self._max_depth, depth)
+    self._feature_columns = np.array(feature_columns, dtype=np.int32)
+    self._thresholds = np.array(thresholds, dtype=np.float32)
+    self._children = np.array(children, dtype=np.int32)
+    self._nan_right = np.array(nan_right, dtype=np.bool_)
+    self._leaf_values = np.array(
+        leaf_values, dtype=np.float32).reshape([-1, prediction_vector_size])
+    self._roots = np.array(roots, dtype=np.int32)
+
+  @property
+  def num_trees(self):
+    return len(self._roots)
+
+  @property
+  def num_nodes(self):
+    return len(self._feature_columns)
+
+  @property
+  def max_depth(self):
+    return self._max_depth
+
+  def _leaf_values(self, leaf):
+    """Returns the dense prediction vector of a `Leaf` proto."""
+    values = np.zeros(self._prediction_vector_size, dtype=np.float32)
+    if leaf is None:
+      return values
+    if leaf.HasField("sparse_vector"):
+      for index, value in zip(leaf.sparse_vector.index,
+                              leaf.sparse_vector.value):
+        values[index] += value
+    else:
+      values[:len(leaf.vector.value)] += np.array(
+          leaf.vector.value, dtype=np.float32)
+    return values
+
+  def _tree_nodes(self, tree):
+    """Returns (feature, threshold, left, right, nan_right, leaf, depth)."""
+    nodes = [None] * len(tree.nodes)
+    stack = [(0, 0)]
+    while stack:
+      node_id, depth = stack.pop()
+      node = tree.nodes[node_id]
+      node_type = node.WhichOneof("node")
+      if node_type == "leaf":
+        nodes[node_id] = (0, 0., node_id, node_id, False, node.leaf, depth)
+      elif node_type == "dense_float_binary_split":
+        split = node.dense_float_binary_split
+        nodes[node_id] = (split.feature_column, split.threshold, split.left_id,
+                          split.right_id, True, None, depth)
+        stack.append((split.left_id, depth + 1))
+        stack.append((split.right_id, depth + 1))
+      else:
+        raise ValueError(
+            "FlatEnsemble only supports dense float splits, got %s." %
+            node_type)
+    # Nodes unreachable from the root, e.g. left over by pruning, are leaves
+    # that are never reached.
+    for node_id, node in enumerate(nodes):
+      if node is None:
+        nodes[node_id] = (0, 0., node_id, node_id, False, None, 0)
+    return nodes
+
+  def _unfold_oblivious_tree(self, tree):
+    """Returns an oblivious tree as a complete binary tree in heap order."""
+    splits = []
+    for node in tree.nodes:
+      if node.HasField("oblivious_dense_float_binary_split"):
+        splits.append(node.oblivious_dense_float_binary_split)
+      elif node.HasField("leaf"):
+        break
+      else:
+        raise ValueError(
+            "FlatEnsemble only supports dense float splits, got %s." %
+            node.WhichOneof("node"))
+    depth = len(splits)
+    nodes = []
+    for level, split in enumerate(splits):
+      for heap_id in range(2**level - 1, 2**(level + 1) - 1):
+        nodes.append((split.feature_column, split.threshold, 2 * heap_id + 1,
+                      2 * heap_id + 2, False, None, level))
+    # The leaves follow the splits, in the order of the path bits from the
+    # first split on, i.e. the heap order of the last level.
+    for leaf_idx in range(2**depth):
+      heap_id = 2**depth - 1 + leaf_idx
+      nodes.append((0, 0., heap_id, heap_id, False,
+                    tree.nodes[depth + leaf_idx].leaf, depth))
+    return nodes
+
+  def predict(self, dense_float_features, name=None):
+    """Builds the predictions of the ensemble.
+
+    Args:
+      dense_float_features: A list of float `Tensor`s of shape `[batch_size]`
+        or `[batch_size, 1]`, as given to `gradient_trees_prediction`.
+      name: A name for the operation (optional).
+
+    Returns:
+      A float32 `Tensor` of shape `[batch_size, prediction_vector_size]` with
+      the sum of the weighted leaf values of all trees, as computed by
+      `gradient_trees_prediction` without dropout or averaging.
+
+    Raises:
+      ValueError: If `dense_float_features` is empty.
+    """
+    if not dense_float_features:
+      raise ValueError("dense_float_features must not be empty.")
+    with ops.name_scope(name, "FlatEnsemblePredict", dense_float_features):
+      features = array_ops.concat(
+          [array_ops.reshape(f, [-1, 1]) for f in dense_float_features], 1)
+      feature_columns = constant_op.constant(
+          self._feature_columns, name="feature_columns")
+      thresholds = constant_op.constant(self._thresholds, name="thresholds")
+      children = constant_op.constant(self._children, name="children")
+      nan_right = constant_op.constant(self._nan_right, name="nan_right")
+      leaf_values = constant_op.constant(self._leaf_values, name="leaf_values")
+
+      batch_size = array_ops.shape(features)[0]
+      # The current node of each tree for each example.
+      nodes = array_ops.tile(
+          array_ops.expand_dims(constant_op.constant(self._roots), 0),
+          [batch_size, 1])
+
+      def _step(depth, nodes):
+        values = array_ops.batch_gather(
+            features, array_ops.gather(feature_columns, nodes))
+        go_right = math_ops.logical_or(
+            values > array_ops.gather(thresholds, nodes),
+            math_ops.logical_and(
+                math_ops.is_nan(values), array_ops.gather(nan_right, nodes)))
+        return depth + 1, array_ops.gather(
+            children, 2 * nodes + math_ops.to_int32(go_right))
+
+      _, nodes = control_flow_ops.while_loop(
+          lambda depth, _: depth < self._max_depth,
+          _step, [constant_op.constant(0), nodes],
+          back_prop=False)
+      return math_ops.reduce_sum(array_ops.gather(leaf_values, nodes), 1)
@@ -0,0 +1,241 @@
+# Copyright 2018 The TensorFlow Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Tests for FlatEnsemble."""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import numpy as np
+
+from google.protobuf import text_format
+from tensorflow.contrib.boosted_trees.proto import learner_pb2
+from tensorflow.contrib.boosted_trees.proto import tree_config_pb2
+from tensorflow.contrib.boosted_trees.python.ops import model_ops
+from tensorflow.contrib.boosted_trees.python.ops import prediction_ops
+from tensorflow.contrib.boosted_trees.python.utils import flat_ensemble
+from tensorflow.python.client import session
+from tensorflow.python.framework import ops
+from tensorflow.python.framework import test_util
+from tensorflow.python.ops import resources
+from tensorflow.python.platform import googletest
+from tensorflow.python.platform import test
+
+
+def _random_ensemble(rng, num_trees, depth, num_features,
+                     prediction_vector_size):
+  """Returns an ensemble of random complete trees of the given depth."""
+  config = tree_config_pb2.DecisionTreeEnsembleConfig()
+  num_nodes = 2**(depth + 1) - 1
+  for _ in range(num_trees):
+    tree = config.trees.add()
+    for node_id in range(num_nodes):
+      node = tree.nodes.add()
+      if 2 * node_id + 1 < num_nodes:
+        split = node.dense_float_binary_split
+        split.feature_column = rng.randint(num_features)
+        split.threshold = rng.randn()
+        split.left_id = 2 * node_id + 1
+        split.right_id = 2 * node_id + 2
+      else:
+        node.leaf.vector.value.extend(rng.randn(prediction_vector_size))
+    config.tree_weights.append(rng.uniform(0.05, 0.2))
+    config.tree_metadata.add(is_finalized=True)
+  return config
+
+
+def _gradient_trees_prediction(tree_ensemble_config, dense_float_features,
+                               num_classes):
+  """Builds the predictions of the proto walking op."""
+  learner_config = learner_pb2.LearnerConfig()
+  learner_config.num_classes = num_classes
+  learner_config.growing_mode = learner_pb2.LearnerConfig.LAYER_BY_LAYER
+  tree_ensemble_handle = model_ops.tree_ensemble_variable(
+      stamp_token=3,
+      tree_ensemble_config=tree_ensemble_config.SerializeToString(),
+      name="tree_ensemble")
+  predictions, _ = prediction_ops.gradient_trees_prediction(
+      tree_ensemble_handle,
+      0, dense_float_features, [], [], [], [], [], [],
+      learner_config=learner_config.SerializeToString(),
+      apply_dropout=False,
+      apply_averaging=False,
+      center_bias=False,
+      reduce_dim=num_classes == 2)
+  return predictions
+
+
+class FlatEnsembleTest(test_util.TensorFlowTestCase):
+
+  def setUp(self):
+    super(FlatEnsembleTest, self).setUp()
+    self._dense_float_features = [
+        np.array([[7.0], [-2.0], [0.5]], dtype=np.float32),
+        np.array([[1.0], [2.0], [np.nan]], dtype=np.float32),
+    ]
+
+  def _assertMatchesPredictionOp(self, tree_ensemble_config, num_classes):
+    with self.cached_session() as sess:
+      expected = _gradient_trees_prediction(
+          tree_ensemble_config, self._dense_float_features, num_classes)
+      resources.initialize_resources(resources.shared_resources()).run()
+      flat = flat_ensemble.FlatEnsemble(
+          tree_ensemble_config.SerializeToString(),
+          num_classes - 1 if num_classes == 2 else num_classes)
+      actual = flat.predict(self._dense_float_features)
+      expected, actual = sess.run([expected, actual])
+    self.assertAllClose(expected, actual)
+    return flat
+
+  def testEmptyEnsemble(self):
+    flat = self._assertMatchesPredictionOp(
+        tree_config_pb2.DecisionTreeEnsembleConfig(), num_classes=2)
+    self.assertEqual(0, flat.num_trees)
+
+  def testDenseSplits(self):
+    tree_ensemble_config = tree_config_pb2.DecisionTreeEnsembleConfig()
+    text_format.Merge("""
+        trees {
+          nodes {
+            dense_float_binary_split {
+              feature_column: 0 threshold: 0.5 left_id: 1 right_id: 2
+            }
+          }
+          nodes {
+            dense_float_binary_split {
+              feature_column: 1 threshold: 1.5 left_id: 3 right_id: 4
+            }
+          }
+          nodes { leaf { sparse_vector { index: 2 value: 1.5 } } }
+          nodes { leaf { vector { value: 0.1 value: -0.2 value: 0.3 } } }
+          nodes { leaf { sparse_vector { index: 0 value: 2.0 } } }
+        }
+        trees { nodes { leaf { vector { value: 1.0 value: 2.0 value: 3.0 } } } }
+        tree_weights: 0.1
+        tree_weights: 0.5
+        tree_metadata { is_finalized: true }
+        tree_metadata { is_finalized: true }
+        """, tree_ensemble_config)
+    flat = self._assertMatchesPredictionOp(tree_ensemble_config, num_classes=3)
+    self.assertEqual(2, flat.num_trees)
+    self.assertEqual(6, flat.num_nodes)
+    self.assertEqual(2, flat.max_depth)
+
+  def testObliviousSplits(self):
+    tree_ensemble_config = tree_config_pb2.DecisionTreeEnsembleConfig()
+    text_format.Merge("""
+        trees {
+          nodes {
+            oblivious_dense_float_binary_split {
+              feature_column: 0 threshold: 0.5
+            }
+          }
+          nodes {
+            oblivious_dense_float_binary_split {
+              feature_column: 1 threshold: 1.5
+            }
+          }
+          nodes { leaf { vector { value: 1.0 } } }
+          nodes { leaf { vector { value: 2.0 } } }
+          nodes { leaf { vector { value: 3.0 } } }
+          nodes { leaf { vector { value: 4.0 } } }
+        }
+        tree_weights: 0.1
+        tree_metadata { is_finalized: true }
+        """, tree_ensemble_config)
+    flat = self._assertMatchesPredictionOp(tree_ensemble_config, num_classes=2)
+    self.assertEqual(7, flat.num_nodes)
+
+  def testRandomEnsemble(self):
+    rng = np.random.RandomState(0)
+    self._dense_float_features = [
+        rng.randn(20, 1).astype(np.float32) for _ in range(5)
+    ]
+    self._assertMatchesPredictionOp(
+        _random_ensemble(rng, 20, 4, 5, 3), num_classes=3)
+
+  def testOnlyFinalizedTrees(self):
+    rng = np.random.RandomState(1)
+    tree_ensemble_config = _random_ensemble(rng, 3, 2, 2, 1)
+    tree_ensemble_config.tree_metadata[2].is_finalized = False
+    flat = flat_ensemble.FlatEnsemble(
+        tree_ensemble_config, 1, only_finalized_trees=True)
+    self.assertEqual(2, flat.num_trees)
+
+  def testUnsupportedSplit(self):
+    tree_ensemble_config = tree_config_pb2.DecisionTreeEnsembleConfig()
+    text_format.Merge("""
+        trees {
+          nodes {
+            categorical_id_binary_split {
+              feature_column: 0 feature_id: 5 left_id: 1 right_id: 2
+            }
+          }
+          nodes { leaf { vector { value: 1.0 } } }
+          nodes { leaf { vector { value: 2.0 } } }
+        }
+        tree_weights: 1.0
+        """, tree_ensemble_config)
+    with self.assertRaisesRegexp(ValueError, "dense float splits"):
+      flat_ensemble.FlatEnsemble(tree_ensemble_config, 1)
+
+
+class FlatEnsembleBenchmark(test.Benchmark):
+  """Compares flat array prediction with the proto walking op."""
+
+  def _benchmark(self, num_trees, batch_size, flat, depth=6, num_features=50):
+    rng = np.random.RandomState(0)
+    tree_ensemble_config = _random_ensemble(rng, num_trees, depth,
+                                            num_features, 1)
+    dense_float_features = [
+        rng.randn(batch_size, 1).astype(np.float32)
+        for _ in range(num_features)
+    ]
+    with ops.Graph().as_default(), session.Session() as sess:
+      if flat:
+        predictions = flat_ensemble.FlatEnsemble(
+            tree_ensemble_config, 1).predict(dense_float_features)
+      else:
+        predictions = _gradient_trees_prediction(tree_ensemble_config,
+                                                 dense_float_features, 2)
+        sess.run(resources.initialize_resources(resources.shared_resources()))
+      self.run_op_benchmark(
+          sess,
+          predictions,
+          min_iters=20,
+          name="%s_%dtree_%dbatch" % ("flat" if flat else "proto", num_trees,
+                                      batch_size))
+
+  def benchmarkProto1000TreesBatch1(self):
+    self._benchmark(1000, 1, flat=False)
+
+  def benchmarkFlat1000TreesBatch1(self):
+    self._benchmark(1000, 1, flat=True)
+
+  def benchmarkProto1000TreesBatch256(self):
+    self._benchmark(1000, 256, flat=False)
+
+  def benchmarkFlat1000TreesBatch256(self):
+    self._benchmark(1000, 256, flat=True)
+
+  def benchmarkProto5000TreesBatch1(self):
+    self._benchmark(5000, 1, flat=False)
+
+  def benchmarkFlat5000TreesBatch1(self):
+    self._benchmark(5000, 1, flat=True)
+
+
+if __name__ == "__main__":
+  googletest.main()
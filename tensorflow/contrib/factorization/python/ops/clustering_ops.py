@@ -32,8 +32,10 @@ from tensorflow.python.ops import check_ops
 from tensorflow.python.ops import control_flow_ops
 from tensorflow.python.ops import math_ops
 from tensorflow.python.ops import nn_impl
+from tensorflow.python.ops import nn_ops
 from tensorflow.python.ops import random_ops
 from tensorflow.python.ops import state_ops
+from tensorflow.python.ops import tensor_array_ops
 from tensorflow.python.ops import variable_scope
 from tensorflow.python.ops.embedding_ops import embedding_lookup
 from tensorflow.python.platform import resource_loader
@@ -56,6 +58,124 @@ KMC2_INIT = 'kmc2'
 # The name of the variable holding the cluster centers. Used by the Estimator.
 CLUSTERS_VAR_NAME = 'clusters'
 
+# The maximum number of elements of the candidate cluster centers gathered at
+# once for approximate assignment.
+_MAX_CANDIDATE_ELEMENTS = 1 << 24
+
+
+def _assignment_cells(clusters, num_cells):
+  """Partitions cluster centers into cells for approximate assignment.
+
+  A strided subset of the cluster centers is used as cell centers, and every
+  cluster center is placed in the cell of its nearest cell center.
+
+  Args:
+    clusters: Tensor of cluster centers, of shape [num_clusters, d].
+    num_cells: Python integer. The number of cells, capped at num_clusters.
+
+  Returns:
+    A tuple (cell_centers, cells). cell_centers has shape [num_cells, d]. cells
+    is an int64 Tensor of shape [num_cells, max_cell_size] with the indices of
+    the cluster centers in each cell. Shorter cells are padded with the index
+    of their cell center, so that every entry is a valid index.
+  """
+  num_clusters = array_ops.shape(clusters, out_type=dtypes.int64)[0]
+  num_cells = math_ops.minimum(
+      constant_op.constant(num_cells, dtype=dtypes.int64), num_clusters)
+  cell_center_indices = math_ops.range(num_cells) * num_clusters // num_cells
+  cell_centers = array_ops.gather(clusters, cell_center_indices)
+  (cell_ids, _) = gen_clustering_ops.nearest_neighbors(clusters, cell_centers,
+                                                       1)
+  cell_ids = array_ops.squeeze(cell_ids, [-1])
+  # Sort the cluster centers by cell and compute the position of each of them
+  # within its cell.
+  _, order = nn_ops.top_k(-cell_ids, math_ops.to_int32(num_clusters))
+  order = math_ops.to_int64(order)
+  sorted_cell_ids = array_ops.gather(cell_ids, order)
+  cell_sizes = math_ops.unsorted_segment_sum(
+      array_ops.ones_like(cell_ids), cell_ids, num_cells)
+  positions = math_ops.range(num_clusters) - array_ops.gather(
+      math_ops.cumsum(cell_sizes, exclusive=True), sorted_cell_ids)
+  # Entries that are not scattered to remain 0 and are replaced by padding.
+  cells = array_ops.scatter_nd(
+      array_ops.stack([sorted_cell_ids, positions], axis=1), order + 1,
+      array_ops.stack([num_cells, math_ops.reduce_max(cell_sizes)]))
+  padding = array_ops.ones_like(cells) * array_ops.expand_dims(
+      cell_center_indices, 1)
+  cells = array_ops.where(cells > 0, cells - 1, padding)
+  return cell_centers, cells
+
+
+def _approximate_nearest_neighbors(inputs, clusters, cell_centers, cells,
+                                   num_probes):
+  """Finds an approximately nearest cluster center for each input.
+
+  Only the cluster centers in the num_probes cells whose cell centers are
+  nearest to an input are compared with it.
+
+  The candidates of an input are padded to num_probes times the size of the
+  largest cell, and comparing n inputs with them needs their coordinates, of
+  n * num_probes * max_cell_size * d elements. With unbalanced cells this can
+  exceed the [n, num_clusters] distances of exact assignment, so the inputs are
+  compared with their candidates in chunks of at most _MAX_CANDIDATE_ELEMENTS
+  gathered elements.
+
+  Args:
+    inputs: Tensor of input points, of shape [n, d].
+    clusters: Tensor of cluster centers, of shape [num_clusters, d].
+    cell_centers: Cell centers returned by `_assignment_cells`.
+    cells: Cells returned by `_assignment_cells`.
+    num_probes: Python integer. The number of cells to search.
+
+  Returns:
+    A tuple (indices, distances) of Tensors of shape [n]: the int64 index of the
+    nearest candidate cluster center of each input, and the squared L2
+    distance to it.
+  """
+  (probes, _) = gen_clustering_ops.nearest_neighbors(inputs, cell_centers,
+                                                     num_probes)
+  num_inputs = array_ops.shape(inputs)[0]
+  candidates = array_ops.reshape(
+      array_ops.gather(cells, probes), [num_inputs, -1])
+  num_candidates = array_ops.shape(candidates)[1]
+  chunk_size = math_ops.maximum(
+      _MAX_CANDIDATE_ELEMENTS //
+      math_ops.maximum(num_candidates * array_ops.shape(inputs)[1], 1), 1)
+  num_chunks = (num_inputs + chunk_size - 1) // chunk_size
+  cluster_norms = math_ops.reduce_sum(math_ops.square(clusters), 1)
+
+  def _compare_chunk(i, nearest_ta, distances_ta):
+    """Compares a chunk of inputs with their candidates."""
+    chunk_inputs = inputs[i * chunk_size:(i + 1) * chunk_size]
+    chunk_candidates = candidates[i * chunk_size:(i + 1) * chunk_size]
+    # Squared distances to the candidates, without the squared norm of the
+    # input which does not depend on the candidate.
+    products = array_ops.squeeze(
+        math_ops.matmul(
+            array_ops.gather(clusters, chunk_candidates),
+            array_ops.expand_dims(chunk_inputs, 2)), [2])
+    distances = array_ops.gather(cluster_norms, chunk_candidates) - 2 * products
+    return (i + 1, nearest_ta.write(i, math_ops.argmin(distances, 1)),
+            distances_ta.write(i, math_ops.reduce_min(distances, 1)))
+
+  _, nearest_ta, distances_ta = control_flow_ops.while_loop(
+      lambda i, *_: i < num_chunks, _compare_chunk, [
+          constant_op.constant(0),
+          tensor_array_ops.TensorArray(
+              dtypes.int64, size=num_chunks, infer_shape=False,
+              element_shape=[None]),
+          tensor_array_ops.TensorArray(
+              inputs.dtype, size=num_chunks, infer_shape=False,
+              element_shape=[None])
+      ])
+  nearest = nearest_ta.concat() + math_ops.to_int64(num_candidates) * (
+      math_ops.range(num_inputs, dtype=dtypes.int64))
+  indices = array_ops.gather(array_ops.reshape(candidates, [-1]), nearest)
+  distances = math_ops.maximum(
+      distances_ta.concat() + math_ops.reduce_sum(math_ops.square(inputs), 1),
+      0)
+  return indices, distances
+
 
 class KMeans(object):
   """Creates the graph for k-means clustering."""
@@ -69,7 +189,9 @@ class KMeans(object):
                mini_batch_steps_per_iteration=1,
                random_seed=0,
                kmeans_plus_plus_num_retries=2,
-               kmc2_chain_length=200):
+               kmc2_chain_length=200,
+               num_assignment_cells=None,
+               num_assignment_probes=1):
     """Creates an object for generating KMeans clustering graph.
 
     This class implements the following variants of K-means algorithm:
@@ -97,6 +219,19 @@ class KMeans(object):
     asynchronously without locking. So this asynchronous version may not behave
     exactly like a full-batch version.
 
+    By default each input is assigned to its nearest cluster center, which
+    costs O(num_clusters) distance computations per input. If
+    num_assignment_cells is set, the assignment is approximate instead: a
+    strided subset of num_assignment_cells cluster centers is used to partition
+    all the centers into cells, and each input is only compared with the
+    centers in the num_assignment_probes cells nearest to it. Probing more
+    cells improves the chance of finding the true nearest center at the cost of
+    more distance computations. This is mostly useful for large num_clusters,
+    with num_assignment_cells around sqrt(num_clusters). Each input is compared
+    with num_assignment_probes times as many centers as the largest cell holds,
+    so cells of very uneven sizes make the assignment slower; the centers are
+    gathered for chunks of inputs at a time to bound the memory used.
+
     Args:
       inputs: An input tensor or list of input tensors. It is assumed that the
         data points have been previously randomly permuted.
@@ -130,10 +265,14 @@ class KMeans(object):
         k-MC2 algorithm to produce one new cluster centers. If a (mini-)batch
         contains less points, one new cluster center is generated from the
         (mini-)batch.
+      num_assignment_cells: If not None, the number of cells used to assign
+        inputs to approximately nearest cluster centers. See above.
+      num_assignment_probes: Number of cells searched for the nearest cluster
+        center of each input. Used only if num_assignment_cells is set.
 
     Raises:
-      ValueError: An invalid argument was passed to initial_clusters or
-        distance_metric.
+      ValueError: An invalid argument was passed to initial_clusters,
+        distance_metric, num_assignment_cells or num_assignment_probes.
     """
     if isinstance(initial_clusters, str) and initial_clusters not in [
         RANDOM_INIT, KMEANS_PLUS_PLUS_INIT, KMC2_INIT
@@ -142,6 +281,12 @@ class KMeans(object):
           "Unsupported initialization algorithm '%s'" % initial_clusters)
     if distance_metric not in [SQUARED_EUCLIDEAN_DISTANCE, COSINE_DISTANCE]:
       raise ValueError("Unsupported distance metric '%s'" % distance_metric)
+    if num_assignment_cells is not None and num_assignment_cells < 1:
+      raise ValueError('num_assignment_cells must be positive, got %d' %
+                       num_assignment_cells)
+    if num_assignment_probes < 1:
+      raise ValueError('num_assignment_probes must be positive, got %d' %
+                       num_assignment_probes)
     self._inputs = inputs if isinstance(inputs, list) else [inputs]
     self._num_clusters = num_clusters
     self._initial_clusters = initial_clusters
@@ -151,6 +296,8 @@ class KMeans(object):
     self._random_seed = random_seed
     self._kmeans_plus_plus_num_retries = kmeans_plus_plus_num_retries
     self._kmc2_chain_length = kmc2_chain_length
+    self._num_assignment_cells = num_assignment_cells
+    self._num_assignment_probes = num_assignment_probes
 
   @classmethod
   def _distance_graph(cls, inputs, clusters, distance_metric):
@@ -256,14 +403,23 @@ class KMeans(object):
       # this.
       with ops.colocate_with(clusters, ignore_existing=True):
         clusters = nn_impl.l2_normalize(clusters, dim=1)
+    if self._num_assignment_cells is not None:
+      with ops.colocate_with(clusters, ignore_existing=True):
+        cell_centers, cells = _assignment_cells(clusters,
+                                                self._num_assignment_cells)
     for inp, score in zip(inputs, scores):
       with ops.colocate_with(inp, ignore_existing=True):
-        (indices, distances) = gen_clustering_ops.nearest_neighbors(
-            inp, clusters, 1)
+        if self._num_assignment_cells is not None:
+          (indices, distances) = _approximate_nearest_neighbors(
+              inp, clusters, cell_centers, cells, self._num_assignment_probes)
+        else:
+          (indices, distances) = gen_clustering_ops.nearest_neighbors(
+              inp, clusters, 1)
+          indices = array_ops.squeeze(indices, [-1])
+          distances = array_ops.squeeze(distances, [-1])
         if self._distance_metric == COSINE_DISTANCE:
           distances *= 0.5
-        output.append((score, array_ops.squeeze(distances, [-1]),
-                       array_ops.squeeze(indices, [-1])))
+        output.append((score, distances, indices))
     return zip(*output)
 
   def _clusters_l2_normalized(self):
@@ -36,6 +36,7 @@ from tensorflow.python.ops import data_flow_ops
 from tensorflow.python.ops import embedding_ops
 from tensorflow.python.ops import linalg_ops
 from tensorflow.python.ops import math_ops
+from tensorflow.python.ops import nn_ops
 from tensorflow.python.ops import random_ops
 from tensorflow.python.ops import sparse_ops
 from tensorflow.python.ops import state_ops
@@ -805,6 +806,118 @@ class WALSModel(object):
         transpose_input=transpose_input,
         row_weights=projection_weights)[0]
 
+  @classmethod
+  def _sharded_top_k(cls, queries, factors, num_items, k, block_size):
+    """Finds the factors with the largest dot products with each query.
+
+    Each shard of factors is scored next to where it is stored, block_size rows
+    at a time. The scores of a block are merged into a running top k, so at
+    most [num_queries, k + block_size] scores exist at any time per shard. The
+    per-shard results are then merged.
+
+    Args:
+      queries: A float32 Tensor of shape [num_queries, n_components].
+      factors: A list of factor shards, sharded as by _shard_sizes.
+      num_items: The total number of rows in factors.
+      k: Number of factors to return for each query.
+      block_size: Number of factor rows scored at a time.
+
+    Returns:
+      A tuple (scores, indices) of Tensors of shape
+      [num_queries, min(k, num_items)] with the largest scores, in decreasing
+      order, and the int64 indices of the corresponding factor rows.
+    """
+    k = min(k, num_items)
+    num_queries = array_ops.shape(queries)[0]
+    shard_scores = []
+    shard_indices = []
+    offset = 0
+    for shard, size in zip(factors,
+                           cls._shard_sizes(num_items, len(factors))):
+      with ops.colocate_with(shard):
+
+        def _cond(start, unused_scores, unused_indices, size=size):
+          return start < size
+
+        def _body(start, scores, indices, shard=shard, offset=offset):
+          """Merges the scores of one block of the shard into the top k."""
+          block = shard[start:start + block_size]
+          block_indices = math_ops.range(
+              start, start + array_ops.shape(block, out_type=dtypes.int64)[0])
+          scores = array_ops.concat(
+              [scores, math_ops.matmul(queries, block, transpose_b=True)], 1)
+          indices = array_ops.concat([
+              indices,
+              array_ops.tile(
+                  array_ops.expand_dims(block_indices + offset, 0),
+                  [num_queries, 1])
+          ], 1)
+          scores, top_k = nn_ops.top_k(scores, k)
+          return (start + block_size, scores,
+                  array_ops.batch_gather(indices, top_k))
+
+        # The running top k starts out with k placeholder entries that score
+        # lower than any factor.
+        _, scores, indices = control_flow_ops.while_loop(
+            _cond,
+            _body, [
+                constant_op.constant(0, dtype=dtypes.int64),
+                array_ops.fill([num_queries, k], float("-inf")),
+                array_ops.fill([num_queries, k],
+                               constant_op.constant(-1, dtype=dtypes.int64))
+            ],
+            back_prop=False)
+      shard_scores.append(scores)
+      shard_indices.append(indices)
+      offset += size
+    scores, top_k = nn_ops.top_k(array_ops.concat(shard_scores, 1), k)
+    return scores, array_ops.batch_gather(
+        array_ops.concat(shard_indices, 1), top_k)
+
+  def top_k_cols(self, row_ids, k, block_size=4096):
+    """Returns the columns with the largest predicted values for some rows.
+
+    The predicted value of column j for row i is the dot product of their
+    factors. The scores are computed blockwise on each column factor shard, so
+    the full [len(row_ids), input_cols] score matrix is never materialized.
+
+    Args:
+      row_ids: A rank-1 Tensor of row indices.
+      k: Python integer. The number of columns to return for each row.
+      block_size: Python integer. The number of column factors scored at a time
+        on each shard. Larger blocks use more memory but fewer steps.
+
+    Returns:
+      A tuple (scores, col_ids) of Tensors of shape
+      [len(row_ids), min(k, input_cols)]: the predicted values of the top
+      columns for each row, in decreasing order, and their int64 indices.
+    """
+    row_factors = embedding_ops.embedding_lookup(
+        self._row_factors, row_ids, partition_strategy="div")
+    return self._sharded_top_k(row_factors, self._col_factors,
+                               self._input_cols, k, block_size)
+
+  def top_k_rows(self, col_ids, k, block_size=4096):
+    """Returns the rows with the largest predicted values for some columns.
+
+    This is the transposed version of top_k_cols.
+
+    Args:
+      col_ids: A rank-1 Tensor of column indices.
+      k: Python integer. The number of rows to return for each column.
+      block_size: Python integer. The number of row factors scored at a time on
+        each shard.
+
+    Returns:
+      A tuple (scores, row_ids) of Tensors of shape
+      [len(col_ids), min(k, input_rows)]: the predicted values of the top rows
+      for each column, in decreasing order, and their int64 indices.
+    """
+    col_factors = embedding_ops.embedding_lookup(
+        self._col_factors, col_ids, partition_strategy="div")
+    return self._sharded_top_k(col_factors, self._row_factors,
+                               self._input_rows, k, block_size)
+
   def _process_input_helper(self,
                             update_row_factors,
                             sp_input=None,
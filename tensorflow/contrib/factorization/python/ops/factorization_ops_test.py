@@ -822,6 +822,53 @@ class WalsModelTest(test.TestCase):
   def test_sum_col_weights(self):
     self._run_test_sum_weights(False)
 
+  def test_top_k_cols(self):
+    rows, cols, dims = 7, 11, 3
+    np.random.seed(4)
+    row_init = np.random.rand(rows, dims).astype(np.float32)
+    col_init = np.random.rand(cols, dims).astype(np.float32)
+    scores = np.dot(row_init, np.transpose(col_init))
+    with ops.Graph().as_default(), self.cached_session():
+      model = factorization_ops.WALSModel(
+          rows,
+          cols,
+          dims,
+          row_init=[row_init[:4], row_init[4:]],
+          col_init=[col_init[:4], col_init[4:8], col_init[8:]],
+          num_row_shards=2,
+          num_col_shards=3)
+      model.initialize_op.run()
+      row_ids = [5, 0, 3]
+      # Blocks smaller than k exercise merging across blocks and shards.
+      top_scores, top_cols = model.top_k_cols(row_ids, k=4, block_size=2)
+      expected_cols = np.argsort(-scores[row_ids], axis=1)[:, :4]
+      self.assertAllEqual(expected_cols, top_cols.eval())
+      self.assertAllClose(-np.sort(-scores[row_ids], axis=1)[:, :4],
+                          top_scores.eval())
+      # Asking for more columns than exist returns all of them.
+      _, top_cols = model.top_k_cols(row_ids, k=20)
+      self.assertAllEqual(np.argsort(-scores[row_ids], axis=1), top_cols.eval())
+
+  def test_top_k_rows(self):
+    rows, cols, dims = 9, 5, 2
+    np.random.seed(5)
+    row_init = np.random.rand(rows, dims).astype(np.float32)
+    col_init = np.random.rand(cols, dims).astype(np.float32)
+    scores = np.transpose(np.dot(row_init, np.transpose(col_init)))
+    with ops.Graph().as_default(), self.cached_session():
+      model = factorization_ops.WALSModel(
+          rows,
+          cols,
+          dims,
+          row_init=[row_init[:5], row_init[5:]],
+          col_init=col_init,
+          num_row_shards=2)
+      model.initialize_op.run()
+      col_ids = [4, 1]
+      _, top_rows = model.top_k_rows(col_ids, k=3, block_size=3)
+      self.assertAllEqual(
+          np.argsort(-scores[col_ids], axis=1)[:, :3], top_rows.eval())
+
 
 if __name__ == "__main__":
   test.main()
@@ -140,7 +140,7 @@ class _ModelFn(object):
   def __init__(self, num_clusters, initial_clusters, distance_metric,
                random_seed, use_mini_batch, mini_batch_steps_per_iteration,
                kmeans_plus_plus_num_retries, relative_tolerance,
-               feature_columns):
+               feature_columns, num_assignment_cells, num_assignment_probes):
     self._num_clusters = num_clusters
     self._initial_clusters = initial_clusters
     self._distance_metric = distance_metric
@@ -150,6 +150,8 @@ class _ModelFn(object):
     self._kmeans_plus_plus_num_retries = kmeans_plus_plus_num_retries
     self._relative_tolerance = relative_tolerance
     self._feature_columns = feature_columns
+    self._num_assignment_cells = num_assignment_cells
+    self._num_assignment_probes = num_assignment_probes
 
   def model_fn(self, features, mode, config):
     """Model function for the estimator.
@@ -202,8 +204,9 @@ class _ModelFn(object):
          use_mini_batch=self._use_mini_batch,
          mini_batch_steps_per_iteration=self._mini_batch_steps_per_iteration,
          random_seed=self._random_seed,
-         kmeans_plus_plus_num_retries=self._kmeans_plus_plus_num_retries
-     ).training_graph()
+         kmeans_plus_plus_num_retries=self._kmeans_plus_plus_num_retries,
+         num_assignment_cells=self._num_assignment_cells,
+         num_assignment_probes=self._num_assignment_probes).training_graph()
 
     loss = math_ops.reduce_sum(losses)
     summary.scalar('loss/raw', loss)
@@ -327,7 +330,9 @@ class KMeansClustering(estimator.Estimator):
                kmeans_plus_plus_num_retries=2,
                relative_tolerance=None,
                config=None,
-               feature_columns=None):
+               feature_columns=None,
+               num_assignment_cells=None,
+               num_assignment_probes=1):
     """Creates an Estimator for running KMeans training and inference.
 
     This Estimator implements the following variants of the K-means algorithm:
@@ -398,10 +403,19 @@ class KMeansClustering(estimator.Estimator):
         used by the model. All items in the set should be feature column
         instances that can be passed to `tf.feature_column.input_layer`. If this
         is None, all features will be used.
+      num_assignment_cells: If not None, input points are assigned to
+        approximately nearest cluster centers. The centers are partitioned into
+        this many cells, and each point is only compared with the centers in
+        the `num_assignment_probes` cells nearest to it. This reduces the cost
+        of training and inference for large `num_clusters`; a value around
+        `sqrt(num_clusters)` works well.
+      num_assignment_probes: The number of cells searched for each input point.
+        Larger values trade speed for a better chance of finding the nearest
+        center. Used only if `num_assignment_cells` is set.
 
     Raises:
-      ValueError: An invalid argument was passed to `initial_clusters` or
-        `distance_metric`.
+      ValueError: An invalid argument was passed to `initial_clusters`,
+        `distance_metric`, `num_assignment_cells` or `num_assignment_probes`.
     """
     if isinstance(initial_clusters, str) and initial_clusters not in [
         KMeansClustering.RANDOM_INIT, KMeansClustering.KMEANS_PLUS_PLUS_INIT
@@ -413,12 +427,19 @@ class KMeansClustering(estimator.Estimator):
         KMeansClustering.COSINE_DISTANCE
     ]:
       raise ValueError("Unsupported distance metric '%s'" % distance_metric)
+    if num_assignment_cells is not None and num_assignment_cells < 1:
+      raise ValueError("num_assignment_cells must be positive, got %d" %
+                       num_assignment_cells)
+    if num_assignment_probes < 1:
+      raise ValueError("num_assignment_probes must be positive, got %d" %
+                       num_assignment_probes)
     super(KMeansClustering, self).__init__(
         model_fn=_ModelFn(
             num_clusters, initial_clusters, distance_metric, random_seed,
             use_mini_batch, mini_batch_steps_per_iteration,
             kmeans_plus_plus_num_retries, relative_tolerance,
-            feature_columns).model_fn,
+            feature_columns, num_assignment_cells,
+            num_assignment_probes).model_fn,
         model_dir=model_dir,
         config=config)
 
@@ -25,7 +25,9 @@ import numpy as np
 from sklearn.cluster import KMeans as SklearnKMeans
 
 # pylint: disable=g-import-not-at-top
+from tensorflow.contrib.factorization.python.ops import clustering_ops
 from tensorflow.contrib.factorization.python.ops import kmeans as kmeans_lib
+from tensorflow.python.client import session
 from tensorflow.python.estimator import run_config
 from tensorflow.python.feature_column import feature_column as fc
 from tensorflow.python.framework import constant_op
@@ -36,6 +38,7 @@ from tensorflow.python.ops import control_flow_ops
 from tensorflow.python.ops import data_flow_ops
 from tensorflow.python.ops import math_ops
 from tensorflow.python.ops import random_ops
+from tensorflow.python.ops import variables
 from tensorflow.python.platform import benchmark
 from tensorflow.python.platform import flags
 from tensorflow.python.platform import test
@@ -135,6 +138,14 @@ class KMeansTestBase(test.TestCase):
   def mini_batch_steps_per_iteration(self):
     return 1
 
+  @property
+  def num_assignment_cells(self):
+    return None
+
+  @property
+  def num_assignment_probes(self):
+    return 1
+
 
 class KMeansTest(KMeansTestBase):
 
@@ -156,7 +167,9 @@ class KMeansTest(KMeansTestBase):
         use_mini_batch=self.use_mini_batch,
         mini_batch_steps_per_iteration=self.mini_batch_steps_per_iteration,
         random_seed=24,
-        relative_tolerance=relative_tolerance)
+        relative_tolerance=relative_tolerance,
+        num_assignment_cells=self.num_assignment_cells,
+        num_assignment_probes=self.num_assignment_probes)
 
   def test_clusters(self):
     kmeans = self._kmeans()
@@ -344,6 +357,61 @@ class FullBatchAsyncKMeansTest(KMeansTest):
     return self.num_points // self.batch_size
 
 
+class ApproximateAssignmentKMeansTest(KMeansTest):
+
+  @property
+  def num_assignment_cells(self):
+    return 3
+
+  @property
+  def num_assignment_probes(self):
+    # Searching every cell makes the assignment exact.
+    return 3
+
+  def test_approximate_assignment(self):
+    np.random.seed(5)
+    centers = make_random_centers(200, 8, center_norm=2000)
+    points, true_assignments, _ = make_random_points(centers, 500)
+
+    def _assign(num_assignment_cells, num_assignment_probes):
+      with ops.Graph().as_default(), self.cached_session() as sess:
+        (_, cluster_idx, scores, _, init_op, _) = clustering_ops.KMeans(
+            constant_op.constant(points),
+            len(centers),
+            initial_clusters=centers,
+            num_assignment_cells=num_assignment_cells,
+            num_assignment_probes=num_assignment_probes).training_graph()
+        sess.run(variables.global_variables_initializer())
+        sess.run(init_op)
+        return sess.run([cluster_idx[0], scores[0]])
+
+    exact_assignments, exact_scores = _assign(None, 1)
+    self.assertAllEqual(true_assignments, exact_assignments)
+    # Probing all cells finds the same centers as exact assignment.
+    assignments, scores = _assign(16, 16)
+    self.assertAllEqual(exact_assignments, assignments)
+    self.assertAllClose(exact_scores, scores, rtol=1e-3)
+    # Comparing the inputs with their candidates in many small chunks gives
+    # the same result.
+    with test.mock.patch.object(clustering_ops, '_MAX_CANDIDATE_ELEMENTS',
+                                1000):
+      chunked_assignments, chunked_scores = _assign(16, 16)
+    self.assertAllEqual(assignments, chunked_assignments)
+    self.assertAllClose(scores, chunked_scores)
+    # Probing fewer cells may miss the nearest center, but never reports a
+    # distance smaller than the exact one.
+    assignments, scores = _assign(16, 4)
+    self.assertGreater(np.mean(assignments == exact_assignments), 0.5)
+    self.assertTrue(np.all(scores >= exact_scores * (1 - 1e-3)))
+
+  def test_invalid_arguments(self):
+    with self.assertRaisesRegexp(ValueError, 'num_assignment_cells'):
+      kmeans_lib.KMeansClustering(5, num_assignment_cells=0)
+    with self.assertRaisesRegexp(ValueError, 'num_assignment_probes'):
+      kmeans_lib.KMeansClustering(
+          5, num_assignment_cells=2, num_assignment_probes=0)
+
+
 class KMeansCosineDistanceTest(KMeansTestBase):
 
   def setUp(self):
@@ -589,6 +657,54 @@ class SklearnKMeansBenchmark(KMeansBenchmark):
     self._report(num_iters, start, time.time(), scores)
 
 
+class KMeansAssignmentBenchmark(benchmark.Benchmark):
+  """Compares exact and approximate assignment of points to many clusters."""
+
+  def _benchmark(self,
+                 num_assignment_cells=None,
+                 num_assignment_probes=1,
+                 num_clusters=20000,
+                 dimension=64,
+                 num_points=4096):
+    np.random.seed(123456)
+    centers = make_random_centers(num_clusters, dimension)
+    points, _, _ = make_random_points(centers, num_points, max_offset=250)
+    exact_assignments = np.concatenate([
+        np.argmin(
+            np.sum(np.square(centers), axis=1) -
+            2 * np.dot(batch, np.transpose(centers)),
+            axis=1) for batch in np.split(points, num_points // 256)
+    ])
+    with ops.Graph().as_default(), session.Session() as sess:
+      (_, cluster_idx, _, _, init_op, _) = clustering_ops.KMeans(
+          constant_op.constant(points),
+          num_clusters,
+          initial_clusters=centers,
+          num_assignment_cells=num_assignment_cells,
+          num_assignment_probes=num_assignment_probes).training_graph()
+      sess.run(variables.global_variables_initializer())
+      sess.run(init_op)
+      recall = np.mean(sess.run(cluster_idx[0]) == exact_assignments)
+      name = 'assign_%dcenter_%dpoint' % (num_clusters, num_points)
+      if num_assignment_cells is not None:
+        name += '_%dcell_%dprobe' % (num_assignment_cells,
+                                     num_assignment_probes)
+      self.run_op_benchmark(
+          sess, cluster_idx[0], name=name, extras={'recall': recall})
+
+  def benchmark_exact(self):
+    self._benchmark()
+
+  def benchmark_approximate_1probe(self):
+    self._benchmark(num_assignment_cells=140, num_assignment_probes=1)
+
+  def benchmark_approximate_4probe(self):
+    self._benchmark(num_assignment_cells=140, num_assignment_probes=4)
+
+  def benchmark_approximate_16probe(self):
+    self._benchmark(num_assignment_cells=140, num_assignment_probes=16)
+
+
 class KMeansTestQueues(test.TestCase):
 
   def input_fn(self):
@@ -28,10 +28,12 @@ from __future__ import division
 from __future__ import print_function
 
 import functools
+import io
 import os
 import sys
 import tarfile
 
+import numpy as np
 from six.moves import urllib
 
 from tensorflow.contrib.layers.python.layers import layers
@@ -63,6 +65,7 @@ __all__ = [
     'frechet_inception_distance',
     'frechet_classifier_distance',
     'frechet_classifier_distance_from_activations',
+    'frechet_classifier_distance_from_statistics',
     'mean_only_frechet_classifier_distance_from_activations',
     'diagonal_only_frechet_classifier_distance_from_activations',
     'kernel_inception_distance',
@@ -71,6 +74,10 @@ __all__ = [
     'kernel_classifier_distance_and_std',
     'kernel_classifier_distance_from_activations',
     'kernel_classifier_distance_and_std_from_activations',
+    'compute_classifier_statistics',
+    'save_classifier_statistics',
+    'load_classifier_statistics',
+    'cached_classifier_statistics',
     'INCEPTION_DEFAULT_IMAGE_SIZE',
 ]
 
@@ -719,6 +726,51 @@ def frechet_classifier_distance_from_activations(real_activations,
       gen_centered, gen_centered, transpose_a=True) / (
           num_examples_generated - 1)
 
+  fid = frechet_classifier_distance_from_statistics(m, sigma, m_w, sigma_w)
+  if activations_dtype != dtypes.float64:
+    fid = math_ops.cast(fid, activations_dtype)
+
+  return fid
+
+
+def frechet_classifier_distance_from_statistics(real_mean, real_covariance,
+                                                generated_mean,
+                                                generated_covariance):
+  """Classifier distance for evaluating a generative model from statistics.
+
+  This function computes the Frechet classifier distance from the means and
+  covariance matrices of the activations of real images and generated images,
+  as computed by `compute_classifier_statistics()`. Since the statistics of
+  the real images don't change across evaluations, they can be computed once,
+  cached with `cached_classifier_statistics()`, and passed here as constants.
+
+  Given two Gaussian distribution with means m and m_w and covariance matrices
+  C and C_w, this function calculates
+
+                |m - m_w|^2 + Tr(C + C_w - 2(C * C_w)^(1/2))
+
+  Args:
+    real_mean: 1D Tensor or array with the mean of the activations of real
+      data. Shape is [activation_size].
+    real_covariance: 2D Tensor or array with the covariance matrix of the
+      activations of real data. Shape is [activation_size, activation_size].
+    generated_mean: 1D Tensor or array with the mean of the activations of
+      generated data.
+    generated_covariance: 2D Tensor or array with the covariance matrix of the
+      activations of generated data.
+
+  Returns:
+   The Frechet Inception distance. A float64 scalar.
+  """
+  m = math_ops.to_double(real_mean)
+  sigma = math_ops.to_double(real_covariance)
+  m_w = math_ops.to_double(generated_mean)
+  sigma_w = math_ops.to_double(generated_covariance)
+  m.shape.assert_has_rank(1)
+  sigma.shape.assert_has_rank(2)
+  m_w.shape.assert_is_compatible_with(m.shape)
+  sigma_w.shape.assert_is_compatible_with(sigma.shape)
+
   # Find the Tr(sqrt(sigma sigma_w)) component of FID
   sqrt_trace_component = trace_sqrt_product(sigma, sigma_w)
 
@@ -731,11 +783,7 @@ def frechet_classifier_distance_from_activations(real_activations,
   # Next the distance between means.
   mean = math_ops.reduce_sum(
       math_ops.squared_difference(m, m_w))  # Equivalent to L2 but more stable.
-  fid = trace + mean
-  if activations_dtype != dtypes.float64:
-    fid = math_ops.cast(fid, activations_dtype)
-
-  return fid
+  return trace + mean
 
 frechet_inception_distance = functools.partial(
     frechet_classifier_distance,
@@ -1111,3 +1159,150 @@ def kernel_classifier_distance_and_std_from_activations(real_activations,
       lambda: math_ops.reduce_sum(math_ops.square(ests - mn)) / (n_blocks_ - 1))
 
   return mn, math_ops.sqrt(var / n_blocks_)
+
+
+def _merge_moments(moments_a, moments_b):
+  """Merges two `(count, mean, comoment)` tuples of moments.
+
+  This is the implementation of `eval_utils.merge_classifier_moments`. It only
+  uses arithmetic operators, so that it works both on numpy arrays and on
+  Tensors.
+
+  Args:
+    moments_a: The moments of the first set of activations.
+    moments_b: The moments of the second set of activations.
+
+  Returns:
+    The moments of the union of both sets.
+  """
+  count_a, mean_a, comoment_a = moments_a
+  count_b, mean_b, comoment_b = moments_b
+  count = count_a + count_b
+  delta = mean_b - mean_a
+  mean = mean_a + delta * (count_b / count)
+  comoment = comoment_a + comoment_b + (
+      delta[:, None] * delta[None, :] * (count_a * count_b / count))
+  return count, mean, comoment
+
+
+def compute_classifier_statistics(activations,
+                                  num_batches,
+                                  session,
+                                  keep_activations=False):
+  """Computes the statistics of activations over many batches.
+
+  Evaluates `activations` `num_batches` times with `session`, and accumulates
+  the mean and covariance matrix of all evaluated activations in float64. Each
+  evaluation must produce a new batch, e.g. when the images come from an input
+  pipeline or a generator with random inputs. Only one batch of images is in
+  the graph at a time, so that large sample sizes, such as the usual 50,000
+  images, can be evaluated without running out of memory.
+
+  Example usage, with the statistics of the real images computed once:
+
+  ```python
+  real_activations = classifier_fn(real_images_batch)
+  generated_activations = classifier_fn(generator_fn(noise_batch))
+  with tf.Session() as sess:
+    real_stats = cached_classifier_statistics(
+        '/tmp/real_stats.npz', real_activations, 500, sess)
+    generated_stats = compute_classifier_statistics(
+        generated_activations, 500, sess)
+    fid = sess.run(frechet_classifier_distance_from_statistics(
+        real_stats['mean'], real_stats['covariance'],
+        generated_stats['mean'], generated_stats['covariance']))
+  ```
+
+  Args:
+    activations: 2D Tensor with a batch of activations. Shape is
+      [batch_size, activation_size].
+    num_batches: Number of times to evaluate `activations`.
+    session: A `Session` to evaluate `activations` in.
+    keep_activations: Whether to also return all evaluated activations, e.g.
+      for `kernel_classifier_distance_from_activations()`.
+
+  Returns:
+    A dict of numpy arrays with the number of activations, `num_examples`, and
+    their `mean` and `covariance`. If `keep_activations` is `True`, it also
+    holds all `activations`, with shape [num_examples, activation_size].
+
+  Raises:
+    ValueError: If `num_batches` isn't positive, or `activations` isn't 2D.
+  """
+  if num_batches < 1:
+    raise ValueError('`num_batches` must be positive, got %d.' % num_batches)
+  activations.shape.assert_has_rank(2)
+
+  count = 0
+  mean = 0.
+  comoment = 0.
+  batches = []
+  for _ in range(num_batches):
+    batch = session.run(activations)
+    if keep_activations:
+      batches.append(batch)
+    batch = batch.astype(np.float64)
+    batch_mean = np.mean(batch, axis=0)
+    centered = batch - batch_mean
+    count, mean, comoment = _merge_moments(
+        (count, mean, comoment),
+        (batch.shape[0], batch_mean, np.dot(centered.T, centered)))
+
+  statistics = {
+      'num_examples': np.array(count, dtype=np.int64),
+      'mean': mean,
+      'covariance': comoment / (count - 1),
+  }
+  if keep_activations:
+    statistics['activations'] = np.concatenate(batches, axis=0)
+  return statistics
+
+
+def save_classifier_statistics(filename, statistics):
+  """Writes statistics returned by `compute_classifier_statistics` to disk."""
+  buf = io.BytesIO()
+  np.savez(buf, **statistics)
+  with gfile.GFile(filename, 'wb') as f:
+    f.write(buf.getvalue())
+
+
+def load_classifier_statistics(filename):
+  """Reads statistics written by `save_classifier_statistics` from disk."""
+  with gfile.GFile(filename, 'rb') as f:
+    data = np.load(io.BytesIO(f.read()))
+  return {key: data[key] for key in data.files}
+
+
+def cached_classifier_statistics(filename,
+                                 activations,
+                                 num_batches,
+                                 session,
+                                 keep_activations=False):
+  """Computes the statistics of activations once, and caches them on disk.
+
+  The statistics of the real images don't change across evaluations of a
+  generative model. This function loads them from `filename` if it exists,
+  and otherwise computes them with `compute_classifier_statistics()` and
+  writes them to `filename`, so that the classifier only has to run on the
+  real images once.
+
+  Args:
+    filename: Path of the cached statistics.
+    activations: 2D Tensor with a batch of activations. Shape is
+      [batch_size, activation_size].
+    num_batches: Number of times to evaluate `activations`.
+    session: A `Session` to evaluate `activations` in.
+    keep_activations: Whether to also cache all evaluated activations, e.g. for
+      `kernel_classifier_distance_from_activations()`.
+
+  Returns:
+    A dict of numpy arrays, as returned by `compute_classifier_statistics()`.
+  """
+  if gfile.Exists(filename):
+    statistics = load_classifier_statistics(filename)
+    if not keep_activations or 'activations' in statistics:
+      return statistics
+  statistics = compute_classifier_statistics(
+      activations, num_batches, session, keep_activations=keep_activations)
+  save_classifier_statistics(filename, statistics)
+  return statistics
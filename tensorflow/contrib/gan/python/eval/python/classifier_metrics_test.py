@@ -33,6 +33,7 @@ from tensorflow.core.framework import graph_pb2
 from tensorflow.python.framework import dtypes
 from tensorflow.python.framework import ops
 from tensorflow.python.ops import array_ops
+from tensorflow.python.ops import random_ops
 from tensorflow.python.ops import variables
 from tensorflow.python.platform import test
 
@@ -459,6 +460,66 @@ class ClassifierMetricsTest(test.TestCase, parameterized.TestCase):
     # Check that the FIDs increase monotonically.
     self.assertTrue(all(fid_a < fid_b for fid_a, fid_b in zip(fids, fids[1:])))
 
+  def test_frechet_classifier_distance_from_statistics_value(self):
+    """Test that `frechet_classifier_distance_from_statistics` is correct."""
+    np.random.seed(0)
+
+    test_pool_real_a = np.float32(np.random.randn(512, 256))
+    test_pool_gen_a = np.float32(np.random.randn(512, 256))
+
+    fid_op = classifier_metrics.frechet_classifier_distance_from_statistics(
+        np.mean(test_pool_real_a, axis=0),
+        np.cov(test_pool_real_a, rowvar=False),
+        np.mean(test_pool_gen_a, axis=0),
+        np.cov(test_pool_gen_a, rowvar=False))
+
+    with self.cached_session() as sess:
+      actual_fid = sess.run(fid_op)
+
+    expected_fid = _expected_fid(test_pool_real_a, test_pool_gen_a)
+
+    self.assertAllClose(expected_fid, actual_fid, 0.0001)
+
+  def test_compute_classifier_statistics_value(self):
+    """Test that `compute_classifier_statistics` accumulates all batches."""
+    activations = random_ops.random_normal([64, 16], mean=10., seed=0)
+
+    with self.cached_session() as sess:
+      stats = classifier_metrics.compute_classifier_statistics(
+          activations, num_batches=5, session=sess, keep_activations=True)
+
+    all_activations = stats['activations']
+    self.assertEqual((320, 16), all_activations.shape)
+    self.assertEqual(320, stats['num_examples'])
+    self.assertAllClose(np.mean(all_activations, axis=0), stats['mean'])
+    self.assertAllClose(
+        np.cov(all_activations, rowvar=False), stats['covariance'])
+
+  def test_cached_classifier_statistics(self):
+    """Test that `cached_classifier_statistics` reads the cached values."""
+    filename = os.path.join(self.get_temp_dir(), 'stats.npz')
+    activations = random_ops.random_normal([32, 8], seed=0)
+
+    with self.cached_session() as sess:
+      stats = classifier_metrics.cached_classifier_statistics(
+          filename, activations, num_batches=2, session=sess)
+      cached_stats = classifier_metrics.cached_classifier_statistics(
+          filename, activations, num_batches=2, session=sess)
+      # The activations weren't cached, so they are computed again.
+      stats_with_activations = classifier_metrics.cached_classifier_statistics(
+          filename, activations, num_batches=2, session=sess,
+          keep_activations=True)
+
+    self.assertEqual(set(['num_examples', 'mean', 'covariance']),
+                     set(cached_stats))
+    for key in stats:
+      self.assertAllEqual(stats[key], cached_stats[key])
+    self.assertNotAllClose(stats['mean'], stats_with_activations['mean'])
+    self.assertEqual(
+        (64, 8),
+        classifier_metrics.load_classifier_statistics(filename)[
+            'activations'].shape)
+
   def test_kernel_classifier_distance_value(self):
     """Test that `kernel_classifier_distance` gives the correct value."""
     np.random.seed(0)
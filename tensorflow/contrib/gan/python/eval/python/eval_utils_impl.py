@@ -12,7 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 # ==============================================================================
-"""Utility file for visualizing generated images."""
+"""Utility file for visualizing and evaluating generated images."""
 
 from __future__ import absolute_import
 from __future__ import division
@@ -20,13 +20,22 @@ from __future__ import print_function
 
 import math
 
+from tensorflow.contrib.gan.python.eval.python import classifier_metrics_impl
+from tensorflow.python.framework import dtypes
 from tensorflow.python.framework import ops
 from tensorflow.python.ops import array_ops
+from tensorflow.python.ops import control_flow_ops
+from tensorflow.python.ops import math_ops
+from tensorflow.python.ops import state_ops
+from tensorflow.python.ops import variable_scope
 
 
 __all__ = [
     "image_grid",
     "image_reshaper",
+    "merge_classifier_moments",
+    "streaming_classifier_moments",
+    "streaming_frechet_classifier_distance",
 ]
 
 
@@ -132,3 +141,164 @@ def image_reshaper(images, num_cols=None):
   img = array_ops.concat(rows, 0)
 
   return array_ops.expand_dims(img, 0)
+
+
+def merge_classifier_moments(moments_a, moments_b):
+  """Merges the moments of two sets of activations.
+
+  The moments of a set of activations are a tuple `(count, mean, comoment)`,
+  where `comoment` is the sum of the outer products of the centered
+  activations, i.e. the covariance matrix times `count - 1`. The moments of the
+  union of two sets are computed with the update of Chan et al., described in
+  https://en.wikipedia.org/wiki/Algorithms_for_calculating_variance:
+
+    C_AB = C_A + C_B + (m_B - m_A) (m_B - m_A)^T * n_A * n_B / n_AB
+
+  which is numerically stable also when the means are large compared to the
+  variances. This can be used to merge the moments accumulated by several
+  evaluation workers. `compute_classifier_statistics` merges the moments of
+  its batches the same way.
+
+  Args:
+    moments_a: The moments of the first set, as float64 Tensors or numpy
+      arrays.
+    moments_b: The moments of the second set, as float64 Tensors or numpy
+      arrays.
+
+  Returns:
+    The moments of the union of both sets.
+  """
+  return classifier_metrics_impl._merge_moments(moments_a, moments_b)  # pylint: disable=protected-access
+
+
+def streaming_classifier_moments(activations,
+                                 metrics_collections=None,
+                                 updates_collections=None,
+                                 name=None):
+  """Accumulates the moments of activations across batches.
+
+  Creates three local variables, `count`, `mean` and `comoment`, holding the
+  float64 moments of all activations seen so far, as described in
+  `merge_classifier_moments`. Each run of `update_op` merges the moments of a
+  batch of `activations` into them, so that only one batch needs to be in
+  memory at a time, and the moments don't lose precision over many batches.
+
+  Args:
+    activations: 2D Tensor with a batch of activations. Shape is
+      [batch_size, activation_size], where `activation_size` must be
+      statically known.
+    metrics_collections: An optional list of collections that the moments
+      should be added to.
+    updates_collections: An optional list of collections that `update_op`
+      should be added to.
+    name: An optional variable_scope name.
+
+  Returns:
+    moments: A tuple `(count, mean, comoment)` of float64 Tensors with the
+      current moments.
+    update_op: An operation that merges the moments of `activations` into the
+      local variables.
+
+  Raises:
+    ValueError: If `activations` isn't 2D, or its size isn't known.
+  """
+  activations.shape.assert_has_rank(2)
+  activation_size = activations.shape[1].value
+  if activation_size is None:
+    raise ValueError("The activation size must be statically known.")
+  with variable_scope.variable_scope(name, "classifier_moments",
+                                     [activations]):
+    count, mean, comoment = [
+        variable_scope.variable(
+            array_ops.zeros(shape, dtypes.float64),
+            trainable=False,
+            collections=[
+                ops.GraphKeys.LOCAL_VARIABLES, ops.GraphKeys.METRIC_VARIABLES
+            ],
+            name=var_name)
+        for shape, var_name in (([], "count"), ([activation_size], "mean"),
+                                ([activation_size, activation_size],
+                                 "comoment"))
+    ]
+
+    activations = math_ops.to_double(activations)
+    batch_mean = math_ops.reduce_mean(activations, 0)
+    centered = activations - batch_mean
+    batch_moments = (math_ops.to_double(array_ops.shape(activations)[0]),
+                     batch_mean,
+                     math_ops.matmul(centered, centered, transpose_a=True))
+    new_moments = merge_classifier_moments((count, mean, comoment),
+                                           batch_moments)
+    # All moments have to be read before any of them is updated.
+    with ops.control_dependencies(new_moments):
+      update_op = control_flow_ops.group(
+          *[state_ops.assign(var, value)
+            for var, value in zip((count, mean, comoment), new_moments)])
+
+    moments = (array_ops.identity(count), array_ops.identity(mean),
+               array_ops.identity(comoment))
+
+  if metrics_collections:
+    ops.add_to_collections(metrics_collections, moments)
+
+  if updates_collections:
+    ops.add_to_collections(updates_collections, update_op)
+
+  return moments, update_op
+
+
+def streaming_frechet_classifier_distance(real_activations,
+                                          generated_activations,
+                                          metrics_collections=None,
+                                          updates_collections=None,
+                                          name=None):
+  """Computes the Frechet classifier distance across batches of activations.
+
+  This is a streaming version of
+  `classifier_metrics.frechet_classifier_distance_from_activations`: instead
+  of the covariance matrices of all activations at once, it accumulates the
+  float64 moments of each batch of real and generated activations with
+  `streaming_classifier_moments`. Evaluating 50,000 images then only needs
+  one batch of them and two covariance matrices in memory.
+
+  Since the distance needs two matrix square roots, `update_op` doesn't
+  compute it, unlike most metrics. Evaluate `frechet_distance` once after all
+  batches have been accumulated, e.g. with `tf.contrib.training.evaluate_once`
+  or as an `eval_metric_ops` entry of an `Estimator`.
+
+  Args:
+    real_activations: 2D Tensor with a batch of activations of real data. Shape
+      is [batch_size, activation_size].
+    generated_activations: 2D Tensor with a batch of activations of generated
+      data. Shape is [batch_size, activation_size].
+    metrics_collections: An optional list of collections that
+      `frechet_distance` should be added to.
+    updates_collections: An optional list of collections that `update_op`
+      should be added to.
+    name: An optional variable_scope name.
+
+  Returns:
+    frechet_distance: A float64 scalar Tensor with the Frechet classifier
+      distance of all activations accumulated so far.
+    update_op: An operation that accumulates a batch of real and generated
+      activations.
+  """
+  with variable_scope.variable_scope(
+      name, "frechet_classifier_distance",
+      [real_activations, generated_activations]):
+    (count, mean, comoment), real_update_op = streaming_classifier_moments(
+        real_activations, name="real")
+    (count_w, mean_w, comoment_w), generated_update_op = (
+        streaming_classifier_moments(generated_activations, name="generated"))
+    frechet_distance = (
+        classifier_metrics_impl.frechet_classifier_distance_from_statistics(
+            mean, comoment / (count - 1), mean_w, comoment_w / (count_w - 1)))
+    update_op = control_flow_ops.group(real_update_op, generated_update_op)
+
+  if metrics_collections:
+    ops.add_to_collections(metrics_collections, frechet_distance)
+
+  if updates_collections:
+    ops.add_to_collections(updates_collections, update_op)
+
+  return frechet_distance, update_op
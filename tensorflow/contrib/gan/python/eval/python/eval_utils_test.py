@@ -18,8 +18,15 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
+import numpy as np
+
+from tensorflow.contrib.gan.python.eval.python import classifier_metrics_impl as classifier_metrics
 from tensorflow.contrib.gan.python.eval.python import eval_utils_impl as eval_utils
+from tensorflow.python.framework import constant_op
+from tensorflow.python.framework import dtypes
+from tensorflow.python.framework import ops
 from tensorflow.python.ops import array_ops
+from tensorflow.python.ops import variables
 from tensorflow.python.platform import test
 
 
@@ -44,5 +51,81 @@ class UtilsTest(test.TestCase):
     images.shape.assert_is_compatible_with([1, 13 * 32, 2 * 32, 3])
 
 
+class StreamingFrechetDistanceTest(test.TestCase):
+
+  def test_streaming_classifier_moments(self):
+    np.random.seed(0)
+    # A large mean compared to the variance, where computing the covariance
+    # from the second moment would lose precision.
+    activations = np.float32(np.random.randn(300, 8) + 1000.)
+    batch = array_ops.placeholder(dtypes.float32, [None, 8])
+    (count, mean, comoment), update_op = (
+        eval_utils.streaming_classifier_moments(batch))
+
+    with self.cached_session() as sess:
+      variables.local_variables_initializer().run()
+      for batch_value in np.split(activations, [50, 200]):
+        sess.run(update_op, {batch: batch_value})
+      count, mean, comoment = sess.run([count, mean, comoment])
+
+    activations = activations.astype(np.float64)
+    self.assertEqual(300, count)
+    self.assertAllClose(np.mean(activations, axis=0), mean)
+    self.assertAllClose(np.cov(activations, rowvar=False), comoment / 299)
+
+  def test_merge_classifier_moments(self):
+    np.random.seed(1)
+    activations = np.random.randn(100, 4)
+
+    def _moments(x):
+      return (np.float64(x.shape[0]), np.mean(x, axis=0),
+              np.cov(x, rowvar=False) * (x.shape[0] - 1))
+
+    moments_a = _moments(activations[:30])
+    moments_b = _moments(activations[30:])
+    expected_count, expected_mean, expected_comoment = _moments(activations)
+
+    # The moments can be merged as numpy arrays and as Tensors.
+    count, mean, comoment = eval_utils.merge_classifier_moments(
+        moments_a, moments_b)
+    self.assertEqual(expected_count, count)
+    self.assertAllClose(expected_mean, mean)
+    self.assertAllClose(expected_comoment, comoment)
+
+    merged = eval_utils.merge_classifier_moments(
+        [constant_op.constant(x) for x in moments_a],
+        [constant_op.constant(x) for x in moments_b])
+    with self.cached_session() as sess:
+      count, mean, comoment = sess.run(merged)
+    self.assertEqual(expected_count, count)
+    self.assertAllClose(expected_mean, mean)
+    self.assertAllClose(expected_comoment, comoment)
+
+  def test_streaming_frechet_classifier_distance(self):
+    np.random.seed(2)
+    real_activations = np.float32(np.random.randn(512, 64))
+    generated_activations = np.float32(np.random.randn(512, 64) * 1.2 + .1)
+    real_batch = array_ops.placeholder(dtypes.float32, [None, 64])
+    generated_batch = array_ops.placeholder(dtypes.float32, [None, 64])
+    fid, update_op = eval_utils.streaming_frechet_classifier_distance(
+        real_batch, generated_batch, metrics_collections=['metrics'],
+        updates_collections=['updates'])
+    self.assertEqual([fid], ops.get_collection('metrics'))
+    self.assertEqual([update_op], ops.get_collection('updates'))
+    expected_fid = (
+        classifier_metrics.frechet_classifier_distance_from_activations(
+            array_ops.constant(real_activations),
+            array_ops.constant(generated_activations)))
+
+    with self.cached_session() as sess:
+      variables.local_variables_initializer().run()
+      for i in range(4):
+        sess.run(update_op, {
+            real_batch: real_activations[128 * i:128 * (i + 1)],
+            generated_batch: generated_activations[128 * i:128 * (i + 1)]
+        })
+      self.assertAllClose(sess.run(expected_fid), sess.run(fid), 0.0001)
+
+
 if __name__ == '__main__':
   test.main()
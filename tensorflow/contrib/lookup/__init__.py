@@ -28,6 +28,8 @@
 @@HashTable
 @@MutableHashTable
 @@MutableDenseHashTable
+@@SortedVocabularyIdTable
+@@write_sorted_vocabulary
 @@TableInitializerBase
 @@KeyValueTensorInitializer
 @@TextFileIndex
@@ -20,11 +20,20 @@ from __future__ import print_function
 
 import functools
 
+import numpy as np
+
 from tensorflow.python.eager import context
+from tensorflow.python.framework import constant_op
 from tensorflow.python.framework import dtypes
 from tensorflow.python.framework import ops
+from tensorflow.python.framework import sparse_tensor
+from tensorflow.python.ops import array_ops
+from tensorflow.python.ops import control_flow_ops
+from tensorflow.python.ops import gen_array_ops
 from tensorflow.python.ops import gen_lookup_ops
 from tensorflow.python.ops import lookup_ops
+from tensorflow.python.ops import math_ops
+from tensorflow.python.ops import string_ops
 # pylint: disable=unused-import
 from tensorflow.python.ops.lookup_ops import FastHashSpec
 from tensorflow.python.ops.lookup_ops import HasherSpec
@@ -42,6 +51,7 @@ from tensorflow.python.ops.lookup_ops import TextFileIndex
 from tensorflow.python.ops.lookup_ops import TextFileInitializer
 from tensorflow.python.ops.lookup_ops import TextFileStringTableInitializer
 # pylint: enable=unused-import
+from tensorflow.python.platform import gfile
 from tensorflow.python.training.saver import BaseSaverBuilder
 from tensorflow.python.util.deprecation import deprecated
 
@@ -784,3 +794,255 @@ class MutableDenseHashTable(LookupInterface):
       with ops.colocate_with(self.op.resource_handle):
         return gen_lookup_ops.lookup_table_import_v2(
             self.op.resource_handle, restored_tensors[0], restored_tensors[1])
+
+
+# String keys of sorted vocabularies are stored as their 63-bit fingerprints.
+_FINGERPRINT_BUCKETS = 2**63 - 1
+
+
+def _sorted_vocabulary_files(path_prefix, key_dtype):
+  """Returns the paths of the sorted keys and ids of a sorted vocabulary."""
+  keys_suffix = ".fingerprints" if key_dtype == dtypes.string else ".keys"
+  return path_prefix + keys_suffix, path_prefix + ".ids"
+
+
+def _strip_line_ending(line):
+  """Strips a trailing newline the way `TextFileInitializer` does."""
+  if line.endswith(b"\n"):
+    line = line[:-1]
+  if line.endswith(b"\r"):
+    line = line[:-1]
+  return line
+
+
+def write_sorted_vocabulary(vocabulary_file,
+                            path_prefix,
+                            key_dtype=dtypes.string,
+                            vocab_size=None):
+  """Builds the files of a `SortedVocabularyIdTable` from a vocabulary file.
+
+  Every line of `vocabulary_file` is a key whose id is its zero-based line
+  number, as for `index_table_from_file`. The keys (or, for string keys, their
+  64-bit fingerprints) are sorted and written next to their ids as raw int64
+  arrays in native byte order, to `path_prefix` with the suffixes `.keys` or
+  `.fingerprints`, and `.ids`. Each file is written under a temporary name and
+  then renamed, so tables in running processes never see a partial file.
+
+  This is meant to run once, offline; the files can then be memory-mapped by
+  any number of tables and processes on the same host.
+
+  Args:
+    vocabulary_file: The vocabulary filename.
+    path_prefix: The prefix of the files to write.
+    key_dtype: The key data type, `tf.string` or `tf.int64`.
+    vocab_size: Number of lines of `vocabulary_file` to use. Defaults to all.
+
+  Returns:
+    The number of keys written.
+
+  Raises:
+    TypeError: If `key_dtype` is neither `tf.string` nor `tf.int64`.
+    ValueError: If the vocabulary is empty, has fewer than `vocab_size` lines,
+      or has duplicate keys (or, for string keys, colliding fingerprints).
+  """
+  key_dtype = dtypes.as_dtype(key_dtype)
+  if key_dtype not in (dtypes.string, dtypes.int64):
+    raise TypeError("Invalid key dtype, expected one of %s, but got %s." %
+                    ((dtypes.string, dtypes.int64), key_dtype))
+  lines = []
+  with gfile.GFile(vocabulary_file, "rb") as f:
+    for line in f:
+      if vocab_size is not None and len(lines) == vocab_size:
+        break
+      lines.append(_strip_line_ending(line))
+  if not lines:
+    raise ValueError("Vocabulary file %s is empty." % vocabulary_file)
+  if vocab_size is not None and len(lines) < vocab_size:
+    raise ValueError("Invalid vocab_size %d, vocabulary file %s has %d lines." %
+                     (vocab_size, vocabulary_file, len(lines)))
+
+  if key_dtype == dtypes.string:
+    with context.eager_mode():
+      keys = string_ops.string_to_hash_bucket_fast(
+          constant_op.constant(lines, dtype=dtypes.string),
+          _FINGERPRINT_BUCKETS).numpy()
+  else:
+    keys = np.array([int(line) for line in lines], dtype=np.int64)
+  ids = np.argsort(keys, kind="mergesort").astype(np.int64)
+  keys = keys[ids]
+  duplicates = np.flatnonzero(keys[1:] == keys[:-1])
+  if duplicates.size:
+    first, second = ids[duplicates[0]], ids[duplicates[0] + 1]
+    raise ValueError(
+        "Lines %d and %d of vocabulary file %s have the same key%s." %
+        (first, second, vocabulary_file,
+         " fingerprint" if key_dtype == dtypes.string else ""))
+
+  for path, array in zip(_sorted_vocabulary_files(path_prefix, key_dtype),
+                         (keys, ids)):
+    temp_path = path + ".tmp"
+    with gfile.GFile(temp_path, "wb") as f:
+      f.write(array.tobytes())
+    gfile.Rename(temp_path, path, overwrite=True)
+  return len(lines)
+
+
+class SortedVocabularyIdTable(LookupInterface):
+  """A read-only table that maps keys to ids through memory-mapped arrays.
+
+  `index_table_from_file` builds a hash table from the whole vocabulary file
+  in every table instance of every process. This table instead reads the
+  sorted key and id arrays written by `write_sorted_vocabulary` with
+  `ImmutableConst` ops, which memory-map the files read-only. The pages are
+  shared by all tables and processes on the host, and nothing is parsed at
+  startup. Keys are looked up by binary search.
+
+  String keys are stored and looked up by their 63-bit
+  `string_to_hash_bucket_fast` fingerprint, so unlike `index_table_from_file`,
+  string lookups are probabilistic: `write_sorted_vocabulary` rejects
+  vocabularies whose own keys collide, but a key missing from the vocabulary
+  whose fingerprint collides with a vocabulary key gets that key's id instead
+  of `default_value` or an OOV bucket. With 63-bit fingerprints this is
+  unlikely, but not impossible. `tf.int64` keys are looked up exactly.
+
+  The files must be on a file system that supports memory-mapping, such as
+  the local disk, and must exist when the table is constructed.
+
+  Example usage:
+
+  ```python
+  tf.contrib.lookup.write_sorted_vocabulary("vocab.txt", "/data/vocab")
+  ...
+  table = tf.contrib.lookup.IdTableWithHashBuckets(
+      tf.contrib.lookup.SortedVocabularyIdTable("/data/vocab"),
+      num_oov_buckets=1)
+  ids = table.lookup(tf.constant(["emerson", "lake", "and", "palmer"]))
+  ```
+  """
+
+  def __init__(self,
+               path_prefix,
+               key_dtype=dtypes.string,
+               default_value=-1,
+               name=None):
+    """Creates a `SortedVocabularyIdTable`.
+
+    Args:
+      path_prefix: The `path_prefix` the table was written with by
+        `write_sorted_vocabulary`.
+      key_dtype: The key data type, `tf.string` or `tf.int64`. Must match the
+        one the table was written with.
+      default_value: The id to use for keys missing from the vocabulary.
+      name: A name for the operation (optional).
+
+    Raises:
+      TypeError: If `key_dtype` is neither `tf.string` nor `tf.int64`.
+      ValueError: If no table was written at `path_prefix` for `key_dtype`.
+    """
+    key_dtype = dtypes.as_dtype(key_dtype)
+    if key_dtype not in (dtypes.string, dtypes.int64):
+      raise TypeError("Invalid key dtype, expected one of %s, but got %s." %
+                      ((dtypes.string, dtypes.int64), key_dtype))
+    keys_file, ids_file = _sorted_vocabulary_files(path_prefix, key_dtype)
+    if not (gfile.Exists(keys_file) and gfile.Exists(ids_file)):
+      raise ValueError("No sorted vocabulary with %s keys at %s. Use "
+                       "write_sorted_vocabulary to build it." %
+                       (key_dtype.name, path_prefix))
+    self._vocab_size = gfile.Stat(keys_file).length // 8
+    super(SortedVocabularyIdTable, self).__init__(key_dtype, dtypes.int64)
+
+    with ops.name_scope(name, "sorted_vocabulary_table") as scope:
+      self._table_name = scope.split("/")[-2]
+      self._default_value = ops.convert_to_tensor(
+          default_value, dtype=dtypes.int64, name="default_value")
+      self._sorted_keys = gen_array_ops.immutable_const(
+          dtype=dtypes.int64,
+          shape=[self._vocab_size],
+          memory_region_name=keys_file,
+          name="keys")
+      self._ids = gen_array_ops.immutable_const(
+          dtype=dtypes.int64,
+          shape=[self._vocab_size],
+          memory_region_name=ids_file,
+          name="ids")
+    self._init_op = self.initialize()
+
+  def create_resource(self):
+    return None
+
+  def initialize(self):
+    with ops.name_scope(None, "init"):
+      return control_flow_ops.no_op()
+
+  @property
+  def initializer(self):
+    return self._init_op
+
+  @property
+  def name(self):
+    return self._table_name
+
+  @property
+  def default_value(self):
+    """The default value of the table."""
+    return self._default_value
+
+  def size(self, name=None):
+    """Compute the number of elements in this table.
+
+    Args:
+      name: A name for the operation (optional).
+
+    Returns:
+      A scalar tensor containing the number of elements in this table.
+    """
+    with ops.name_scope(name, "%s_Size" % self.name) as name:
+      return constant_op.constant(self._vocab_size, dtype=dtypes.int64,
+                                  name=name)
+
+  def lookup(self, keys, name=None):
+    """Looks up `keys` in the table, outputs the corresponding ids.
+
+    The `default_value` is used for keys not present in the table.
+
+    Args:
+      keys: Keys to look up. May be either a `SparseTensor` or dense `Tensor`.
+      name: A name for the operation (optional).
+
+    Returns:
+      A `SparseTensor` if keys are sparse, otherwise a dense `Tensor`.
+
+    Raises:
+      TypeError: when `keys` doesn't match the table key data type.
+    """
+    if keys.dtype.base_dtype != self._key_dtype:
+      raise TypeError("Signature mismatch. Keys must be dtype %s, got %s." %
+                      (self._key_dtype, keys.dtype))
+    key_tensor = keys
+    if isinstance(keys, sparse_tensor.SparseTensor):
+      key_tensor = keys.values
+
+    with ops.name_scope(name, "%s_Lookup" % self.name,
+                        (self._sorted_keys, key_tensor)) as scope:
+      with ops.colocate_with(self._sorted_keys):
+        if self._key_dtype == dtypes.string:
+          search_keys = string_ops.string_to_hash_bucket_fast(
+              key_tensor, _FINGERPRINT_BUCKETS)
+        else:
+          search_keys = key_tensor
+        search_keys = array_ops.reshape(search_keys, [-1])
+        positions = array_ops.searchsorted(
+            array_ops.expand_dims(self._sorted_keys, 0),
+            array_ops.expand_dims(search_keys, 0))[0]
+        positions = math_ops.minimum(positions, self._vocab_size - 1)
+        found = math_ops.equal(
+            array_ops.gather(self._sorted_keys, positions), search_keys)
+        ids = array_ops.where(
+            found, array_ops.gather(self._ids, positions),
+            array_ops.fill(array_ops.shape(positions), self._default_value))
+        ids = array_ops.reshape(ids, array_ops.shape(key_tensor), name=scope)
+
+    ids.set_shape(key_tensor.get_shape())
+    if isinstance(keys, sparse_tensor.SparseTensor):
+      return sparse_tensor.SparseTensor(keys.indices, ids, keys.dense_shape)
+    return ids
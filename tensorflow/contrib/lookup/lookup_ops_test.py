@@ -2779,5 +2779,92 @@ class MutableDenseHashTableBenchmark(MutableHashTableBenchmark):
         deleted_key=-2)
 
 
+class SortedVocabularyIdTableTest(test.TestCase):
+
+  def _createVocabFile(self, basename, values=("brain", "salad", "surgery")):
+    vocabulary_file = os.path.join(self.get_temp_dir(), basename)
+    with open(vocabulary_file, "w") as f:
+      f.write("\n".join(values) + "\n")
+    return vocabulary_file
+
+  def _writeSortedVocabulary(self,
+                             basename,
+                             values=("brain", "salad", "surgery"),
+                             key_dtype=dtypes.string,
+                             vocab_size=None):
+    path_prefix = os.path.join(self.get_temp_dir(), basename)
+    size = lookup.write_sorted_vocabulary(
+        self._createVocabFile(basename + ".txt", values),
+        path_prefix,
+        key_dtype=key_dtype,
+        vocab_size=vocab_size)
+    self.assertEqual(vocab_size or len(values), size)
+    return path_prefix
+
+  def testStringKeys(self):
+    path_prefix = self._writeSortedVocabulary("sorted_vocab1")
+    with self.cached_session():
+      table = lookup.SortedVocabularyIdTable(path_prefix)
+      ids = table.lookup(
+          constant_op.constant([["salad", "surgery"], ["tarkus", "brain"]]))
+      self.assertEqual([2, 2], ids.get_shape().as_list())
+      self.assertAllEqual([[1, 2], [-1, 0]], ids.eval())
+      self.assertAllEqual(3, table.size().eval())
+
+  def testInt64Keys(self):
+    path_prefix = self._writeSortedVocabulary(
+        "sorted_vocab2", values=("42", "1", "-7"), key_dtype=dtypes.int64)
+    with self.cached_session():
+      table = lookup.SortedVocabularyIdTable(
+          path_prefix, key_dtype=dtypes.int64, default_value=-2)
+      ids = table.lookup(constant_op.constant([1, 42, -7, 5], dtypes.int64))
+      self.assertAllEqual([1, 0, 2, -2], ids.eval())
+
+  def testVocabSize(self):
+    path_prefix = self._writeSortedVocabulary("sorted_vocab3", vocab_size=2)
+    with self.cached_session():
+      table = lookup.SortedVocabularyIdTable(path_prefix)
+      ids = table.lookup(constant_op.constant(["brain", "salad", "surgery"]))
+      self.assertAllEqual([0, 1, -1], ids.eval())
+
+  def testSparseKeys(self):
+    path_prefix = self._writeSortedVocabulary("sorted_vocab4")
+    with self.cached_session():
+      table = lookup.SortedVocabularyIdTable(path_prefix)
+      sp_ids = table.lookup(
+          sparse_tensor.SparseTensor(
+              indices=[[0, 0], [1, 1]],
+              values=["surgery", "tarkus"],
+              dense_shape=[2, 2]))
+      self.assertAllEqual([2, -1], sp_ids.values.eval())
+      self.assertAllEqual([[0, 0], [1, 1]], sp_ids.indices.eval())
+
+  def testWithHashBuckets(self):
+    path_prefix = self._writeSortedVocabulary("sorted_vocab5")
+    with self.cached_session():
+      table = lookup.IdTableWithHashBuckets(
+          lookup.SortedVocabularyIdTable(path_prefix), num_oov_buckets=1)
+      ids = table.lookup(constant_op.constant(["salad", "surgery", "tarkus"]))
+      lookup_ops.tables_initializer().run()
+      self.assertAllEqual([1, 2, 3], ids.eval())
+      self.assertAllEqual(4, table.size().eval())
+
+  def testDuplicateKeys(self):
+    with self.assertRaisesRegexp(ValueError, "Lines 0 and 2 .* same key"):
+      self._writeSortedVocabulary(
+          "sorted_vocab6", values=("brain", "salad", "brain"))
+
+  def testMissingTable(self):
+    path_prefix = self._writeSortedVocabulary("sorted_vocab7")
+    with self.assertRaisesRegexp(ValueError, "No sorted vocabulary"):
+      lookup.SortedVocabularyIdTable(path_prefix, key_dtype=dtypes.int64)
+
+  def testKeyDtypeMismatch(self):
+    path_prefix = self._writeSortedVocabulary("sorted_vocab8")
+    table = lookup.SortedVocabularyIdTable(path_prefix)
+    with self.assertRaises(TypeError):
+      table.lookup(constant_op.constant([1], dtypes.int64))
+
+
 if __name__ == "__main__":
   test.main()
@@ -25,6 +25,10 @@ The following ops generate multiprobe sequences for various hash families.
 
 @@hyperplane_lsh_hash
 
+### LSH indices
+
+@@HyperplaneLSHIndex
+
 """
 
 from __future__ import absolute_import
@@ -32,5 +36,6 @@ from __future__ import division
 from __future__ import print_function
 
 # pylint: disable=unused-import,wildcard-import, line-too-long
+from tensorflow.contrib.nearest_neighbor.python.ops.hyperplane_lsh_index import HyperplaneLSHIndex
 from tensorflow.contrib.nearest_neighbor.python.ops.nearest_neighbor_ops import *
 # pylint: enable=unused-import,wildcard-import,line-too-long
@@ -0,0 +1,180 @@
+# Copyright 2018 The TensorFlow Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Tests for HyperplaneLSHIndex."""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import os
+
+import numpy as np
+
+from tensorflow.contrib.nearest_neighbor.python.ops.hyperplane_lsh_index import HyperplaneLSHIndex
+from tensorflow.python.client import session
+from tensorflow.python.framework import ops
+from tensorflow.python.ops import math_ops
+from tensorflow.python.ops import nn_ops
+from tensorflow.python.platform import test
+from tensorflow.python.training.checkpointable import util as checkpointable_utils
+
+
+def _random_unit_vectors(num_points, dimension, seed):
+  points = np.random.RandomState(seed).randn(num_points, dimension)
+  points /= np.linalg.norm(points, axis=1, keepdims=True)
+  return points.astype(np.float32)
+
+
+def _exact_neighbors(points, queries, k):
+  distances = (np.sum(np.square(points), axis=1) -
+               2 * np.dot(queries, np.transpose(points)))
+  return np.argsort(distances, axis=1)[:, :k]
+
+
+def _recall(indices, exact_indices):
+  return np.mean([
+      len(set(found) & set(exact)) / len(exact)
+      for found, exact in zip(indices, exact_indices)
+  ])
+
+
+class HyperplaneLSHIndexTest(test.TestCase):
+
+  def testQueryFindsIndexedPoints(self):
+    points = _random_unit_vectors(200, 16, seed=0)
+    with self.cached_session():
+      index = HyperplaneLSHIndex(
+          points, num_tables=4, num_hyperplanes_per_table=6, seed=1)
+      index.initializer.run()
+      distances, indices = index.query(points[:10], k=3)
+      distances, indices = distances.eval(), indices.eval()
+      # Each point hashes to its own buckets, so it is always its own nearest
+      # neighbor.
+      self.assertAllEqual(np.arange(10), indices[:, 0])
+      self.assertAllClose(np.zeros(10), distances[:, 0], atol=1e-5)
+      # Distances are sorted, and match the returned indices.
+      self.assertTrue(np.all(np.diff(distances, axis=1) >= 0))
+      for i in range(10):
+        found = indices[i] >= 0
+        self.assertEqual(len(set(indices[i][found])), np.sum(found))
+        self.assertAllClose(
+            np.sum(np.square(points[indices[i][found]] - points[i]), axis=1),
+            distances[i][found], atol=1e-5)
+
+  def testMoreProbesImproveRecall(self):
+    points = _random_unit_vectors(2000, 32, seed=2)
+    queries = _random_unit_vectors(50, 32, seed=3)
+    exact_indices = _exact_neighbors(points, queries, 5)
+    with self.cached_session():
+      index = HyperplaneLSHIndex(
+          points, num_tables=4, num_hyperplanes_per_table=8, seed=4)
+      index.initializer.run()
+      recalls = []
+      for num_probes in (4, 64):
+        _, indices = index.query(queries, k=5, num_probes=num_probes)
+        recalls.append(_recall(indices.eval(), exact_indices))
+      self.assertGreater(recalls[1], recalls[0])
+
+  def testMissingNeighbors(self):
+    points = np.array([[1., 0.], [0., 1.], [-1., 0.]], dtype=np.float32)
+    with self.cached_session():
+      index = HyperplaneLSHIndex(
+          points, num_tables=1, num_hyperplanes_per_table=2, seed=5)
+      index.initializer.run()
+      distances, indices = index.query([[1., 0.]], k=8)
+      distances, indices = distances.eval(), indices.eval()
+      found = np.isfinite(distances)
+      self.assertEqual(0, indices[0, 0])
+      self.assertTrue(np.all(indices[~found] == -1))
+      self.assertTrue(np.all(indices[found] >= 0))
+
+  def testSaveAndRestore(self):
+    points = _random_unit_vectors(100, 8, seed=6)
+    queries = _random_unit_vectors(5, 8, seed=7)
+    prefix = os.path.join(self.get_temp_dir(), "ckpt")
+    with ops.Graph().as_default(), self.session() as sess:
+      index = HyperplaneLSHIndex(
+          points, num_tables=3, num_hyperplanes_per_table=4, seed=8)
+      index.initializer.run()
+      expected = sess.run(index.query(queries, k=4))
+      save_path = checkpointable_utils.Checkpoint(index=index).save(
+          prefix, session=sess)
+    with ops.Graph().as_default(), self.session() as sess:
+      # The hyperplanes and tables come from the checkpoint, not from the
+      # points and seed given here.
+      index = HyperplaneLSHIndex(
+          np.zeros_like(points), num_tables=3, num_hyperplanes_per_table=4,
+          seed=9)
+      checkpointable_utils.Checkpoint(index=index).restore(
+          save_path).assert_consumed().run_restore_ops()
+      actual = sess.run(index.query(queries, k=4))
+    self.assertAllClose(expected[0], actual[0])
+    self.assertAllEqual(expected[1], actual[1])
+
+  def testInvalidArguments(self):
+    points = _random_unit_vectors(10, 4, seed=10)
+    with self.assertRaisesRegexp(ValueError, "num_tables"):
+      HyperplaneLSHIndex(points, num_tables=0, num_hyperplanes_per_table=4)
+    with self.assertRaisesRegexp(ValueError, "num_hyperplanes_per_table"):
+      HyperplaneLSHIndex(points, num_tables=1, num_hyperplanes_per_table=31)
+    index = HyperplaneLSHIndex(
+        points, num_tables=2, num_hyperplanes_per_table=4)
+    with self.assertRaisesRegexp(ValueError, "larger than num_probes"):
+      index.query(points, k=5, num_probes=2, max_candidates_per_probe=2)
+
+
+class HyperplaneLSHIndexBenchmark(test.Benchmark):
+  """Compares index queries with exhaustive search."""
+
+  def _benchmark(self,
+                 num_probes=None,
+                 num_points=100000,
+                 dimension=64,
+                 batch_size=256,
+                 k=10):
+    points = _random_unit_vectors(num_points, dimension, seed=0)
+    # Queries close to indexed points, as is typical for embedding look-ups.
+    queries = points[:batch_size] + 0.5 * _random_unit_vectors(
+        batch_size, dimension, seed=1)
+    exact_indices = _exact_neighbors(points, queries, k)
+    with ops.Graph().as_default(), session.Session() as sess:
+      if num_probes is None:
+        _, indices = nn_ops.top_k(math_ops.matmul(queries, points.T), k)
+        name = "exhaustive_%dpoint" % num_points
+      else:
+        index = HyperplaneLSHIndex(
+            points, num_tables=16, num_hyperplanes_per_table=14, seed=2)
+        sess.run(index.initializer)
+        _, indices = index.query(queries, k, num_probes=num_probes)
+        name = "lsh_%dpoint_%dprobe" % (num_points, num_probes)
+      recall = _recall(sess.run(indices), exact_indices)
+      self.run_op_benchmark(
+          sess, indices, name=name, extras={"recall": recall})
+
+  def benchmarkExhaustive(self):
+    self._benchmark()
+
+  def benchmarkLSH16Probes(self):
+    self._benchmark(num_probes=16)
+
+  def benchmarkLSH64Probes(self):
+    self._benchmark(num_probes=64)
+
+  def benchmarkLSH256Probes(self):
+    self._benchmark(num_probes=256)
+
+
+if __name__ == "__main__":
+  test.main()
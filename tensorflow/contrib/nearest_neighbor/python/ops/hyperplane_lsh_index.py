@@ -0,0 +1,234 @@
+# Copyright 2018 The TensorFlow Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""A multiprobe hyperplane LSH index for nearest neighbor look-ups."""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import numpy as np
+
+from tensorflow.contrib.nearest_neighbor.python.ops import nearest_neighbor_ops
+from tensorflow.python.framework import dtypes
+from tensorflow.python.framework import ops
+from tensorflow.python.ops import array_ops
+from tensorflow.python.ops import control_flow_ops
+from tensorflow.python.ops import math_ops
+from tensorflow.python.ops import nn_ops
+from tensorflow.python.ops import resource_variable_ops
+from tensorflow.python.training.checkpointable import tracking
+
+
+class HyperplaneLSHIndex(tracking.Checkpointable):
+  """A multiprobe hyperplane LSH index over a fixed set of points.
+
+  Each of the `num_tables` hash tables hashes a point to the signs of its inner
+  products with `num_hyperplanes_per_table` random hyperplanes, so that points
+  at a small angle from each other are likely to share a bucket. A query is
+  hashed the same way; the buckets visited are given by the multiprobe
+  sequence of `hyperplane_lsh_probes`, and the points found in them are
+  re-ranked by their exact squared Euclidean distance to the query. Since the
+  hash only depends on directions, the index works best for points with
+  similar norms, e.g. L2-normalized embeddings.
+
+  The tables are stored as one sorted array of (table, bucket) keys with the
+  matching point indices, and the buckets of a query are located with binary
+  search. The points, hyperplanes and tables are variables, so the index can be
+  saved and restored with `tf.train.Checkpoint`; a restored index does not need
+  to rebuild its tables.
+
+  Example:
+
+  ```python
+  index = HyperplaneLSHIndex(embeddings, num_tables=8,
+                             num_hyperplanes_per_table=12)
+  distances, indices = index.query(queries, k=10, num_probes=32)
+  ```
+  """
+
+  def __init__(self,
+               points,
+               num_tables,
+               num_hyperplanes_per_table,
+               seed=None,
+               name=None):
+    """Creates the index and the variables holding it.
+
+    Args:
+      points: A float matrix of shape `[num_points, dimension]` with the points
+        to index. The dimension must be statically known. To restore a saved
+        index, pass any matrix of the same shape, such as zeros.
+      num_tables: The number of hash tables.
+      num_hyperplanes_per_table: The number of hyperplanes, i.e. hash bits, per
+        table. At most 30.
+      seed: Python integer seed for drawing the hyperplanes.
+      name: A name for the index (optional).
+
+    Raises:
+      ValueError: If `num_tables` or `num_hyperplanes_per_table` is out of
+        range, or if `points` is not a matrix with a known dimension.
+    """
+    if num_tables < 1:
+      raise ValueError("num_tables must be positive, got %d" % num_tables)
+    if not 1 <= num_hyperplanes_per_table <= 30:
+      raise ValueError("num_hyperplanes_per_table must be in [1, 30], got %d" %
+                       num_hyperplanes_per_table)
+    self._num_tables = num_tables
+    self._num_hyperplanes_per_table = num_hyperplanes_per_table
+    with ops.name_scope(name, "HyperplaneLSHIndex", [points]):
+      points = ops.convert_to_tensor(
+          points, dtype=dtypes.float32, name="points")
+      points.get_shape().assert_has_rank(2)
+      dimension = points.get_shape()[1].value
+      if dimension is None:
+        raise ValueError("The dimension of points must be statically known.")
+      hyperplanes = np.random.RandomState(seed).randn(
+          dimension, num_tables * num_hyperplanes_per_table).astype(np.float32)
+      sorted_keys, sorted_indices = self._build_tables(points, hyperplanes)
+      self._points = resource_variable_ops.ResourceVariable(
+          points, trainable=False, name="points")
+      self._hyperplanes = resource_variable_ops.ResourceVariable(
+          hyperplanes, trainable=False, name="hyperplanes")
+      self._sorted_keys = resource_variable_ops.ResourceVariable(
+          sorted_keys, trainable=False, name="sorted_keys")
+      self._sorted_indices = resource_variable_ops.ResourceVariable(
+          sorted_indices, trainable=False, name="sorted_indices")
+
+  @property
+  def num_tables(self):
+    return self._num_tables
+
+  @property
+  def num_hyperplanes_per_table(self):
+    return self._num_hyperplanes_per_table
+
+  @property
+  def initializer(self):
+    """An op initializing the index from the points it was created with."""
+    return control_flow_ops.group(
+        self._points.initializer, self._hyperplanes.initializer,
+        self._sorted_keys.initializer, self._sorted_indices.initializer)
+
+  def _bucket_keys(self, probes, table_ids):
+    """Combines table ids and probes into int64 keys of the sorted tables."""
+    num_buckets = 1 << self._num_hyperplanes_per_table
+    return (math_ops.to_int64(table_ids) * num_buckets +
+            math_ops.to_int64(probes))
+
+  def _build_tables(self, points, hyperplanes):
+    """Returns the sorted bucket keys of all points and their indices."""
+    # The first num_tables probes are the buckets of a point in each table.
+    probes, table_ids = nearest_neighbor_ops.hyperplane_lsh_probes(
+        math_ops.matmul(points, hyperplanes), self._num_tables,
+        self._num_hyperplanes_per_table, self._num_tables)
+    keys = array_ops.reshape(self._bucket_keys(probes, table_ids), [-1])
+    indices = array_ops.reshape(
+        array_ops.tile(
+            array_ops.expand_dims(
+                math_ops.range(
+                    array_ops.shape(points, out_type=dtypes.int64)[0]), 1),
+            [1, self._num_tables]), [-1])
+    _, order = nn_ops.top_k(-keys, array_ops.size(keys))
+    return array_ops.gather(keys, order), array_ops.gather(indices, order)
+
+  def query(self,
+            queries,
+            k,
+            num_probes=None,
+            max_candidates_per_probe=32,
+            name=None):
+    """Finds approximate nearest neighbors of a batch of queries.
+
+    Args:
+      queries: A float matrix of shape `[batch_size, dimension]`.
+      k: Python integer. The number of neighbors to return for each query.
+      num_probes: Python integer. The number of buckets to visit for each
+        query, across all tables. Defaults to `num_tables`, i.e. one bucket per
+        table. Visiting more buckets increases recall and query time.
+      max_candidates_per_probe: Python integer. At most this many points are
+        taken from each visited bucket.
+      name: A name for the operation (optional).
+
+    Returns:
+      distances: A float32 Tensor of shape `[batch_size, k]` with the squared
+        Euclidean distances to the neighbors found, in increasing order. If
+        fewer than `k` distinct points were found, the remaining entries are
+        `inf`.
+      indices: An int64 Tensor of shape `[batch_size, k]` with the indices of
+        the neighbors in `points`, or -1 where `distances` is `inf`.
+
+    Raises:
+      ValueError: If `k` is larger than the number of candidates visited,
+        `num_probes * max_candidates_per_probe`.
+    """
+    if num_probes is None:
+      num_probes = self._num_tables
+    num_candidates = num_probes * max_candidates_per_probe
+    if k > num_candidates:
+      raise ValueError(
+          "k=%d is larger than num_probes * max_candidates_per_probe=%d" %
+          (k, num_candidates))
+    with ops.name_scope(name, "HyperplaneLSHIndexQuery", [queries]):
+      queries = ops.convert_to_tensor(
+          queries, dtype=dtypes.float32, name="queries")
+      probes, table_ids = nearest_neighbor_ops.hyperplane_lsh_probes(
+          math_ops.matmul(queries, self._hyperplanes), self._num_tables,
+          self._num_hyperplanes_per_table, num_probes)
+      keys = self._bucket_keys(probes, table_ids)
+      batch_size = array_ops.shape(keys)[0]
+
+      # Locate each probed bucket in the sorted tables.
+      sorted_keys = array_ops.expand_dims(self._sorted_keys, 0)
+      flat_keys = array_ops.reshape(keys, [1, -1])
+      starts, limits = [
+          array_ops.reshape(
+              array_ops.searchsorted(
+                  sorted_keys, flat_keys, side=side, out_type=dtypes.int64),
+              [batch_size, -1, 1]) for side in ("left", "right")
+      ]
+      positions = starts + math_ops.range(
+          max_candidates_per_probe, dtype=dtypes.int64)
+      positions = math_ops.minimum(
+          positions, array_ops.size(self._sorted_indices, out_type=dtypes.int64)
+          - 1)
+      candidates = array_ops.where(
+          positions < limits, array_ops.gather(self._sorted_indices, positions),
+          -array_ops.ones_like(positions))
+      candidates = array_ops.reshape(candidates, [batch_size, num_candidates])
+
+      # A point can be found in several tables. Sorting the candidates makes
+      # duplicates adjacent, so that all but one of them can be masked out.
+      candidates, _ = nn_ops.top_k(candidates, num_candidates)
+      duplicates = array_ops.concat([
+          array_ops.zeros([batch_size, 1], dtype=dtypes.bool),
+          math_ops.equal(candidates[:, 1:], candidates[:, :-1])
+      ], 1)
+      valid = math_ops.logical_and(candidates >= 0,
+                                   math_ops.logical_not(duplicates))
+
+      # Re-rank the candidates by their exact distances.
+      distances = math_ops.reduce_sum(
+          math_ops.square(
+              array_ops.gather(self._points, math_ops.maximum(candidates, 0)) -
+              array_ops.expand_dims(queries, 1)), 2)
+      distances = array_ops.where(
+          valid, distances, array_ops.fill(
+              array_ops.shape(distances), np.inf))
+      negative_distances, nearest = nn_ops.top_k(-distances, k)
+      indices = array_ops.batch_gather(candidates, nearest)
+      indices = array_ops.where(
+          math_ops.is_finite(negative_distances), indices,
+          -array_ops.ones_like(indices))
+      return -negative_distances, indices
@@ -992,5 +992,69 @@ class AttentionWrapperTest(test.TestCase):
         expected_final_alignment_history=expected_final_alignment_history,
         name='testMultiAttention')
 
+  def testUntiledMemoryMatchesTiledMemory(self):
+    batch_size = 2
+    beam_width = 3
+    max_time = 5
+    encoder_output_depth = 4
+    decoder_input_depth = 6
+    num_steps = 3
+    create_attention_mechanisms = [
+        wrapper.LuongAttention,
+        functools.partial(wrapper.LuongAttention, scale=True),
+        wrapper.BahdanauAttention,
+        functools.partial(wrapper.BahdanauAttention, normalize=True),
+        wrapper.LuongMonotonicAttention,
+        wrapper.BahdanauMonotonicAttention,
+    ]
+
+    np.random.seed(0)
+    memory = np.random.randn(batch_size, max_time,
+                             encoder_output_depth).astype(np.float32)
+    memory_sequence_length = np.array([5, 3], dtype=np.int32)
+    inputs = np.random.randn(batch_size * beam_width, num_steps,
+                             decoder_input_depth).astype(np.float32)
+    tiled_memory = np.repeat(memory, beam_width, axis=0)
+    tiled_memory_sequence_length = np.repeat(
+        memory_sequence_length, beam_width, axis=0)
+
+    def _decode(create_attention_mechanism, memory, memory_sequence_length,
+                beam_width, scope):
+      # Variables of equal shapes get equal values from the seeded
+      # initializer, so the tiled and untiled cells share their weights.
+      with vs.variable_scope(
+          scope,
+          initializer=init_ops.random_uniform_initializer(
+              -0.5, 0.5, seed=1)):
+        attention_mechanism = create_attention_mechanism(
+            num_units=7,
+            memory=memory,
+            memory_sequence_length=memory_sequence_length,
+            beam_width=beam_width)
+        cell = wrapper.AttentionWrapper(
+            rnn_cell.LSTMCell(8),
+            attention_mechanism,
+            attention_layer_size=3)
+        state = cell.zero_state(batch_size * beam_width, dtypes.float32)
+        outputs = []
+        for t in range(num_steps):
+          output, state = cell(inputs[:, t], state)
+          outputs.append(output)
+        return outputs, state.alignments
+
+    for i, create_attention_mechanism in enumerate(
+        create_attention_mechanisms):
+      with self.cached_session() as sess:
+        expected = _decode(create_attention_mechanism, tiled_memory,
+                           tiled_memory_sequence_length, None,
+                           'tiled_%d' % i)
+        actual = _decode(create_attention_mechanism, memory,
+                         memory_sequence_length, beam_width,
+                         'untiled_%d' % i)
+        sess.run(variables.global_variables_initializer())
+        expected_value, actual_value = sess.run([expected, actual])
+        nest.map_structure(self.assertAllClose, expected_value, actual_value)
+
+
 if __name__ == '__main__':
   test.main()
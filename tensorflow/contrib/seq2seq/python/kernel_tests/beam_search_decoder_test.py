@@ -25,12 +25,14 @@ from tensorflow.contrib.seq2seq.python.ops import attention_wrapper
 from tensorflow.contrib.seq2seq.python.ops import beam_search_decoder
 from tensorflow.contrib.seq2seq.python.ops import beam_search_ops
 from tensorflow.contrib.seq2seq.python.ops import decoder
+from tensorflow.python.client import session
 from tensorflow.python.framework import constant_op
 from tensorflow.python.framework import dtypes
 from tensorflow.python.framework import errors
 from tensorflow.python.framework import ops
 from tensorflow.python.layers import core as layers_core
 from tensorflow.python.ops import array_ops
+from tensorflow.python.ops import init_ops
 from tensorflow.python.ops import nn_ops
 from tensorflow.python.ops import rnn_cell
 from tensorflow.python.ops import variables
@@ -362,6 +364,113 @@ class TestBeamStep(test.TestCase):
     expected_log_probs[1][2] += log_probs_[1, 0, 1]
     self.assertAllEqual(next_state_.log_probs, expected_log_probs)
 
+  def _finished_beam_state(self):
+    """Returns a beam state in which all beams of batch entry 1 finished."""
+    return beam_search_decoder.BeamSearchDecoderState(
+        cell_state=array_ops.zeros([self.batch_size, self.beam_width]),
+        log_probs=ops.convert_to_tensor(
+            [[-1.0, -1.5, -2.0], [-2.5, -0.5, -1.0]], dtype=dtypes.float32),
+        lengths=ops.convert_to_tensor(
+            [[2, 1, 2], [3, 1, 2]], dtype=dtypes.int64),
+        finished=ops.convert_to_tensor(
+            [[False, True, False], [True, True, True]], dtype=dtypes.bool),
+        accumulated_attention_probs=())
+
+  def test_step_with_alive_batch_indices(self):
+    np.random.seed(0)
+    logits_ = np.random.randn(self.batch_size, self.beam_width,
+                              self.vocab_size).astype(np.float32)
+    beam_state = self._finished_beam_state()
+    step_fn = lambda logits, **kwargs: beam_search_decoder._beam_search_step(
+        time=2,
+        logits=logits,
+        next_cell_state=beam_state.cell_state,
+        beam_state=beam_state,
+        batch_size=ops.convert_to_tensor(self.batch_size),
+        beam_width=self.beam_width,
+        end_token=self.end_token,
+        length_penalty_weight=self.length_penalty_weight,
+        coverage_penalty_weight=self.coverage_penalty_weight,
+        **kwargs)
+    expected = step_fn(constant_op.constant(logits_))
+    # Only the logits of the alive batch entry 0 are given.
+    actual = step_fn(
+        constant_op.constant(logits_[:1]),
+        alive_batch_indices=constant_op.constant([0]))
+
+    with self.cached_session() as sess:
+      (expected_outputs, expected_state), (actual_outputs, actual_state) = (
+          sess.run([expected, actual]))
+
+    self.assertAllEqual(expected_outputs.predicted_ids,
+                        actual_outputs.predicted_ids)
+    self.assertAllEqual(expected_outputs.parent_ids, actual_outputs.parent_ids)
+    self.assertAllClose(expected_outputs.scores, actual_outputs.scores)
+    self.assertAllEqual(expected_state.finished, actual_state.finished)
+    self.assertAllEqual(expected_state.lengths, actual_state.lengths)
+    self.assertAllClose(expected_state.log_probs, actual_state.log_probs)
+    # The finished beams are sorted by score.
+    self.assertAllEqual([1, 2, 0], actual_outputs.parent_ids[1])
+
+  def test_step_with_early_stopping(self):
+    logits_ = np.full([self.batch_size, self.beam_width, self.vocab_size],
+                      0.0001)
+    logits_[:, :, self.end_token] = -5.0
+    # The best continuation of batch entry 0 is the end token.
+    logits_[0, 0, self.end_token] = 5.0
+    logits_[1, 0, 2] = 5.0
+    beam_state = beam_search_decoder.BeamSearchDecoderState(
+        cell_state=array_ops.zeros([self.batch_size, self.beam_width]),
+        log_probs=ops.convert_to_tensor(
+            [[-0.5, -1.0, -1.5], [-0.5, -1.0, -1.5]], dtype=dtypes.float32),
+        lengths=constant_op.constant(
+            2, shape=[self.batch_size, self.beam_width], dtype=dtypes.int64),
+        finished=array_ops.zeros(
+            [self.batch_size, self.beam_width], dtype=dtypes.bool),
+        accumulated_attention_probs=())
+
+    outputs, next_beam_state = beam_search_decoder._beam_search_step(
+        time=2,
+        logits=constant_op.constant(logits_, dtype=dtypes.float32),
+        next_cell_state=beam_state.cell_state,
+        beam_state=beam_state,
+        batch_size=ops.convert_to_tensor(self.batch_size),
+        beam_width=self.beam_width,
+        end_token=self.end_token,
+        length_penalty_weight=0.0,
+        coverage_penalty_weight=self.coverage_penalty_weight,
+        early_stopping=True)
+
+    with self.cached_session() as sess:
+      outputs_, next_state_ = sess.run([outputs, next_beam_state])
+
+    self.assertEqual(self.end_token, outputs_.predicted_ids[0, 0])
+    self.assertAllEqual(next_state_.finished,
+                        [[True, True, True], [False, False, False]])
+    # Beams cut short keep their length.
+    self.assertAllEqual(next_state_.lengths, [[3, 3, 3], [3, 3, 3]])
+
+
+class TestTopKOverBeams(test.TestCase):
+
+  def test_top_k_over_beams(self):
+    np.random.seed(0)
+    batch_size, beam_width, vocab_size = 4, 3, 50
+    # Few distinct values, so that there are many ties.
+    scores_ = np.random.randint(
+        -5, 0, size=[batch_size, beam_width, vocab_size]).astype(np.float32)
+    scores = constant_op.constant(scores_)
+    expected = nn_ops.top_k(
+        array_ops.reshape(scores, [batch_size, -1]), k=beam_width)
+    actual = beam_search_decoder._top_k_over_beams(
+        scores, beam_width, vocab_size)
+
+    with self.cached_session() as sess:
+      expected_, actual_ = sess.run([expected, actual])
+
+    self.assertAllEqual(expected_[0], actual_[0])
+    self.assertAllEqual(expected_[1], actual_[1])
+
 
 class TestLargeBeamStep(test.TestCase):
   """Tests large beam step.
@@ -463,7 +572,8 @@ class TestLargeBeamStep(test.TestCase):
 class BeamSearchDecoderTest(test.TestCase):
 
   def _testDynamicDecodeRNN(self, time_major, has_attention,
-                            with_alignment_history=False):
+                            with_alignment_history=False,
+                            early_stopping=False):
     encoder_sequence_length = np.array([3, 2, 3, 1, 1])
     decoder_sequence_length = np.array([2, 0, 1, 2, 3])
     batch_size = 5
@@ -519,7 +629,8 @@ class BeamSearchDecoderTest(test.TestCase):
           beam_width=beam_width,
           output_layer=output_layer,
           length_penalty_weight=0.0,
-          coverage_penalty_weight=coverage_penalty_weight)
+          coverage_penalty_weight=coverage_penalty_weight,
+          early_stopping=early_stopping)
 
       final_outputs, final_state, final_sequence_lengths = (
           decoder.dynamic_decode(
@@ -573,6 +684,52 @@ class BeamSearchDecoderTest(test.TestCase):
         has_attention=True,
         with_alignment_history=True)
 
+  def testDynamicDecodeRNNBatchMajorEarlyStopping(self):
+    self._testDynamicDecodeRNN(
+        time_major=False, has_attention=True, early_stopping=True)
+
+
+class BeamSearchDecoderBenchmark(test.Benchmark):
+  """Measures decoding with a large vocabulary."""
+
+  def _benchmark(self, early_stopping, batch_size=32, beam_width=8,
+                 vocab_size=32000, cell_depth=256, maximum_iterations=50):
+    with ops.Graph().as_default(), session.Session() as sess:
+      np.random.seed(0)
+      embedding = np.random.randn(vocab_size, 64).astype(np.float32)
+      cell = rnn_cell.LSTMCell(cell_depth)
+      # Make the end token likely, so that beams finish at different times.
+      end_token_bias = np.zeros([vocab_size], dtype=np.float32)
+      end_token_bias[0] = 8.0
+      output_layer = layers_core.Dense(
+          vocab_size,
+          bias_initializer=init_ops.constant_initializer(end_token_bias))
+      bsd = beam_search_decoder.BeamSearchDecoder(
+          cell=cell,
+          embedding=embedding,
+          start_tokens=array_ops.fill([batch_size], 1),
+          end_token=0,
+          initial_state=cell.zero_state(batch_size * beam_width,
+                                        dtypes.float32),
+          beam_width=beam_width,
+          output_layer=output_layer,
+          early_stopping=early_stopping)
+      final_outputs, _, _ = decoder.dynamic_decode(
+          bsd, maximum_iterations=maximum_iterations)
+      sess.run(variables.global_variables_initializer())
+      self.run_op_benchmark(
+          sess,
+          final_outputs.predicted_ids,
+          min_iters=5,
+          name="beam_search_decode_%dvocab%s" % (
+              vocab_size, "_early_stopping" if early_stopping else ""))
+
+  def benchmarkDecode(self):
+    self._benchmark(early_stopping=False)
+
+  def benchmarkDecodeEarlyStopping(self):
+    self._benchmark(early_stopping=True)
+
 
 if __name__ == '__main__':
   test.main()
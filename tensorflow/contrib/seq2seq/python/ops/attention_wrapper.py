@@ -149,6 +149,7 @@ class _BaseAttentionMechanism(AttentionMechanism):
   Common functionality includes:
     1. Storing the query and memory layers.
     2. Preprocessing and storing the memory.
+    3. Querying the memory with `beam_width` queries per batch entry.
   """
 
   def __init__(self,
@@ -159,7 +160,8 @@ class _BaseAttentionMechanism(AttentionMechanism):
                memory_layer=None,
                check_inner_dims_defined=True,
                score_mask_value=None,
-               name=None):
+               name=None,
+               beam_width=None):
     """Construct base AttentionMechanism class.
 
     Args:
@@ -185,6 +187,12 @@ class _BaseAttentionMechanism(AttentionMechanism):
         `probability_fn`. The default is -inf. Only used if
         `memory_sequence_length` is not None.
       name: Name to use when creating ops.
+      beam_width: (optional) Python integer.  If given, `memory` and
+        `memory_sequence_length` are not tiled with `tile_batch`, and the
+        queries, states and alignments have a batch size of
+        `batch_size * beam_width`, as in `BeamSearchDecoder`.  The memory and
+        its projection are then kept once per batch entry, instead of
+        `beam_width` times.
     """
     if (query_layer is not None
         and not isinstance(query_layer, layers_base.Layer)):
@@ -203,10 +211,7 @@ class _BaseAttentionMechanism(AttentionMechanism):
     if score_mask_value is None:
       score_mask_value = dtypes.as_dtype(
           self._memory_layer.dtype).as_numpy_dtype(-np.inf)
-    self._probability_fn = lambda score, prev: (  # pylint:disable=g-long-lambda
-        probability_fn(
-            _maybe_mask_score(score, memory_sequence_length, score_mask_value),
-            prev))
+    self._beam_width = beam_width
     with ops.name_scope(
         name, "BaseAttentionMechanismInit", nest.flatten(memory)):
       self._values = _prepare_memory(
@@ -218,8 +223,21 @@ class _BaseAttentionMechanism(AttentionMechanism):
       self._batch_size = (
           tensor_shape.dimension_value(self._keys.shape[0]) or
           array_ops.shape(self._keys)[0])
+      if beam_width is not None:
+        self._batch_size *= beam_width
+        if memory_sequence_length is not None:
+          # The scores are masked per beam, which only needs a tiled copy of
+          # the sequence lengths.
+          memory_sequence_length = array_ops.reshape(
+              array_ops.tile(
+                  array_ops.expand_dims(memory_sequence_length, 1),
+                  [1, beam_width]), [-1])
       self._alignments_size = (tensor_shape.dimension_value(self._keys.shape[1])
                                or array_ops.shape(self._keys)[1])
+    self._probability_fn = lambda score, prev: (  # pylint:disable=g-long-lambda
+        probability_fn(
+            _maybe_mask_score(score, memory_sequence_length, score_mask_value),
+            prev))
 
   @property
   def memory_layer(self):
@@ -241,10 +259,34 @@ class _BaseAttentionMechanism(AttentionMechanism):
   def batch_size(self):
     return self._batch_size
 
+  @property
+  def beam_width(self):
+    return self._beam_width
+
   @property
   def alignments_size(self):
     return self._alignments_size
 
+  def _split_beams(self, t):
+    """Reshapes `[batch_size * beam_width, d]` to `[batch_size, beam_width, d]`.
+
+    Returns `t` unchanged if the memory isn't queried per beam.
+    """
+    if self._beam_width is None:
+      return t
+    depth = tensor_shape.dimension_value(t.shape[1]) or array_ops.shape(t)[1]
+    return array_ops.reshape(t, [-1, self._beam_width, depth])
+
+  def _merge_beams(self, t):
+    """Reshapes `[batch_size, beam_width, d]` to `[batch_size * beam_width, d]`.
+
+    Returns `t` unchanged if the memory isn't queried per beam.
+    """
+    if self._beam_width is None:
+      return t
+    depth = tensor_shape.dimension_value(t.shape[2]) or array_ops.shape(t)[2]
+    return array_ops.reshape(t, [-1, depth])
+
   @property
   def state_size(self):
     return self._alignments_size
@@ -302,12 +344,14 @@ def _luong_score(query, keys, scale):
   To enable the second form, call this function with `scale=True`.
 
   Args:
-    query: Tensor, shape `[batch_size, num_units]` to compare to keys.
+    query: Tensor, shape `[batch_size, num_units]` to compare to keys, or
+      `[batch_size, beam_width, num_units]` for several queries per keys.
     keys: Processed memory, shape `[batch_size, max_time, num_units]`.
     scale: Whether to apply a scale to the score function.
 
   Returns:
-    A `[batch_size, max_time]` tensor of unnormalized score values.
+    A `[batch_size, max_time]` tensor of unnormalized score values, or
+    `[batch_size, beam_width, max_time]` for several queries per keys.
 
   Raises:
     ValueError: If `key` and `query` depths do not match.
@@ -321,10 +365,12 @@ def _luong_score(query, keys, scale):
         "Perhaps you need to set num_units to the keys' dimension (%s)?"
         % (query, depth, keys, key_units, key_units))
   dtype = query.dtype
+  is_single_query = query.get_shape().ndims == 2
 
   # Reshape from [batch_size, depth] to [batch_size, 1, depth]
   # for matmul.
-  query = array_ops.expand_dims(query, 1)
+  if is_single_query:
+    query = array_ops.expand_dims(query, 1)
 
   # Inner product along the query units dimension.
   # matmul shapes: query is [batch_size, 1, depth] and
@@ -336,7 +382,8 @@ def _luong_score(query, keys, scale):
   #   [batch_size, 1, max_time].
   # we then squeeze out the center singleton dimension.
   score = math_ops.matmul(query, keys, transpose_b=True)
-  score = array_ops.squeeze(score, [1])
+  if is_single_query:
+    score = array_ops.squeeze(score, [1])
 
   if scale:
     # Scalar used in weight scaling
@@ -372,7 +419,8 @@ class LuongAttention(_BaseAttentionMechanism):
                probability_fn=None,
                score_mask_value=None,
                dtype=None,
-               name="LuongAttention"):
+               name="LuongAttention",
+               beam_width=None):
     """Construct the AttentionMechanism mechanism.
 
     Args:
@@ -392,6 +440,10 @@ class LuongAttention(_BaseAttentionMechanism):
         `memory_sequence_length` is not None.
       dtype: The data type for the memory layer of the attention mechanism.
       name: Name to use when creating ops.
+      beam_width: (optional) Python integer.  If given, `memory` and
+        `memory_sequence_length` must not be tiled, and the queries have a
+        batch size of `batch_size * beam_width`, as in `BeamSearchDecoder`.
+        This keeps a single copy of the memory and its projection.
     """
     # For LuongAttention, we only transform the memory layer; thus
     # num_units **must** match expected the query depth.
@@ -408,7 +460,8 @@ class LuongAttention(_BaseAttentionMechanism):
         probability_fn=wrapped_probability_fn,
         memory_sequence_length=memory_sequence_length,
         score_mask_value=score_mask_value,
-        name=name)
+        name=name,
+        beam_width=beam_width)
     self._num_units = num_units
     self._scale = scale
     self._name = name
@@ -429,7 +482,8 @@ class LuongAttention(_BaseAttentionMechanism):
         `max_time`).
     """
     with variable_scope.variable_scope(None, "luong_attention", [query]):
-      score = _luong_score(query, self._keys, self._scale)
+      score = self._merge_beams(
+          _luong_score(self._split_beams(query), self._keys, self._scale))
     alignments = self._probability_fn(score, state)
     next_state = alignments
     return alignments, next_state
@@ -456,19 +510,27 @@ def _bahdanau_score(processed_query, keys, normalize):
   To enable the second form, set `normalize=True`.
 
   Args:
-    processed_query: Tensor, shape `[batch_size, num_units]` to compare to keys.
+    processed_query: Tensor, shape `[batch_size, num_units]` to compare to keys,
+      or `[batch_size, beam_width, num_units]` for several queries per keys.
     keys: Processed memory, shape `[batch_size, max_time, num_units]`.
     normalize: Whether to normalize the score function.
 
   Returns:
-    A `[batch_size, max_time]` tensor of unnormalized score values.
+    A `[batch_size, max_time]` tensor of unnormalized score values, or
+    `[batch_size, beam_width, max_time]` for several queries per keys.
   """
   dtype = processed_query.dtype
   # Get the number of hidden units from the trailing dimension of keys
   num_units = tensor_shape.dimension_value(
       keys.shape[2]) or array_ops.shape(keys)[2]
-  # Reshape from [batch_size, ...] to [batch_size, 1, ...] for broadcasting.
-  processed_query = array_ops.expand_dims(processed_query, 1)
+  if processed_query.get_shape().ndims == 3:
+    # Reshape to [batch_size, beam_width, 1, ...] and [batch_size, 1, ...]
+    # for broadcasting.
+    processed_query = array_ops.expand_dims(processed_query, 2)
+    keys = array_ops.expand_dims(keys, 1)
+  else:
+    # Reshape from [batch_size, ...] to [batch_size, 1, ...] for broadcasting.
+    processed_query = array_ops.expand_dims(processed_query, 1)
   v = variable_scope.get_variable(
       "attention_v", [num_units], dtype=dtype)
   if normalize:
@@ -485,9 +547,9 @@ def _bahdanau_score(processed_query, keys, normalize):
     normed_v = g * v * math_ops.rsqrt(
         math_ops.reduce_sum(math_ops.square(v)))
     return math_ops.reduce_sum(
-        normed_v * math_ops.tanh(keys + processed_query + b), [2])
+        normed_v * math_ops.tanh(keys + processed_query + b), [-1])
   else:
-    return math_ops.reduce_sum(v * math_ops.tanh(keys + processed_query), [2])
+    return math_ops.reduce_sum(v * math_ops.tanh(keys + processed_query), [-1])
 
 
 class BahdanauAttention(_BaseAttentionMechanism):
@@ -520,7 +582,8 @@ class BahdanauAttention(_BaseAttentionMechanism):
                probability_fn=None,
                score_mask_value=None,
                dtype=None,
-               name="BahdanauAttention"):
+               name="BahdanauAttention",
+               beam_width=None):
     """Construct the Attention mechanism.
 
     Args:
@@ -541,6 +604,10 @@ class BahdanauAttention(_BaseAttentionMechanism):
       dtype: The data type for the query and memory layers of the attention
         mechanism.
       name: Name to use when creating ops.
+      beam_width: (optional) Python integer.  If given, `memory` and
+        `memory_sequence_length` must not be tiled, and the queries have a
+        batch size of `batch_size * beam_width`, as in `BeamSearchDecoder`.
+        This keeps a single copy of the memory and its projection.
     """
     if probability_fn is None:
       probability_fn = nn_ops.softmax
@@ -556,7 +623,8 @@ class BahdanauAttention(_BaseAttentionMechanism):
         probability_fn=wrapped_probability_fn,
         memory_sequence_length=memory_sequence_length,
         score_mask_value=score_mask_value,
-        name=name)
+        name=name,
+        beam_width=beam_width)
     self._num_units = num_units
     self._normalize = normalize
     self._name = name
@@ -578,7 +646,9 @@ class BahdanauAttention(_BaseAttentionMechanism):
     """
     with variable_scope.variable_scope(None, "bahdanau_attention", [query]):
       processed_query = self.query_layer(query) if self.query_layer else query
-      score = _bahdanau_score(processed_query, self._keys, self._normalize)
+      score = self._merge_beams(
+          _bahdanau_score(self._split_beams(processed_query), self._keys,
+                          self._normalize))
     alignments = self._probability_fn(score, state)
     next_state = alignments
     return alignments, next_state
@@ -794,7 +864,8 @@ class BahdanauMonotonicAttention(_BaseMonotonicAttentionMechanism):
                score_bias_init=0.,
                mode="parallel",
                dtype=None,
-               name="BahdanauMonotonicAttention"):
+               name="BahdanauMonotonicAttention",
+               beam_width=None):
     """Construct the Attention mechanism.
 
     Args:
@@ -820,6 +891,10 @@ class BahdanauMonotonicAttention(_BaseMonotonicAttentionMechanism):
       dtype: The data type for the query and memory layers of the attention
         mechanism.
       name: Name to use when creating ops.
+      beam_width: (optional) Python integer.  If given, `memory` and
+        `memory_sequence_length` must not be tiled, and the queries have a
+        batch size of `batch_size * beam_width`, as in `BeamSearchDecoder`.
+        This keeps a single copy of the memory and its projection.
     """
     # Set up the monotonic probability fn with supplied parameters
     if dtype is None:
@@ -836,7 +911,8 @@ class BahdanauMonotonicAttention(_BaseMonotonicAttentionMechanism):
         probability_fn=wrapped_probability_fn,
         memory_sequence_length=memory_sequence_length,
         score_mask_value=score_mask_value,
-        name=name)
+        name=name,
+        beam_width=beam_width)
     self._num_units = num_units
     self._normalize = normalize
     self._name = name
@@ -860,7 +936,9 @@ class BahdanauMonotonicAttention(_BaseMonotonicAttentionMechanism):
     with variable_scope.variable_scope(
         None, "bahdanau_monotonic_attention", [query]):
       processed_query = self.query_layer(query) if self.query_layer else query
-      score = _bahdanau_score(processed_query, self._keys, self._normalize)
+      score = self._merge_beams(
+          _bahdanau_score(self._split_beams(processed_query), self._keys,
+                          self._normalize))
       score_bias = variable_scope.get_variable(
           "attention_score_bias", dtype=processed_query.dtype,
           initializer=self._score_bias_init)
@@ -896,7 +974,8 @@ class LuongMonotonicAttention(_BaseMonotonicAttentionMechanism):
                score_bias_init=0.,
                mode="parallel",
                dtype=None,
-               name="LuongMonotonicAttention"):
+               name="LuongMonotonicAttention",
+               beam_width=None):
     """Construct the Attention mechanism.
 
     Args:
@@ -922,6 +1001,10 @@ class LuongMonotonicAttention(_BaseMonotonicAttentionMechanism):
       dtype: The data type for the query and memory layers of the attention
         mechanism.
       name: Name to use when creating ops.
+      beam_width: (optional) Python integer.  If given, `memory` and
+        `memory_sequence_length` must not be tiled, and the queries have a
+        batch size of `batch_size * beam_width`, as in `BeamSearchDecoder`.
+        This keeps a single copy of the memory and its projection.
     """
     # Set up the monotonic probability fn with supplied parameters
     if dtype is None:
@@ -937,7 +1020,8 @@ class LuongMonotonicAttention(_BaseMonotonicAttentionMechanism):
         probability_fn=wrapped_probability_fn,
         memory_sequence_length=memory_sequence_length,
         score_mask_value=score_mask_value,
-        name=name)
+        name=name,
+        beam_width=beam_width)
     self._num_units = num_units
     self._scale = scale
     self._score_bias_init = score_bias_init
@@ -960,7 +1044,8 @@ class LuongMonotonicAttention(_BaseMonotonicAttentionMechanism):
     """
     with variable_scope.variable_scope(None, "luong_monotonic_attention",
                                        [query]):
-      score = _luong_score(query, self._keys, self._scale)
+      score = self._merge_beams(
+          _luong_score(self._split_beams(query), self._keys, self._scale))
       score_bias = variable_scope.get_variable(
           "attention_score_bias", dtype=query.dtype,
           initializer=self._score_bias_init)
@@ -1053,19 +1138,35 @@ def _compute_attention(attention_mechanism, cell_output, attention_state,
   alignments, next_attention_state = attention_mechanism(
       cell_output, state=attention_state)
 
-  # Reshape from [batch_size, memory_time] to [batch_size, 1, memory_time]
-  expanded_alignments = array_ops.expand_dims(alignments, 1)
-  # Context is the inner product of alignments and values along the
-  # memory time dimension.
-  # alignments shape is
-  #   [batch_size, 1, memory_time]
-  # attention_mechanism.values shape is
-  #   [batch_size, memory_time, memory_size]
-  # the batched matmul is over memory_time, so the output shape is
-  #   [batch_size, 1, memory_size].
-  # we then squeeze out the singleton dim.
-  context = math_ops.matmul(expanded_alignments, attention_mechanism.values)
-  context = array_ops.squeeze(context, [1])
+  beam_width = getattr(attention_mechanism, "beam_width", None)
+  if beam_width is None:
+    # Reshape from [batch_size, memory_time] to [batch_size, 1, memory_time]
+    expanded_alignments = array_ops.expand_dims(alignments, 1)
+    # Context is the inner product of alignments and values along the
+    # memory time dimension.
+    # alignments shape is
+    #   [batch_size, 1, memory_time]
+    # attention_mechanism.values shape is
+    #   [batch_size, memory_time, memory_size]
+    # the batched matmul is over memory_time, so the output shape is
+    #   [batch_size, 1, memory_size].
+    # we then squeeze out the singleton dim.
+    context = math_ops.matmul(expanded_alignments, attention_mechanism.values)
+    context = array_ops.squeeze(context, [1])
+  else:
+    # With untiled memory, the alignments of all beams of a batch entry are
+    # multiplied with its values at once. The alignments are reshaped to
+    # [batch_size, beam_width, memory_time], so that the output shape of the
+    # batched matmul is [batch_size, beam_width, memory_size].
+    memory_time = (tensor_shape.dimension_value(alignments.shape[1]) or
+                   array_ops.shape(alignments)[1])
+    memory_size = (
+        tensor_shape.dimension_value(attention_mechanism.values.shape[2]) or
+        array_ops.shape(attention_mechanism.values)[2])
+    context = math_ops.matmul(
+        array_ops.reshape(alignments, [-1, beam_width, memory_time]),
+        attention_mechanism.values)
+    context = array_ops.reshape(context, [-1, memory_size])
 
   if attention_layer is not None:
     attention = attention_layer(array_ops.concat([cell_output, context], 1))
@@ -1122,6 +1223,11 @@ class AttentionWrapper(rnn_cell_impl.RNNCell):
         cell_state=tiled_encoder_final_state)
     ```
 
+    Instead of tiling the encoder output and sequence lengths, they can be
+    passed as they are to an attention mechanism created with
+    `beam_width=beam_width`, which then keeps a single copy of the memory and
+    its projection for all beams.
+
     Args:
       cell: An instance of `RNNCell`.
       attention_mechanism: A list of `AttentionMechanism` instances or a single
@@ -279,7 +279,8 @@ class BeamSearchDecoder(decoder.Decoder):
                output_layer=None,
                length_penalty_weight=0.0,
                coverage_penalty_weight=0.0,
-               reorder_tensor_arrays=True):
+               reorder_tensor_arrays=True,
+               early_stopping=False):
     """Initialize the BeamSearchDecoder.
 
     Args:
@@ -302,6 +303,13 @@ class BeamSearchDecoder(decoder.Decoder):
         Otherwise, the `TensorArray` will be returned as is. Set this flag to
         `False` if the cell state contains `TensorArray`s that are not amenable
         to reordering.
+      early_stopping: If `True`, all beams of a batch entry are finished once
+        its best beam has finished, as no other beam can then get a better
+        score without a length penalty. Decoding stops as soon as this is the
+        case for all batch entries, instead of when all beams have finished.
+        The best beam is unchanged, but the other beams may be cut short. With
+        a length penalty, the best beam may also differ, as unfinished beams
+        are only compared at their current length.
 
     Raises:
       TypeError: if `cell` is not an instance of `RNNCell`,
@@ -317,6 +325,7 @@ class BeamSearchDecoder(decoder.Decoder):
     self._cell = cell
     self._output_layer = output_layer
     self._reorder_tensor_arrays = reorder_tensor_arrays
+    self._early_stopping = early_stopping
 
     if callable(embedding):
       self._embedding_fn = embedding
@@ -661,6 +670,16 @@ class BeamSearchDecoder(decoder.Decoder):
       next_cell_state = nest.map_structure(
           self._maybe_split_batch_beams, next_cell_state, self._cell.state_size)
 
+      # Batch entries whose beams have all finished can only be continued
+      # with the end token, so only the other ones need the output layer and
+      # the search over the vocabulary.
+      alive_batch_indices = math_ops.to_int32(
+          array_ops.reshape(
+              array_ops.where(
+                  math_ops.logical_not(
+                      math_ops.reduce_all(state.finished, 1))), [-1]))
+      cell_outputs = nest.map_structure(
+          lambda out: array_ops.gather(out, alive_batch_indices), cell_outputs)
       if self._output_layer is not None:
         cell_outputs = self._output_layer(cell_outputs)
 
@@ -673,7 +692,9 @@ class BeamSearchDecoder(decoder.Decoder):
           beam_width=beam_width,
           end_token=end_token,
           length_penalty_weight=length_penalty_weight,
-          coverage_penalty_weight=coverage_penalty_weight)
+          coverage_penalty_weight=coverage_penalty_weight,
+          alive_batch_indices=alive_batch_indices,
+          early_stopping=self._early_stopping)
 
       finished = beam_search_state.finished
       sample_ids = beam_search_output.predicted_ids
@@ -686,7 +707,8 @@ class BeamSearchDecoder(decoder.Decoder):
 
 def _beam_search_step(time, logits, next_cell_state, beam_state, batch_size,
                       beam_width, end_token, length_penalty_weight,
-                      coverage_penalty_weight):
+                      coverage_penalty_weight, alive_batch_indices=None,
+                      early_stopping=False):
   """Performs a single step of Beam Search Decoding.
 
   Args:
@@ -694,7 +716,8 @@ def _beam_search_step(time, logits, next_cell_state, beam_state, batch_size,
       that all beams are equal and consider only the first beam for
       continuations.
     logits: Logits at the current time step. A tensor of shape
-      `[batch_size, beam_width, vocab_size]`
+      `[batch_size, beam_width, vocab_size]`, or
+      `[num_alive, beam_width, vocab_size]` if `alive_batch_indices` is given.
     next_cell_state: The next state from the cell, e.g. an instance of
       AttentionWrapperState if the cell is attentional.
     beam_state: Current state of the beam search.
@@ -705,36 +728,21 @@ def _beam_search_step(time, logits, next_cell_state, beam_state, batch_size,
     length_penalty_weight: Float weight to penalize length. Disabled with 0.0.
     coverage_penalty_weight: Float weight to penalize the coverage of source
       sentence. Disabled with 0.0.
+    alive_batch_indices: (Optional) int32 vector with the indices of the batch
+      entries that have unfinished beams, which `logits` are given for. The
+      beams of all other batch entries are only sorted by their scores, as a
+      search over their masked logits would do.
+    early_stopping: Python bool. Whether to finish all beams of a batch entry
+      once its best beam has finished.
 
   Returns:
     A new beam state.
   """
   static_batch_size = tensor_util.constant_value(batch_size)
 
-  # Calculate the current lengths of the predictions
-  prediction_lengths = beam_state.lengths
   previously_finished = beam_state.finished
   not_finished = math_ops.logical_not(previously_finished)
 
-  # Calculate the total log probs for the new hypotheses
-  # Final Shape: [batch_size, beam_width, vocab_size]
-  step_log_probs = nn_ops.log_softmax(logits)
-  step_log_probs = _mask_probs(step_log_probs, end_token, previously_finished)
-  total_probs = array_ops.expand_dims(beam_state.log_probs, 2) + step_log_probs
-
-  # Calculate the continuation lengths by adding to all continuing beams.
-  vocab_size = logits.shape.dims[-1].value or array_ops.shape(logits)[-1]
-  lengths_to_add = array_ops.one_hot(
-      indices=array_ops.fill([batch_size, beam_width], end_token),
-      depth=vocab_size,
-      on_value=np.int64(0),
-      off_value=np.int64(1),
-      dtype=dtypes.int64)
-  add_mask = math_ops.to_int64(not_finished)
-  lengths_to_add *= array_ops.expand_dims(add_mask, 2)
-  new_prediction_lengths = (
-      lengths_to_add + array_ops.expand_dims(prediction_lengths, 2))
-
   # Calculate the accumulated attention probabilities if coverage penalty is
   # enabled.
   accumulated_attention_probs = None
@@ -745,45 +753,60 @@ def _beam_search_step(time, logits, next_cell_state, beam_state, batch_size,
     accumulated_attention_probs = (
         beam_state.accumulated_attention_probs + attention_probs)
 
-  # Calculate the scores for each beam
-  scores = _get_scores(
-      log_probs=total_probs,
-      sequence_lengths=new_prediction_lengths,
-      length_penalty_weight=length_penalty_weight,
-      coverage_penalty_weight=coverage_penalty_weight,
-      finished=previously_finished,
-      accumulated_attention_probs=accumulated_attention_probs)
-
   time = ops.convert_to_tensor(time, name="time")
-  # During the first time step we only consider the initial beam
-  scores_flat = array_ops.reshape(scores, [batch_size, -1])
-
-  # Pick the next beams according to the specified successors function
-  next_beam_size = ops.convert_to_tensor(
-      beam_width, dtype=dtypes.int32, name="beam_width")
-  next_beam_scores, word_indices = nn_ops.top_k(scores_flat, k=next_beam_size)
+  if alive_batch_indices is None:
+    next_beam_scores, next_word_ids, next_beam_ids, next_beam_probs = (
+        _select_next_beams(
+            logits=logits,
+            beam_state=beam_state,
+            accumulated_attention_probs=accumulated_attention_probs,
+            batch_size=batch_size,
+            beam_width=beam_width,
+            end_token=end_token,
+            length_penalty_weight=length_penalty_weight,
+            coverage_penalty_weight=coverage_penalty_weight))
+  else:
+    # Search the vocabulary only for the alive batch entries, and merge the
+    # result with the sorted beams of the finished ones.
+    gather_alive = lambda t: array_ops.gather(t, alive_batch_indices)
+    alive_attention_probs = None
+    if accumulated_attention_probs is not None:
+      alive_attention_probs = gather_alive(accumulated_attention_probs)
+    alive_selection = _select_next_beams(
+        logits=logits,
+        beam_state=beam_state._replace(
+            log_probs=gather_alive(beam_state.log_probs),
+            lengths=gather_alive(beam_state.lengths),
+            finished=gather_alive(previously_finished)),
+        accumulated_attention_probs=alive_attention_probs,
+        batch_size=array_ops.size(alive_batch_indices),
+        beam_width=beam_width,
+        end_token=end_token,
+        length_penalty_weight=length_penalty_weight,
+        coverage_penalty_weight=coverage_penalty_weight)
+    finished_selection = _sort_finished_beams(
+        beam_state=beam_state,
+        accumulated_attention_probs=accumulated_attention_probs,
+        beam_width=beam_width,
+        end_token=end_token,
+        length_penalty_weight=length_penalty_weight,
+        coverage_penalty_weight=coverage_penalty_weight)
+    alive = math_ops.logical_not(math_ops.reduce_all(previously_finished, 1))
+    indices = array_ops.expand_dims(alive_batch_indices, 1)
+    next_beam_scores, next_word_ids, next_beam_ids, next_beam_probs = [
+        array_ops.where(
+            alive,
+            array_ops.scatter_nd(indices, alive_value,
+                                 array_ops.shape(finished_value)),
+            finished_value)
+        for alive_value, finished_value in zip(alive_selection,
+                                               finished_selection)
+    ]
 
   next_beam_scores.set_shape([static_batch_size, beam_width])
-  word_indices.set_shape([static_batch_size, beam_width])
-
-  # Pick out the probs, beam_ids, and states according to the chosen predictions
-  next_beam_probs = _tensor_gather_helper(
-      gather_indices=word_indices,
-      gather_from=total_probs,
-      batch_size=batch_size,
-      range_size=beam_width * vocab_size,
-      gather_shape=[-1],
-      name="next_beam_probs")
-  # Note: just doing the following
-  #   math_ops.to_int32(word_indices % vocab_size,
-  #       name="next_beam_word_ids")
-  # would be a lot cleaner but for reasons unclear, that hides the results of
-  # the op which prevents capturing it with tfdbg debug ops.
-  raw_next_word_ids = math_ops.mod(
-      word_indices, vocab_size, name="next_beam_word_ids")
-  next_word_ids = math_ops.to_int32(raw_next_word_ids)
-  next_beam_ids = math_ops.to_int32(
-      word_indices / vocab_size, name="next_beam_parent_ids")
+  next_word_ids.set_shape([static_batch_size, beam_width])
+  next_beam_ids.set_shape([static_batch_size, beam_width])
+  next_beam_probs.set_shape([static_batch_size, beam_width])
 
   # Append new ids to current predictions
   previously_finished = _tensor_gather_helper(
@@ -796,6 +819,13 @@ def _beam_search_step(time, logits, next_cell_state, beam_state, batch_size,
       previously_finished,
       math_ops.equal(next_word_ids, end_token),
       name="next_beam_finished")
+  if early_stopping:
+    # The beams are sorted by score, so once the best beam of a batch entry
+    # has finished, no other beam can overtake it without a length penalty:
+    # extending a beam can only lower its log probability and coverage
+    # penalty. With a length penalty, this compares the unfinished beams at
+    # their current length.
+    next_finished = math_ops.logical_or(next_finished, next_finished[:, :1])
 
   # Calculate the length of the next predictions.
   # 1. Finished beams remain unchanged.
@@ -850,6 +880,164 @@ def _beam_search_step(time, logits, next_cell_state, beam_state, batch_size,
   return output, next_state
 
 
+def _select_next_beams(logits, beam_state, accumulated_attention_probs,
+                       batch_size, beam_width, end_token, length_penalty_weight,
+                       coverage_penalty_weight):
+  """Selects the best continuations of the beams.
+
+  Args:
+    logits: Logits at the current time step. A tensor of shape
+      `[batch_size, beam_width, vocab_size]`.
+    beam_state: Current state of the beam search.
+      An instance of `BeamSearchDecoderState`.
+    accumulated_attention_probs: Accumulated attention probabilities up to the
+      current time step, with shape `[batch_size, beam_width, max_time]` if
+      coverage_penalty_weight is not 0.0.
+    batch_size: The batch size for this input.
+    beam_width: Python int.  The size of the beams.
+    end_token: The int32 end token.
+    length_penalty_weight: Float weight to penalize length. Disabled with 0.0.
+    coverage_penalty_weight: Float weight to penalize the coverage of source
+      sentence. Disabled with 0.0.
+
+  Returns:
+    A tuple of the scores, word ids, parent beam ids and log probabilities of
+    the next beams, each of shape `[batch_size, beam_width]`.
+  """
+  # Calculate the current lengths of the predictions
+  prediction_lengths = beam_state.lengths
+  previously_finished = beam_state.finished
+  not_finished = math_ops.logical_not(previously_finished)
+
+  # Calculate the total log probs for the new hypotheses
+  # Final Shape: [batch_size, beam_width, vocab_size]
+  step_log_probs = nn_ops.log_softmax(logits)
+  step_log_probs = _mask_probs(step_log_probs, end_token, previously_finished)
+  total_probs = array_ops.expand_dims(beam_state.log_probs, 2) + step_log_probs
+
+  # Calculate the continuation lengths by adding to all continuing beams.
+  vocab_size = logits.shape.dims[-1].value or array_ops.shape(logits)[-1]
+  lengths_to_add = array_ops.one_hot(
+      indices=array_ops.fill([batch_size, beam_width], end_token),
+      depth=vocab_size,
+      on_value=np.int64(0),
+      off_value=np.int64(1),
+      dtype=dtypes.int64)
+  add_mask = math_ops.to_int64(not_finished)
+  lengths_to_add *= array_ops.expand_dims(add_mask, 2)
+  new_prediction_lengths = (
+      lengths_to_add + array_ops.expand_dims(prediction_lengths, 2))
+
+  # Calculate the scores for each beam
+  scores = _get_scores(
+      log_probs=total_probs,
+      sequence_lengths=new_prediction_lengths,
+      length_penalty_weight=length_penalty_weight,
+      coverage_penalty_weight=coverage_penalty_weight,
+      finished=previously_finished,
+      accumulated_attention_probs=accumulated_attention_probs)
+
+  # Pick the next beams according to the specified successors function
+  next_beam_scores, word_indices = _top_k_over_beams(
+      scores, beam_width, vocab_size)
+
+  # Pick out the probs, beam_ids, and states according to the chosen predictions
+  next_beam_probs = _tensor_gather_helper(
+      gather_indices=word_indices,
+      gather_from=total_probs,
+      batch_size=batch_size,
+      range_size=beam_width * vocab_size,
+      gather_shape=[-1],
+      name="next_beam_probs")
+  # Note: just doing the following
+  #   math_ops.to_int32(word_indices % vocab_size,
+  #       name="next_beam_word_ids")
+  # would be a lot cleaner but for reasons unclear, that hides the results of
+  # the op which prevents capturing it with tfdbg debug ops.
+  raw_next_word_ids = math_ops.mod(
+      word_indices, vocab_size, name="next_beam_word_ids")
+  next_word_ids = math_ops.to_int32(raw_next_word_ids)
+  next_beam_ids = math_ops.to_int32(
+      word_indices / vocab_size, name="next_beam_parent_ids")
+  return next_beam_scores, next_word_ids, next_beam_ids, next_beam_probs
+
+
+def _top_k_over_beams(scores, beam_width, vocab_size):
+  """Finds the best `beam_width` scores over all beams of each batch entry.
+
+  This is the `top_k` of `scores` reshaped to
+  `[batch_size, beam_width * vocab_size]`. If the vocabulary is larger than
+  the beam, the best `beam_width` scores of each beam are selected first, and
+  the result is the `top_k` of these `beam_width * beam_width` candidates.
+  The sort over the whole vocabulary is then per beam, which is much cheaper
+  for large vocabularies. Both return the same beams in the same order, since
+  `top_k` returns equal scores in the order of their indices.
+
+  Args:
+    scores: A tensor of shape `[batch_size, beam_width, vocab_size]`.
+    beam_width: Python int.  The size of the beams.
+    vocab_size: Python int or int32 scalar tensor.  The size of the vocabulary.
+
+  Returns:
+    The best scores, and their indices into the flattened beams and
+    vocabulary, `beam_id * vocab_size + word_id`, both of shape
+    `[batch_size, beam_width]`.
+  """
+  batch_size = array_ops.shape(scores)[0]
+  if not isinstance(vocab_size, int) or vocab_size <= beam_width:
+    return nn_ops.top_k(array_ops.reshape(scores, [batch_size, -1]),
+                        k=beam_width)
+  beam_scores, beam_word_ids = nn_ops.top_k(scores, k=beam_width)
+  next_beam_scores, candidate_indices = nn_ops.top_k(
+      array_ops.reshape(beam_scores, [batch_size, beam_width * beam_width]),
+      k=beam_width)
+  word_ids = array_ops.batch_gather(
+      array_ops.reshape(beam_word_ids, [batch_size, beam_width * beam_width]),
+      candidate_indices)
+  beam_ids = candidate_indices // beam_width
+  return next_beam_scores, beam_ids * vocab_size + word_ids
+
+
+def _sort_finished_beams(beam_state, accumulated_attention_probs, beam_width,
+                         end_token, length_penalty_weight,
+                         coverage_penalty_weight):
+  """Selects the next beams of batch entries whose beams have all finished.
+
+  A finished beam can only be continued with `end_token`, which doesn't change
+  its log probability or length. The next beams of such a batch entry are
+  thus its current beams sorted by score, as `_select_next_beams` would
+  select them from the masked logits.
+
+  Args:
+    beam_state: Current state of the beam search.
+      An instance of `BeamSearchDecoderState`.
+    accumulated_attention_probs: Accumulated attention probabilities up to the
+      current time step, with shape `[batch_size, beam_width, max_time]` if
+      coverage_penalty_weight is not 0.0.
+    beam_width: Python int.  The size of the beams.
+    end_token: The int32 end token.
+    length_penalty_weight: Float weight to penalize length. Disabled with 0.0.
+    coverage_penalty_weight: Float weight to penalize the coverage of source
+      sentence. Disabled with 0.0.
+
+  Returns:
+    A tuple of the scores, word ids, parent beam ids and log probabilities of
+    the next beams, each of shape `[batch_size, beam_width]`.
+  """
+  scores = _get_scores(
+      log_probs=array_ops.expand_dims(beam_state.log_probs, 2),
+      sequence_lengths=array_ops.expand_dims(beam_state.lengths, 2),
+      length_penalty_weight=length_penalty_weight,
+      coverage_penalty_weight=coverage_penalty_weight,
+      finished=beam_state.finished,
+      accumulated_attention_probs=accumulated_attention_probs)
+  next_beam_scores, next_beam_ids = nn_ops.top_k(
+      array_ops.squeeze(scores, [2]), k=beam_width)
+  next_word_ids = array_ops.fill(array_ops.shape(next_beam_ids), end_token)
+  next_beam_probs = array_ops.batch_gather(beam_state.log_probs, next_beam_ids)
+  return next_beam_scores, next_word_ids, next_beam_ids, next_beam_probs
+
+
 def get_attention_probs(next_cell_state, coverage_penalty_weight):
   """Get attention probabilities from the cell state.
 
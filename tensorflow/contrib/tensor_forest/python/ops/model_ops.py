@@ -25,6 +25,7 @@ from tensorflow.contrib.tensor_forest.python.ops import gen_model_ops
 from tensorflow.contrib.tensor_forest.python.ops.gen_model_ops import feature_usage_counts
 from tensorflow.contrib.tensor_forest.python.ops.gen_model_ops import traverse_tree_v4
 from tensorflow.contrib.tensor_forest.python.ops.gen_model_ops import tree_predictions_v4
+from tensorflow.contrib.tensor_forest.python.ops.gen_model_ops import tree_serialize
 from tensorflow.contrib.tensor_forest.python.ops.gen_model_ops import tree_size
 from tensorflow.contrib.tensor_forest.python.ops.gen_model_ops import update_model_v4
 # pylint: enable=unused-import
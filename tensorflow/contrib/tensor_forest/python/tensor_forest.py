@@ -22,6 +22,7 @@ import numbers
 import random
 
 from google.protobuf import text_format
+import numpy as np
 
 from tensorflow.contrib.decision_trees.proto import generic_tree_model_pb2 as _tree_proto
 from tensorflow.contrib.framework.python.ops import variables as framework_variables
@@ -30,6 +31,8 @@ from tensorflow.contrib.tensor_forest.python.ops import data_ops
 from tensorflow.contrib.tensor_forest.python.ops import model_ops
 from tensorflow.contrib.tensor_forest.python.ops import stats_ops
 
+from tensorflow.python.framework import constant_op
+from tensorflow.python.framework import dtypes
 from tensorflow.python.framework import ops
 from tensorflow.python.ops import array_ops
 from tensorflow.python.ops import control_flow_ops
@@ -530,6 +533,21 @@ class RandomForestGraphs(object):
           0., expected_squares - average_values * average_values)
       return average_values, tree_paths, regression_variance
 
+  def tree_configs(self):
+    """Constructs a TF graph for serializing the trees of a forest.
+
+    The results can be passed to `FlatForest` to serve the trained forest.
+
+    Returns:
+      A list of scalar string Tensors with the serialized
+      `decision_trees.Model` proto of each tree.
+    """
+    configs = []
+    for i in range(self.params.num_trees):
+      with ops.device(self.variables.device_dummies[i].device):
+        configs.append(model_ops.tree_serialize(self.variables[i].tree))
+    return configs
+
   def average_size(self):
     """Constructs a TF graph for evaluating the average size of a forest.
 
@@ -698,3 +716,185 @@ class RandomTreeGraphs(object):
   def feature_usage_counts(self):
     return model_ops.feature_usage_counts(
         self.variables.tree, params=self.params.serialized_params_proto)
+
+
+class FlatForest(object):
+  """Evaluates a trained forest packed into flat arrays.
+
+  `RandomForestGraphs.inference_graph` evaluates each tree with its own
+  TreePredictionsV4 op, so graph size and the number of ops run per batch grow
+  with the number of trees. `FlatForest` instead packs the nodes of all trees
+  into contiguous arrays, with the children of node `i` at `2 * i` and
+  `2 * i + 1` and leaves pointing back to themselves. Inference then moves
+  every (example, tree) pair one level down per step with a handful of gathers,
+  so a forest of any size is evaluated in `max_depth` vectorized steps.
+  Missing (NaN) values go to the right child of the original split, as in
+  TreePredictionsV4. That direction is kept per node, since `>=` and `>` splits
+  are packed with their children swapped.
+
+  Only dense input data and axis-aligned inequality splits are supported, which
+  covers forests trained with the default `ForestHParams`.
+  """
+
+  def __init__(self, params, tree_configs):
+    """Packs the trees of a forest.
+
+    Args:
+      params: The `ForestHParams` the forest was trained with.
+      tree_configs: A list with the serialized `decision_trees.Model` proto of
+        each tree, e.g. the evaluated results of
+        `RandomForestGraphs.tree_configs`.
+
+    Raises:
+      ValueError: If a tree contains a split other than an axis-aligned
+        inequality.
+    """
+    self.params = params
+    features = []
+    thresholds = []
+    nan_right = []
+    children = []
+    leaf_values = []
+    roots = []
+    self.max_depth = 0
+    for tree_num, tree_config in enumerate(tree_configs):
+      model = _tree_proto.Model()
+      model.ParseFromString(tree_config)
+      nodes = model.decision_tree.nodes
+      offset = len(features)
+      roots.append(offset)
+      if not nodes:
+        # An untrained tree is a single empty leaf.
+        nodes = [_tree_proto.TreeNode(leaf=_tree_proto.Leaf())]
+      for i, node in enumerate(nodes):
+        node_type = node.WhichOneof('node_type')
+        if node_type == 'leaf':
+          features.append(0)
+          thresholds.append(0.)
+          nan_right.append(False)
+          children.extend([offset + i, offset + i])
+          leaf_values.append(self._leaf_values(node.leaf))
+          continue
+        test = node.binary_node.inequality_left_child_test
+        if (node_type != 'binary_node' or
+            not node.binary_node.HasField('inequality_left_child_test') or
+            test.HasField('oblique')):
+          raise ValueError(
+              'FlatForest only supports axis-aligned inequality splits, got: '
+              '%s' % node)
+        feature = int(test.feature_id.id.value)
+        if params.bagged_features:
+          feature = params.bagged_features[tree_num][feature]
+        left = offset + node.binary_node.left_child_id.value
+        right = offset + node.binary_node.right_child_id.value
+        # Rewrite every test as `value <= threshold` going left.
+        threshold = np.float32(test.threshold.float_value)
+        if test.type in (_tree_proto.InequalityTest.LESS_THAN,
+                         _tree_proto.InequalityTest.GREATER_OR_EQUAL):
+          threshold = np.nextafter(threshold, np.float32('-inf'))
+        # NaN values fail every comparison and go to the original right child.
+        swapped = test.type in (_tree_proto.InequalityTest.GREATER_OR_EQUAL,
+                                _tree_proto.InequalityTest.GREATER_THAN)
+        if swapped:
+          left, right = right, left
+        features.append(feature)
+        thresholds.append(threshold)
+        nan_right.append(not swapped)
+        children.extend([left, right])
+        leaf_values.append(np.zeros(params.num_classes, dtype=np.float32))
+      self.max_depth = max(self.max_depth, self._depth(nodes))
+    self._features = np.array(features, dtype=np.int32)
+    self._thresholds = np.array(thresholds, dtype=np.float32)
+    self._nan_right = np.array(nan_right, dtype=np.bool_)
+    self._children = np.array(children, dtype=np.int32)
+    self._leaf_values = np.array(leaf_values, dtype=np.float32)
+    self._roots = np.array(roots, dtype=np.int32)
+
+  def _leaf_values(self, leaf):
+    """Returns the output values of a leaf, as TreePredictionsV4 does."""
+    values = np.zeros(self.params.num_classes, dtype=np.float32)
+    if leaf.HasField('vector'):
+      for i, value in enumerate(leaf.vector.value[:len(values)]):
+        values[i] = value.float_value
+    else:
+      for i, value in leaf.sparse_vector.sparse_value.items():
+        if i < len(values):
+          values[i] = value.float_value
+    total = np.sum(values)
+    if not self.params.regression and total > 0 and total != 1:
+      values /= total
+    return values
+
+  @staticmethod
+  def _depth(nodes):
+    """Returns the number of edges on the longest path from the root."""
+    depth = 0
+    stack = [(0, 0)]
+    while stack:
+      node_id, node_depth = stack.pop()
+      depth = max(depth, node_depth)
+      node = nodes[node_id]
+      if node.WhichOneof('node_type') == 'binary_node':
+        stack.append((node.binary_node.left_child_id.value, node_depth + 1))
+        stack.append((node.binary_node.right_child_id.value, node_depth + 1))
+    return depth
+
+  @property
+  def num_nodes(self):
+    return len(self._features)
+
+  def inference_graph(self, input_data):
+    """Constructs a TF graph for evaluating the forest.
+
+    Args:
+      input_data: A tensor or dict of string->Tensor for the input data, with
+        the same spec as the data the forest was trained on.
+
+    Returns:
+      A tuple of (probabilities, variance), as returned by
+      `RandomForestGraphs.inference_graph` without the tree paths.
+
+    Raises:
+      NotImplementedError: If the input data has sparse features.
+    """
+    processed_dense_features, processed_sparse_features, _ = (
+        data_ops.ParseDataTensorOrDict(input_data))
+    if processed_sparse_features is not None:
+      raise NotImplementedError('FlatForest does not support sparse features.')
+    features = constant_op.constant(self._features, name='features')
+    thresholds = constant_op.constant(self._thresholds, name='thresholds')
+    nan_right = constant_op.constant(self._nan_right, name='nan_right')
+    children = constant_op.constant(self._children, name='children')
+    leaf_values = constant_op.constant(self._leaf_values, name='leaf_values')
+
+    batch_size = array_ops.shape(processed_dense_features)[0]
+    # The current node of each tree for each example.
+    nodes = array_ops.tile(
+        array_ops.expand_dims(constant_op.constant(self._roots), 0),
+        [batch_size, 1])
+
+    def _step(depth, nodes):
+      values = array_ops.batch_gather(processed_dense_features,
+                                      array_ops.gather(features, nodes))
+      go_right = math_ops.to_int32(
+          math_ops.logical_or(
+              values > array_ops.gather(thresholds, nodes),
+              math_ops.logical_and(
+                  math_ops.is_nan(values), array_ops.gather(nan_right, nodes))))
+      return depth + 1, array_ops.gather(children, 2 * nodes + go_right)
+
+    _, nodes = control_flow_ops.while_loop(
+        lambda depth, _: depth < self.max_depth,
+        _step, [constant_op.constant(0, dtype=dtypes.int32), nodes],
+        back_prop=False)
+
+    # shape of all_predict is [batch_size, num_trees, num_outputs]
+    all_predict = array_ops.gather(leaf_values, nodes)
+    num_trees = len(self._roots)
+    average_values = math_ops.div(
+        math_ops.reduce_sum(all_predict, 1), num_trees, name='probabilities')
+    expected_squares = math_ops.div(
+        math_ops.reduce_sum(all_predict * all_predict, 1), num_trees)
+    regression_variance = math_ops.maximum(
+        0., expected_squares - average_values * average_values)
+    return average_values, regression_variance
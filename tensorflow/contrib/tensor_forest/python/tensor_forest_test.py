@@ -18,15 +18,45 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
+import numpy as np
+
 from google.protobuf.json_format import ParseDict
 from tensorflow.contrib.decision_trees.proto import generic_tree_model_pb2 as _tree_proto
 from tensorflow.contrib.tensor_forest.python import tensor_forest
+from tensorflow.python.client import session
 from tensorflow.python.framework import ops
 from tensorflow.python.framework import sparse_tensor
 from tensorflow.python.framework import test_util
 from tensorflow.python.ops import resources
 from tensorflow.python.ops import variables
 from tensorflow.python.platform import googletest
+from tensorflow.python.platform import test
+
+
+def _random_tree(rng, num_classes, num_features, depth):
+  """Returns a serialized random complete tree of the given depth."""
+  model = _tree_proto.Model()
+  nodes = model.decision_tree.nodes
+  test_types = [_tree_proto.InequalityTest.LESS_OR_EQUAL,
+                _tree_proto.InequalityTest.LESS_THAN,
+                _tree_proto.InequalityTest.GREATER_OR_EQUAL,
+                _tree_proto.InequalityTest.GREATER_THAN]
+  num_nodes = 2 ** (depth + 1) - 1
+  for i in range(num_nodes):
+    node = nodes.add()
+    node.node_id.value = i
+    if 2 * i + 1 < num_nodes:
+      node.binary_node.left_child_id.value = 2 * i + 1
+      node.binary_node.right_child_id.value = 2 * i + 2
+      split = node.binary_node.inequality_left_child_test
+      split.feature_id.id.value = str(rng.randint(num_features))
+      split.type = test_types[rng.randint(len(test_types))]
+      # Thresholds on a coarse grid, so that ties with the data are exercised.
+      split.threshold.float_value = rng.randint(-4, 5) / 2.
+    else:
+      for value in rng.randint(0, 10, size=num_classes):
+        node.leaf.vector.value.add().float_value = value
+  return model.SerializeToString()
 
 
 class TensorForestTest(test_util.TensorFlowTestCase):
@@ -200,5 +230,130 @@ class TensorForestTest(test_util.TensorFlowTestCase):
     self.assertTrue(isinstance(var, ops.Tensor))
 
 
+class FlatForestTest(test_util.TensorFlowTestCase):
+
+  def _assertMatchesForest(self, hparams, tree_configs):
+    rng = np.random.RandomState(0)
+    input_data = (rng.randint(-5, 6, size=(50, hparams.num_features)) /
+                  2.).astype(np.float32)
+    # Missing values go to the original right child of each split.
+    input_data[rng.rand(*input_data.shape) < 0.1] = np.nan
+    graph_builder = tensor_forest.RandomForestGraphs(hparams, tree_configs)
+    probs, _, var = graph_builder.inference_graph(input_data)
+    flat_forest = tensor_forest.FlatForest(hparams, tree_configs)
+    flat_probs, flat_var = flat_forest.inference_graph(input_data)
+    with self.cached_session() as sess:
+      variables.global_variables_initializer().run()
+      resources.initialize_resources(resources.shared_resources()).run()
+      probs, var, flat_probs, flat_var = sess.run(
+          [probs, var, flat_probs, flat_var])
+    self.assertAllClose(probs, flat_probs)
+    self.assertAllClose(var, flat_var)
+
+  def testMatchesRandomForestGraphsClassification(self):
+    hparams = tensor_forest.ForestHParams(
+        num_classes=3,
+        num_features=4,
+        num_trees=5,
+        max_nodes=1000,
+        split_after_samples=25).fill()
+    rng = np.random.RandomState(1)
+    tree_configs = [_random_tree(rng, 3, 4, depth) for depth in range(5)]
+    self._assertMatchesForest(hparams, tree_configs)
+
+  def testMatchesRandomForestGraphsRegression(self):
+    hparams = tensor_forest.ForestHParams(
+        num_classes=2,
+        num_features=4,
+        num_trees=3,
+        max_nodes=1000,
+        split_after_samples=25,
+        regression=True).fill()
+    rng = np.random.RandomState(2)
+    tree_configs = [_random_tree(rng, 2, 4, 3) for _ in range(3)]
+    self._assertMatchesForest(hparams, tree_configs)
+
+  def testTreeConfigs(self):
+    hparams = tensor_forest.ForestHParams(
+        num_classes=2,
+        num_features=4,
+        num_trees=2,
+        max_nodes=1000,
+        split_after_samples=25).fill()
+    rng = np.random.RandomState(3)
+    tree_configs = [_random_tree(rng, 2, 4, 2) for _ in range(2)]
+    graph_builder = tensor_forest.RandomForestGraphs(hparams, tree_configs)
+    with self.cached_session() as sess:
+      variables.global_variables_initializer().run()
+      resources.initialize_resources(resources.shared_resources()).run()
+      serialized = sess.run(graph_builder.tree_configs())
+    flat_forest = tensor_forest.FlatForest(hparams, serialized)
+    self.assertEqual(14, flat_forest.num_nodes)
+    self.assertEqual(2, flat_forest.max_depth)
+
+  def testUnsupportedSplit(self):
+    hparams = tensor_forest.ForestHParams(
+        num_classes=2,
+        num_features=2,
+        num_trees=1,
+        max_nodes=1000,
+        split_after_samples=25).fill()
+    model = _tree_proto.Model()
+    node = model.decision_tree.nodes.add()
+    node.binary_node.left_child_id.value = 1
+    node.binary_node.right_child_id.value = 2
+    node.binary_node.inequality_left_child_test.oblique.features.add()
+    with self.assertRaisesRegexp(ValueError, 'axis-aligned'):
+      tensor_forest.FlatForest(hparams, [model.SerializeToString()])
+
+
+class FlatForestBenchmark(test.Benchmark):
+  """Compares per-tree and flattened inference for growing forests."""
+
+  def _benchmark(self, num_trees, flat, depth=10, num_features=100,
+                 batch_size=256):
+    hparams = tensor_forest.ForestHParams(
+        num_classes=2,
+        num_features=num_features,
+        num_trees=num_trees,
+        max_nodes=2 ** (depth + 1),
+        split_after_samples=25).fill()
+    rng = np.random.RandomState(0)
+    tree_configs = [
+        _random_tree(rng, 2, num_features, depth) for _ in range(num_trees)
+    ]
+    input_data = rng.randn(batch_size, num_features).astype(np.float32)
+    with ops.Graph().as_default(), session.Session() as sess:
+      if flat:
+        probs, _ = tensor_forest.FlatForest(
+            hparams, tree_configs).inference_graph(input_data)
+      else:
+        probs, _, _ = tensor_forest.RandomForestGraphs(
+            hparams, tree_configs).inference_graph(input_data)
+        sess.run(variables.global_variables_initializer())
+        sess.run(resources.initialize_resources(resources.shared_resources()))
+      self.run_op_benchmark(
+          sess, probs,
+          name='%s_%dtree' % ('flat' if flat else 'per_tree', num_trees))
+
+  def benchmarkPerTree10Trees(self):
+    self._benchmark(10, flat=False)
+
+  def benchmarkFlat10Trees(self):
+    self._benchmark(10, flat=True)
+
+  def benchmarkPerTree100Trees(self):
+    self._benchmark(100, flat=False)
+
+  def benchmarkFlat100Trees(self):
+    self._benchmark(100, flat=True)
+
+  def benchmarkPerTree500Trees(self):
+    self._benchmark(500, flat=False)
+
+  def benchmarkFlat500Trees(self):
+    self._benchmark(500, flat=True)
+
+
 if __name__ == "__main__":
   googletest.main()
@@ -195,14 +195,30 @@ def _internal_input_layer(features,
     builder = _LazyBuilder(features)
     output_tensors = []
     ordered_columns = []
+    shared_embedding_groups = _shared_embedding_column_groups(feature_columns)
+    shared_embedding_tensors = {}
     for column in sorted(feature_columns, key=lambda x: x.name):
       ordered_columns.append(column)
       with variable_scope.variable_scope(
           None, default_name=column._var_scope_name):  # pylint: disable=protected-access
-        tensor = column._get_dense_tensor(  # pylint: disable=protected-access
-            builder,
-            weight_collections=weight_collections,
-            trainable=trainable)
+        if column in shared_embedding_groups:
+          # The first column of a group looks up the whole group, and creates
+          # the shared variable in its scope, as it would on its own.
+          if column not in shared_embedding_tensors:
+            columns = shared_embedding_groups[column]
+            shared_embedding_tensors.update(
+                zip(columns,
+                    _get_shared_embedding_dense_tensors(
+                        columns,
+                        builder,
+                        weight_collections=weight_collections,
+                        trainable=trainable)))
+          tensor = shared_embedding_tensors[column]
+        else:
+          tensor = column._get_dense_tensor(  # pylint: disable=protected-access
+              builder,
+              weight_collections=weight_collections,
+              trainable=trainable)
         num_elements = column._variable_shape.num_elements()  # pylint: disable=protected-access
         batch_size = array_ops.shape(tensor)[0]
         output_tensor = array_ops.reshape(
@@ -2722,45 +2738,8 @@ class _SharedEmbeddingColumn(
       sparse_ids = sparse_tensors.id_tensor
       sparse_weights = sparse_tensors.weight_tensor
 
-      embedding_shape = (self.categorical_column._num_buckets, self.dimension)  # pylint: disable=protected-access
-      shared_embedding_collection = ops.get_collection(
-          self.shared_embedding_collection_name)
-      if shared_embedding_collection:
-        if len(shared_embedding_collection) > 1:
-          raise ValueError(
-              'Collection {} can only contain one variable. '
-              'Suggested fix A: Choose a unique name for this collection. '
-              'Suggested fix B: Do not add any variables to this collection. '
-              'The feature_column library already adds a variable under the '
-              'hood.'.format(shared_embedding_collection))
-        embedding_weights = shared_embedding_collection[0]
-        if embedding_weights.get_shape() != embedding_shape:
-          raise ValueError(
-              'Shared embedding collection {} contains variable {} of '
-              'unexpected shape {}. Expected shape is {}. '
-              'Suggested fix A: Choose a unique name for this collection. '
-              'Suggested fix B: Do not add any variables to this collection. '
-              'The feature_column library already adds a variable under the '
-              'hood.'.format(self.shared_embedding_collection_name,
-                             embedding_weights.name,
-                             embedding_weights.get_shape(), embedding_shape))
-      else:
-        embedding_weights = variable_scope.get_variable(
-            name='embedding_weights',
-            shape=embedding_shape,
-            dtype=dtypes.float32,
-            initializer=self.initializer,
-            trainable=self.trainable and trainable,
-            collections=weight_collections)
-        ops.add_to_collection(self.shared_embedding_collection_name,
-                              embedding_weights)
-      if self.ckpt_to_load_from is not None:
-        to_restore = embedding_weights
-        if isinstance(to_restore, variables.PartitionedVariable):
-          to_restore = to_restore._get_variable_list()  # pylint: disable=protected-access
-        checkpoint_utils.init_from_checkpoint(self.ckpt_to_load_from, {
-            self.tensor_name_in_ckpt: to_restore
-        })
+      embedding_weights = self._get_embedding_weights(
+          weight_collections=weight_collections, trainable=trainable)
 
       # Return embedding lookup result.
       return embedding_ops.safe_embedding_lookup_sparse(
@@ -2771,6 +2750,49 @@ class _SharedEmbeddingColumn(
           name='%s_weights' % self.name,
           max_norm=self.max_norm)
 
+  def _get_embedding_weights(self, weight_collections=None, trainable=None):
+    """Returns the embedding variable, creating it for the first column."""
+    embedding_shape = (self.categorical_column._num_buckets, self.dimension)  # pylint: disable=protected-access
+    shared_embedding_collection = ops.get_collection(
+        self.shared_embedding_collection_name)
+    if shared_embedding_collection:
+      if len(shared_embedding_collection) > 1:
+        raise ValueError(
+            'Collection {} can only contain one variable. '
+            'Suggested fix A: Choose a unique name for this collection. '
+            'Suggested fix B: Do not add any variables to this collection. '
+            'The feature_column library already adds a variable under the '
+            'hood.'.format(shared_embedding_collection))
+      embedding_weights = shared_embedding_collection[0]
+      if embedding_weights.get_shape() != embedding_shape:
+        raise ValueError(
+            'Shared embedding collection {} contains variable {} of '
+            'unexpected shape {}. Expected shape is {}. '
+            'Suggested fix A: Choose a unique name for this collection. '
+            'Suggested fix B: Do not add any variables to this collection. '
+            'The feature_column library already adds a variable under the '
+            'hood.'.format(self.shared_embedding_collection_name,
+                           embedding_weights.name,
+                           embedding_weights.get_shape(), embedding_shape))
+    else:
+      embedding_weights = variable_scope.get_variable(
+          name='embedding_weights',
+          shape=embedding_shape,
+          dtype=dtypes.float32,
+          initializer=self.initializer,
+          trainable=self.trainable and trainable,
+          collections=weight_collections)
+      ops.add_to_collection(self.shared_embedding_collection_name,
+                            embedding_weights)
+    if self.ckpt_to_load_from is not None:
+      to_restore = embedding_weights
+      if isinstance(to_restore, variables.PartitionedVariable):
+        to_restore = to_restore._get_variable_list()  # pylint: disable=protected-access
+      checkpoint_utils.init_from_checkpoint(self.ckpt_to_load_from, {
+          self.tensor_name_in_ckpt: to_restore
+      })
+    return embedding_weights
+
   def _get_dense_tensor(self, inputs, weight_collections=None, trainable=None):
     if isinstance(self.categorical_column, _SequenceCategoricalColumn):
       raise ValueError(
@@ -2810,6 +2832,72 @@ class _SharedEmbeddingColumn(
         dense_tensor=dense_tensor, sequence_length=sequence_length)
 
 
+def _shared_embedding_column_groups(feature_columns):
+  """Groups the `_SharedEmbeddingColumn`s that can be looked up together.
+
+  Args:
+    feature_columns: An iterable of `_DenseColumn`s.
+
+  Returns:
+    A dict from each `_SharedEmbeddingColumn` that shares its embedding table,
+    combiner and `max_norm` with at least one other column to the list of all
+    such columns, sorted by name.
+  """
+  groups = collections.OrderedDict()
+  for column in sorted(feature_columns, key=lambda x: x.name):
+    if (isinstance(column, _SharedEmbeddingColumn) and
+        not isinstance(column.categorical_column, _SequenceCategoricalColumn)):
+      key = (column.shared_embedding_collection_name, column.combiner,
+             column.max_norm, column.ckpt_to_load_from,
+             column.tensor_name_in_ckpt)
+      groups.setdefault(key, []).append(column)
+  return {
+      column: columns
+      for columns in groups.values() if len(columns) > 1
+      for column in columns
+  }
+
+
+def _get_shared_embedding_dense_tensors(columns,
+                                        inputs,
+                                        weight_collections=None,
+                                        trainable=None):
+  """Returns the embeddings of `_SharedEmbeddingColumn`s sharing a table.
+
+  All columns are looked up with a single
+  `embedding_ops.safe_embedding_lookup_sparse_multi`, which looks up the ids
+  found in several columns once, instead of with one lookup per column.
+
+  Args:
+    columns: A list of `_SharedEmbeddingColumn`s with the same embedding table,
+      combiner and `max_norm`, as grouped by `_shared_embedding_column_groups`.
+    inputs: A `_LazyBuilder` as used by `_get_dense_tensor`.
+    weight_collections: List of graph collections to which the embedding
+      variable is added, if it is created.
+    trainable: If `True` the embedding variable is trainable.
+
+  Returns:
+    A list with the dense `Tensor` of each column, as returned by its
+    `_get_dense_tensor`.
+  """
+  sparse_ids_list = []
+  sparse_weights_list = []
+  for column in columns:
+    sparse_tensors = column.categorical_column._get_sparse_tensors(  # pylint: disable=protected-access
+        inputs, weight_collections=weight_collections, trainable=trainable)
+    sparse_ids_list.append(sparse_tensors.id_tensor)
+    sparse_weights_list.append(sparse_tensors.weight_tensor)
+  embedding_weights = columns[0]._get_embedding_weights(  # pylint: disable=protected-access
+      weight_collections=weight_collections, trainable=trainable)
+  return embedding_ops.safe_embedding_lookup_sparse_multi(
+      embedding_weights=embedding_weights,
+      sparse_ids_list=sparse_ids_list,
+      sparse_weights_list=sparse_weights_list,
+      combiner=columns[0].combiner,
+      name='%s_weights' % columns[0].shared_embedding_collection_name,
+      max_norm=columns[0].max_norm)
+
+
 def _create_tuple(shape, value):
   """Returns a tuple with given shape and filled with value."""
   if shape:
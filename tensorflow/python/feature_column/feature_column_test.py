@@ -5963,6 +5963,12 @@ class SharedEmbeddingColumnTest(test.TestCase):
         features={'aaa': sparse_input_a, 'bbb': sparse_input_b},
         feature_columns=(embedding_column_b, embedding_column_a))
 
+    # Both columns are looked up together, deduplicating their ids once.
+    self.assertEqual(1, len([
+        op for op in ops.get_default_graph().get_operations()
+        if op.type == 'Unique'
+    ]))
+
     # Assert expected embedding variable and lookups.
     global_vars = ops.get_collection(ops.GraphKeys.GLOBAL_VARIABLES)
     self.assertItemsEqual(
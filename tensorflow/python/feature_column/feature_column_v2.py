@@ -399,13 +399,27 @@ class DenseFeatures(Layer):
       raise ValueError('We expected a dictionary here. Instead we got: ',
                        features)
     transformation_cache = FeatureTransformationCache(features)
+    transformation_cache.transform_shared_lookups(self._feature_columns,
+                                                  self._state_manager)
+    shared_embedding_groups = _shared_embedding_column_groups(
+        self._feature_columns)
+    shared_embedding_tensors = {}
     output_tensors = []
     ordered_columns = []
     for column in self._feature_columns:
       with ops.name_scope(column.name):
         ordered_columns.append(column)
-        tensor = column.get_dense_tensor(transformation_cache,
-                                         self._state_manager)
+        if column in shared_embedding_groups:
+          if column not in shared_embedding_tensors:
+            columns = shared_embedding_groups[column]
+            shared_embedding_tensors.update(
+                zip(columns,
+                    _get_shared_embedding_dense_tensors(
+                        columns, transformation_cache, self._state_manager)))
+          tensor = shared_embedding_tensors[column]
+        else:
+          tensor = column.get_dense_tensor(transformation_cache,
+                                           self._state_manager)
         num_elements = column.variable_shape.num_elements()
         batch_size = array_ops.shape(tensor)[0]
         tensor = array_ops.reshape(tensor, shape=(batch_size, num_elements))
@@ -495,6 +509,8 @@ class _LinearModelLayer(Layer):
                        .format(features))
     with ops.name_scope(self.name):
       transformation_cache = FeatureTransformationCache(features)
+      transformation_cache.transform_shared_lookups(self._feature_columns,
+                                                    self._state_manager)
       weighted_sums = []
       for column in self._feature_columns:
         with ops.name_scope(column.name):
@@ -2213,6 +2229,49 @@ class FeatureTransformationCache(object):
     """
     self._features = features.copy()
     self._feature_tensors = {}
+    self._fingerprints = {}
+
+  def transform_shared_lookups(self, feature_columns, state_manager):
+    """Transforms categorical columns that share a lookup in batches.
+
+    Categorical columns with the same vocabulary (or hash bucket) configuration
+    map equal values to equal ids, but transforming them one by one creates a
+    lookup table and a lookup op per column. This finds such columns among
+    `feature_columns` and their parents, and transforms each group with a
+    single table and a single lookup over the concatenated input values. The
+    per-column results are then cached like any other transformation.
+
+    Args:
+      feature_columns: An iterable of `FeatureColumn`s about to be transformed
+        with this cache.
+      state_manager: A StateManager object that holds the FeatureColumn state.
+    """
+    groups = collections.OrderedDict()
+    for column in _collect_shared_lookup_columns(feature_columns):
+      if column not in self._feature_tensors:
+        groups.setdefault(column._shared_lookup_key, []).append(column)  # pylint: disable=protected-access
+
+    for columns in groups.values():
+      if len(columns) < 2:
+        continue
+      input_tensors = []
+      for column in columns:
+        input_tensor = _to_sparse_input_and_drop_ignore_values(
+            self.get(column.key, state_manager))
+        input_tensors.append(column._prepare_input_tensor(input_tensor))  # pylint: disable=protected-access
+      values = [input_tensor.values for input_tensor in input_tensors]
+      if len(set(value.dtype for value in values)) > 1:
+        values = [math_ops.to_int64(value) for value in values]
+      ids = columns[0]._lookup_values(  # pylint: disable=protected-access
+          array_ops.concat(values, 0),
+          name='{}_shared_lookup'.format(columns[0].key))
+      split_ids = array_ops.split(
+          ids, array_ops.stack([array_ops.size(value) for value in values]),
+          num=len(columns))
+      for column, input_tensor, column_ids in zip(columns, input_tensors,
+                                                  split_ids):
+        self._feature_tensors[column] = sparse_tensor_lib.SparseTensor(
+            input_tensor.indices, column_ids, input_tensor.dense_shape)
 
   def get(self, key, state_manager):
     """Returns a `Tensor` for the given key.
@@ -2257,6 +2316,36 @@ class FeatureTransformationCache(object):
     self._feature_tensors[column] = transformed
     return transformed
 
+  def get_fingerprints(self, key, state_manager):
+    """Returns the base feature `key` with its strings replaced by fingerprints.
+
+    `sparse_cross_hashed` hashes string values with Fingerprint64 but uses
+    integer values as they are, so a string feature and its int64 fingerprints
+    produce the same hashed crosses. The fingerprints are cached, so all the
+    crosses of a base feature share a single hashing pass instead of each
+    re-hashing the feature for every combination it takes part in.
+
+    Args:
+      key: A `str` key of a base feature.
+      state_manager: A StateManager object that holds the FeatureColumn state.
+
+    Returns:
+      The `Tensor` or `SparseTensor` returned by `get(key)`, with string
+      values replaced by their int64 fingerprints.
+    """
+    if key in self._fingerprints:
+      return self._fingerprints[key]
+    feature_tensor = self.get(key, state_manager)
+    if feature_tensor.dtype == dtypes.string:
+      if isinstance(feature_tensor, sparse_tensor_lib.SparseTensor):
+        feature_tensor = sparse_tensor_lib.SparseTensor(
+            feature_tensor.indices, _fingerprint64(feature_tensor.values),
+            feature_tensor.dense_shape)
+      else:
+        feature_tensor = _fingerprint64(feature_tensor)
+    self._fingerprints[key] = feature_tensor
+    return feature_tensor
+
   def _get_raw_feature_as_tensor(self, key):
     """Gets the raw_feature (keyed by `key`) as `tensor`.
 
@@ -2307,6 +2396,63 @@ class FeatureTransformationCache(object):
           lambda: feature_tensor)
 
 
+# `string_to_hash_bucket_fast` returns Fingerprint64 modulo `num_buckets`.
+_FINGERPRINT_MODULUS = 2**63 - 1
+
+
+def _fingerprint64(values):
+  """Returns the Fingerprint64 of a string `Tensor`, as int64 values.
+
+  Fingerprint64 is recovered from its residues modulo `2**63 - 1` and 3: it is
+  `low + k * (2**63 - 1)` with `low` its first residue and `k` in {0, 1, 2},
+  and since `2**63 - 1 = 1 (mod 3)`, `k = fingerprint - low (mod 3)`. The
+  result wraps to negative values like the `uint64` to `int64` conversion
+  done by `sparse_cross_hashed`.
+
+  Args:
+    values: A string `Tensor`.
+  """
+  low = string_ops.string_to_hash_bucket_fast(values, _FINGERPRINT_MODULUS)
+  k = math_ops.floormod(
+      string_ops.string_to_hash_bucket_fast(values, 3) -
+      math_ops.floormod(low, 3), 3)
+  # With k == 1 the fingerprint only fits into int64 when low == 0. The
+  # maximum keeps the unused branch from overflowing.
+  high = array_ops.where(
+      math_ops.equal(low, 0),
+      array_ops.ones_like(low) * _FINGERPRINT_MODULUS,
+      math_ops.maximum(low, 1) - _FINGERPRINT_MODULUS - 2)
+  return array_ops.where(
+      math_ops.equal(k, 0), low,
+      array_ops.where(math_ops.equal(k, 1), high, low - 2))
+
+
+def _collect_shared_lookup_columns(feature_columns):
+  """Returns the columns in `feature_columns` and parents sharing lookups.
+
+  These are the `feature_columns` and their (transitive) `FeatureColumn`
+  parents that define a `_shared_lookup_key`, without duplicates and in
+  depth-first order.
+
+  Args:
+    feature_columns: An iterable of `FeatureColumn`s.
+  """
+  columns = []
+  visited = set()
+  stack = list(reversed(list(feature_columns)))
+  while stack:
+    column = stack.pop()
+    if not isinstance(column, FeatureColumn) or column in visited:
+      continue
+    visited.add(column)
+    if isinstance(column, (HashedCategoricalColumn,
+                           VocabularyFileCategoricalColumn,
+                           VocabularyListCategoricalColumn)):
+      columns.append(column)
+    stack.extend(reversed(column.parents))
+  return columns
+
+
 # TODO(ptucker): Move to third_party/tensorflow/python/ops/sparse_ops.py
 def _to_sparse_input_and_drop_ignore_values(input_tensor, ignore_value=None):
   """Converts a `Tensor` to a `SparseTensor`, dropping ignore_value cells.
@@ -2917,6 +3063,68 @@ def _raise_shared_embedding_column_error():
                    '`DenseFeatures` or `LinearModel` instead.')
 
 
+def _shared_embedding_column_groups(feature_columns):
+  """Groups the `SharedEmbeddingColumn`s that can be looked up together.
+
+  Args:
+    feature_columns: An iterable of `DenseColumn`s.
+
+  Returns:
+    A dict from each `SharedEmbeddingColumn` that shares its embedding table,
+    combiner and `max_norm` with at least one other column to the list of all
+    such columns, in the order of `feature_columns`.
+  """
+  groups = collections.OrderedDict()
+  for column in feature_columns:
+    if (isinstance(column, SharedEmbeddingColumn) and
+        not isinstance(column.categorical_column, SequenceCategoricalColumn)):
+      key = (id(column.shared_embedding_column_creator), column.combiner,
+             column.max_norm)
+      groups.setdefault(key, []).append(column)
+  return {
+      column: columns
+      for columns in groups.values() if len(columns) > 1
+      for column in columns
+  }
+
+
+def _get_shared_embedding_dense_tensors(columns, transformation_cache,
+                                        state_manager):
+  """Returns the embeddings of `SharedEmbeddingColumn`s sharing a table.
+
+  All columns are looked up with a single
+  `embedding_ops.safe_embedding_lookup_sparse_multi`, which looks up the ids
+  found in several columns once, instead of with one lookup per column.
+
+  Args:
+    columns: A list of `SharedEmbeddingColumn`s with the same embedding table,
+      combiner and `max_norm`, as grouped by `_shared_embedding_column_groups`.
+    transformation_cache: A `FeatureTransformationCache` object to access
+      features.
+    state_manager: A `StateManager` to create / access resources such as
+      lookup tables.
+
+  Returns:
+    A list with the dense `Tensor` of each column, as returned by its
+    `get_dense_tensor`.
+  """
+  sparse_ids_list = []
+  sparse_weights_list = []
+  for column in columns:
+    sparse_tensors = column.categorical_column.get_sparse_tensors(
+        transformation_cache, state_manager)
+    sparse_ids_list.append(sparse_tensors.id_tensor)
+    sparse_weights_list.append(sparse_tensors.weight_tensor)
+  return embedding_ops.safe_embedding_lookup_sparse_multi(
+      embedding_weights=(
+          columns[0].shared_embedding_column_creator.embedding_weights),
+      sparse_ids_list=sparse_ids_list,
+      sparse_weights_list=sparse_weights_list,
+      combiner=columns[0].combiner,
+      name='%s_weights' % columns[0].name,
+      max_norm=columns[0].max_norm)
+
+
 class SharedEmbeddingColumnCreator(tracking.Checkpointable):
 
   def __init__(self,
@@ -3223,8 +3431,13 @@ class HashedCategoricalColumn(
   def _parse_example_spec(self):
     return self.parse_example_spec
 
-  def _transform_input_tensor(self, input_tensor):
-    """Hashes the values in the feature_column."""
+  @property
+  def _shared_lookup_key(self):
+    """Columns with equal keys map equal values to equal ids."""
+    return ('hash_bucket', self.hash_bucket_size, self.dtype == dtypes.string)
+
+  def _prepare_input_tensor(self, input_tensor):
+    """Validates the input of `_lookup_values`."""
     if not isinstance(input_tensor, sparse_tensor_lib.SparseTensor):
       raise ValueError('SparseColumn input must be a SparseTensor.')
 
@@ -3237,14 +3450,19 @@ class HashedCategoricalColumn(
           'Column dtype and SparseTensors dtype must be compatible. '
           'key: {}, column dtype: {}, tensor dtype: {}'.format(
               self.key, self.dtype, input_tensor.dtype))
+    return input_tensor
 
-    if self.dtype == dtypes.string:
-      sparse_values = input_tensor.values
-    else:
-      sparse_values = string_ops.as_string(input_tensor.values)
+  def _lookup_values(self, values, name):
+    """Hashes a `Tensor` of prepared input values to ids."""
+    if self.dtype != dtypes.string:
+      values = string_ops.as_string(values)
+    return string_ops.string_to_hash_bucket_fast(
+        values, self.hash_bucket_size, name=name)
 
-    sparse_id_values = string_ops.string_to_hash_bucket_fast(
-        sparse_values, self.hash_bucket_size, name='lookup')
+  def _transform_input_tensor(self, input_tensor):
+    """Hashes the values in the feature_column."""
+    input_tensor = self._prepare_input_tensor(input_tensor)
+    sparse_id_values = self._lookup_values(input_tensor.values, name='lookup')
     return sparse_tensor_lib.SparseTensor(
         input_tensor.indices, sparse_id_values, input_tensor.dense_shape)
 
@@ -3332,8 +3550,14 @@ class VocabularyFileCategoricalColumn(
   def _parse_example_spec(self):
     return self.parse_example_spec
 
-  def _transform_input_tensor(self, input_tensor):
-    """Creates a lookup table for the vocabulary."""
+  @property
+  def _shared_lookup_key(self):
+    """Columns with equal keys map equal values to equal ids."""
+    return ('vocabulary_file', self.vocabulary_file, self.vocabulary_size,
+            self.num_oov_buckets, self.default_value, self.dtype.is_integer)
+
+  def _prepare_input_tensor(self, input_tensor):
+    """Validates the input of `_lookup_values` and casts it to the key type."""
     if self.dtype.is_integer != input_tensor.dtype.is_integer:
       raise ValueError(
           'Column dtype and SparseTensors dtype must be compatible. '
@@ -3344,12 +3568,14 @@ class VocabularyFileCategoricalColumn(
         input_tensor.dtype,
         prefix='column_name: {} input_tensor'.format(self.key))
 
-    key_dtype = self.dtype
     if input_tensor.dtype.is_integer:
       # `index_table_from_file` requires 64-bit integer keys.
-      key_dtype = dtypes.int64
       input_tensor = math_ops.to_int64(input_tensor)
+    return input_tensor
 
+  def _lookup_values(self, values, name):
+    """Creates a lookup table for the vocabulary and looks up `values`."""
+    key_dtype = dtypes.int64 if self.dtype.is_integer else self.dtype
     # TODO(rohanj): Use state manager to manage the index table creation.
     return lookup_ops.index_table_from_file(
         vocabulary_file=self.vocabulary_file,
@@ -3357,7 +3583,13 @@ class VocabularyFileCategoricalColumn(
         vocab_size=self.vocabulary_size,
         default_value=self.default_value,
         key_dtype=key_dtype,
-        name='{}_lookup'.format(self.key)).lookup(input_tensor)
+        name=name).lookup(values)
+
+  def _transform_input_tensor(self, input_tensor):
+    """Creates a lookup table for the vocabulary."""
+    return self._lookup_values(
+        self._prepare_input_tensor(input_tensor),
+        name='{}_lookup'.format(self.key))
 
   def transform_feature(self, transformation_cache, state_manager):
     """Creates a lookup table for the vocabulary."""
@@ -3444,8 +3676,14 @@ class VocabularyListCategoricalColumn(
   def _parse_example_spec(self):
     return self.parse_example_spec
 
-  def _transform_input_tensor(self, input_tensor):
-    """Creates a lookup table for the vocabulary list."""
+  @property
+  def _shared_lookup_key(self):
+    """Columns with equal keys map equal values to equal ids."""
+    return ('vocabulary_list', tuple(self.vocabulary_list),
+            self.num_oov_buckets, self.default_value, self.dtype.is_integer)
+
+  def _prepare_input_tensor(self, input_tensor):
+    """Validates the input of `_lookup_values` and casts it to the key type."""
     if self.dtype.is_integer != input_tensor.dtype.is_integer:
       raise ValueError(
           'Column dtype and SparseTensors dtype must be compatible. '
@@ -3456,19 +3694,27 @@ class VocabularyListCategoricalColumn(
         input_tensor.dtype,
         prefix='column_name: {} input_tensor'.format(self.key))
 
-    key_dtype = self.dtype
     if input_tensor.dtype.is_integer:
       # `index_table_from_tensor` requires 64-bit integer keys.
-      key_dtype = dtypes.int64
       input_tensor = math_ops.to_int64(input_tensor)
+    return input_tensor
 
+  def _lookup_values(self, values, name):
+    """Creates a lookup table for the vocabulary list and looks up `values`."""
+    key_dtype = dtypes.int64 if self.dtype.is_integer else self.dtype
     # TODO(rohanj): Use state manager to manage the index table creation.
     return lookup_ops.index_table_from_tensor(
         vocabulary_list=tuple(self.vocabulary_list),
         default_value=self.default_value,
         num_oov_buckets=self.num_oov_buckets,
         dtype=key_dtype,
-        name='{}_lookup'.format(self.key)).lookup(input_tensor)
+        name=name).lookup(values)
+
+  def _transform_input_tensor(self, input_tensor):
+    """Creates a lookup table for the vocabulary list."""
+    return self._lookup_values(
+        self._prepare_input_tensor(input_tensor),
+        name='{}_lookup'.format(self.key))
 
   def transform_feature(self, transformation_cache, state_manager):
     """Creates a lookup table for the vocabulary list."""
@@ -3816,7 +4062,8 @@ class CrossedColumn(
     feature_tensors = []
     for key in _collect_leaf_level_keys(self):
       if isinstance(key, six.string_types):
-        feature_tensors.append(transformation_cache.get(key, state_manager))
+        feature_tensors.append(
+            transformation_cache.get_fingerprints(key, state_manager))
       elif isinstance(key, (fc_old._CategoricalColumn, CategoricalColumn)):  # pylint: disable=protected-access
         ids_and_weights = key.get_sparse_tensors(transformation_cache,
                                                  state_manager)
@@ -0,0 +1,95 @@
+# Copyright 2018 The TensorFlow Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Benchmark for feature columns of models with many crosses."""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import itertools
+
+import numpy as np
+
+from tensorflow.python.client import session
+from tensorflow.python.feature_column import feature_column_v2 as fc
+from tensorflow.python.framework import ops
+from tensorflow.python.framework import sparse_tensor
+from tensorflow.python.ops import control_flow_ops
+from tensorflow.python.ops import sparse_ops
+from tensorflow.python.platform import test
+
+
+class CrossedColumnBenchmark(test.Benchmark):
+  """Compares crosses of shared base features with per-cross hashing."""
+
+  BATCH_SIZE = 1024
+  VALUES_PER_ROW = 4
+  HASH_BUCKET_SIZE = 1000000
+
+  def _features(self, num_base_features):
+    rng = np.random.RandomState(0)
+    indices = np.array(
+        [[row, col] for row in range(self.BATCH_SIZE)
+         for col in range(self.VALUES_PER_ROW)], dtype=np.int64)
+    dense_shape = [self.BATCH_SIZE, self.VALUES_PER_ROW]
+    features = {}
+    for i in range(num_base_features):
+      values = np.array([
+          'feature_%d_value_%d' % (i, value)
+          for value in rng.randint(100000, size=len(indices))
+      ])
+      features['f%d' % i] = sparse_tensor.SparseTensor(
+          indices, values, dense_shape)
+    return features
+
+  def _run(self, num_base_features, cross_size, shared):
+    keys = ['f%d' % i for i in range(num_base_features)]
+    crossed_keys = list(itertools.combinations(keys, cross_size))
+    name = 'crosses_%d_of_%d_features_%s' % (
+        len(crossed_keys), num_base_features,
+        'shared_fingerprints' if shared else 'per_cross_hashing')
+    with ops.Graph().as_default() as g:
+      features = self._features(num_base_features)
+      num_ops_before = len(g.get_operations())
+      if shared:
+        columns = [
+            fc.crossed_column_v2(list(cross), self.HASH_BUCKET_SIZE)
+            for cross in crossed_keys
+        ]
+        outputs = fc._transform_features(features, columns, None).values()  # pylint: disable=protected-access
+      else:
+        outputs = [
+            sparse_ops.sparse_cross_hashed(
+                [features[key] for key in cross],
+                num_buckets=self.HASH_BUCKET_SIZE) for cross in crossed_keys
+        ]
+      num_cross_ops = len(g.get_operations()) - num_ops_before
+      with session.Session() as sess:
+        self.run_op_benchmark(
+            sess,
+            control_flow_ops.group(*[output.values for output in outputs]),
+            burn_iters=3,
+            min_iters=20,
+            name=name,
+            extras={'num_cross_ops': num_cross_ops})
+
+  def benchmark_crosses(self):
+    for num_base_features, cross_size in [(8, 2), (12, 2), (8, 3)]:
+      for shared in [False, True]:
+        self._run(num_base_features, cross_size, shared)
+
+
+if __name__ == '__main__':
+  test.main()
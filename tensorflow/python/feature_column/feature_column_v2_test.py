@@ -44,6 +44,7 @@ from tensorflow.python.ops import array_ops
 from tensorflow.python.ops import lookup_ops
 from tensorflow.python.ops import parsing_ops
 from tensorflow.python.ops import partitioned_variables
+from tensorflow.python.ops import sparse_ops
 from tensorflow.python.ops import variable_scope
 from tensorflow.python.ops import variables as variables_lib
 from tensorflow.python.platform import test
@@ -1255,6 +1256,48 @@ class CrossedColumnTest(test.TestCase):
         self.assertAllEqual(expected_values, id_tensor_eval.values)
         self.assertAllEqual((2, 4), id_tensor_eval.dense_shape)
 
+  def test_crosses_share_fingerprints(self):
+    crossed1 = fc.crossed_column_v2(['c', 'd'], 10)
+    crossed2 = fc.crossed_column_v2(['c', 'e'], 20, hash_key=5)
+    with ops.Graph().as_default() as g:
+      features = {
+          'c':
+              sparse_tensor.SparseTensor(
+                  indices=((0, 0), (1, 0), (1, 1)),
+                  values=['cA', 'cB', 'cC'],
+                  dense_shape=(2, 2)),
+          'd':
+              constant_op.constant([['dA'], ['dB']]),
+          'e':
+              sparse_tensor.SparseTensor(
+                  indices=((0, 0), (1, 0)),
+                  values=constant_op.constant([3, -5], dtypes.int64),
+                  dense_shape=(2, 1)),
+      }
+      transformation_cache = fc.FeatureTransformationCache(features)
+      id_tensors = [
+          crossed.get_sparse_tensors(transformation_cache, None).id_tensor
+          for crossed in (crossed1, crossed2)
+      ]
+      # 'c' is fingerprinted once for both crosses, 'e' is not a string.
+      self.assertEqual(4, len([
+          op for op in g.get_operations()
+          if op.type == 'StringToHashBucketFast'
+      ]))
+      expected_id_tensors = [
+          sparse_ops.sparse_cross_hashed(
+              [features['c'], features['d']], num_buckets=10),
+          sparse_ops.sparse_cross_hashed(
+              [features['c'], features['e']], num_buckets=20, hash_key=5),
+      ]
+      with _initialized_session() as sess:
+        for id_tensor, expected_id_tensor in zip(
+            *sess.run([id_tensors, expected_id_tensors])):
+          self.assertAllEqual(expected_id_tensor.indices, id_tensor.indices)
+          self.assertAllEqual(expected_id_tensor.values, id_tensor.values)
+          self.assertAllEqual(expected_id_tensor.dense_shape,
+                              id_tensor.dense_shape)
+
   def test_linear_model(self):
     """Tests linear_model.
 
@@ -1617,6 +1660,34 @@ class LinearModelTest(test.TestCase):
         sess.run(bias.assign([5.]))
         self.assertAllClose([[1005.], [10015.]], predictions.eval())
 
+  def test_shared_hash_bucket_lookup(self):
+    wire_cast = fc.categorical_column_with_hash_bucket_v2('wire_cast', 4)
+    wire_cast_2 = fc.categorical_column_with_hash_bucket_v2('wire_cast_2', 4)
+    with ops.Graph().as_default() as g:
+      features = {
+          'wire_cast': sparse_tensor.SparseTensor(
+              values=['omar', 'stringer', 'marlo'],  # hashed to = [2, 0, 3]
+              indices=[[0, 0], [1, 0], [1, 1]],
+              dense_shape=[2, 2]),
+          'wire_cast_2': sparse_tensor.SparseTensor(
+              values=['marlo'],  # hashed to = [3]
+              indices=[[0, 0]],
+              dense_shape=[2, 1]),
+      }
+      model = fc.LinearModel([wire_cast, wire_cast_2])
+      predictions = model(features)
+      # Both columns are hashed by a single op.
+      self.assertEqual(1, len([
+          op for op in g.get_operations()
+          if op.type == 'StringToHashBucketFast'
+      ]))
+      wire_cast_var, wire_cast_2_var, bias = model.variables
+      with _initialized_session() as sess:
+        sess.run(wire_cast_var.assign([[10.], [100.], [1000.], [10000.]]))
+        sess.run(wire_cast_2_var.assign([[1.], [2.], [3.], [4.]]))
+        sess.run(bias.assign([5.]))
+        self.assertAllClose([[1009.], [10015.]], predictions.eval())
+
   def test_dense_and_sparse_bias(self):
     wire_cast = fc.categorical_column_with_hash_bucket_v2('wire_cast', 4)
     price = fc.numeric_column_v2('price')
@@ -3659,6 +3730,45 @@ class DenseFeaturesTest(test.TestCase):
       with self.assertRaisesOpError('Feature .* cannot have rank 0'):
         sess.run(net, feed_dict={features['price']: np.array(1)})
 
+  def test_shared_vocabulary_lookup(self):
+    vocabulary_list = ['hardtop', 'wagon', 'sedan']
+    body_style = fc.categorical_column_with_vocabulary_list_v2(
+        'body-style', vocabulary_list=vocabulary_list)
+    trailer_style = fc.categorical_column_with_vocabulary_list_v2(
+        'trailer-style', vocabulary_list=vocabulary_list)
+    country = fc.categorical_column_with_vocabulary_list_v2(
+        'country', vocabulary_list=['US', 'JP', 'CA'])
+    with ops.Graph().as_default() as g:
+      features = {
+          'body-style': sparse_tensor.SparseTensor(
+              indices=((0, 0), (1, 0)),
+              values=('sedan', 'hardtop'),
+              dense_shape=(2, 1)),
+          'trailer-style': sparse_tensor.SparseTensor(
+              indices=((0, 0), (1, 0), (1, 1)),
+              values=('wagon', 'sedan', 'hardtop'),
+              dense_shape=(2, 2)),
+          'country': sparse_tensor.SparseTensor(
+              indices=((0, 0), (1, 0)),
+              values=('CA', 'US'),
+              dense_shape=(2, 1)),
+      }
+      net = fc.DenseFeatures([
+          fc.indicator_column_v2(body_style),
+          fc.indicator_column_v2(trailer_style),
+          fc.indicator_column_v2(country)
+      ])(features)
+      # The two columns with the same vocabulary share a table.
+      self.assertEqual(2, len([
+          op for op in g.get_operations() if op.type == 'HashTableV2'
+      ]))
+      with _initialized_session() as sess:
+        # Columns are ordered by name: body-style, country, trailer-style.
+        self.assertAllEqual(
+            [[0., 0., 1., 0., 0., 1., 0., 1., 0.],
+             [1., 0., 0., 1., 0., 0., 1., 0., 1.]],
+            sess.run(net))
+
 
 class InputLayerTest(test.TestCase):
 
@@ -0,0 +1,104 @@
+# Copyright 2018 The TensorFlow Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Benchmark for the construction of large graphs."""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import time
+
+from tensorflow.core.framework import attr_value_pb2
+from tensorflow.python.framework import dtypes
+from tensorflow.python.framework import ops
+from tensorflow.python.ops import array_ops
+from tensorflow.python.ops import math_ops
+from tensorflow.python.ops import nn_ops
+from tensorflow.python.platform import test
+
+
+class GraphConstructionBenchmark(test.Benchmark):
+  """Measures the number of ops created per second when building graphs."""
+
+  NUM_OPS = 100000
+  WIDTH = 64
+
+  def _report(self, name, build_fn):
+    with ops.Graph().as_default() as g:
+      start_time = time.time()
+      with ops.op_creation_stats(g) as stats:
+        build_fn(g)
+      wall_time = time.time() - start_time
+    num_ops = len(g.get_operations())
+    extras = {"ops_per_second": num_ops / wall_time, "num_ops": num_ops}
+    for phase, seconds in stats.phase_seconds.items():
+      extras["%s_seconds" % phase] = seconds
+    print(name)
+    print(stats)
+    self.report_benchmark(
+        name=name, iters=1, wall_time=wall_time, extras=extras)
+
+  def _build_mlp(self, g):
+    """Builds dense layers of MatMul, BiasAdd and Relu ops."""
+    del g
+    x = array_ops.placeholder(dtypes.float32, [None, self.WIDTH])
+    w = array_ops.placeholder(dtypes.float32, [self.WIDTH, self.WIDTH])
+    b = array_ops.placeholder(dtypes.float32, [self.WIDTH])
+    for _ in range(self.NUM_OPS // 3):
+      x = nn_ops.relu(nn_ops.bias_add(math_ops.matmul(x, w), b))
+
+  def _build_residual(self, g):
+    """Builds residual blocks of MatMul, Relu and Add ops."""
+    del g
+    x = array_ops.placeholder(dtypes.float32, [None, self.WIDTH])
+    w = array_ops.placeholder(dtypes.float32, [self.WIDTH, self.WIDTH])
+    for _ in range(self.NUM_OPS // 3):
+      x = math_ops.add(x, nn_ops.relu(math_ops.matmul(x, w)))
+
+  def _build_mlp_batched(self, g):
+    """Builds the same graph as `_build_mlp` with `Graph.create_ops`."""
+    x = array_ops.placeholder(dtypes.float32, [None, self.WIDTH])
+    w = array_ops.placeholder(dtypes.float32, [self.WIDTH, self.WIDTH])
+    b = array_ops.placeholder(dtypes.float32, [self.WIDTH])
+    t = attr_value_pb2.AttrValue(type=dtypes.float32.as_datatype_enum)
+    false = attr_value_pb2.AttrValue(b=False)
+    matmul_attrs = {"T": t, "transpose_a": false, "transpose_b": false}
+    bias_add_attrs = {"T": t, "data_format": attr_value_pb2.AttrValue(
+        s=b"NHWC")}
+    relu_attrs = {"T": t}
+    op_specs = []
+    for _ in range(self.NUM_OPS // 3):
+      op_specs.append(dict(op_type="MatMul", inputs=[x, w],
+                           dtypes=[dtypes.float32], attrs=matmul_attrs))
+      op_specs.append(dict(op_type="BiasAdd",
+                           inputs=[(len(op_specs) - 1, 0), b],
+                           dtypes=[dtypes.float32], attrs=bias_add_attrs))
+      op_specs.append(dict(op_type="Relu", inputs=[(len(op_specs) - 1, 0)],
+                           dtypes=[dtypes.float32], attrs=relu_attrs))
+      x = (len(op_specs) - 1, 0)
+    g.create_ops(op_specs)
+
+  def benchmark_mlp(self):
+    self._report("mlp", self._build_mlp)
+
+  def benchmark_residual(self):
+    self._report("residual", self._build_residual)
+
+  def benchmark_mlp_batched(self):
+    self._report("mlp_batched", self._build_mlp_batched)
+
+
+if __name__ == "__main__":
+  test.main()
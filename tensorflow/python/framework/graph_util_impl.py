@@ -18,17 +18,22 @@
 from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
-import copy
+import collections
+import os
 import re
+
+import numpy as np
 import six
 
-from tensorflow.core.framework import attr_value_pb2
 from tensorflow.core.framework import graph_pb2
 from tensorflow.core.framework import node_def_pb2
 from tensorflow.python.framework import dtypes
 from tensorflow.python.framework import ops
+from tensorflow.python.framework import tensor_shape
 from tensorflow.python.framework import tensor_util
+from tensorflow.python.platform import gfile
 from tensorflow.python.platform import tf_logging as logging
+from tensorflow.python.util import compat
 from tensorflow.python.util import deprecation
 from tensorflow.python.util.tf_export import tf_export
 
@@ -141,18 +146,238 @@ def _bfs_for_reachable_nodes(target_nodes, name_to_input_name):
   """Breadth first search for reachable nodes from target nodes."""
   nodes_to_keep = set()
   # Breadth first search to find all the nodes that we should keep.
-  next_to_visit = target_nodes[:]
+  next_to_visit = collections.deque(target_nodes)
   while next_to_visit:
-    n = next_to_visit[0]
-    del next_to_visit[0]
+    n = next_to_visit.popleft()
     if n in nodes_to_keep:
       # Already visited this node.
       continue
     nodes_to_keep.add(n)
-    next_to_visit += name_to_input_name[n]
+    next_to_visit.extend(name_to_input_name[n])
   return nodes_to_keep
 
 
+class _IndexedGraphDef(object):
+  """An editable, name-indexed view of a `GraphDef`.
+
+  The view holds references to the `NodeDef`s of the wrapped graph rather than
+  copies. A node is only copied the first time its inputs are rewritten, so a
+  chain of transformations applied to the same view never modifies the original
+  graph, and every node is copied exactly once when the result is materialized
+  with `to_graph_def`.
+
+  The name to node map is kept up to date on every edit. The map from a node
+  to its consumers is built on first use and then updated incrementally, while
+  the topological order is recomputed on first use after an edit.
+  """
+
+  def __init__(self, graph_def):
+    self._graph_def = graph_def
+    self._nodes = collections.OrderedDict()
+    self._duplicate_names = []
+    for node in graph_def.node:
+      name = _node_name(node.name)
+      if name in self._nodes:
+        # As in `_extract_graph_summary`, the last definition wins.
+        self._duplicate_names.append(name)
+        del self._nodes[name]
+      self._nodes[name] = node
+    self._owned_names = set()
+    self._input_names = {}
+    self._consumers = None
+    self._topological_order = None
+
+  def __contains__(self, name):
+    return name in self._nodes
+
+  def __getitem__(self, name):
+    return self._nodes[name]
+
+  def __iter__(self):
+    return iter(self._nodes)
+
+  def __len__(self):
+    return len(self._nodes)
+
+  def nodes(self):
+    """Returns the `NodeDef`s of the view, in graph order."""
+    return list(self._nodes.values())
+
+  def input_names(self, name):
+    """Returns the names of the nodes that `name` takes as inputs."""
+    input_names = self._input_names.get(name)
+    if input_names is None:
+      input_names = [_node_name(x) for x in self._nodes[name].input]
+      self._input_names[name] = input_names
+    return input_names
+
+  def consumers(self, name):
+    """Returns the names of the nodes that take `name` as an input.
+
+    A consumer is listed once per input that refers to `name`, including
+    control inputs.
+
+    Args:
+      name: The name of a node. It does not need to be in the view.
+
+    Returns:
+      A list of node names.
+    """
+    if self._consumers is None:
+      self._consumers = collections.defaultdict(list)
+      for consumer in self._nodes:
+        self._link(consumer)
+    return list(self._consumers.get(name, ()))
+
+  def topological_order(self):
+    """Returns the node names in topological order.
+
+    Inputs that are not in the view are ignored, as are the back edges of
+    `NextIteration` ops, so that graphs with while loops can be sorted.
+
+    Returns:
+      A list of node names.
+
+    Raises:
+      ValueError: If the graph contains a cycle that is not a while loop.
+    """
+    if self._topological_order is None:
+      pending_counts = {}
+      for name, node in six.iteritems(self._nodes):
+        pending_counts[name] = sum(
+            1 for x in self.input_names(name)
+            if x in self._nodes and self._nodes[x].op != "NextIteration")
+      ready = collections.deque(
+          name for name, count in six.iteritems(pending_counts) if not count)
+      order = []
+      while ready:
+        name = ready.popleft()
+        order.append(name)
+        if self._nodes[name].op == "NextIteration":
+          continue
+        for consumer in self.consumers(name):
+          if consumer not in pending_counts:
+            continue
+          pending_counts[consumer] -= 1
+          if not pending_counts[consumer]:
+            ready.append(consumer)
+      if len(order) != len(self._nodes):
+        raise ValueError("Graph contains a cycle through: %s" % sorted(
+            name for name, count in six.iteritems(pending_counts) if count))
+      self._topological_order = order
+    return list(self._topological_order)
+
+  def reachable_from(self, dest_nodes):
+    """Returns the set of names of the nodes that `dest_nodes` depend on."""
+    _assert_nodes_are_present(self._nodes, dest_nodes)
+    return _bfs_for_reachable_nodes(dest_nodes, _InputNamesMap(self))
+
+  def check_unique_names(self):
+    """Raises a `ValueError` if the wrapped graph has duplicate node names."""
+    if self._duplicate_names:
+      raise ValueError("Duplicate node names detected for ",
+                       self._duplicate_names[0])
+
+  def add(self, node):
+    """Appends `node` to the view, taking ownership of it.
+
+    Args:
+      node: A `NodeDef`.
+
+    Raises:
+      ValueError: If a node with the same name is already in the view.
+    """
+    name = _node_name(node.name)
+    if name in self._nodes:
+      raise ValueError("Duplicate node names detected for ", name)
+    self._nodes[name] = node
+    self._owned_names.add(name)
+    self._edited(name, ())
+
+  def replace(self, node):
+    """Replaces the node with the same name as `node`, keeping its position."""
+    name = _node_name(node.name)
+    old_inputs = list(self._nodes[name].input)
+    self._nodes[name] = node
+    self._owned_names.add(name)
+    self._edited(name, old_inputs)
+
+  def remove(self, name):
+    """Removes the node called `name` from the view."""
+    old_inputs = list(self._nodes.pop(name).input)
+    self._owned_names.discard(name)
+    self._edited(name, old_inputs)
+
+  def retain(self, names):
+    """Removes all nodes whose names are not in `names`."""
+    for name in [x for x in self._nodes if x not in names]:
+      self.remove(name)
+
+  def set_inputs(self, name, inputs):
+    """Rewrites the inputs of node `name`, copying the node if necessary."""
+    node = self._nodes[name]
+    old_inputs = list(node.input)
+    if name not in self._owned_names:
+      node = node_def_pb2.NodeDef()
+      node.CopyFrom(self._nodes[name])
+    del node.input[:]
+    node.input.extend(inputs)
+    self._nodes[name] = node
+    self._owned_names.add(name)
+    self._edited(name, old_inputs)
+
+  def to_graph_def(self, names=None, include_library=True):
+    """Materializes the view as a new `GraphDef`.
+
+    Args:
+      names: Optional collection of node names. If given, only these nodes are
+        copied to the result.
+      include_library: Whether to copy the function library and the versions of
+        the wrapped graph.
+
+    Returns:
+      A `GraphDef`.
+    """
+    out = graph_pb2.GraphDef()
+    if names is None:
+      out.node.extend(self._nodes.values())
+    else:
+      out.node.extend(
+          node for name, node in six.iteritems(self._nodes) if name in names)
+    if include_library:
+      out.library.CopyFrom(self._graph_def.library)
+      out.versions.CopyFrom(self._graph_def.versions)
+    return out
+
+  def _link(self, name):
+    for input_name in self.input_names(name):
+      self._consumers[input_name].append(name)
+
+  def _unlink(self, name, inputs):
+    for input_name in set(_node_name(x) for x in inputs):
+      consumers = self._consumers[input_name]
+      consumers[:] = [x for x in consumers if x != name]
+
+  def _edited(self, name, old_inputs):
+    """Updates the indices after the node called `name` has changed."""
+    self._input_names.pop(name, None)
+    self._topological_order = None
+    if self._consumers is not None:
+      self._unlink(name, old_inputs)
+      if name in self._nodes:
+        self._link(name)
+
+
+class _InputNamesMap(object):
+  """Adapts an `_IndexedGraphDef` to `_bfs_for_reachable_nodes`."""
+
+  def __init__(self, indexed_graph_def):
+    self._indexed_graph_def = indexed_graph_def
+
+  def __getitem__(self, name):
+    return self._indexed_graph_def.input_names(name)
+
+
 @deprecation.deprecated(
     date=None,
     instructions="Use tf.compat.v1.graph_util.extract_sub_graph")
@@ -176,22 +401,9 @@ def extract_sub_graph(graph_def, dest_nodes):
   if isinstance(dest_nodes, six.string_types):
     raise TypeError("dest_nodes must be a list.")
 
-  name_to_input_name, name_to_node, name_to_seq_num = _extract_graph_summary(
-      graph_def)
-  _assert_nodes_are_present(name_to_node, dest_nodes)
-
-  nodes_to_keep = _bfs_for_reachable_nodes(dest_nodes, name_to_input_name)
-
-  nodes_to_keep_list = sorted(
-      list(nodes_to_keep), key=lambda n: name_to_seq_num[n])
-  # Now construct the output GraphDef
-  out = graph_pb2.GraphDef()
-  for n in nodes_to_keep_list:
-    out.node.extend([copy.deepcopy(name_to_node[n])])
-  out.library.CopyFrom(graph_def.library)
-  out.versions.CopyFrom(graph_def.versions)
-
-  return out
+  indexed_graph_def = _IndexedGraphDef(graph_def)
+  nodes_to_keep = indexed_graph_def.reachable_from(dest_nodes)
+  return indexed_graph_def.to_graph_def(nodes_to_keep)
 
 
 @deprecation.deprecated(
@@ -212,6 +424,101 @@ def tensor_shape_from_node_def_name(graph, input_name):
   return shape
 
 
+# Size of the chunks in which external tensor files are written.
+_EXTERNAL_TENSOR_CHUNK_BYTES = 64 << 20
+
+
+def _variable_byte_size(node):
+  """Returns the size in bytes of the value of variable `node`, or None."""
+  if "shape" not in node.attr or "dtype" not in node.attr:
+    return None
+  shape = tensor_shape.TensorShape(node.attr["shape"].shape)
+  if not shape.is_fully_defined():
+    return None
+  return shape.num_elements() * dtypes.as_dtype(node.attr["dtype"].type).size
+
+
+def _batch_variable_nodes(variable_nodes, max_batch_bytes):
+  """Groups variable nodes into batches fetched by a single `Session.run`.
+
+  Args:
+    variable_nodes: A list of variable `NodeDef`s.
+    max_batch_bytes: Maximum total size of the variables of a batch, or None
+      to fetch all the variables at once. A variable that is larger than the
+      bound, or whose size is unknown, is fetched on its own.
+
+  Returns:
+    A list of lists of `NodeDef`s.
+  """
+  if max_batch_bytes is None:
+    return [variable_nodes] if variable_nodes else []
+  batches = []
+  batch = []
+  batch_bytes = 0
+  for node in variable_nodes:
+    num_bytes = _variable_byte_size(node)
+    if num_bytes is None:
+      num_bytes = max_batch_bytes
+    if batch and batch_bytes + num_bytes > max_batch_bytes:
+      batches.append(batch)
+      batch = []
+      batch_bytes = 0
+    batch.append(node)
+    batch_bytes += num_bytes
+  if batch:
+    batches.append(batch)
+  return batches
+
+
+def _write_external_tensor(path, data):
+  """Writes the raw bytes of the ndarray `data` to `path`, in chunks."""
+  flat_bytes = np.ascontiguousarray(data).reshape([-1]).view(np.uint8)
+  with gfile.GFile(path, "wb") as f:
+    for start in range(0, flat_bytes.size, _EXTERNAL_TENSOR_CHUNK_BYTES):
+      f.write(
+          flat_bytes[start:start + _EXTERNAL_TENSOR_CHUNK_BYTES].tobytes())
+
+
+def _fill_constant_node_def(output_node, input_node, data, external_tensor_dir,
+                            external_tensor_min_bytes, file_index):
+  """Turns `output_node` into a constant holding the value of a variable.
+
+  Args:
+    output_node: The `NodeDef` to fill in.
+    input_node: The variable `NodeDef`.
+    data: The value of the variable, as an ndarray.
+    external_tensor_dir: Directory where large values are written, or None to
+      store all the values in the graph.
+    external_tensor_min_bytes: Values of at least this size are written to
+      `external_tensor_dir`.
+    file_index: Index used to make the name of the external file unique.
+
+  Returns:
+    Whether the value was written to an external file.
+  """
+  dtype = input_node.attr["dtype"]
+  output_node.name = input_node.name
+  output_node.attr["dtype"].CopyFrom(dtype)
+  if (external_tensor_dir is not None and not data.dtype.hasobject and
+      data.nbytes and data.nbytes >= external_tensor_min_bytes):
+    # ImmutableConst maps the file read-only instead of holding a copy of the
+    # value in the graph.
+    path = os.path.join(
+        external_tensor_dir,
+        "%d_%s.tensor" % (file_index, re.sub(r"[^\w.-]", "_",
+                                             input_node.name)))
+    _write_external_tensor(path, data)
+    output_node.op = "ImmutableConst"
+    output_node.attr["shape"].shape.CopyFrom(
+        tensor_shape.TensorShape(data.shape).as_proto())
+    output_node.attr["memory_region_name"].s = compat.as_bytes(path)
+    return True
+  output_node.op = "Const"
+  output_node.attr["value"].tensor.CopyFrom(
+      tensor_util.make_tensor_proto(data, dtype=dtype.type, shape=data.shape))
+  return False
+
+
 @deprecation.deprecated(
     date=None,
     instructions="Use tf.compat.v1.graph_util.convert_variables_to_constants")
@@ -220,7 +527,10 @@ def convert_variables_to_constants(sess,
                                    input_graph_def,
                                    output_node_names,
                                    variable_names_whitelist=None,
-                                   variable_names_blacklist=None):
+                                   variable_names_blacklist=None,
+                                   max_batch_bytes=None,
+                                   external_tensor_dir=None,
+                                   external_tensor_min_bytes=1 << 20):
   """Replaces all the variables in a graph with constants of the same values.
 
   If you have a trained graph containing Variable ops, it can be convenient to
@@ -228,6 +538,14 @@ def convert_variables_to_constants(sess,
   to describe the network fully with a single GraphDef file, and allows the
   removal of a lot of ops related to loading and saving the variables.
 
+  For large models, `max_batch_bytes` bounds the amount of variable data that
+  is fetched from the session at once, and `external_tensor_dir` keeps large
+  values out of the `GraphDef`, which is limited to 2GB. Such values are
+  written as raw files and loaded by `ImmutableConst` ops, which memory-map
+  them read-only. The files are referenced by their path joined to
+  `external_tensor_dir`, so an absolute directory should be used if the graph
+  is loaded from another working directory.
+
   Args:
     sess: Active TensorFlow session containing the variables.
     input_graph_def: GraphDef object holding the network.
@@ -236,18 +554,30 @@ def convert_variables_to_constants(sess,
                               all variables are converted).
     variable_names_blacklist: The set of variable names to omit converting
                               to constants.
+    max_batch_bytes: Maximum total size in bytes of the variables fetched by a
+                     single `Session.run` call (by default, all the variables
+                     are fetched at once).
+    external_tensor_dir: Directory where the values of at least
+                         `external_tensor_min_bytes` bytes are written (by
+                         default, all the values are stored in the graph).
+                         Values of string dtype are always stored in the graph.
+    external_tensor_min_bytes: The size in bytes from which values are written
+                               to `external_tensor_dir`.
 
   Returns:
     GraphDef containing a simplified version of the original.
   """
   # This graph only includes the nodes needed to evaluate the output nodes, and
   # removes unneeded nodes like those involved in saving and assignment.
-  inference_graph = extract_sub_graph(input_graph_def, output_node_names)
-
-  found_variables = {}
-  variable_names = []
-  variable_dict_names = []
-  for node in inference_graph.node:
+  indexed_graph_def = _IndexedGraphDef(input_graph_def)
+  nodes_to_keep = indexed_graph_def.reachable_from(output_node_names)
+  inference_nodes = [
+      node for name, node in zip(indexed_graph_def, indexed_graph_def.nodes())
+      if name in nodes_to_keep
+  ]
+
+  variable_nodes = []
+  for node in inference_nodes:
     if node.op in ["Variable", "VariableV2", "VarHandleOp"]:
       variable_name = node.name
       if ((variable_names_whitelist is not None and
@@ -255,38 +585,23 @@ def convert_variables_to_constants(sess,
           (variable_names_blacklist is not None and
            variable_name in variable_names_blacklist)):
         continue
-      variable_dict_names.append(variable_name)
-      if node.op == "VarHandleOp":
-        variable_names.append(variable_name + "/Read/ReadVariableOp:0")
-      else:
-        variable_names.append(variable_name + ":0")
-  if variable_names:
-    returned_variables = sess.run(variable_names)
-  else:
-    returned_variables = []
-  found_variables = dict(zip(variable_dict_names, returned_variables))
-  logging.info("Froze %d variables.", len(returned_variables))
+      variable_nodes.append(node)
+  variable_dict_names = set(node.name for node in variable_nodes)
 
+  # The output graph is laid out first, so that the constants can be filled in
+  # place one batch of variables at a time, without holding all the fetched
+  # values or intermediate copies of the constant nodes.
   output_graph_def = graph_pb2.GraphDef()
-  how_many_converted = 0
-  for input_node in inference_graph.node:
-    output_node = node_def_pb2.NodeDef()
-    if input_node.name in found_variables:
-      output_node.op = "Const"
-      output_node.name = input_node.name
-      dtype = input_node.attr["dtype"]
-      data = found_variables[input_node.name]
-      output_node.attr["dtype"].CopyFrom(dtype)
-      output_node.attr["value"].CopyFrom(
-          attr_value_pb2.AttrValue(
-              tensor=tensor_util.make_tensor_proto(
-                  data, dtype=dtype.type, shape=data.shape)))
-      how_many_converted += 1
+  constant_nodes = {}
+  for input_node in inference_nodes:
+    output_node = output_graph_def.node.add()
+    if input_node.name in variable_dict_names:
+      constant_nodes[input_node.name] = output_node
     elif input_node.op == "ReadVariableOp" and (
-        input_node.input[0] in found_variables):
-      # The preceding branch converts all VarHandleOps of ResourceVariables to
-      # constants, so we need to convert the associated ReadVariableOps to
-      # Identity ops.
+        input_node.input[0] in variable_dict_names):
+      # The variables of all the VarHandleOps of ResourceVariables are
+      # converted to constants, so we need to convert the associated
+      # ReadVariableOps to Identity ops.
       output_node.op = "Identity"
       output_node.name = input_node.name
       output_node.input.extend([input_node.input[0]])
@@ -295,9 +610,32 @@ def convert_variables_to_constants(sess,
         output_node.attr["_class"].CopyFrom(input_node.attr["_class"])
     else:
       output_node.CopyFrom(input_node)
-    output_graph_def.node.extend([output_node])
 
-  output_graph_def.library.CopyFrom(inference_graph.library)
+  if external_tensor_dir is not None and not gfile.IsDirectory(
+      external_tensor_dir):
+    gfile.MakeDirs(external_tensor_dir)
+  how_many_converted = 0
+  how_many_external = 0
+  for batch in _batch_variable_nodes(variable_nodes, max_batch_bytes):
+    variable_names = []
+    for node in batch:
+      if node.op == "VarHandleOp":
+        variable_names.append(node.name + "/Read/ReadVariableOp:0")
+      else:
+        variable_names.append(node.name + ":0")
+    returned_variables = sess.run(variable_names)
+    for node, data in zip(batch, returned_variables):
+      if _fill_constant_node_def(constant_nodes[node.name], node, data,
+                                 external_tensor_dir, external_tensor_min_bytes,
+                                 how_many_converted):
+        how_many_external += 1
+      how_many_converted += 1
+  logging.info("Froze %d variables.", how_many_converted)
+  if how_many_external:
+    logging.info("Wrote %d variables to %s.", how_many_external,
+                 external_tensor_dir)
+
+  output_graph_def.library.CopyFrom(input_graph_def.library)
   logging.info("Converted %d variables to const ops.", how_many_converted)
   return output_graph_def
 
@@ -325,35 +663,41 @@ def remove_training_nodes(input_graph, protected_nodes=None):
   Returns:
     A list of nodes with the unnecessary ones removed.
   """
-  if not protected_nodes:
-    protected_nodes = []
+  indexed_graph_def = _IndexedGraphDef(input_graph)
+  _remove_training_nodes(indexed_graph_def, protected_nodes)
+  return indexed_graph_def.to_graph_def(include_library=False)
+
+
+def _remove_training_nodes(indexed_graph_def, protected_nodes=None):
+  """Implements `remove_training_nodes` in place on an `_IndexedGraphDef`."""
+  protected_nodes = set(protected_nodes or ())
 
   types_to_remove = {"CheckNumerics": True}
 
-  input_nodes = input_graph.node
   names_to_remove = {}
-  for node in input_nodes:
+  for node in indexed_graph_def.nodes():
     if node.op in types_to_remove and node.name not in protected_nodes:
       names_to_remove[node.name] = True
 
-  nodes_after_removal = []
-  for node in input_nodes:
-    if node.name in names_to_remove:
+  # Only the consumers of the removed nodes need their inputs rewritten.
+  consumers = set()
+  for name in names_to_remove:
+    consumers.update(indexed_graph_def.consumers(name))
+    indexed_graph_def.remove(name)
+  for name in consumers:
+    if name in names_to_remove:
       continue
-    new_node = node_def_pb2.NodeDef()
-    new_node.CopyFrom(node)
-    input_before_removal = node.input
-    del new_node.input[:]
-    for full_input_name in input_before_removal:
-      input_name = re.sub(r"^\^", "", full_input_name)
-      if input_name in names_to_remove:
-        continue
-      new_node.input.append(full_input_name)
-    nodes_after_removal.append(new_node)
+    node = indexed_graph_def[name]
+    new_inputs = [
+        full_input_name for full_input_name in node.input
+        if re.sub(r"^\^", "", full_input_name) not in names_to_remove
+    ]
+    if len(new_inputs) != len(node.input):
+      indexed_graph_def.set_inputs(name, new_inputs)
 
   types_to_splice = {"Identity": True}
   names_to_splice = {}
-  for node in nodes_after_removal:
+  for node in indexed_graph_def.nodes():
     if node.op in types_to_splice and node.name not in protected_nodes:
       # We don't want to remove nodes that have control edge inputs, because
       # they might be involved in subtle dependency issues that removing them
@@ -365,22 +709,20 @@ def remove_training_nodes(input_graph, protected_nodes=None):
       if not has_control_edge:
         names_to_splice[node.name] = node.input[0]
 
-  nodes_after_splicing = []
-  for node in nodes_after_removal:
-    if node.name in names_to_splice:
+  consumers = set()
+  for name in names_to_splice:
+    consumers.update(indexed_graph_def.consumers(name))
+    indexed_graph_def.remove(name)
+  for name in consumers:
+    if name in names_to_splice:
       continue
-    new_node = node_def_pb2.NodeDef()
-    new_node.CopyFrom(node)
-    input_before_removal = node.input
-    del new_node.input[:]
-    for full_input_name in input_before_removal:
+    node = indexed_graph_def[name]
+    new_inputs = []
+    for full_input_name in node.input:
       input_name = re.sub(r"^\^", "", full_input_name)
       while input_name in names_to_splice:
         full_input_name = names_to_splice[input_name]
         input_name = re.sub(r"^\^", "", full_input_name)
-      new_node.input.append(full_input_name)
-    nodes_after_splicing.append(new_node)
-
-  output_graph = graph_pb2.GraphDef()
-  output_graph.node.extend(nodes_after_splicing)
-  return output_graph
+      new_inputs.append(full_input_name)
+    if new_inputs != list(node.input):
+      indexed_graph_def.set_inputs(name, new_inputs)
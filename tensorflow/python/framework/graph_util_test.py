@@ -18,6 +18,10 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
+import os
+
+import numpy as np
+
 from tensorflow.core.framework import attr_value_pb2
 from tensorflow.core.framework import graph_pb2
 from tensorflow.core.framework import node_def_pb2
@@ -26,6 +30,7 @@ from tensorflow.python.framework import constant_op
 from tensorflow.python.framework import dtypes
 from tensorflow.python.framework import function
 from tensorflow.python.framework import graph_util
+from tensorflow.python.framework import graph_util_impl
 from tensorflow.python.framework import importer
 from tensorflow.python.framework import ops
 from tensorflow.python.framework import tensor_util
@@ -298,6 +303,47 @@ class DeviceFunctionsTest(test.TestCase):
         output = sess.run(output_node)
         self.assertNear(2.0, output, 0.00001)
 
+  def testConvertVariablesToConstsInBatchesWithExternalTensors(self):
+    external_tensor_dir = os.path.join(self.get_temp_dir(), "external")
+    with ops.Graph().as_default():
+      small_variable = variables.Variable([1.0, 2.0], name="small_variable")
+      large_variable = variables.Variable(
+          np.arange(1024, dtype=np.float32), name="large_variable")
+      output_node = math_ops_lib.add(
+          math_ops_lib.reduce_sum(small_variable),
+          math_ops_lib.reduce_sum(large_variable),
+          name="output_node")
+      with session.Session() as sess:
+        sess.run(variables.global_variables_initializer())
+        expected_output = sess.run(output_node)
+        fetches = []
+
+        class _RecordingSession(object):
+
+          def run(self, fetch_list):
+            fetches.append(fetch_list)
+            return sess.run(fetch_list)
+
+        constant_graph_def = graph_util.convert_variables_to_constants(
+            _RecordingSession(),
+            sess.graph.as_graph_def(), ["output_node"],
+            max_batch_bytes=1024,
+            external_tensor_dir=external_tensor_dir,
+            external_tensor_min_bytes=1024)
+
+    # The large variable does not fit in the batch of the small one.
+    self.assertEqual([["small_variable:0"], ["large_variable:0"]], fetches)
+    node_ops = {node.name: node.op for node in constant_graph_def.node}
+    self.assertEqual("Const", node_ops["small_variable"])
+    self.assertEqual("ImmutableConst", node_ops["large_variable"])
+    self.assertEqual(1, len(os.listdir(external_tensor_dir)))
+
+    with ops.Graph().as_default():
+      _ = importer.import_graph_def(constant_graph_def, name="")
+      with session.Session() as sess:
+        output = sess.run("output_node:0")
+        self.assertNear(expected_output, output, 0.00001)
+
   def create_node_def(self, op, name, inputs):
     new_node = node_def_pb2.NodeDef()
     new_node.op = op
@@ -390,6 +436,63 @@ class DeviceFunctionsTest(test.TestCase):
 
     self.assertProtoEquals(expected_graph_def,
                            graph_util.remove_training_nodes(graph_def))
+    # The input graph must be left untouched.
+    self.assertEqual(["C"], graph_def.node[1].input)
+
+  def testIndexedGraphDef(self):
+    graph_def = graph_pb2.GraphDef()
+    graph_def.node.extend([
+        self.create_node_def("Aop", "A", ["B:1", "^C"]),
+        self.create_node_def("Bop", "B", ["C", "C"]),
+        self.create_node_def("Merge", "C", ["D", "E"]),
+        self.create_node_def("Dop", "D", []),
+        self.create_node_def("NextIteration", "E", ["C"])
+    ])
+    graph_def.versions.producer = 21
+    indexed_graph_def = graph_util_impl._IndexedGraphDef(graph_def)
+
+    self.assertEqual(5, len(indexed_graph_def))
+    self.assertEqual(["B", "C"], indexed_graph_def.input_names("A"))
+    self.assertEqual(["A", "B", "B", "E"],
+                     sorted(indexed_graph_def.consumers("C")))
+    self.assertEqual([], indexed_graph_def.consumers("A"))
+    self.assertEqual(["D", "C", "B", "E", "A"],
+                     indexed_graph_def.topological_order())
+    self.assertEqual(set(["B", "C", "D", "E"]),
+                     indexed_graph_def.reachable_from(["B"]))
+
+    # Edits copy the node on write and keep the indices up to date.
+    indexed_graph_def.set_inputs("B", ["D"])
+    self.assertEqual(["C", "C"], graph_def.node[1].input)
+    self.assertEqual(["A", "E"], sorted(indexed_graph_def.consumers("C")))
+    self.assertEqual(["B", "C"], sorted(indexed_graph_def.consumers("D")))
+    self.assertEqual(["D", "C", "B", "E", "A"],
+                     indexed_graph_def.topological_order())
+    indexed_graph_def.remove("A")
+    self.assertEqual(["E"], indexed_graph_def.consumers("C"))
+    with self.assertRaisesRegexp(ValueError, "Duplicate node names"):
+      indexed_graph_def.add(self.create_node_def("Bop", "B", []))
+
+    sub_graph_def = indexed_graph_def.to_graph_def(["B", "D"])
+    self.assertEqual(["B", "D"], [node.name for node in sub_graph_def.node])
+    self.assertEqual(["D"], sub_graph_def.node[0].input)
+    self.assertEqual(21, sub_graph_def.versions.producer)
+    self.assertEqual(
+        0,
+        indexed_graph_def.to_graph_def(
+            include_library=False).versions.producer)
+
+  def testIndexedGraphDefWithCycle(self):
+    graph_def = graph_pb2.GraphDef()
+    graph_def.node.extend([
+        self.create_node_def("Aop", "A", ["B"]),
+        self.create_node_def("Bop", "B", ["A"])
+    ])
+    indexed_graph_def = graph_util_impl._IndexedGraphDef(graph_def)
+    with self.assertRaisesRegexp(ValueError, "cycle"):
+      indexed_graph_def.topological_order()
+    # Cycles are fine for extracting sub-graphs.
+    self.assertEqual(set(["A", "B"]), indexed_graph_def.reachable_from(["A"]))
 
 
 if __name__ == "__main__":
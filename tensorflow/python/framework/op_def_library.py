@@ -243,6 +243,16 @@ class _OpInfo(object):
               "Attr '%s' of '%s' used as a number_attr but has type %s" %
               (arg.number_attr, op_def.name, attr_type))
 
+    # Default types for all "type" attrs, see `_apply_op_helper`. Computed once
+    # here as reading the OpDef proto fields is slow compared to op creation.
+    self.default_type_attr_map = {}
+    for attr_def in op_def.attr:
+      if attr_def.type != "type":
+        continue
+      if attr_def.HasField("default_value"):
+        self.default_type_attr_map[attr_def.name] = dtypes.as_dtype(
+            attr_def.default_value.type)
+
 
 # pylint: disable=g-doc-return-or-yield
 @tf_contextlib.contextmanager
@@ -354,6 +364,12 @@ class OpDefLibrary(object):
           "Cannot determine graph for Op '%s' due to: %s"
           % (op_type_name, e.message))
 
+    # pylint: disable=protected-access
+    stats = g._op_creation_stats
+    # pylint: enable=protected-access
+    if stats is not None:
+      start = stats.start()
+
     # Default name if not specified.
     if name is None:
       name = op_type_name
@@ -377,14 +393,7 @@ class OpDefLibrary(object):
     # way if you have two inputs, one of whose type resolution depends
     # on the other.  Handling this will require restructuring this code
     # significantly.
-    default_type_attr_map = {}
-    for attr_def in op_def.attr:
-      if attr_def.type != "type":
-        continue
-      key = attr_def.name
-      if attr_def.HasField("default_value"):
-        default_type_attr_map[key] = dtypes.as_dtype(
-            attr_def.default_value.type)
+    default_type_attr_map = op_info.default_type_attr_map
 
     # Requires that op_def has passed validation (using the C++
     # ValidateOpDef() from ../framework/op_def_util.h).
@@ -781,6 +790,8 @@ class OpDefLibrary(object):
       # the newly created op and any of its reference-typed inputs.
       must_colocate_inputs = [val for arg, val in zip(op_def.input_arg, inputs)
                               if arg.is_ref]
+      if stats is not None:
+        stats.record("op_def_library", start)
       with _MaybeColocateWith(must_colocate_inputs):
         # Add Op to graph
         op = g.create_op(op_type_name, inputs, output_types, name=scope,
@@ -23,6 +23,7 @@ import copy
 import re
 import sys
 import threading
+import time
 
 import numpy as np
 import six
@@ -1796,7 +1797,8 @@ class Operation(object):
     # should be None.
 
     if isinstance(node_def, node_def_pb2.NodeDef):
-      if node_def.ByteSize() >= (1 << 31) or node_def.ByteSize() < 0:
+      byte_size = node_def.ByteSize()
+      if byte_size >= (1 << 31) or byte_size < 0:
         raise ValueError(
             "Cannot create a tensor proto whose content is larger than 2GB.")
       if not _VALID_OP_NAME_REGEX.match(node_def.name):
@@ -2143,6 +2145,10 @@ class Operation(object):
 
     # Reset cached inputs.
     self._inputs_val = None
+    # pylint: disable=protected-access
+    if self._id <= self._graph._inputs_version_max_op_id:
+      self._graph._inputs_version += 1
+    # pylint: enable=protected-access
     c_api.UpdateEdge(
         self._graph._c_graph,  # pylint: disable=protected-access
         tensor._as_tf_output(),  # pylint: disable=protected-access
@@ -2943,6 +2949,17 @@ class Graph(object):
     # Stack of colocate_with ops. After switch_to_thread_local(),
     # self._thread_local._colocation_stack is used instead.
     self._graph_colocation_stack = traceable_stack.TraceableStack()
+    # `OpCreationStats` updated as ops are created, see `op_creation_stats`.
+    self._op_creation_stats = None
+    # Incremented when the inputs of an existing op are updated, to invalidate
+    # caches of the graph structure such as the reachability indices of
+    # gradients_impl. Only updates of ops whose id is at most
+    # `_inputs_version_max_op_id` are counted: ops created after the caches
+    # cannot be part of them.
+    self._inputs_version = 0
+    self._inputs_version_max_op_id = -1
+    # Cache of gradients_impl._ReachabilityIndex objects for this graph.
+    self._reachability_indices = collections.OrderedDict()
     # Set of tensors that are dangerous to feed!
     self._unfeedable_tensors = set()
     # Set of operations that are dangerous to fetch!
@@ -3334,6 +3351,114 @@ class Graph(object):
     del compute_shapes
 
     self._check_not_finalized()
+    return self._create_op_internal(op_type, inputs, dtypes, input_types, name,
+                                    attrs, op_def, compute_device)
+
+  def create_ops(self, op_specs, compute_device=True):
+    """Creates a batch of `Operation`s in this graph.
+
+    This is equivalent to calling `create_op` once per element of
+    `op_specs`, but the graph state shared by all the ops of the batch (the
+    device function and colocation stacks) is only looked up once, which
+    makes it cheaper to build very large graphs programmatically.
+
+    Each element of `op_specs` is a dictionary of keyword arguments for
+    `create_op`: `op_type`, `inputs`, `dtypes` and optionally `input_types`,
+    `name`, `attrs` and `op_def`. An input may also be a tuple
+    `(op_index, output_index)` referring to an output of an op created earlier
+    in the same batch. For example:
+
+    ```python
+    attrs = {"T": tf.AttrValue(type=tf.float32.as_datatype_enum)}
+    ops = g.create_ops(
+        [dict(op_type="Add", inputs=[x, y], dtypes=[tf.float32], attrs=attrs),
+         dict(op_type="Add", inputs=[(0, 0), y], dtypes=[tf.float32],
+              attrs=attrs)])
+    ```
+
+    Args:
+      op_specs: A list of dictionaries describing the ops to create.
+      compute_device: (Optional.) If True, device functions will be executed
+        to compute the device property of the Operations.
+
+    Raises:
+      TypeError: if any of the inputs is not a `Tensor` or a reference to an
+        op created earlier in the batch.
+      ValueError: if colocation conflicts with existing device assignment.
+
+    Returns:
+      A list of `Operation` objects, one per element of `op_specs`.
+    """
+    self._check_not_finalized()
+    # Subclasses such as function graphs preprocess the inputs of each op in
+    # `create_op`, which must then be called for every op.
+    overrides_create_op = (
+        six.get_unbound_function(type(self).create_op) is not
+        six.get_unbound_function(Graph.create_op))
+    stacks = self._snapshot_op_creation_stacks(compute_device)
+    created_ops = []
+    for spec in op_specs:
+      inputs = [
+          created_ops[a[0]].outputs[a[1]] if isinstance(a, tuple) else a
+          for a in spec["inputs"]
+      ]
+      if overrides_create_op:
+        kwargs = {
+            key: value
+            for key, value in spec.items()
+            if key not in ("op_type", "inputs", "dtypes")
+        }
+        created_ops.append(
+            self.create_op(
+                spec["op_type"],
+                inputs,
+                spec["dtypes"],
+                compute_device=compute_device,
+                **kwargs))
+        continue
+      created_ops.append(
+          self._create_op_internal(
+              spec["op_type"],
+              inputs,
+              spec["dtypes"],
+              spec.get("input_types"),
+              spec.get("name"),
+              spec.get("attrs"),
+              spec.get("op_def"),
+              compute_device,
+              stacks=stacks))
+    return created_ops
+
+  def _create_op_internal(self,
+                          op_type,
+                          inputs,
+                          dtypes,  # pylint: disable=redefined-outer-name
+                          input_types,
+                          name,
+                          attrs,
+                          op_def,
+                          compute_device,
+                          stacks=None):
+    """Implementation of `create_op` and `create_ops`.
+
+    Args:
+      op_type: See `create_op`.
+      inputs: See `create_op`.
+      dtypes: See `create_op`.
+      input_types: See `create_op`.
+      name: See `create_op`.
+      attrs: See `create_op`.
+      op_def: See `create_op`.
+      compute_device: See `create_op`.
+      stacks: (Optional.) The result of `_snapshot_op_creation_stacks`, to
+        reuse for this op.
+
+    Returns:
+      An `Operation` object.
+    """
+    stats = self._op_creation_stats
+    if stats is not None:
+      start = stats.start()
     for idx, a in enumerate(inputs):
       if not isinstance(a, Tensor):
         raise TypeError("Input #%d is not a tensor: %s" % (idx, a))
@@ -3347,9 +3472,16 @@ class Graph(object):
       name = self.unique_name(name)
 
     node_def = _NodeDef(op_type, name, device=None, attrs=attrs)
+    if stats is not None:
+      start = stats.record("naming", start)
 
-    input_ops = set([t.op for t in inputs])
-    control_inputs = self._control_dependencies_for_inputs(input_ops)
+    if self._control_dependencies_stack:
+      input_ops = set([t.op for t in inputs])
+      control_inputs = self._control_dependencies_for_inputs(input_ops)
+    else:
+      control_inputs = []
+    if stats is not None:
+      start = stats.record("control_dependencies", start)
     # _create_op_helper mutates the new Operation. `_mutation_lock` ensures a
     # Session.run call cannot occur between creating and mutating the op.
     with self._mutation_lock():
@@ -3362,7 +3494,12 @@ class Graph(object):
           input_types=input_types,
           original_op=self._default_original_op,
           op_def=op_def)
-      self._create_op_helper(ret, compute_device=compute_device)
+      if stats is not None:
+        start = stats.record("operation", start)
+      self._create_op_helper(ret, compute_device=compute_device, stacks=stacks)
+    if stats is not None:
+      stats.record("context", start)
+      stats.num_ops += 1
     return ret
 
   def _create_op_from_tf_operation(self, c_op, compute_device=True):
@@ -3427,8 +3564,44 @@ class Graph(object):
                    coloc_op_summary=coloc_op_info["devs_and_colocs"]))
     return msg
 
-  def _create_op_helper(self, op, compute_device=True):
-    """Common logic for creating an op in this graph."""
+  def _snapshot_op_creation_stacks(self, compute_device=True):
+    """Snapshots the device and colocation stacks applied to new ops.
+
+    Args:
+      compute_device: Whether device functions will be executed.
+
+    Returns:
+      A tuple `(device_specs, device_code_locations, colocation_ops,
+      colocation_code_locations)` for `_create_op_helper`.
+    """
+    if compute_device:
+      device_specs = self._device_function_stack.peek_objs()
+      device_code_locations = self._snapshot_device_function_stack_metadata()
+    else:
+      device_specs = None
+      device_code_locations = None
+    if self._colocation_stack:
+      colocation_ops = self._colocation_stack.peek_objs()
+    else:
+      colocation_ops = []
+    return (device_specs, device_code_locations, colocation_ops,
+            self._snapshot_colocation_stack_metadata())
+
+  def _create_op_helper(self, op, compute_device=True, stacks=None):
+    """Common logic for creating an op in this graph.
+
+    Args:
+      op: The new `Operation`.
+      compute_device: If True, device functions will be executed to compute
+        the device property of `op`.
+      stacks: (Optional.) The result of `_snapshot_op_creation_stacks`. The
+        current stacks are used if not set.
+    """
+    if stacks is None:
+      stacks = self._snapshot_op_creation_stacks(compute_device)
+    (device_specs, device_code_locations, colocation_ops,
+     colocation_code_locations) = stacks
+
     # Apply any additional attributes requested. Do not overwrite any existing
     # attributes.
     for key, value in self._attr_scope_map.items():
@@ -3465,18 +3638,18 @@ class Graph(object):
     self._record_op_seen_by_control_dependencies(op)
 
     if compute_device:
-      self._apply_device_functions(op)
+      self._apply_device_functions(op, device_specs, device_code_locations)
 
     # Snapshot the colocation stack metadata before we might generate error
     # messages using it.  Note that this snapshot depends on the actual stack
     # and is independent of the op's _class attribute.
     # pylint: disable=protected-access
-    op._colocation_code_locations = self._snapshot_colocation_stack_metadata()
+    op._colocation_code_locations = colocation_code_locations
     # pylint: enable=protected-access
 
-    if self._colocation_stack:
+    if colocation_ops:
       all_colocation_groups = []
-      for colocation_op in self._colocation_stack.peek_objs():
+      for colocation_op in colocation_ops:
         all_colocation_groups.extend(colocation_op.colocation_groups())
         if colocation_op.device:
           if (op.device and pydev.canonical_name(op.device) !=
@@ -4335,18 +4508,30 @@ class Graph(object):
     finally:
       self._device_function_stack.pop_obj()
 
-  def _apply_device_functions(self, op):
-    """Applies the current device function stack to the given operation."""
+  def _apply_device_functions(self, op, device_specs=None,
+                              device_code_locations=None):
+    """Applies the current device function stack to the given operation.
+
+    Args:
+      op: An `Operation`.
+      device_specs: (Optional.) Snapshot of the device function stack, as
+        returned by `_snapshot_op_creation_stacks`.
+      device_code_locations: (Optional.) Snapshot of the device function stack
+        metadata, as returned by `_snapshot_op_creation_stacks`.
+    """
+    if device_specs is None:
+      device_specs = self._device_function_stack.peek_objs()
+      device_code_locations = self._snapshot_device_function_stack_metadata()
     # Apply any device functions in LIFO order, so that the most recently
     # pushed function has the first chance to apply a device to the op.
     # We apply here because the result can depend on the Operation's
     # signature, which is computed in the Operation constructor.
     # pylint: disable=protected-access
-    for device_spec in self._device_function_stack.peek_objs():
+    for device_spec in device_specs:
       if device_spec.function is None:
         break
       op._set_device(device_spec.function(op))
-    op._device_code_locations = self._snapshot_device_function_stack_metadata()
+    op._device_code_locations = device_code_locations
     # pylint: enable=protected-access
 
   # pylint: disable=g-doc-return-or-yield
@@ -4988,6 +5173,105 @@ class Graph(object):
     return self._group_lock.group(_SESSION_RUN_LOCK_GROUP)
 
 
+class OpCreationStats(object):
+  """Wall time spent in each phase of op creation.
+
+  The time of each phase excludes the time spent creating other ops, e.g. the
+  constants created while converting the inputs of an op.
+
+  Attributes:
+    num_ops: Number of ops created while collecting the stats.
+    phase_seconds: Dictionary mapping each phase to the total time spent in it,
+      in seconds. The phases are:
+      * "op_def_library": input conversion and attr inference in
+        `OpDefLibrary.apply_op`.
+      * "naming": `Graph.unique_name` and `NodeDef` construction.
+      * "control_dependencies": control inputs from `control_dependencies`.
+      * "operation": construction of the `Operation` and its `TF_Operation`.
+      * "context": attr scopes, kernel labels, device functions and
+        colocation.
+  """
+
+  def __init__(self):
+    self.num_ops = 0
+    self.phase_seconds = collections.defaultdict(float)
+    self._recorded_seconds = 0.
+
+  def start(self):
+    """Returns a token to pass to `record` at the end of a phase."""
+    return time.time(), self._recorded_seconds
+
+  def record(self, phase, start):
+    """Adds the time elapsed since `start` to `phase`.
+
+    Args:
+      phase: Name of the phase.
+      start: Token returned by `start` or `record`.
+
+    Returns:
+      A token for the next phase.
+    """
+    start_time, start_recorded_seconds = start
+    now = time.time()
+    elapsed = (now - start_time) - (
+        self._recorded_seconds - start_recorded_seconds)
+    self.phase_seconds[phase] += elapsed
+    self._recorded_seconds += elapsed
+    return now, self._recorded_seconds
+
+  @property
+  def total_seconds(self):
+    return self._recorded_seconds
+
+  @property
+  def ops_per_second(self):
+    if not self._recorded_seconds:
+      return 0.
+    return self.num_ops / self._recorded_seconds
+
+  def __str__(self):
+    lines = ["%d ops in %.3fs (%.0f ops/sec)" %
+             (self.num_ops, self.total_seconds, self.ops_per_second)]
+    for phase, seconds in sorted(
+        self.phase_seconds.items(), key=lambda item: -item[1]):
+      lines.append("  %s: %.3fs (%.1f%%)" %
+                   (phase, seconds,
+                    100. * seconds / max(self.total_seconds, 1e-9)))
+    return "\n".join(lines)
+
+
+@tf_contextlib.contextmanager
+def op_creation_stats(graph=None):
+  """Collects the time spent in each phase of op creation in `graph`.
+
+  For example:
+
+  ```python
+  with ops.op_creation_stats() as stats:
+    build_model()
+  print(stats)
+  ```
+
+  Args:
+    graph: The `Graph` to instrument. Defaults to the default graph.
+
+  Yields:
+    An `OpCreationStats` updated as ops are created in `graph`. Ops created in
+    a nested `op_creation_stats` context are only recorded there.
+  """
+  if graph is None:
+    graph = get_default_graph()
+  stats = OpCreationStats()
+  # pylint: disable=protected-access
+  previous_stats = graph._op_creation_stats
+  graph._op_creation_stats = stats
+  try:
+    yield stats
+  finally:
+    graph._op_creation_stats = previous_stats
+  # pylint: enable=protected-access
+
+
 # TODO(agarwal): currently device directives in an outer eager scope will not
 # apply to inner graph mode code. Fix that.
 
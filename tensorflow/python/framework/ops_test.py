@@ -671,6 +671,54 @@ class CreateOpTest(test_util.TensorFlowTestCase):
     g._unsafe_unfinalize()
     g.create_op("FloatOutput", [], [dtypes.float32], None, name="myop1")
 
+  def testCreateOps(self):
+    g = ops.Graph()
+    op1 = g.create_op("FloatOutput", [], [dtypes.float32], None, name="myop1")
+    with g.device("/device:GPU:0"):
+      op2, op3 = g.create_ops([
+          dict(op_type="FloatOutputStringOutput", inputs=[],
+               dtypes=[dtypes.float32, dtypes.string], name="myop2"),
+          dict(op_type="Foo3", inputs=[op1.outputs[0], (0, 1), (0, 0)],
+               dtypes=[dtypes.float32, dtypes.int32])
+      ])
+    self.assertDeviceEqual("/device:GPU:0", op2.device)
+    self.assertDeviceEqual("/device:GPU:0", op3.device)
+    self.assertProtoEquals(
+        "name:'Foo3' input:'myop1' input:'myop2:1' input:'myop2' op:'Foo3' "
+        "device:'/device:GPU:0'", op3.node_def)
+
+    with self.assertRaises(TypeError):
+      g.create_ops([dict(op_type="Foo3", inputs=[1.0], dtypes=[])])
+
+  def testCreateOpsWithControlDependencies(self):
+    g = ops.Graph()
+    a = g.create_op("FloatOutput", [], [dtypes.float32])
+    with g.control_dependencies([a]):
+      b, c = g.create_ops([
+          dict(op_type="FloatOutput", inputs=[], dtypes=[dtypes.float32]),
+          dict(op_type="TwoFloatInputs", inputs=[(0, 0), (0, 0)], dtypes=[])
+      ])
+    self.assertEqual([a], b.control_inputs)
+    # `c` is dominated by its data dependency on `b`.
+    self.assertEqual([], c.control_inputs)
+
+  def testOpCreationStats(self):
+    g = ops.Graph()
+    with g.as_default():
+      with ops.op_creation_stats() as stats:
+        x = constant_op.constant(1.0)
+        math_ops.add(x, 2.0)
+        g.create_ops([
+            dict(op_type="FloatOutput", inputs=[], dtypes=[dtypes.float32])
+        ])
+      constant_op.constant(3.0)
+    self.assertEqual(4, stats.num_ops)
+    self.assertEqual(
+        set(["op_def_library", "naming", "control_dependencies", "operation",
+             "context"]), set(stats.phase_seconds))
+    self.assertAllClose(stats.total_seconds, sum(stats.phase_seconds.values()))
+    self.assertIsNone(g._op_creation_stats)
+
 
 # NOTE(skyewm): these cases test the private Graph._create_op_from_tf_operation
 # method. Arguably we should only test the public APIs that depend on this
@@ -25,6 +25,7 @@ import collections
 import itertools
 import json
 import os
+import threading
 import weakref
 
 import numpy as np
@@ -2895,6 +2896,10 @@ def print_tensor(x, message=''):
 # GRAPH MANIPULATION
 
 
+# Maximum number of callables cached per `GraphExecutionFunction`.
+_MAX_CALLABLES = 8
+
+
 class GraphExecutionFunction(object):
   """Runs a computation graph.
 
@@ -2969,6 +2974,19 @@ class GraphExecutionFunction(object):
     self._symbol_vals = None
     self._fetches = None
     self._session = None
+    # Callables generated for `self._session`, keyed on the feed signature
+    # (which inputs are fed arrays or symbols, and the fetches), so that
+    # alternating between signatures does not rebuild callables. The least
+    # recently used callables are released beyond `_MAX_CALLABLES`.
+    self._callables = collections.OrderedDict()
+    # Numpy dtypes expected by the callable for each input.
+    self._input_np_dtypes = [
+        dtypes_module.as_dtype(x.dtype).as_numpy_dtype for x in self.inputs
+    ]
+    # Reusable buffers for inputs that need a dtype conversion or a
+    # contiguous copy, keyed on the input index. Buffers are per thread since
+    # a function may be called concurrently.
+    self._local = threading.local()
 
   def _make_callable(self, feed_arrays, feed_symbols, symbol_vals, session):
     """Generates a callable that runs the graph.
@@ -2982,6 +3000,29 @@ class GraphExecutionFunction(object):
     Returns:
       Function that runs the graph according to the above options.
     """
+    if session is not self._session:
+      # Callables are bound to the session they were created in.
+      self._callables = collections.OrderedDict()
+    signature = (tuple(feed_arrays), tuple(feed_symbols), tuple(symbol_vals),
+                 tuple(self.fetches))
+    callable_fn = self._callables.pop(signature, None)
+    if callable_fn is None:
+      callable_fn = self._create_callable(feed_arrays, feed_symbols,
+                                          symbol_vals, session)
+    self._callables[signature] = callable_fn
+    while len(self._callables) > _MAX_CALLABLES:
+      self._callables.popitem(last=False)
+    # Cache parameters corresponding to the current callable, so that
+    # we can detect future mismatches and switch callables.
+    self._callable_fn = callable_fn
+    self._feed_arrays = feed_arrays
+    self._feed_symbols = feed_symbols
+    self._symbol_vals = symbol_vals
+    self._fetches = list(self.fetches)
+    self._session = session
+
+  def _create_callable(self, feed_arrays, feed_symbols, symbol_vals, session):
+    """Creates a session callable for the given feed signature."""
     # Prepare callable options.
     callable_opts = config_pb2.CallableOptions()
     # Handle external-data feed.
@@ -3009,15 +3050,51 @@ class GraphExecutionFunction(object):
     if self.run_options:
       callable_opts.run_options.CopyFrom(self.run_options)
     # Create callable.
-    callable_fn = session._make_callable_from_options(callable_opts)
-    # Cache parameters corresponding to the generated callable, so that
-    # we can detect future mismatches and refresh the callable.
-    self._callable_fn = callable_fn
-    self._feed_arrays = feed_arrays
-    self._feed_symbols = feed_symbols
-    self._symbol_vals = symbol_vals
-    self._fetches = list(self.fetches)
-    self._session = session
+    return session._make_callable_from_options(callable_opts)
+
+  def _as_feed_array(self, index, value):
+    """Converts `value` to a Numpy array that `callable_fn` can be fed.
+
+    `callable_fn` only supports exact dtype matches. Contiguous arrays of the
+    right dtype are fed as is; other arrays are copied into a buffer that is
+    reused across calls.
+
+    Arguments:
+      index: Index of the input being fed.
+      value: Value to feed to the input.
+
+    Returns:
+      A Numpy array.
+    """
+    np_dtype = self._input_np_dtypes[index]
+    if type(value) is np.ndarray:  # pylint: disable=unidiomatic-typecheck
+      if value.dtype == np_dtype and value.flags.c_contiguous:
+        return value
+      if value.dtype.kind in 'biuf' and np.dtype(np_dtype).kind in 'biuf':
+        input_buffers = self._get_input_buffers()
+        buf = input_buffers.get(index)
+        if buf is None or buf.shape != value.shape:
+          buf = np.empty(value.shape, dtype=np_dtype)
+          input_buffers[index] = buf
+        np.copyto(buf, value, casting='unsafe')
+        return buf
+    return np.asarray(value, dtype=np_dtype)
+
+  def _get_input_buffers(self):
+    if not hasattr(self._local, 'input_buffers'):
+      self._local.input_buffers = {}
+    return self._local.input_buffers
+
+  def _copy_aliased_outputs(self, fetched):
+    """Copies fetched arrays sharing memory with a reused input buffer."""
+    buffers = list(self._get_input_buffers().values())
+    if not buffers:
+      return fetched
+    for i, value in enumerate(fetched):
+      if isinstance(value, np.ndarray) and any(
+          np.may_share_memory(value, buf) for buf in buffers):
+        fetched[i] = value.copy()
+    return fetched
 
   def _call_fetch_callbacks(self, fetches_output):
     for fetch, output in zip(self._fetches, fetches_output):
@@ -3033,7 +3110,7 @@ class GraphExecutionFunction(object):
     array_vals = []
     feed_symbols = []
     symbol_vals = []
-    for tensor, value in zip(self.inputs, inputs):
+    for index, (tensor, value) in enumerate(zip(self.inputs, inputs)):
       if value is None:
         continue
       if is_sparse(tensor):
@@ -3050,9 +3127,7 @@ class GraphExecutionFunction(object):
         feed_arrays.append(tensor)
         # We need to do array conversion and type casting at this level, since
         # `callable_fn` only supports exact matches.
-        tensor_type = dtypes_module.as_dtype(tensor.dtype)
-        array_vals.append(np.asarray(value,
-                                     dtype=tensor_type.as_numpy_dtype))
+        array_vals.append(self._as_feed_array(index, value))
 
     if self.feed_dict:
       for key in sorted(self.feed_dict.keys()):
@@ -3068,6 +3143,7 @@ class GraphExecutionFunction(object):
 
     fetched = self._callable_fn(*array_vals,
                                 run_metadata=self.run_metadata)
+    fetched = self._copy_aliased_outputs(fetched)
     self._call_fetch_callbacks(fetched[-len(self._fetches):])
     return fetched[:len(self.outputs)]
 
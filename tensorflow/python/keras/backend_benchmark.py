@@ -0,0 +1,82 @@
+# Copyright 2018 The TensorFlow Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Benchmarks for the per-call overhead of Keras backend functions."""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import time
+
+import numpy as np
+
+from tensorflow.python import keras
+from tensorflow.python.framework import ops
+from tensorflow.python.platform import test
+
+
+class GraphExecutionFunctionBenchmark(test.Benchmark):
+  """Measures the overhead of `GraphExecutionFunction.__call__`."""
+
+  def _run_function(self, inputs, num_iters):
+    with ops.Graph().as_default():
+      x1 = keras.backend.placeholder(shape=(None, 4), dtype='float32')
+      x2 = keras.backend.placeholder(shape=(None, 4), dtype='float32')
+      f = keras.backend.function([x1, x2], [x1 + x2])
+      # Warm up to build the session callable.
+      f(inputs)
+
+      start = time.time()
+      for _ in range(num_iters):
+        f(inputs)
+      return (time.time() - start) / num_iters
+
+  def benchmarkFunctionCallOverhead(self):
+    num_iters = 10000
+    cases = [
+        ('float32', [np.ones((8, 4), dtype=np.float32)] * 2),
+        ('float64', [np.ones((8, 4), dtype=np.float64)] * 2),
+        ('non_contiguous',
+         [np.ones((8, 8), dtype=np.float32)[:, ::2]] * 2),
+        ('alternating_symbolic', None),
+    ]
+    for name, inputs in cases:
+      if inputs is None:
+        wall_time = self._run_alternating_feeds(num_iters)
+      else:
+        wall_time = self._run_function(inputs, num_iters)
+      print('%s: %.1f us/call' % (name, wall_time * 1e6))
+      self.report_benchmark(
+          iters=num_iters,
+          wall_time=wall_time,
+          name='keras_function_call_overhead_%s' % name)
+
+  def _run_alternating_feeds(self, num_iters):
+    with ops.Graph().as_default():
+      x1 = keras.backend.placeholder(shape=(None, 4), dtype='float32')
+      x2 = keras.backend.placeholder(shape=(None, 4), dtype='float32')
+      f = keras.backend.function([x1, x2], [x1 + x2])
+      array = np.ones((8, 4), dtype=np.float32)
+      symbol = keras.backend.constant(array)
+      f([array, array])
+      f([symbol, array])
+
+      start = time.time()
+      for i in range(num_iters):
+        f([symbol if i % 2 else array, array])
+      return (time.time() - start) / num_iters
+
+
+if __name__ == '__main__':
+  test.main()
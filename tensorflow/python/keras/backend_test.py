@@ -1573,6 +1573,58 @@ class BackendGraphTests(test.TestCase):
       self.assertEqual(callback.times_called, 1)
       self.assertEqual(callback.callback_result, 200)
 
+  def test_function_caches_callables_per_feed_signature(self):
+    with self.cached_session():
+      x1 = keras.backend.placeholder(shape=())
+      x2 = keras.backend.placeholder(shape=())
+      f = keras.backend.function(inputs=[x1, x2], outputs=[x1 + x2])
+      y1 = keras.backend.constant(10.)
+
+      self.assertEqual(f([1., 2.]), [3.])
+      self.assertEqual(f([y1, 2.]), [12.])
+      callable_fn = f._callable_fn
+      self.assertEqual(f([1., 2.]), [3.])
+      self.assertEqual(f([y1, 3.]), [13.])
+      # Alternating feed signatures reuses the cached callables.
+      self.assertIs(f._callable_fn, callable_fn)
+      self.assertEqual(len(f._callables), 2)
+
+  def test_function_bounds_callable_cache(self):
+    with self.cached_session():
+      x1 = keras.backend.placeholder(shape=())
+      x2 = keras.backend.placeholder(shape=())
+      f = keras.backend.function(inputs=[x1, x2], outputs=[x1 + x2])
+      y1 = keras.backend.constant(10.)
+
+      self.assertEqual(f([y1, 2.]), [12.])
+      callable_fn = f._callable_fn
+      # Each symbolic input is a new feed signature.
+      for i in range(keras.backend._MAX_CALLABLES):
+        self.assertEqual(f([keras.backend.constant(float(i)), 2.]),
+                         [i + 2.])
+      self.assertEqual(len(f._callables), keras.backend._MAX_CALLABLES)
+      # The least recently used callable was released and is rebuilt.
+      self.assertEqual(f([y1, 2.]), [12.])
+      self.assertIsNot(f._callable_fn, callable_fn)
+      self.assertEqual(len(f._callables), keras.backend._MAX_CALLABLES)
+
+  def test_function_input_buffers_do_not_alias_outputs(self):
+    with self.cached_session():
+      x = keras.backend.placeholder(shape=(None, 3), dtype='float32')
+      f = keras.backend.function(inputs=[x], outputs=[array_ops.identity(x)])
+
+      a = np.ones((2, 3), dtype='float64')
+      b = np.zeros((2, 3), dtype='float64')
+      out_a = f([a])[0]
+      out_b = f([b])[0]
+      self.assertEqual(out_a.dtype, np.float32)
+      self.assertAllEqual(out_a, a)
+      self.assertAllEqual(out_b, b)
+
+      # Non-contiguous inputs of the right dtype are also supported.
+      c = np.arange(12, dtype='float32').reshape((2, 6))[:, ::2]
+      self.assertAllEqual(f([c])[0], c)
+
   def test_placeholder(self):
     x = keras.backend.placeholder(shape=(3, 4))
     self.assertEqual(x.get_shape().as_list(), [3, 4])
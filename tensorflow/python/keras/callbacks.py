@@ -25,6 +25,7 @@ import csv
 import io
 import json
 import math
+from multiprocessing.pool import ThreadPool
 import os
 import time
 
@@ -35,6 +36,7 @@ from tensorflow.python.data.ops import iterator_ops
 from tensorflow.python.eager import context
 from tensorflow.python.framework import dtypes
 from tensorflow.python.keras import backend as K
+from tensorflow.python.keras.engine import saving
 from tensorflow.python.keras.engine.training_utils import standardize_input_data
 from tensorflow.python.keras.utils.data_utils import Sequence
 from tensorflow.python.keras.utils.generic_utils import Progbar
@@ -47,6 +49,11 @@ from tensorflow.python.summary import summary as tf_summary
 from tensorflow.python.training import saver
 from tensorflow.python.util.tf_export import tf_export
 
+try:
+  import h5py  # pylint: disable=g-import-not-at-top
+except ImportError:
+  h5py = None
+
 
 try:
   import requests
@@ -169,6 +176,53 @@ def _is_generator_like(data):
       data, (Sequence, iterator_ops.Iterator, iterator_ops.EagerIterator)))
 
 
+class _BackgroundWorker(object):
+  """Runs tasks on a single background thread, one task at a time.
+
+  Submitting a task first waits for the outstanding one, so that at most one
+  task is pending at any time. Errors raised by a task are re-raised by the
+  next call to `submit`, `wait` or `close`.
+  """
+
+  def __init__(self):
+    self._pool = None
+    self._pending = None
+
+  def submit(self, fn, *args):
+    """Runs `fn(*args)` in the background.
+
+    Arguments:
+        fn: Function to run.
+        *args: Arguments of `fn`.
+
+    Returns:
+        The time, in seconds, spent waiting for the previous task.
+    """
+    wait_time = self.wait()
+    if self._pool is None:
+      self._pool = ThreadPool(1)
+    self._pending = self._pool.apply_async(fn, args)
+    return wait_time
+
+  def wait(self):
+    """Waits for the outstanding task, and returns the time spent waiting."""
+    start = time.time()
+    if self._pending is not None:
+      pending, self._pending = self._pending, None
+      pending.get()
+    return time.time() - start
+
+  def close(self):
+    """Waits for the outstanding task and stops the background thread."""
+    try:
+      self.wait()
+    finally:
+      if self._pool is not None:
+        self._pool.close()
+        self._pool.join()
+        self._pool = None
+
+
 class CallbackList(object):
   """Container abstracting a list of callbacks.
 
@@ -408,8 +462,10 @@ class BaseLogger(Callback):
   def on_batch_end(self, batch, logs=None):
     logs = logs or {}
     batch_size = logs.get('size', 0)
-    # In case of distribution strategy we can potentially run multiple steps
-    # at the same time, we should account for that in the `seen` calculation.
+    # In case of distribution strategy or `steps_per_execution` we can
+    # potentially run multiple steps at the same time, the logs then hold
+    # values averaged over the steps, so the totals are weighted by all of the
+    # samples they were computed on.
     num_steps = logs.get('num_steps', 1)
     self.seen += batch_size * num_steps
 
@@ -418,9 +474,9 @@ class BaseLogger(Callback):
         self.totals[k] = v
       else:
         if k in self.totals:
-          self.totals[k] += v * batch_size
+          self.totals[k] += v * batch_size * num_steps
         else:
-          self.totals[k] = v * batch_size
+          self.totals[k] = v * batch_size * num_steps
 
   def on_epoch_end(self, epoch, logs=None):
     if logs is not None:
@@ -577,6 +633,12 @@ class ModelCheckpoint(Callback):
           saved (`model.save_weights(filepath)`), else the full model
           is saved (`model.save(filepath)`).
       period: Interval (number of epochs) between checkpoints.
+      async_save: if True, the model is snapshotted to an in-memory HDF5 file
+          on the training thread, and the snapshot is written to `filepath`
+          by a background thread. At most one save is outstanding: a new
+          checkpoint waits for the previous one to be written. Only HDF5
+          files are saved asynchronously; weights saved in TensorFlow format
+          are still saved synchronously.
   """
 
   def __init__(self,
@@ -586,7 +648,8 @@ class ModelCheckpoint(Callback):
                save_best_only=False,
                save_weights_only=False,
                mode='auto',
-               period=1):
+               period=1,
+               async_save=False):
     super(ModelCheckpoint, self).__init__()
     self.monitor = monitor
     self.verbose = verbose
@@ -595,6 +658,10 @@ class ModelCheckpoint(Callback):
     self.save_weights_only = save_weights_only
     self.period = period
     self.epochs_since_last_save = 0
+    self.async_save = async_save
+    if async_save and h5py is None:
+      raise ImportError('`async_save` requires h5py.')
+    self._worker = _BackgroundWorker()
 
     if mode not in ['auto', 'min', 'max']:
       logging.warning('ModelCheckpoint mode %s is unknown, '
@@ -633,10 +700,7 @@ class ModelCheckpoint(Callback):
                     ' saving model to %s' % (epoch + 1, self.monitor, self.best,
                                              current, filepath))
             self.best = current
-            if self.save_weights_only:
-              self.model.save_weights(filepath, overwrite=True)
-            else:
-              self.model.save(filepath, overwrite=True)
+            self._save_model(epoch, filepath)
           else:
             if self.verbose > 0:
               print('\nEpoch %05d: %s did not improve from %0.5f' %
@@ -644,10 +708,43 @@ class ModelCheckpoint(Callback):
       else:
         if self.verbose > 0:
           print('\nEpoch %05d: saving model to %s' % (epoch + 1, filepath))
-        if self.save_weights_only:
-          self.model.save_weights(filepath, overwrite=True)
-        else:
-          self.model.save(filepath, overwrite=True)
+        self._save_model(epoch, filepath)
+
+  def on_train_end(self, logs=None):
+    self._worker.close()
+
+  def _save_model(self, epoch, filepath):
+    """Saves the model, and logs the time training was stalled for it."""
+    start = time.time()
+    is_hdf5 = (filepath.endswith('.h5') or filepath.endswith('.keras') or
+               filepath.endswith('.hdf5'))
+    if self.async_save and (is_hdf5 or not self.save_weights_only):
+      self._worker.submit(_write_file, filepath, self._snapshot_model())
+    elif self.save_weights_only:
+      self.model.save_weights(filepath, overwrite=True)
+    else:
+      self.model.save(filepath, overwrite=True)
+    logging.info('Epoch %05d: saving model to %s stalled training for %0.3f '
+                 'seconds.', epoch + 1, filepath, time.time() - start)
+
+  def _snapshot_model(self):
+    """Returns the contents of a HDF5 file holding the model."""
+    f = h5py.File('model_checkpoint_%d.h5' % id(self), mode='w',
+                  driver='core', backing_store=False)
+    try:
+      if self.save_weights_only:
+        saving.save_weights_to_hdf5_group(f, self.model.layers)
+      else:
+        self.model.save(f, overwrite=True)
+      f.flush()
+      return f.id.get_file_image()
+    finally:
+      f.close()
+
+
+def _write_file(filepath, contents):
+  with open(filepath, 'wb') as f:
+    f.write(contents)
 
 
 @tf_export('keras.callbacks.EarlyStopping')
@@ -913,6 +1010,13 @@ class TensorBoard(Callback):
           the callback will write the metrics and losses to TensorBoard every
           1000 samples. Note that writing too frequently to TensorBoard
           can slow down your training.
+      async_summaries: whether to keep summary writing off the training
+          thread. Summaries are not flushed after every write, and weight
+          histograms are computed by a background thread from a snapshot of
+          the weights taken at the end of the epoch, instead of being
+          evaluated in the graph on every validation batch. At most one
+          snapshot is outstanding: a new one waits for the previous one to be
+          written.
 
   Raises:
       ValueError: If histogram_freq is set and no validation data is provided.
@@ -937,7 +1041,8 @@ class TensorBoard(Callback):
                embeddings_layer_names=None,
                embeddings_metadata=None,
                embeddings_data=None,
-               update_freq='epoch'):
+               update_freq='epoch',
+               async_summaries=False):
     super(TensorBoard, self).__init__()
     self.log_dir = log_dir
     self.histogram_freq = histogram_freq
@@ -963,6 +1068,8 @@ class TensorBoard(Callback):
       self.update_freq = update_freq
     self._samples_seen = 0
     self._samples_seen_at_last_write = 0
+    self.async_summaries = async_summaries
+    self._worker = _BackgroundWorker()
 
   def _init_writer(self):
     """Sets file writer."""
@@ -980,7 +1087,8 @@ class TensorBoard(Callback):
       for layer in self.model.layers:
         for weight in layer.weights:
           mapped_weight_name = weight.name.replace(':', '_')
-          tf_summary.histogram(mapped_weight_name, weight)
+          if not self.async_summaries:
+            tf_summary.histogram(mapped_weight_name, weight)
           if self.write_images:
             w_img = array_ops.squeeze(weight)
             shape = K.int_shape(w_img)
@@ -1139,6 +1247,30 @@ class TensorBoard(Callback):
         summary_value.simple_value = value
         summary_value.tag = name
         self.writer.add_summary(summary, step)
+      if self.async_summaries:
+        # The writer adds events to its file from its own thread.
+        return
+    self.writer.flush()
+
+  def _write_weight_histograms(self, names, values, step):
+    """Writes histograms of weight values, computed with NumPy."""
+    summary = tf_summary.Summary()
+    for name, value in zip(names, values):
+      value = np.asarray(value, dtype=np.float64).ravel()
+      if not value.size:
+        continue
+      counts, edges = np.histogram(value, bins=30)
+      summary_value = summary.value.add()
+      summary_value.tag = name
+      histo = summary_value.histo
+      histo.min = value.min()
+      histo.max = value.max()
+      histo.num = value.size
+      histo.sum = value.sum()
+      histo.sum_squares = np.dot(value, value)
+      histo.bucket_limit.extend(edges[1:].tolist())
+      histo.bucket.extend(counts.tolist())
+    self.writer.add_summary(summary, step)
     self.writer.flush()
 
   def on_train_begin(self, logs=None):
@@ -1180,7 +1312,8 @@ class TensorBoard(Callback):
       self._current_val_batch = 0
       # pylint: disable=protected-access
       # add the histogram summary op if it should run this epoch
-      if self.merged not in self.model._eval_function.fetches:
+      if (self.merged is not None and
+          self.merged not in self.model._eval_function.fetches):
         self.model._eval_function.fetches.append(self.merged)
         self.model._eval_function.fetch_callbacks[
             self.merged] = self._fetch_callback
@@ -1188,6 +1321,7 @@ class TensorBoard(Callback):
 
   def on_epoch_end(self, epoch, logs=None):
     """Checks if summary ops should run next epoch, logs scalar summaries."""
+    start = time.time()
 
     # don't output batch_size and
     # batch number as Tensorboard summaries
@@ -1200,6 +1334,16 @@ class TensorBoard(Callback):
       step = self._samples_seen
     self._write_custom_summaries(step, logs)
 
+    if (self.async_summaries and self.histogram_freq and
+        epoch % self.histogram_freq == 0):
+      weights = [weight for layer in self.model.layers
+                 for weight in layer.weights]
+      names = [weight.name.replace(':', '_') for weight in weights]
+      self._worker.submit(self._write_weight_histograms, names,
+                          K.batch_get_value(weights), epoch)
+    elif self.async_summaries and not context.executing_eagerly():
+      self._worker.submit(self.writer.flush)
+
     # pop the histogram summary op after each epoch
     if self.histogram_freq:
       # pylint: disable=protected-access
@@ -1249,8 +1393,14 @@ class TensorBoard(Callback):
 
           i += self.batch_size
 
+    logging.info('Epoch %05d: writing summaries stalled training for %0.3f '
+                 'seconds.', epoch + 1, time.time() - start)
+
   def on_train_end(self, logs=None):
-    self.writer.close()
+    try:
+      self._worker.close()
+    finally:
+      self.writer.close()
 
 
 @tf_export('keras.callbacks.ReduceLROnPlateau')
@@ -36,6 +36,7 @@ from tensorflow.python.framework import test_util
 from tensorflow.python.keras import testing_utils
 from tensorflow.python.platform import test
 from tensorflow.python.platform import tf_logging as logging
+from tensorflow.python.summary import summary_iterator
 from tensorflow.python.summary.writer import writer_cache
 from tensorflow.python.training import adam
 
@@ -226,6 +227,63 @@ class KerasCallbacksTest(test.TestCase):
           save_best_only=save_best_only,
           mode='unknown')
 
+  def test_ModelCheckpoint_async_save(self):
+    if h5py is None:
+      return  # Skip test if models cannot be saved.
+
+    with self.cached_session():
+      np.random.seed(1337)
+
+      temp_dir = self.get_temp_dir()
+      self.addCleanup(shutil.rmtree, temp_dir, ignore_errors=True)
+
+      (x_train, y_train), (x_test, y_test) = testing_utils.get_test_data(
+          train_samples=TRAIN_SAMPLES,
+          test_samples=TEST_SAMPLES,
+          input_shape=(INPUT_DIM,),
+          num_classes=NUM_CLASSES)
+      y_test = keras.utils.to_categorical(y_test)
+      y_train = keras.utils.to_categorical(y_train)
+
+      model = keras.models.Sequential()
+      model.add(
+          keras.layers.Dense(
+              NUM_HIDDEN, input_dim=INPUT_DIM, activation='relu'))
+      model.add(keras.layers.Dense(NUM_CLASSES, activation='softmax'))
+      model.compile(
+          loss='categorical_crossentropy',
+          optimizer='rmsprop',
+          metrics=['accuracy'])
+
+      for save_weights_only in (False, True):
+        filepath = os.path.join(temp_dir, 'checkpoint.{epoch:02d}.h5')
+        cbks = [
+            keras.callbacks.ModelCheckpoint(
+                filepath, save_weights_only=save_weights_only,
+                async_save=True)
+        ]
+        model.fit(
+            x_train,
+            y_train,
+            batch_size=BATCH_SIZE,
+            validation_data=(x_test, y_test),
+            callbacks=cbks,
+            epochs=2,
+            verbose=0)
+        # All the saves are written by the end of training.
+        for epoch in (1, 2):
+          self.assertTrue(os.path.exists(filepath.format(epoch=epoch)))
+
+        ref_y = model.predict(x_test)
+        if save_weights_only:
+          model.load_weights(filepath.format(epoch=2))
+          self.assertAllClose(model.predict(x_test), ref_y)
+        else:
+          loaded_model = keras.models.load_model(filepath.format(epoch=2))
+          self.assertAllClose(loaded_model.predict(x_test), ref_y)
+        for epoch in (1, 2):
+          os.remove(filepath.format(epoch=epoch))
+
   def test_EarlyStopping(self):
     with self.cached_session():
       np.random.seed(123)
@@ -850,6 +908,53 @@ class KerasCallbacksTest(test.TestCase):
       # Make sure file writer cache is clear to avoid failures during cleanup.
       writer_cache.FileWriterCache.clear()
 
+  def test_TensorBoard_async_summaries(self):
+    np.random.seed(1337)
+    temp_dir = self.get_temp_dir()
+    self.addCleanup(shutil.rmtree, temp_dir, ignore_errors=True)
+
+    (x_train, y_train), (x_test, y_test) = testing_utils.get_test_data(
+        train_samples=TRAIN_SAMPLES,
+        test_samples=TEST_SAMPLES,
+        input_shape=(INPUT_DIM,),
+        num_classes=NUM_CLASSES)
+    y_test = keras.utils.to_categorical(y_test)
+    y_train = keras.utils.to_categorical(y_train)
+
+    with self.cached_session():
+      model = keras.models.Sequential()
+      model.add(
+          keras.layers.Dense(
+              NUM_HIDDEN, input_dim=INPUT_DIM, activation='relu',
+              name='dense_a'))
+      model.add(keras.layers.Dense(NUM_CLASSES, activation='softmax'))
+      model.compile(
+          loss='categorical_crossentropy',
+          optimizer='sgd',
+          metrics=['accuracy'])
+      tsb = keras.callbacks.TensorBoard(
+          log_dir=temp_dir, histogram_freq=1, async_summaries=True,
+          update_freq='batch')
+      model.fit(
+          x_train,
+          y_train,
+          batch_size=BATCH_SIZE,
+          validation_data=(x_test, y_test),
+          callbacks=[tsb],
+          epochs=2,
+          verbose=0)
+
+    tags = set()
+    for event_file in os.listdir(temp_dir):
+      for event in summary_iterator.summary_iterator(
+          os.path.join(temp_dir, event_file)):
+        for value in event.summary.value:
+          tags.add(value.tag)
+    self.assertIn('dense_a/kernel_0', tags)
+    self.assertIn('dense_a_out', tags)
+    self.assertIn('epoch_loss', tags)
+    self.assertIn('batch_loss', tags)
+
   def test_TensorBoard_multi_input_output(self):
     np.random.seed(1337)
     tmpdir = self.get_temp_dir()
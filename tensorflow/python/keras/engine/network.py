@@ -1389,7 +1389,8 @@ class Network(base_layer.Layer):
     from tensorflow.python.keras.models import save_model  # pylint: disable=g-import-not-at-top
     save_model(self, filepath, overwrite, include_optimizer)
 
-  def save_weights(self, filepath, overwrite=True, save_format=None):
+  def save_weights(self, filepath, overwrite=True, save_format=None,
+                   max_chunk_bytes=None):
     """Saves all layer weights.
 
     Either saves in HDF5 or in TensorFlow format based on the `save_format`
@@ -1425,6 +1426,11 @@ class Network(base_layer.Layer):
         save_format: Either 'tf' or 'h5'. A `filepath` ending in '.h5' or
             '.keras' will default to HDF5 if `save_format` is `None`. Otherwise
             `None` defaults to 'tf'.
+        max_chunk_bytes: Only used when saving in HDF5 format. Optional
+            maximum number of bytes of a weight held in host memory at once.
+            When set, weights are written to the file in slices along their
+            first axis, which bounds the memory used to save large (e.g.
+            embedding) weights.
 
     Raises:
         ImportError: If h5py is not available when attempting to save in HDF5
@@ -1468,7 +1474,8 @@ class Network(base_layer.Layer):
         return
     if save_format == 'h5':
       with h5py.File(filepath, 'w') as f:
-        saving.save_weights_to_hdf5_group(f, self.layers)
+        saving.save_weights_to_hdf5_group(
+            f, self.layers, max_chunk_bytes=max_chunk_bytes)
     else:
       if context.executing_eagerly():
         session = None
@@ -1491,7 +1498,7 @@ class Network(base_layer.Layer):
           model_checkpoint_path=filepath,
           all_model_checkpoint_paths=[filepath])
 
-  def load_weights(self, filepath, by_name=False):
+  def load_weights(self, filepath, by_name=False, max_chunk_bytes=None):
     """Loads all layer weights, either from a TensorFlow or an HDF5 weight file.
 
     If `by_name` is False weights are loaded based on the network's
@@ -1502,7 +1509,8 @@ class Network(base_layer.Layer):
 
     If `by_name` is True, weights are loaded into layers only if they share the
     same name. This is useful for fine-tuning or transfer-learning models where
-    some of the layers have changed.
+    some of the layers have changed. Weights of layers that have no matching
+    name are not read from the file.
 
     Only topological loading (`by_name=False`) is supported when loading weights
     from the TensorFlow format. Note that topological loading differs slightly
@@ -1518,6 +1526,11 @@ class Network(base_layer.Layer):
         by_name: Boolean, whether to load weights by name or by topological
             order. Only topological loading is supported for weight files in
             TensorFlow format.
+        max_chunk_bytes: Only used when loading weights in HDF5 format.
+            Optional maximum number of bytes of a weight held in host memory
+            at once. When set, weights are read from the file in slices along
+            their first axis (except for layers whose weights need a format
+            conversion, which are loaded at once).
 
     Returns:
         When loading a weight file in TensorFlow format, returns the same status
@@ -1567,9 +1580,11 @@ class Network(base_layer.Layer):
       if 'layer_names' not in f.attrs and 'model_weights' in f:
         f = f['model_weights']
       if by_name:
-        saving.load_weights_from_hdf5_group_by_name(f, self.layers)
+        saving.load_weights_from_hdf5_group_by_name(
+            f, self.layers, max_chunk_bytes=max_chunk_bytes)
       else:
-        saving.load_weights_from_hdf5_group(f, self.layers)
+        saving.load_weights_from_hdf5_group(
+            f, self.layers, max_chunk_bytes=max_chunk_bytes)
 
   def _updated_config(self):
     """Util shared between different serialization methods.
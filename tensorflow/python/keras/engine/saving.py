@@ -19,16 +19,21 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
+import contextlib
 import json
+from multiprocessing.pool import ThreadPool
 import os
 
 import numpy as np
 from six.moves import zip  # pylint: disable=redefined-builtin
 
+from tensorflow.python.eager import context
+from tensorflow.python.framework import dtypes
 from tensorflow.python.keras import backend as K
 from tensorflow.python.keras import optimizers
 from tensorflow.python.keras.utils import conv_utils
 from tensorflow.python.keras.utils.io_utils import ask_to_proceed_with_overwrite
+from tensorflow.python.ops import array_ops
 from tensorflow.python.platform import tf_logging as logging
 from tensorflow.python.util import serialization
 from tensorflow.python.util.tf_export import tf_export
@@ -718,12 +723,206 @@ def _convert_rnn_weights(layer, weights):
   return weights
 
 
-def save_weights_to_hdf5_group(f, layers):
+# Layer classes whose weights may be converted by
+# `preprocess_weights_for_loading`, and hence are never loaded in chunks.
+_PREPROCESSED_LAYER_CLASSES = frozenset([
+    'Bidirectional', 'TimeDistributed', 'Model', 'Sequential', 'Conv1D',
+    'Conv2D', 'Conv3D', 'Conv2DTranspose', 'ConvLSTM2D', 'GRU', 'LSTM',
+    'CuDNNGRU', 'CuDNNLSTM'
+])
+
+
+def _get_weight_chunks(shape, dtype, max_chunk_bytes):
+  """Splits a non-scalar weight into slices along its first axis.
+
+  Arguments:
+      shape: Shape of the weight, as a tuple of integers.
+      dtype: Numpy dtype of the weight.
+      max_chunk_bytes: Maximum number of bytes of a slice. A slice always holds
+          at least one row.
+
+  Returns:
+      A list of `(start, end)` tuples.
+  """
+  row_bytes = max(1, np.dtype(dtype).itemsize * int(np.prod(shape[1:])))
+  rows_per_chunk = max(1, max_chunk_bytes // row_bytes)
+  return [(start, min(start + rows_per_chunk, shape[0]))
+          for start in range(0, shape[0], rows_per_chunk)]
+
+
+def _get_weight_slice_ops(x):
+  """Returns (and caches on `x`) the ops reading and assigning row slices."""
+  if not hasattr(x, '_slice_start_placeholder'):
+    with x.graph.as_default():
+      start = array_ops.placeholder(dtypes.int64, shape=())
+      end = array_ops.placeholder(dtypes.int64, shape=())
+      value = array_ops.placeholder(x.dtype.base_dtype, shape=None)
+      x._slice_start_placeholder = start
+      x._slice_end_placeholder = end
+      x._slice_value_placeholder = value
+      x._slice_read = array_ops.identity(x[start:end])
+      x._slice_assign_op = x[start:end].assign(value)
+  return (x._slice_start_placeholder, x._slice_end_placeholder,
+          x._slice_value_placeholder, x._slice_read, x._slice_assign_op)
+
+
+def _get_weight_chunk(x, bounds, session):
+  """Returns a row slice of `x` as a Numpy array.
+
+  Arguments:
+      x: Weight variable.
+      bounds: `(start, end)` tuple.
+      session: Session to run the slice ops in, or `None` when executing
+          eagerly. The ops must already exist, see `_get_weight_slice_ops`.
+
+  Returns:
+      A Numpy array.
+  """
+  if session is None:
+    return x[bounds[0]:bounds[1]].numpy()
+  start, end, _, read, _ = _get_weight_slice_ops(x)
+  return session.run(read, feed_dict={start: bounds[0], end: bounds[1]})
+
+
+def _set_weight_chunk(x, bounds, value, session):
+  """Assigns `value` to a row slice of `x`.
+
+  Arguments:
+      x: Weight variable.
+      bounds: `(start, end)` tuple.
+      value: Numpy array.
+      session: Session to run the slice ops in, or `None` when executing
+          eagerly. The ops must already exist, see `_get_weight_slice_ops`.
+  """
+  value = np.asarray(value, dtype=K.dtype(x))
+  if session is None:
+    x[bounds[0]:bounds[1]].assign(value)
+  else:
+    start, end, placeholder, _, assign_op = _get_weight_slice_ops(x)
+    session.run(assign_op, feed_dict={start: bounds[0],
+                                      end: bounds[1],
+                                      placeholder: value})
+
+
+@contextlib.contextmanager
+def _chunk_io_context(weights):
+  """Prepares the streaming of `weights` between the backend and HDF5.
+
+  In graph mode, the slice ops of all the weights are created upfront and a
+  worker thread is started, so that backend reads and assignments overlap with
+  HDF5 I/O. Ops are never created by the worker thread, and the session is
+  resolved here since default sessions are thread-local.
+
+  Arguments:
+      weights: List of weight variables that will be streamed.
+
+  Yields:
+      A `(session, pool)` tuple, both `None` when executing eagerly.
+  """
+  if context.executing_eagerly():
+    yield None, None
+    return
+  for w in weights:
+    if K.int_shape(w):
+      _get_weight_slice_ops(w)
+  session = K.get_session()
+  pool = ThreadPool(1)
+  try:
+    yield session, pool
+  finally:
+    pool.close()
+    pool.join()
+
+
+def _save_weight_in_chunks(group, name, x, max_chunk_bytes, session, pool):
+  """Writes a weight to a HDF5 dataset one row slice at a time.
+
+  When `pool` is set, the next slice is read from the backend while the
+  current one is written, so at most two slices are held in memory.
+  """
+  shape = K.int_shape(x)
+  dtype = np.dtype(K.dtype(x))
+  param_dset = group.create_dataset(name, shape, dtype=dtype)
+  if not shape:
+    param_dset[()] = K.get_value(x)
+    return
+  chunks = _get_weight_chunks(shape, dtype, max_chunk_bytes)
+  pending = None
+  for i, bounds in enumerate(chunks):
+    if pending is None:
+      val = _get_weight_chunk(x, bounds, session)
+    else:
+      val = pending.get()
+    if pool is not None and i + 1 < len(chunks):
+      pending = pool.apply_async(_get_weight_chunk,
+                                 (x, chunks[i + 1], session))
+    param_dset[bounds[0]:bounds[1]] = val
+
+
+def _load_weight_in_chunks(dataset, x, max_chunk_bytes, session, pool):
+  """Assigns a HDF5 dataset to a weight one row slice at a time.
+
+  When `pool` is set, the current slice is assigned in the backend while the
+  next one is read from the file, so at most two slices are held in memory.
+  """
+  if not dataset.shape:
+    K.set_value(x, dataset[()])
+    return
+  pending = None
+  for bounds in _get_weight_chunks(dataset.shape, dataset.dtype,
+                                   max_chunk_bytes):
+    val = dataset[bounds[0]:bounds[1]]
+    if pending is not None:
+      pending.get()
+    if pool is None:
+      _set_weight_chunk(x, bounds, val, session)
+    else:
+      pending = pool.apply_async(_set_weight_chunk, (x, bounds, val, session))
+  if pending is not None:
+    pending.get()
+
+
+def _load_weights_in_chunks(weight_dataset_tuples, max_chunk_bytes):
+  """Streams a list of `(weight, dataset)` tuples into the weights."""
+  if not weight_dataset_tuples:
+    return
+  with _chunk_io_context([w for w, _ in weight_dataset_tuples]) as (session,
+                                                                   pool):
+    for w, dataset in weight_dataset_tuples:
+      _load_weight_in_chunks(dataset, w, max_chunk_bytes, session, pool)
+
+
+def _can_load_in_chunks(layer, weight_values, symbolic_weights):
+  """Whether HDF5 datasets can be assigned to `layer` without preprocessing."""
+  if layer.__class__.__name__ in _PREPROCESSED_LAYER_CLASSES:
+    return False
+  if len(weight_values) != len(symbolic_weights):
+    return False
+  return all(
+      tuple(dset.shape) == K.int_shape(x)
+      for dset, x in zip(weight_values, symbolic_weights))
+
+
+def _get_weight_names(symbolic_weights):
+  weight_names = []
+  for i, w in enumerate(symbolic_weights):
+    if hasattr(w, 'name') and w.name:
+      name = str(w.name)
+    else:
+      name = 'param_' + str(i)
+    weight_names.append(name.encode('utf8'))
+  return weight_names
+
+
+def save_weights_to_hdf5_group(f, layers, max_chunk_bytes=None):
   """Saves the weights of a list of layers to a HDF5 group.
 
   Arguments:
       f: HDF5 group.
       layers: List of layer instances.
+      max_chunk_bytes: Optional maximum number of bytes of a weight held in
+          memory at once. When set, weights are streamed to the file in row
+          slices instead of being fetched all at once per layer.
   """
   from tensorflow.python.keras import __version__ as keras_version  # pylint: disable=g-import-not-at-top
 
@@ -732,17 +931,23 @@ def save_weights_to_hdf5_group(f, layers):
   f.attrs['backend'] = K.backend().encode('utf8')
   f.attrs['keras_version'] = str(keras_version).encode('utf8')
 
+  if max_chunk_bytes is not None:
+    weights = [w for layer in layers for w in layer.weights]
+    with _chunk_io_context(weights) as (session, pool):
+      for layer in layers:
+        g = f.create_group(layer.name)
+        symbolic_weights = layer.weights
+        weight_names = _get_weight_names(symbolic_weights)
+        save_attributes_to_hdf5_group(g, 'weight_names', weight_names)
+        for name, w in zip(weight_names, symbolic_weights):
+          _save_weight_in_chunks(g, name, w, max_chunk_bytes, session, pool)
+    return
+
   for layer in layers:
     g = f.create_group(layer.name)
     symbolic_weights = layer.weights
     weight_values = K.batch_get_value(symbolic_weights)
-    weight_names = []
-    for i, (w, val) in enumerate(zip(symbolic_weights, weight_values)):
-      if hasattr(w, 'name') and w.name:
-        name = str(w.name)
-      else:
-        name = 'param_' + str(i)
-      weight_names.append(name.encode('utf8'))
+    weight_names = _get_weight_names(symbolic_weights)
     save_attributes_to_hdf5_group(g, 'weight_names', weight_names)
     for name, val in zip(weight_names, weight_values):
       param_dset = g.create_dataset(name, val.shape, dtype=val.dtype)
@@ -753,12 +958,15 @@ def save_weights_to_hdf5_group(f, layers):
         param_dset[:] = val
 
 
-def load_weights_from_hdf5_group(f, layers):
+def load_weights_from_hdf5_group(f, layers, max_chunk_bytes=None):
   """Implements topological (order-based) weight loading.
 
   Arguments:
       f: A pointer to a HDF5 group.
       layers: a list of target layers.
+      max_chunk_bytes: Optional maximum number of bytes of a weight held in
+          memory at once. When set, weights of layers that need no format
+          conversion are streamed from the file in row slices.
 
   Raises:
       ValueError: in case of mismatch between provided layers
@@ -796,12 +1004,18 @@ def load_weights_from_hdf5_group(f, layers):
   # We batch weight value assignments in a single backend call
   # which provides a speedup in TensorFlow.
   weight_value_tuples = []
+  chunked_weight_tuples = []
   for k, name in enumerate(layer_names):
     g = f[name]
     weight_names = load_attributes_from_hdf5_group(g, 'weight_names')
-    weight_values = [np.asarray(g[weight_name]) for weight_name in weight_names]
     layer = filtered_layers[k]
     symbolic_weights = layer.weights
+    if max_chunk_bytes is not None:
+      datasets = [g[weight_name] for weight_name in weight_names]
+      if _can_load_in_chunks(layer, datasets, symbolic_weights):
+        chunked_weight_tuples += zip(symbolic_weights, datasets)
+        continue
+    weight_values = [np.asarray(g[weight_name]) for weight_name in weight_names]
     weight_values = preprocess_weights_for_loading(
         layer, weight_values, original_keras_version, original_backend)
     if len(weight_values) != len(symbolic_weights):
@@ -814,18 +1028,23 @@ def load_weights_from_hdf5_group(f, layers):
                        str(len(weight_values)) + ' elements.')
     weight_value_tuples += zip(symbolic_weights, weight_values)
   K.batch_set_value(weight_value_tuples)
+  _load_weights_in_chunks(chunked_weight_tuples, max_chunk_bytes)
 
 
-def load_weights_from_hdf5_group_by_name(f, layers):
+def load_weights_from_hdf5_group_by_name(f, layers, max_chunk_bytes=None):
   """Implements name-based weight loading.
 
   (instead of topological weight loading).
 
-  Layers that have no matching name are skipped.
+  Layers that have no matching name are skipped, and their weights are never
+  read from the file.
 
   Arguments:
       f: A pointer to a HDF5 group.
       layers: a list of target layers.
+      max_chunk_bytes: Optional maximum number of bytes of a weight held in
+          memory at once. When set, weights of layers that need no format
+          conversion are streamed from the file in row slices.
 
   Raises:
       ValueError: in case of mismatch between provided layers
@@ -852,13 +1071,23 @@ def load_weights_from_hdf5_group_by_name(f, layers):
   # We batch weight value assignments in a single backend call
   # which provides a speedup in TensorFlow.
   weight_value_tuples = []
+  chunked_weight_tuples = []
   for k, name in enumerate(layer_names):
+    if name not in index:
+      continue
     g = f[name]
     weight_names = load_attributes_from_hdf5_group(g, 'weight_names')
-    weight_values = [np.asarray(g[weight_name]) for weight_name in weight_names]
+    datasets = [g[weight_name] for weight_name in weight_names]
+    weight_values = None
 
-    for layer in index.get(name, []):
+    for layer in index[name]:
       symbolic_weights = layer.weights
+      if (max_chunk_bytes is not None and
+          _can_load_in_chunks(layer, datasets, symbolic_weights)):
+        chunked_weight_tuples += zip(symbolic_weights, datasets)
+        continue
+      if weight_values is None:
+        weight_values = [np.asarray(dataset) for dataset in datasets]
       weight_values = preprocess_weights_for_loading(
           layer, weight_values, original_keras_version, original_backend)
       if len(weight_values) != len(symbolic_weights):
@@ -879,6 +1108,7 @@ def load_weights_from_hdf5_group_by_name(f, layers):
         else:
           weight_value_tuples.append((symbolic_weights[i], weight_values[i]))
   K.batch_set_value(weight_value_tuples)
+  _load_weights_in_chunks(chunked_weight_tuples, max_chunk_bytes)
 
 
 def save_attributes_to_hdf5_group(group, name, data):
@@ -251,6 +251,43 @@ class TestWeightSavingAndLoading(test.TestCase, parameterized.TestCase):
 
       self.assertAllClose(y, ref_y)
 
+  def test_chunked_weight_saving_and_loading(self):
+    if h5py is None:
+      return
+
+    temp_dir = self.get_temp_dir()
+    self.addCleanup(shutil.rmtree, temp_dir)
+    h5_path = os.path.join(temp_dir, 'test.h5')
+    chunked_h5_path = os.path.join(temp_dir, 'test_chunked.h5')
+
+    def make_model():
+      model = keras.models.Sequential()
+      model.add(keras.layers.Embedding(37, 4, input_length=2, name='emb'))
+      model.add(keras.layers.Flatten())
+      model.add(keras.layers.BatchNormalization(name='bn'))
+      model.add(keras.layers.Dense(3, name='dense'))
+      return model
+
+    with self.cached_session():
+      x = np.random.randint(0, 37, size=(5, 2))
+      model = make_model()
+      ref_y = model.predict(x)
+      # Chunks of 16 bytes hold a single row of the embedding weights.
+      model.save_weights(chunked_h5_path, max_chunk_bytes=16)
+      model.save_weights(h5_path)
+
+      with h5py.File(h5_path, 'r') as f, h5py.File(chunked_h5_path, 'r') as g:
+        for name in ('emb/emb/embeddings:0', 'dense/dense/kernel:0'):
+          self.assertAllEqual(f[name][()], g[name][()])
+
+      model = make_model()
+      model.load_weights(chunked_h5_path, max_chunk_bytes=16)
+      self.assertAllClose(model.predict(x), ref_y)
+
+      model = make_model()
+      model.load_weights(h5_path, by_name=True, max_chunk_bytes=16)
+      self.assertAllClose(model.predict(x), ref_y)
+
   def test_sequential_weight_loading_group_name_with_incorrect_length(self):
     if h5py is None:
       return
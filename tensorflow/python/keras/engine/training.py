@@ -416,14 +416,29 @@ class Model(Network):
             or a dict mapping output names to target tensors.
         distribute: The DistributionStrategy instance that we want to use to
             distribute the training of the model.
-        **kwargs: These arguments are passed to `tf.Session.run`.
+        **kwargs: Any additional arguments. `steps_per_execution` (integer,
+            defaults to 1) is the number of batches to run during each
+            execution when training or evaluating on arrays in graph mode:
+            the batches of an execution are sliced at once and callbacks are
+            called once per execution, receiving `num_steps` and logs
+            aggregated over the execution. Each batch is still run with its
+            own session call, so only the per-batch callback overhead is
+            amortized, not the session overhead. It is not supported when
+            running eagerly or with a DistributionStrategy. The remaining
+            arguments are passed to `tf.Session.run`.
 
     Raises:
         ValueError: In case of invalid arguments for
-            `optimizer`, `loss`, `metrics` or `sample_weight_mode`.
+            `optimizer`, `loss`, `metrics`, `sample_weight_mode` or
+            `steps_per_execution`.
     """
     run_eagerly = kwargs.pop('run_eagerly', None)
     self._run_eagerly = run_eagerly
+    steps_per_execution = kwargs.pop('steps_per_execution', 1)
+    if not isinstance(steps_per_execution, int) or steps_per_execution < 1:
+      raise ValueError('`steps_per_execution` should be a positive integer, '
+                       'got: %s' % (steps_per_execution,))
+    self._steps_per_execution = steps_per_execution
 
     # Validate that arguments passed by the user to `compile` are supported by
     # DistributionStrategy.
@@ -445,6 +460,9 @@ class Model(Network):
       if target_tensors:
         raise ValueError('target_tensors is not supported with '
                          'DistributionStrategy.')
+      if steps_per_execution > 1:
+        raise NotImplementedError('steps_per_execution is not supported with '
+                                  'DistributionStrategy.')
 
     loss = loss or {}
     if self.run_eagerly and not isinstance(
@@ -469,6 +487,10 @@ class Model(Network):
       raise ValueError(
           'target_tensors argument is not supported when '
           'running a model eagerly.')
+    if self.run_eagerly and steps_per_execution > 1:
+      raise ValueError(
+          'steps_per_execution argument is not supported when '
+          'running a model eagerly.')
     self.target_tensors = target_tensors
 
     # Set DistributionStrategy specific parameters.
@@ -1402,6 +1424,16 @@ class Model(Network):
         'output_%d' % (i + 1) for i in range(len(self.outputs))]
     self.built = True
 
+  def _warn_if_steps_per_execution_ignored(self):
+    """Warns that `steps_per_execution` is ignored when running eagerly.
+
+    `compile` rejects `steps_per_execution` for eager models, but
+    `run_eagerly` can still be set after compiling.
+    """
+    if getattr(self, '_steps_per_execution', 1) > 1:
+      logging.warning('steps_per_execution=%d is ignored when running a model '
+                      'eagerly.' % self._steps_per_execution)
+
   def fit(self,
           x=None,
           y=None,
@@ -1664,6 +1696,7 @@ class Model(Network):
       val_sample_weights = None
 
     if self.run_eagerly:
+      self._warn_if_steps_per_execution_ignored()
       return training_eager.fit_loop(
           self,
           inputs=x,
@@ -1822,6 +1855,7 @@ class Model(Network):
         steps=steps)
 
     if self.run_eagerly:
+      self._warn_if_steps_per_execution_ignored()
       return training_eager.test_loop(
           self,
           inputs=x,
@@ -1853,7 +1887,8 @@ class Model(Network):
               steps=None,
               max_queue_size=10,
               workers=1,
-              use_multiprocessing=False):
+              use_multiprocessing=False,
+              out=None):
     """Generates output predictions for the input samples.
 
     Computation is done in batches.
@@ -1890,6 +1925,12 @@ class Model(Network):
             `False`. Note that because this implementation relies on
             multiprocessing, you should not pass non-picklable arguments to
             the generator as they can't be passed easily to children processes.
+        out: Optional Numpy array (or list of arrays, in case the model has
+            multiple outputs) to write the predictions to instead of
+            allocating new arrays, e.g. a `np.memmap` to store predictions
+            that do not fit in memory. Its first dimension must be the number
+            of samples. Not supported for generator or `keras.utils.Sequence`
+            inputs, nor for models compiled with DistributionStrategy.
 
 
     Returns:
@@ -1901,6 +1942,14 @@ class Model(Network):
             or in case a stateful model receives a number of samples
             that is not a multiple of the batch size.
     """
+    if out is not None:
+      if (data_utils.is_generator_or_sequence(x) or
+          self._distribution_strategy):
+        raise ValueError('`out` is not supported for generator inputs or '
+                         'models compiled with DistributionStrategy.')
+      if not isinstance(out, (list, tuple)):
+        out = [out]
+
     if data_utils.is_generator_or_sequence(x):
       return self.predict_generator(
           x,
@@ -1929,14 +1978,96 @@ class Model(Network):
 
     if self.run_eagerly:
       return training_eager.predict_loop(
-          self, x, batch_size=batch_size, verbose=verbose, steps=steps)
+          self, x, batch_size=batch_size, verbose=verbose, steps=steps,
+          out=out)
     elif self._distribution_strategy:
       results = training_distributed.predict_loop(
           self, x, verbose=verbose, steps=steps)
       return results
     else:
       return training_arrays.predict_loop(
-          self, x, batch_size=batch_size, verbose=verbose, steps=steps)
+          self, x, batch_size=batch_size, verbose=verbose, steps=steps,
+          out=out)
+
+  def predict_batches(self,
+                      x,
+                      batch_size=None,
+                      steps=None,
+                      max_queue_size=10,
+                      workers=1,
+                      use_multiprocessing=False):
+    """Returns an iterator over the output predictions of each batch.
+
+    Unlike `predict`, the predictions are not accumulated in memory: the
+    outputs of each batch are yielded as soon as they are computed, so that
+    they can be streamed to a sink such as a `np.memmap` or a
+    `tf.python_io.TFRecordWriter`.
+
+    ```python
+    with tf.python_io.TFRecordWriter(path) as writer:
+      for batch_predictions in model.predict_batches(x, batch_size=256):
+        for prediction in batch_predictions:
+          writer.write(prediction.tobytes())
+    ```
+
+    Arguments:
+        x: Input samples, with the same structure as in `predict`.
+        batch_size: Integer or `None`.
+            Number of samples per batch.
+            If unspecified, `batch_size` will default to 32.
+            Do not specify the `batch_size` is your data is in the
+            form of symbolic tensors, dataset, dataset iterators,
+            generators, or `keras.utils.Sequence` instances (since they generate
+            batches).
+        steps: Total number of steps (batches of samples)
+            before declaring the prediction round finished.
+            Ignored with the default value of `None`.
+        max_queue_size: Integer. Used for generator or `keras.utils.Sequence`
+            input only. Maximum size for the generator queue.
+        workers: Integer. Used for generator or `keras.utils.Sequence` input
+            only. Maximum number of processes to spin up when using
+            process-based threading. If 0, will execute the generator on the
+            main thread.
+        use_multiprocessing: Boolean. Used for generator or
+            `keras.utils.Sequence` input only. If `True`, use process-based
+            threading.
+
+    Returns:
+        An iterator yielding, for each batch, a Numpy array of predictions
+        (if the model has a single output) or a list of arrays of predictions
+        (if the model has multiple outputs).
+
+    Raises:
+        NotImplementedError: If the model was compiled with
+            DistributionStrategy.
+        ValueError: In case of mismatch between the provided
+            input data and the model's expectations.
+    """
+    if self._distribution_strategy:
+      raise NotImplementedError('`predict_batches` is not supported for '
+                                'models compiled with DistributionStrategy.')
+
+    if data_utils.is_generator_or_sequence(x):
+      batches = training_generator.predict_generator_batches(
+          self,
+          x,
+          steps=steps,
+          max_queue_size=max_queue_size,
+          workers=workers,
+          use_multiprocessing=use_multiprocessing)
+    else:
+      # Same default batch size as `predict`.
+      if batch_size is None and steps is None:
+        batch_size = 32
+      x, _, _ = self._standardize_user_data(
+          x, check_steps=True, steps_name='steps', steps=steps)
+      if self.run_eagerly:
+        batches = training_eager.predict_batches(
+            self, x, batch_size=batch_size, steps=steps)
+      else:
+        batches = training_arrays.predict_batches(
+            self, x, batch_size=batch_size, steps=steps)
+    return (outs[0] if len(outs) == 1 else outs for outs in batches)
 
   def train_on_batch(self, x, y=None, sample_weight=None, class_weight=None):
     """Runs a single gradient update on a single batch of data.
@@ -2372,9 +2503,11 @@ class DistributedCallbackModel(Model):
   def set_original_model(self, orig_model):
     self._original_model = orig_model
 
-  def save_weights(self, filepath, overwrite=True, save_format=None):
+  def save_weights(self, filepath, overwrite=True, save_format=None,
+                   max_chunk_bytes=None):
     self._replicated_model.save_weights(filepath, overwrite=overwrite,
-                                        save_format=save_format)
+                                        save_format=save_format,
+                                        max_chunk_bytes=max_chunk_bytes)
 
   def save(self, filepath, overwrite=True, include_optimizer=True):
     # save weights from the distributed model to the original model
@@ -2384,8 +2517,9 @@ class DistributedCallbackModel(Model):
     # Saving the first replicated model works as well.
     self._original_model.save(filepath, overwrite=True, include_optimizer=False)
 
-  def load_weights(self, filepath, by_name=False):
-    self._original_model.load_weights(filepath, by_name=False)
+  def load_weights(self, filepath, by_name=False, max_chunk_bytes=None):
+    self._original_model.load_weights(filepath, by_name=False,
+                                      max_chunk_bytes=max_chunk_bytes)
     # Copy the weights from the original model to each of the replicated models.
     orig_model_weights = self._original_model.get_weights()
     distributed_training_utils.set_weights(
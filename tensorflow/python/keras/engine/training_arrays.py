@@ -95,14 +95,40 @@ class MetricsAggregator(Aggregator):
 
 
 class OutputsAggregator(Aggregator):
-  """Aggregator that concatenates outputs."""
+  """Aggregator that concatenates outputs.
+
+  Batch outputs are written in place into preallocated arrays, so that no
+  concatenation is needed at the end of the loop. When using `steps`, the
+  number of samples is unknown: the arrays are allocated for `steps` batches
+  of the size of the first batch, grown if needed and trimmed on `finalize`.
+
+  Arguments:
+    use_steps: Whether the loop is using `step` or `batch_size`.
+    num_samples_or_steps: Either `batch_size*num_batches` or `steps`.
+    out: Optional list of arrays (e.g. `np.memmap` instances) to write the
+      outputs to, one per output of the model. Their first dimension must be
+      the number of samples, or at least the total number of samples when
+      `use_steps` is `True`.
+  """
+
+  def __init__(self, use_steps, num_samples_or_steps, out=None):
+    super(OutputsAggregator, self).__init__(use_steps, num_samples_or_steps)
+    self.out = out
+    self._num_rows = 0
 
   def create(self, batch_outs):
-    if self.use_steps:
-      # Cannot pre-allocate the returned NumPy arrays bc
-      # batch sizes are unknown. Concatenate batches at the end.
-      for _ in batch_outs:
-        self.results.append([])
+    if self.out is not None:
+      _check_output_arrays(self.out, batch_outs,
+                           None if self.use_steps else
+                           self.num_samples_or_steps)
+      self.results = list(self.out)
+    elif self.use_steps:
+      # The size of the remaining batches is unknown: assume that they match
+      # the first one, `aggregate` grows the arrays if they do not.
+      for batch_out in batch_outs:
+        shape = ((self.num_samples_or_steps * batch_out.shape[0],) +
+                 batch_out.shape[1:])
+        self.results.append(np.empty(shape, dtype=batch_out.dtype))
     else:
       # Pre-allocate NumPy arrays.
       for batch_out in batch_outs:
@@ -111,15 +137,50 @@ class OutputsAggregator(Aggregator):
 
   def aggregate(self, batch_outs, batch_start=None, batch_end=None):
     if self.use_steps:
+      batch_start = self._num_rows
+      batch_end = batch_start + batch_outs[0].shape[0]
       for i, batch_out in enumerate(batch_outs):
-        self.results[i].append(batch_out)
+        if batch_end > self.results[i].shape[0]:
+          if self.out is not None:
+            raise ValueError('The output array of shape %s is too small to '
+                             'hold %d samples.' %
+                             (self.results[i].shape, batch_end))
+          self.results[i] = _grow_array(self.results[i], batch_start,
+                                        batch_end)
+        self.results[i][batch_start:batch_end] = batch_out
+      self._num_rows = batch_end
     else:
       for i, batch_out in enumerate(batch_outs):
         self.results[i][batch_start:batch_end] = batch_out
 
   def finalize(self):
     if self.use_steps:
-      self.results = [np.concatenate(result, axis=0) for result in self.results]
+      self.results = [
+          result if result.shape[0] == self._num_rows else
+          result[:self._num_rows] for result in self.results
+      ]
+
+
+def _check_output_arrays(out, batch_outs, num_samples=None):
+  """Checks that the arrays passed as `out` can hold the model outputs."""
+  if len(out) != len(batch_outs):
+    raise ValueError('Expected %d output arrays, one per output of the '
+                     'model, but got %d.' % (len(batch_outs), len(out)))
+  for out_array, batch_out in zip(out, batch_outs):
+    if (tuple(out_array.shape[1:]) != tuple(batch_out.shape[1:]) or
+        (num_samples is not None and out_array.shape[0] != num_samples)):
+      raise ValueError('Output array of shape %s cannot hold predictions of '
+                       'shape %s for %s samples.' %
+                       (out_array.shape, (None,) + batch_out.shape[1:],
+                        num_samples if num_samples is not None else 'all'))
+
+
+def _grow_array(array, num_rows, min_size):
+  """Returns a larger copy of the first `num_rows` rows of `array`."""
+  size = max(min_size, 2 * array.shape[0])
+  grown = np.empty((size,) + array.shape[1:], dtype=array.dtype)
+  grown[:num_rows] = array[:num_rows]
+  return grown
 
 
 def _get_model_feed(model, mode):
@@ -178,6 +239,73 @@ def _make_logs(model, outputs, mode, prefix=''):
   return logs
 
 
+def _make_batch_logs(batch, size, num_steps, steps_per_execution):
+  """Used to make logs to send to `on_batch_begin` methods."""
+  batch_logs = {'batch': batch, 'size': size}
+  if steps_per_execution > 1:
+    batch_logs['num_steps'] = num_steps
+  return batch_logs
+
+
+def _group_batches(batches, steps_per_execution):
+  """Groups consecutive batches into executions of `steps_per_execution` steps.
+
+  A trailing partial batch is always run as an execution of its own, so that
+  every execution is made of batches of a single size.
+
+  Arguments:
+      batches: List of `(batch_start, batch_end)` tuples.
+      steps_per_execution: Maximum number of batches per execution.
+
+  Yields:
+      Tuples `(batch_index, execution_batches)` where `batch_index` is the index
+      of the first batch of the execution.
+  """
+  num_batches = len(batches)
+  num_full_batches = num_batches
+  if num_batches > 1:
+    full_size = batches[0][1] - batches[0][0]
+    if batches[-1][1] - batches[-1][0] != full_size:
+      num_full_batches -= 1
+  for batch_index in range(0, num_full_batches, steps_per_execution):
+    yield batch_index, batches[batch_index:min(
+        batch_index + steps_per_execution, num_full_batches)]
+  if num_full_batches < num_batches:
+    yield num_full_batches, batches[num_full_batches:]
+
+
+def _slice_execution_inputs(ins_execution, start, stop):
+  """Slices the inputs of one step out of the inputs of an execution."""
+  return [
+      x if x is None or isinstance(x, int) else x[start:stop]
+      for x in ins_execution
+  ]
+
+
+def _merge_execution_outs(execution_outs, batch_sizes, mode):
+  """Merges the outputs of the steps of one execution into batch logs values.
+
+  The loss is averaged over the steps, weighted by the batch sizes. Metrics are
+  stateful, so the values of the last step are kept.
+
+  Arguments:
+      execution_outs: List of batch-level outputs, one per step.
+      batch_sizes: List of the number of samples (or `1` when using steps)
+        processed by each step.
+      mode: One of 'train'/'test'/'predict'.
+
+  Returns:
+      A list of outputs with the same structure as the batch-level outputs.
+  """
+  if len(execution_outs) == 1 or mode == 'predict':
+    return execution_outs[-1]
+  merged_outs = list(execution_outs[-1])
+  total_size = float(sum(batch_sizes))
+  merged_outs[0] = sum(batch_outs[0] * size for batch_outs, size in zip(
+      execution_outs, batch_sizes)) / total_size
+  return merged_outs
+
+
 def model_iteration(model,
                     inputs,
                     targets=None,
@@ -194,6 +322,7 @@ def model_iteration(model,
                     steps_per_epoch=None,
                     validation_steps=None,
                     mode='train',
+                    out=None,
                     **kwargs):
   """Loop function for arrays of data with modes 'train'/'test'/'predict'.
 
@@ -220,6 +349,8 @@ def model_iteration(model,
       validation_steps: Number of steps to run validation for (only if doing
         validation from data tensors). Ignored with the default value of `None`.
       mode: One of 'train'/'test'/'predict'.
+      out: Optional list of arrays to write the predictions to, one per output
+        of the model. Only used in 'predict' mode.
       **kwargs: Additional arguments for backwards compatibility.
 
   Returns:
@@ -241,6 +372,7 @@ def model_iteration(model,
   # Get step function and loop type.
   f = model._get_execution_function(mode)
   use_steps = steps_per_epoch is not None
+  steps_per_execution = getattr(model, '_steps_per_execution', 1)
   do_validation = val_inputs is not None
 
   # Prepare input data.
@@ -286,7 +418,7 @@ def model_iteration(model,
 
   # Select aggregation method.
   if mode == 'predict':
-    aggregator = OutputsAggregator(use_steps, num_samples_or_steps)
+    aggregator = OutputsAggregator(use_steps, num_samples_or_steps, out=out)
   else:
     aggregator = MetricsAggregator(use_steps, num_samples_or_steps)
 
@@ -308,14 +440,26 @@ def model_iteration(model,
 
     if use_steps:
       # Step-wise loop.
-      for step in range(steps_per_epoch):
-        batch_logs = {'batch': step, 'size': 1}
+      step = 0
+      while step < steps_per_epoch:
+        num_steps = min(steps_per_execution, steps_per_epoch - step)
+        batch_logs = _make_batch_logs(step, 1, num_steps, steps_per_execution)
         callbacks._call_batch_hook(mode, 'begin', step, batch_logs)
         progbar.on_batch_begin(step, batch_logs)
 
         # Get outputs.
+        execution_outs = []
         try:
-          batch_outs = f(ins)
+          for _ in range(num_steps):
+            batch_outs = f(ins)
+            if not isinstance(batch_outs, list):
+              batch_outs = [batch_outs]
+
+            # Aggregate results.
+            if step == 0 and not execution_outs:
+              aggregator.create(batch_outs)
+            aggregator.aggregate(batch_outs)
+            execution_outs.append(batch_outs)
         except errors.OutOfRangeError:
           logging.warning('Your dataset iterator ran out of data; '
                           'interrupting training. Make sure that your dataset '
@@ -325,18 +469,14 @@ def model_iteration(model,
                           'dataset.' %
                           steps_per_epoch * epochs)
           break
-        if not isinstance(batch_outs, list):
-          batch_outs = [batch_outs]
-
-        # Aggregate results.
-        if step == 0:
-          aggregator.create(batch_outs)
-        aggregator.aggregate(batch_outs)
 
         # Callbacks batch end.
+        batch_outs = _merge_execution_outs(execution_outs, [1] * num_steps,
+                                           mode)
         batch_logs.update(_make_logs(model, batch_outs, mode))
         callbacks._call_batch_hook(mode, 'end', step, batch_logs)
         progbar.on_batch_end(step, batch_logs)
+        step += num_steps
 
         if callbacks.model.stop_training:
           break
@@ -349,16 +489,19 @@ def model_iteration(model,
         np.random.shuffle(index_array)
       batches = make_batches(num_samples_or_steps, batch_size)
 
-      for batch_index, (batch_start, batch_end) in enumerate(batches):
-        batch_ids = index_array[batch_start:batch_end]
+      for batch_index, execution_batches in _group_batches(
+          batches, steps_per_execution):
+        execution_start = execution_batches[0][0]
+        execution_end = execution_batches[-1][1]
+        batch_ids = index_array[execution_start:execution_end]
 
-        # Slice into a batch.
+        # Slice all the batches of this execution at once.
         try:
           if ins and isinstance(ins[-1], int):
             # Do not slice the training phase flag.
-            ins_batch = slice_arrays(ins[:-1], batch_ids) + [ins[-1]]
+            ins_execution = slice_arrays(ins[:-1], batch_ids) + [ins[-1]]
           else:
-            ins_batch = slice_arrays(ins, batch_ids)
+            ins_execution = slice_arrays(ins, batch_ids)
         except TypeError:
           raise TypeError('TypeError while preparing batch. '
                           'If using HDF5 input data, '
@@ -367,24 +510,41 @@ def model_iteration(model,
         # Sparse to dense conversion.
         if issparse is not None:
           for i in indices_for_conversion_to_dense:
-            ins_batch[i] = ins_batch[i].toarray()
+            ins_execution[i] = ins_execution[i].toarray()
 
         # Callbacks batch_begin.
-        batch_logs = {'batch': batch_index, 'size': len(batch_ids)}
+        num_steps = len(execution_batches)
+        batch_logs = _make_batch_logs(
+            batch_index, execution_batches[0][1] - execution_batches[0][0],
+            num_steps, steps_per_execution)
         callbacks._call_batch_hook(mode, 'begin', batch_index, batch_logs)
         progbar.on_batch_begin(batch_index, batch_logs)
 
-        # Get outputs.
-        batch_outs = f(ins_batch)
-        if not isinstance(batch_outs, list):
-          batch_outs = [batch_outs]
-
-        # Aggregate results.
-        if batch_index == 0:
-          aggregator.create(batch_outs)
-        aggregator.aggregate(batch_outs, batch_start, batch_end)
+        execution_outs = []
+        batch_sizes = []
+        for batch_start, batch_end in execution_batches:
+          # Take contiguous views of the already sliced arrays.
+          if num_steps == 1:
+            ins_batch = ins_execution
+          else:
+            ins_batch = _slice_execution_inputs(
+                ins_execution, batch_start - execution_start,
+                batch_end - execution_start)
+
+          # Get outputs.
+          batch_outs = f(ins_batch)
+          if not isinstance(batch_outs, list):
+            batch_outs = [batch_outs]
+
+          # Aggregate results.
+          if batch_index == 0 and not execution_outs:
+            aggregator.create(batch_outs)
+          aggregator.aggregate(batch_outs, batch_start, batch_end)
+          execution_outs.append(batch_outs)
+          batch_sizes.append(batch_end - batch_start)
 
         # Callbacks batch end.
+        batch_outs = _merge_execution_outs(execution_outs, batch_sizes, mode)
         batch_logs.update(_make_logs(model, batch_outs, mode))
         callbacks._call_batch_hook(mode, 'end', batch_index, batch_logs)
         progbar.on_batch_end(batch_index, batch_logs)
@@ -423,6 +583,67 @@ def model_iteration(model,
   return results
 
 
+def predict_batches(model, inputs, batch_size=None, steps=None):
+  """Iterates over the predictions of the model on arrays of data.
+
+  Unlike `predict_loop`, the batch-level outputs are not aggregated: they are
+  yielded as soon as they are computed.
+
+  Arguments:
+      model: Keras Model instance.
+      inputs: Either a list of arrays or a dictionary.
+      batch_size: Integer batch size or None if unknown.
+      steps: Total number of steps (batches of samples) to run. Ignored with
+        the default value of `None`.
+
+  Yields:
+      Lists of batch-level outputs, one array per output of the model.
+  """
+  f = model._get_execution_function('predict')
+  inputs = training_utils.ModelInputs(inputs).as_list()
+  if not isinstance(K.symbolic_learning_phase(), int):
+    ins = inputs + [False]
+  else:
+    ins = inputs
+
+  if steps is not None:
+    for _ in range(steps):
+      try:
+        batch_outs = f(ins)
+      except errors.OutOfRangeError:
+        logging.warning('Your dataset iterator ran out of data; '
+                        'interrupting prediction. Make sure that your '
+                        'dataset can generate at least `steps` batches (in '
+                        'this case, %d batches).', steps)
+        return
+      if not isinstance(batch_outs, list):
+        batch_outs = [batch_outs]
+      yield batch_outs
+    return
+
+  indices_for_conversion_to_dense = []
+  if issparse is not None:
+    feed = _get_model_feed(model, 'predict')
+    for i, (input_data, feed_tensor) in enumerate(zip(ins, feed)):
+      if issparse(input_data) and not K.is_sparse(feed_tensor):
+        indices_for_conversion_to_dense.append(i)
+
+  num_samples = _get_num_samples_or_steps(ins, batch_size, None)
+  for batch_start, batch_end in make_batches(num_samples, batch_size):
+    if ins and isinstance(ins[-1], int):
+      # Do not slice the training phase flag.
+      ins_batch = slice_arrays(ins[:-1], batch_start, batch_end) + [ins[-1]]
+    else:
+      ins_batch = slice_arrays(ins, batch_start, batch_end)
+    for i in indices_for_conversion_to_dense:
+      ins_batch[i] = ins_batch[i].toarray()
+
+    batch_outs = f(ins_batch)
+    if not isinstance(batch_outs, list):
+      batch_outs = [batch_outs]
+    yield batch_outs
+
+
 # For backwards compatibility for internal users of these loops.
 fit_loop = functools.partial(model_iteration, mode='train')
 test_loop = functools.partial(model_iteration, mode='test', shuffle=False)
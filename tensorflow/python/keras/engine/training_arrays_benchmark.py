@@ -0,0 +1,69 @@
+# Copyright 2018 The TensorFlow Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Benchmarks for the Keras training loop on plain array data."""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import time
+
+import numpy as np
+
+from tensorflow.python import keras
+from tensorflow.python.framework import ops
+from tensorflow.python.platform import test
+from tensorflow.python.training.gradient_descent import GradientDescentOptimizer
+
+
+class StepsPerExecutionBenchmark(test.Benchmark):
+  """Measures training steps/sec of a small model vs `steps_per_execution`."""
+
+  def _run_fit(self, steps_per_execution, num_batches, batch_size):
+    with ops.Graph().as_default():
+      model = keras.models.Sequential([
+          keras.layers.Dense(16, activation='relu', input_shape=(8,)),
+          keras.layers.Dense(1)
+      ])
+      model.compile(
+          loss='mse',
+          optimizer=GradientDescentOptimizer(0.01),
+          steps_per_execution=steps_per_execution)
+      x = np.random.random((num_batches * batch_size, 8)).astype(np.float32)
+      y = np.random.random((num_batches * batch_size, 1)).astype(np.float32)
+
+      # Warm up to build the training function and the session callable.
+      model.fit(x, y, batch_size=batch_size, epochs=1, verbose=0)
+
+      start = time.time()
+      model.fit(x, y, batch_size=batch_size, epochs=1, verbose=0)
+      return time.time() - start
+
+  def benchmarkStepsPerExecution(self):
+    num_batches = 2000
+    batch_size = 8
+    for steps_per_execution in [1, 4, 16, 64]:
+      wall_time = self._run_fit(steps_per_execution, num_batches, batch_size)
+      steps_per_sec = num_batches / wall_time
+      print('steps_per_execution: %d, steps/sec: %.1f' %
+            (steps_per_execution, steps_per_sec))
+      self.report_benchmark(
+          iters=num_batches,
+          wall_time=wall_time / num_batches,
+          extras={'steps_per_sec': steps_per_sec},
+          name='keras_fit_steps_per_execution_%d' % steps_per_execution)
+
+
+if __name__ == '__main__':
+  test.main()
@@ -21,8 +21,6 @@ from __future__ import print_function
 
 import copy
 
-import numpy as np
-
 from tensorflow.python.data.ops import iterator_ops
 from tensorflow.python.eager.backprop import GradientTape
 from tensorflow.python.framework import errors
@@ -31,6 +29,7 @@ from tensorflow.python.framework import tensor_util
 from tensorflow.python.keras import backend
 from tensorflow.python.keras import callbacks as cbks
 from tensorflow.python.keras import metrics as metrics_module
+from tensorflow.python.keras.engine import training_arrays
 from tensorflow.python.keras.engine import training_utils
 from tensorflow.python.keras.utils import generic_utils
 from tensorflow.python.ops import math_ops
@@ -442,7 +441,8 @@ def iterator_test_loop(model, inputs, steps, verbose=0):
   return outs
 
 
-def iterator_predict_loop(model, inputs, steps, verbose=0):
+def iterator_predict_loop(model, inputs, steps, verbose=0, out=None,
+                          num_samples=None):
   """Predict function for eager execution when input is dataset iterator.
 
   Arguments:
@@ -451,6 +451,10 @@ def iterator_predict_loop(model, inputs, steps, verbose=0):
       steps: Total number of steps (batches of samples) before declaring
           `_predict_loop` finished.
       verbose: Verbosity mode.
+      out: Optional list of arrays to write the predictions to, one per
+          output of the model.
+      num_samples: Number of samples the iterator yields, if known. The
+          arrays in `out` must then have exactly that many rows.
 
   Returns:
       Array of predictions (if the model has a single output)
@@ -460,6 +464,32 @@ def iterator_predict_loop(model, inputs, steps, verbose=0):
       ValueError: In case of mismatch between given number of inputs and
         expectations of the model.
   """
+  _check_predict_iterator(inputs)
+  if verbose == 1:
+    progbar = generic_utils.Progbar(target=steps)
+
+  # The number of samples is not known beforehand, the aggregator writes the
+  # outputs into arrays sized after the first batch and grows them if needed.
+  aggregator = training_arrays.OutputsAggregator(True, steps, out=out)
+  for step_index, batch_outs in enumerate(
+      _iter_predict_batches(model, inputs, steps)):
+    if step_index == 0:
+      if out is not None:
+        # Validate `out` like the graph mode loop does, before writing to it.
+        training_arrays._check_output_arrays(out, batch_outs, num_samples)
+      aggregator.create(batch_outs)
+    aggregator.aggregate(batch_outs)
+
+    if verbose == 1:
+      progbar.update(step_index + 1)
+  aggregator.finalize()
+  outs = aggregator.results
+  if len(outs) == 1:
+    return outs[0]
+  return outs
+
+
+def _check_predict_iterator(inputs):
   assert isinstance(inputs, iterator_ops.EagerIterator)
   if not isinstance(inputs.output_shapes,
                     (list, tuple)) or len(inputs.output_shapes) > 3:
@@ -468,11 +498,11 @@ def iterator_predict_loop(model, inputs, steps, verbose=0):
         ' - `(input)`, or `(input, target)`, or `(input, target,'
         'sample_weights)`. Received %s. We do not use the `target` or'
         '`sample_weights` value here.' % inputs.output_shapes)
-  outs = []
-  if verbose == 1:
-    progbar = generic_utils.Progbar(target=steps)
 
-  for step_index in range(steps):
+
+def _iter_predict_batches(model, inputs, steps):
+  """Yields the batch-level outputs of the model on an eager iterator."""
+  for _ in range(steps):
     # Get data from the iterator.
     try:
       next_element = inputs.get_next()
@@ -482,7 +512,7 @@ def iterator_predict_loop(model, inputs, steps, verbose=0):
           'Make sure that your dataset can generate at least `steps` batches '
           '(in this case, %d batches). You may need to use the repeat() '
           'function when building your dataset.', steps)
-      break
+      return
 
     # expects a tuple, where first element of tuple represents inputs
     x = next_element[0]
@@ -494,29 +524,14 @@ def iterator_predict_loop(model, inputs, steps, verbose=0):
     if isinstance(x, list) and len(x) == 1:
       x = x[0]
 
-    if model._expects_training_arg:
-      batch_outs = model.call(x, training=False)
-    else:
-      batch_outs = model.call(x)
+    with backend.learning_phase_scope(0):
+      if model._expects_training_arg:
+        batch_outs = model.call(x, training=False)
+      else:
+        batch_outs = model.call(x)
     if not isinstance(batch_outs, list):
       batch_outs = [batch_outs]
-
-    # We collect the results from every step and then concatenate them once
-    # in the end. This is an expensive process. We are doing this because we
-    # do not know the number of samples beforehand.
-    if step_index == 0:
-      for _ in batch_outs:
-        outs.append([])
-    for i, batch_out in enumerate(batch_outs):
-      outs[i].append(backend.get_value(batch_out))
-
-    if verbose == 1:
-      progbar.update(step_index + 1)
-  for i, out in enumerate(outs):
-    outs[i] = np.concatenate(tuple(out), axis=0)
-  if len(outs) == 1:
-    return outs[0]
-  return outs
+    yield [backend.get_value(batch_out) for batch_out in batch_outs]
 
 
 def _process_single_batch(model,
@@ -816,7 +831,8 @@ def test_loop(model, inputs, targets,
     return iterator_test_loop(model, inputs, steps, verbose=verbose)
 
 
-def predict_loop(model, inputs, batch_size=32, verbose=0, steps=None):
+def predict_loop(model, inputs, batch_size=32, verbose=0, steps=None,
+                 out=None):
   """Predict function for eager execution.
 
   Arguments:
@@ -827,13 +843,40 @@ def predict_loop(model, inputs, batch_size=32, verbose=0, steps=None):
       steps: Total number of steps (batches of samples)
           before declaring `_predict_loop` finished.
           Ignored with the default value of `None`.
+      out: Optional list of arrays to write the predictions to, one per
+          output of the model.
 
   Returns:
       Array of predictions (if the model has a single output)
       or list of arrays of predictions
       (if the model has multiple outputs).
   """
+  num_samples = None
+  if (out is not None and steps is None and
+      not isinstance(inputs, iterator_ops.EagerIterator)):
+    num_samples = training_utils.check_num_samples(inputs)
   with backend.learning_phase_scope(0):
     inputs, steps = training_utils.convert_to_iterator(
         x=inputs, batch_size=batch_size, steps_per_epoch=steps)
-    return iterator_predict_loop(model, inputs, steps, verbose=verbose)
+    return iterator_predict_loop(model, inputs, steps, verbose=verbose,
+                                 out=out, num_samples=num_samples)
+
+
+def predict_batches(model, inputs, batch_size=32, steps=None):
+  """Returns an iterator over the predictions of the model in eager mode.
+
+  Arguments:
+      model: Model instance.
+      inputs: List of input arrays.
+      batch_size: integer batch size.
+      steps: Total number of steps (batches of samples) to run.
+          Ignored with the default value of `None`.
+
+  Returns:
+      An iterator yielding lists of batch-level outputs, one per output of the
+      model.
+  """
+  inputs, steps = training_utils.convert_to_iterator(
+      x=inputs, batch_size=batch_size, steps_per_epoch=steps)
+  _check_predict_iterator(inputs)
+  return _iter_predict_batches(model, inputs, steps)
@@ -23,6 +23,7 @@ import numpy as np
 
 from tensorflow.python.eager import context
 from tensorflow.python.keras import callbacks as cbks
+from tensorflow.python.keras.engine import training_arrays
 from tensorflow.python.keras.utils.data_utils import GeneratorEnqueuer
 from tensorflow.python.keras.utils.data_utils import iter_sequence_infinite
 from tensorflow.python.keras.utils.data_utils import OrderedEnqueuer
@@ -341,11 +342,57 @@ def predict_generator(model,
                       use_multiprocessing=False,
                       verbose=0):
   """See docstring for `Model.predict_generator`."""
+  steps = _get_predict_steps(generator, steps, workers, use_multiprocessing)
   if not context.executing_eagerly():
     model._make_predict_function()
 
-  steps_done = 0
-  all_outs = []
+  if verbose == 1:
+    progbar = Progbar(target=steps)
+
+  # Outputs are written into preallocated arrays instead of being
+  # concatenated at the end.
+  aggregator = training_arrays.OutputsAggregator(True, steps)
+  batches = _iter_predict_generator(model, generator, steps, max_queue_size,
+                                    workers, use_multiprocessing)
+  for steps_done, outs in enumerate(batches, 1):
+    outs = [np.asarray(out) for out in outs]
+    if steps_done == 1:
+      aggregator.create(outs)
+    aggregator.aggregate(outs)
+    if verbose == 1:
+      progbar.update(steps_done)
+
+  aggregator.finalize()
+  if len(aggregator.results) == 1:
+    return aggregator.results[0]
+  return aggregator.results
+
+
+def predict_generator_batches(model,
+                              generator,
+                              steps=None,
+                              max_queue_size=10,
+                              workers=1,
+                              use_multiprocessing=False):
+  """Returns an iterator over the predictions of the model on a generator.
+
+  Arguments are checked right away; the batches are only drawn from
+  `generator` as the returned iterator is consumed. The enqueuer is stopped
+  once the iterator is exhausted or closed.
+
+  Returns:
+      An iterator yielding lists of batch-level outputs, one per output of the
+      model.
+  """
+  steps = _get_predict_steps(generator, steps, workers, use_multiprocessing)
+  if not context.executing_eagerly():
+    model._make_predict_function()
+  return _iter_predict_generator(model, generator, steps, max_queue_size,
+                                 workers, use_multiprocessing)
+
+
+def _get_predict_steps(generator, steps, workers, use_multiprocessing):
+  """Checks the prediction arguments and returns the number of steps."""
   is_sequence = isinstance(generator, Sequence)
   if not is_sequence and use_multiprocessing and workers > 1:
     logging.warning(
@@ -361,6 +408,13 @@ def predict_generator(model,
                        ' based on the `keras.utils.Sequence` class.'
                        ' Please specify `steps` or use the'
                        ' `keras.utils.Sequence` class.')
+  return steps
+
+
+def _iter_predict_generator(model, generator, steps, max_queue_size, workers,
+                            use_multiprocessing):
+  """Yields the batch-level outputs of the model on `steps` batches."""
+  is_sequence = isinstance(generator, Sequence)
   enqueuer = None
 
   try:
@@ -380,10 +434,7 @@ def predict_generator(model,
       else:
         output_generator = generator
 
-    if verbose == 1:
-      progbar = Progbar(target=steps)
-
-    while steps_done < steps:
+    for _ in range(steps):
       generator_output = next(output_generator)
       if isinstance(generator_output, tuple):
         # Compatibility with the generators
@@ -404,27 +455,8 @@ def predict_generator(model,
       outs = model.predict_on_batch(x)
       if not isinstance(outs, list):
         outs = [outs]
-
-      if not all_outs:
-        for out in outs:
-          all_outs.append([])
-
-      for i, out in enumerate(outs):
-        all_outs[i].append(out)
-      steps_done += 1
-      if verbose == 1:
-        progbar.update(steps_done)
+      yield outs
 
   finally:
     if enqueuer is not None:
       enqueuer.stop()
-
-  if len(all_outs) == 1:
-    if steps_done == 1:
-      return all_outs[0][0]
-    else:
-      return np.concatenate(all_outs[0])
-  if steps_done == 1:
-    return [out[0] for out in all_outs]
-  else:
-    return [np.concatenate(out) for out in all_outs]
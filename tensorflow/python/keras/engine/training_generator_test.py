@@ -271,7 +271,10 @@ class TestGeneratorMethods(test.TestCase):
         validation_data=val_data,
         epochs=2)
     model.evaluate(custom_generator(), steps=2)
-    model.predict(custom_generator(), steps=2)
+    self.assertEqual((20, 1), model.predict(custom_generator(), steps=2).shape)
+
+    batches = list(model.predict_batches(custom_generator(), steps=2))
+    self.assertEqual([(10, 1), (10, 1)], [batch.shape for batch in batches])
 
   @tf_test_util.run_in_graph_and_eager_modes
   def test_sequence_input_to_fit_eval_predict(self):
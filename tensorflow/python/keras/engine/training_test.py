@@ -35,6 +35,7 @@ from tensorflow.python.framework import test_util as tf_test_util
 from tensorflow.python.keras import metrics as metrics_module
 from tensorflow.python.keras import testing_utils
 from tensorflow.python.keras.callbacks import Callback
+from tensorflow.python.keras.engine import training_arrays
 from tensorflow.python.keras.engine.training_utils import weighted_masked_objective
 from tensorflow.python.ops import array_ops
 from tensorflow.python.ops import sparse_ops
@@ -544,6 +545,155 @@ class TrainingTest(test.TestCase):
               'val_loss', 'val_weighted_mean_absolute_error'
           ]))
 
+  def test_fit_and_evaluate_with_steps_per_execution(self):
+    with self.cached_session():
+      input_dim = 5
+      num_classes = 1
+
+      class TestCallback(Callback):
+
+        def __init__(self):
+          super(TestCallback, self).__init__()
+          self.batch_end_logs = []
+
+        def on_batch_end(self, batch, logs=None):
+          self.batch_end_logs.append((batch, dict(logs)))
+
+      np.random.seed(1337)
+      (x_train, y_train), (_, _) = testing_utils.get_test_data(
+          train_samples=11,
+          test_samples=10,
+          input_shape=(input_dim,),
+          num_classes=num_classes)
+
+      model = testing_utils.get_small_sequential_mlp(
+          num_hidden=10, num_classes=num_classes, input_dim=input_dim)
+      model.compile(
+          loss='binary_crossentropy',
+          metrics=['acc'],
+          optimizer=RMSPropOptimizer(learning_rate=0.01))
+      expected_loss = model.evaluate(x_train, y_train, batch_size=2,
+                                     verbose=0)[0]
+
+      model.compile(
+          loss='binary_crossentropy',
+          metrics=['acc'],
+          optimizer=RMSPropOptimizer(learning_rate=0.01),
+          steps_per_execution=2)
+      loss = model.evaluate(x_train, y_train, batch_size=2, verbose=0)[0]
+      self.assertAllClose(expected_loss, loss)
+
+      test_callback = TestCallback()
+      model.fit(
+          x_train,
+          y_train,
+          batch_size=2,
+          epochs=1,
+          verbose=0,
+          callbacks=[test_callback])
+      # 5 full batches grouped by 2, and the partial batch on its own.
+      self.assertEqual([0, 2, 4, 5],
+                       [batch for batch, _ in test_callback.batch_end_logs])
+      self.assertEqual([2, 2, 1, 1], [
+          logs['num_steps'] for _, logs in test_callback.batch_end_logs
+      ])
+      self.assertEqual([2, 2, 2, 1],
+                       [logs['size'] for _, logs in test_callback.batch_end_logs])
+      self.assertSetEqual(
+          set(test_callback.batch_end_logs[0][1].keys()),
+          set(['batch', 'size', 'num_steps', 'acc', 'loss']))
+
+  def test_fit_history_with_steps_per_execution(self):
+    with self.cached_session():
+      np.random.seed(1337)
+      x = np.random.random((11, 3)).astype('float32')
+      y = np.random.random((11, 2)).astype('float32')
+      model = testing_utils.get_small_sequential_mlp(
+          num_hidden=10, num_classes=2, input_dim=3)
+      initial_weights = model.get_weights()
+
+      histories = []
+      for steps_per_execution in (1, 3):
+        model.set_weights(initial_weights)
+        model.compile(
+            loss='mse', optimizer='sgd',
+            steps_per_execution=steps_per_execution)
+        history = model.fit(
+            x, y, batch_size=2, epochs=2, shuffle=False, verbose=0)
+        histories.append(history.history['loss'])
+      # The epoch loss is averaged over the samples, not over the executions.
+      self.assertAllClose(histories[0], histories[1])
+
+  def test_invalid_steps_per_execution(self):
+    model = testing_utils.get_small_sequential_mlp(
+        num_hidden=10, num_classes=2, input_dim=3)
+    with self.assertRaisesRegexp(ValueError, 'steps_per_execution'):
+      model.compile(loss='mse', optimizer='sgd', steps_per_execution=0)
+
+  def test_steps_per_execution_not_supported_eagerly(self):
+    with context.eager_mode():
+      model = testing_utils.get_small_sequential_mlp(
+          num_hidden=10, num_classes=2, input_dim=3)
+      with self.assertRaisesRegexp(ValueError, 'steps_per_execution'):
+        model.compile(
+            loss='mse',
+            optimizer=RMSPropOptimizer(learning_rate=0.01),
+            run_eagerly=True,
+            steps_per_execution=2)
+
+  @tf_test_util.run_in_graph_and_eager_modes
+  def test_predict_batches_and_output_arrays(self):
+    model = testing_utils.get_small_sequential_mlp(
+        num_hidden=10, num_classes=2, input_dim=3)
+    model.compile(loss='mse', optimizer=RMSPropOptimizer(learning_rate=0.01))
+    x = np.random.random((11, 3)).astype('float32')
+    expected = model.predict(x, batch_size=4)
+
+    batches = list(model.predict_batches(x, batch_size=4))
+    self.assertEqual([4, 4, 3], [batch.shape[0] for batch in batches])
+    self.assertAllClose(expected, np.concatenate(batches))
+
+    out = np.zeros((11, 2), dtype='float32')
+    results = model.predict(x, batch_size=4, out=out)
+    self.assertIs(results, out)
+    self.assertAllClose(expected, out)
+
+    with self.assertRaisesRegexp(ValueError, 'cannot hold'):
+      model.predict(x, batch_size=4, out=np.zeros((10, 2), dtype='float32'))
+
+  def test_predict_output_arrays_run_eagerly(self):
+    with context.eager_mode():
+      model = testing_utils.get_small_sequential_mlp(
+          num_hidden=10, num_classes=2, input_dim=3)
+      model.compile(
+          loss='mse',
+          optimizer=RMSPropOptimizer(learning_rate=0.01),
+          run_eagerly=True)
+      x = np.random.random((11, 3)).astype('float32')
+      expected = model.predict(x, batch_size=4)
+
+      out = np.zeros((11, 2), dtype='float32')
+      results = model.predict(x, batch_size=4, out=out)
+      self.assertIs(results, out)
+      self.assertAllClose(expected, out)
+
+      # Arrays of the wrong size are rejected the same way as in graph mode.
+      for rows in (10, 12):
+        with self.assertRaisesRegexp(ValueError, 'cannot hold'):
+          model.predict(
+              x, batch_size=4, out=np.zeros((rows, 2), dtype='float32'))
+      with self.assertRaisesRegexp(ValueError, 'output arrays'):
+        model.predict(x, batch_size=4, out=[out, out])
+
+  def test_outputs_aggregator_with_steps(self):
+    aggregator = training_arrays.OutputsAggregator(True, 2)
+    batches = [np.ones((2, 3)), 2 * np.ones((5, 3)), 3 * np.ones((1, 3))]
+    aggregator.create([batches[0]])
+    for batch in batches:
+      aggregator.aggregate([batch])
+    aggregator.finalize()
+    self.assertAllEqual(np.concatenate(batches), aggregator.results[0])
+
 
 class TestExceptionsAndWarnings(test.TestCase):
 
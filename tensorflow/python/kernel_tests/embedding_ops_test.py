@@ -749,6 +749,69 @@ class EmbeddingLookupSparseTest(test.TestCase):
         embedding_ops.embedding_lookup_sparse(
             x, sp_ids, sp_weights, combiner="mean")
 
+  def testEmbeddingLookupSparseMulti(self):
+    vocab_size = 13
+    param_shape = [2, 5]
+    features = [
+        self._RandomIdsAndWeights(batch_size, vocab_size)[:2]
+        for batch_size in [10, 3, 7]
+    ]
+    sp_ids_list = [sp_ids for sp_ids, _ in features]
+
+    for num_shards, combiner, weighted in itertools.product(
+        [1, 5], ["sum", "mean", "sqrtn"], [[], [0, 2], [0, 1, 2]]):
+      with self.cached_session() as sess:
+        p, _, feed_dict = _EmbeddingParams(
+            num_shards, vocab_size, shape=param_shape, dtype=dtypes.float32)
+        sp_weights_list = [
+            sp_weights if i in weighted else None
+            for i, (_, sp_weights) in enumerate(features)
+        ]
+        expected = [
+            embedding_ops.embedding_lookup_sparse(
+                p, sp_ids, sp_weights, combiner=combiner)
+            for sp_ids, sp_weights in zip(sp_ids_list, sp_weights_list)
+        ]
+        actual = embedding_ops.embedding_lookup_sparse_multi(
+            p, sp_ids_list, sp_weights_list, combiner=combiner)
+
+        self.assertEqual(len(actual), len(sp_ids_list))
+        for output in actual:
+          self.assertEqual(output.get_shape().as_list(),
+                           [None] + param_shape)
+        self.assertAllClose(*sess.run([expected, actual], feed_dict=feed_dict))
+
+  def testEmbeddingLookupSparseMultiEmptyRows(self):
+    with self.cached_session():
+      params = constant_op.constant([[1.0, 2.0], [3.0, 4.0], [5.0, 6.0]])
+      # The last row of the first feature and the first row of the second
+      # feature have no ids.
+      sp_ids_a = sparse_tensor.SparseTensor(
+          constant_op.constant([[0, 0], [0, 1]], dtypes.int64),
+          constant_op.constant([0, 2], dtypes.int64),
+          constant_op.constant([2, 2], dtypes.int64))
+      sp_ids_b = sparse_tensor.SparseTensor(
+          constant_op.constant([[1, 0]], dtypes.int64),
+          constant_op.constant([2], dtypes.int64),
+          constant_op.constant([2, 1], dtypes.int64))
+      sp_weights_b = sparse_tensor.SparseTensor(
+          constant_op.constant([[1, 0]], dtypes.int64),
+          constant_op.constant([2.0], dtypes.float32),
+          constant_op.constant([2, 1], dtypes.int64))
+      outputs = embedding_ops.embedding_lookup_sparse_multi(
+          params, [sp_ids_a, sp_ids_b], [None, sp_weights_b], combiner="mean")
+      self.assertAllClose([[[3.0, 4.0], [0.0, 0.0]],
+                           [[0.0, 0.0], [5.0, 6.0]]], self.evaluate(outputs))
+
+  def testEmbeddingLookupSparseMultiMismatchedWeights(self):
+    sp_ids = sparse_tensor.SparseTensor(
+        constant_op.constant([[0, 0]], dtypes.int64),
+        constant_op.constant([0], dtypes.int64),
+        constant_op.constant([1, 1], dtypes.int64))
+    with self.assertRaisesRegexp(ValueError, "same length"):
+      embedding_ops.embedding_lookup_sparse_multi(
+          constant_op.constant([[1.0]]), [sp_ids, sp_ids], [None])
+
 
 class SafeEmbeddingLookupSparseTest(test.TestCase):
 
@@ -966,6 +1029,29 @@ class SafeEmbeddingLookupSparseTest(test.TestCase):
                         embedding_weights, sparse_ids, sparse_weights)
 
 
+  def test_safe_embedding_lookup_sparse_multi(self):
+    with self.cached_session() as sess:
+      embedding_weights = self._random_weights(num_shards=3)
+      sparse_ids_2d, sparse_weights_2d = self._ids_and_weights_2d()
+      sparse_ids_3d, sparse_weights_3d = self._ids_and_weights_3d()
+      sparse_ids_list = [sparse_ids_2d, sparse_ids_3d, sparse_ids_2d]
+      sparse_weights_list = [sparse_weights_2d, sparse_weights_3d, None]
+
+      for combiner in ["sum", "mean", "sqrtn"]:
+        expected = [
+            embedding_ops.safe_embedding_lookup_sparse(
+                embedding_weights, sparse_ids, sparse_weights,
+                combiner=combiner)
+            for sparse_ids, sparse_weights in zip(sparse_ids_list,
+                                                  sparse_weights_list)
+        ]
+        actual = embedding_ops.safe_embedding_lookup_sparse_multi(
+            embedding_weights, sparse_ids_list, sparse_weights_list,
+            combiner=combiner)
+        self.assertEqual([[None, 4], [None, None, 4], [None, 4]],
+                         [output.get_shape().as_list() for output in actual])
+        self.assertAllClose(*sess.run([expected, actual]))
+
 class DynamicStitchOpTest(test.TestCase):
 
   def testCint32Cpu(self):
@@ -491,6 +491,166 @@ def embedding_lookup_sparse(params,
     return embeddings
 
 
+def embedding_lookup_sparse_multi(params,
+                                  sp_ids_list,
+                                  sp_weights_list=None,
+                                  partition_strategy="mod",
+                                  name=None,
+                                  combiner="mean",
+                                  max_norm=None):
+  """Computes `embedding_lookup_sparse` for several features sharing `params`.
+
+  Calling `embedding_lookup_sparse` once per feature emits a `unique`, a full
+  (possibly partitioned) `embedding_lookup` and a segment reduction for every
+  feature. This function instead concatenates the ids of all features,
+  deduplicates them once, looks up each distinct id once and combines all
+  features with a single segment reduction whose segments are the rows of all
+  features laid end to end. The result is then split back per feature.
+
+  Unlike `embedding_lookup_sparse`, rows without any ids are allowed and
+  produce zero vectors, so the first dimension of every result always equals
+  `dense_shape[0]` of the corresponding `SparseTensor`.
+
+  Args:
+    params: A single tensor representing the complete embedding tensor,
+      or a list of P tensors all of same shape except for the first dimension,
+      representing sharded embedding tensors.  Alternatively, a
+      `PartitionedVariable`, created by partitioning along dimension 0.
+    sp_ids_list: A list of 2-D `SparseTensor`s of ids, each in canonical
+      row-major order. All ids must lie in the range `[0, p0)`, where `p0` is
+      the sum of the size of `params` along dimension 0.
+    sp_weights_list: `None`, or a list of the same length as `sp_ids_list`
+      whose entries are either `None` (all weights are 1) or a `SparseTensor`
+      of float / double weights with the same indices as the matching ids.
+    partition_strategy: A string specifying the partitioning strategy, relevant
+      if `len(params) > 1`. Currently `"div"` and `"mod"` are supported.
+    name: Optional name for the op.
+    combiner: A string specifying the reduction op applied to every feature.
+      Currently "mean", "sqrtn" and "sum" are supported.
+    max_norm: If not `None`, each embedding is clipped if its l2-norm is
+      larger than this value, before combining.
+
+  Returns:
+    A list with one dense tensor per element of `sp_ids_list`, equal to what
+    `embedding_lookup_sparse` returns for that feature.
+
+  Raises:
+    TypeError: If an element of `sp_ids_list` is not a `SparseTensor`, or if
+      an element of `sp_weights_list` is neither `None` nor `SparseTensor`.
+    ValueError: If `combiner` is not one of {"mean", "sqrtn", "sum"}, or if
+      `sp_weights_list` and `sp_ids_list` have different lengths.
+  """
+  if combiner not in ("mean", "sqrtn", "sum"):
+    raise ValueError("combiner must be one of 'mean', 'sqrtn' or 'sum'")
+  if isinstance(params, variables.PartitionedVariable):
+    params = list(params)  # Iterate to get the underlying Variables.
+  if not isinstance(params, list):
+    params = [params]
+  sp_ids_list = list(sp_ids_list)
+  for sp_ids in sp_ids_list:
+    if not isinstance(sp_ids, sparse_tensor.SparseTensor):
+      raise TypeError("sp_ids must be SparseTensor")
+  if sp_weights_list is None:
+    sp_weights_list = [None] * len(sp_ids_list)
+  sp_weights_list = list(sp_weights_list)
+  if len(sp_weights_list) != len(sp_ids_list):
+    raise ValueError("sp_weights_list must have the same length as "
+                     "sp_ids_list, got %d and %d." %
+                     (len(sp_weights_list), len(sp_ids_list)))
+  for sp_weights in sp_weights_list:
+    if (sp_weights is not None and
+        not isinstance(sp_weights, sparse_tensor.SparseTensor)):
+      raise TypeError("sp_weights must be either None or SparseTensor")
+  if not sp_ids_list:
+    return []
+  ignore_weights = all(sp_weights is None for sp_weights in sp_weights_list)
+
+  with ops.name_scope(name, "embedding_lookup_sparse_multi",
+                      params + sp_ids_list) as name:
+    # Give every feature its own range of segments by offsetting its row ids
+    # by the number of rows of the features before it. Each feature is in
+    # canonical order, so the concatenated segment ids stay sorted.
+    ids_dtype = sp_ids_list[0].values.dtype
+    if any(sp_ids.values.dtype != ids_dtype for sp_ids in sp_ids_list):
+      ids_dtype = dtypes.int64
+    all_ids = []
+    all_segment_ids = []
+    num_rows = []
+    num_segments = constant_op.constant(0, dtype=dtypes.int32)
+    for sp_ids in sp_ids_list:
+      all_ids.append(math_ops.cast(sp_ids.values, ids_dtype))
+      all_segment_ids.append(
+          math_ops.cast(sp_ids.indices[:, 0], dtypes.int32) + num_segments)
+      rows = math_ops.cast(sp_ids.dense_shape[0], dtypes.int32)
+      num_rows.append(rows)
+      num_segments += rows
+    segment_ids = array_ops.concat(all_segment_ids, 0)
+    ids, idx = array_ops.unique(array_ops.concat(all_ids, 0))
+
+    embeddings = embedding_lookup(
+        params, ids, partition_strategy=partition_strategy, max_norm=max_norm)
+    if embeddings.dtype in (dtypes.float16, dtypes.bfloat16):
+      embeddings = math_ops.to_float(embeddings)
+
+    if ignore_weights:
+      # The sparse segment kernels gather and reduce in a single pass, without
+      # materializing one embedding per input id.
+      if combiner == "sum":
+        combined = math_ops.sparse_segment_sum(
+            embeddings, idx, segment_ids, num_segments=num_segments)
+      elif combiner == "mean":
+        combined = math_ops.sparse_segment_mean(
+            embeddings, idx, segment_ids, num_segments=num_segments)
+      else:
+        combined = math_ops.sparse_segment_sqrt_n(
+            embeddings, idx, segment_ids, num_segments=num_segments)
+    else:
+      weights = []
+      for sp_ids, sp_weights in zip(sp_ids_list, sp_weights_list):
+        if sp_weights is None:
+          weights.append(
+              array_ops.ones_like(sp_ids.values, dtype=embeddings.dtype))
+        else:
+          sp_ids.values.get_shape().assert_is_compatible_with(
+              sp_weights.values.get_shape())
+          weights.append(math_ops.cast(sp_weights.values, embeddings.dtype))
+      weights = array_ops.concat(weights, 0)
+
+      # A sparse [num_segments, num_ids] matrix of weights gathers, scales and
+      # sums the embeddings in a single matmul, without materializing one
+      # embedding per input id.
+      num_ids = array_ops.shape(ids)[0]
+      weight_matrix = sparse_tensor.SparseTensor(
+          array_ops.stack(
+              [math_ops.to_int64(segment_ids), math_ops.to_int64(idx)], 1),
+          weights,
+          math_ops.to_int64(array_ops.stack([num_segments, num_ids])))
+      combined = sparse_ops.sparse_tensor_dense_matmul(
+          weight_matrix, array_ops.reshape(embeddings, [num_ids, -1]))
+      if combiner == "mean":
+        weight_sum = math_ops.unsorted_segment_sum(weights, segment_ids,
+                                                   num_segments)
+        combined = math_ops.div_no_nan(
+            combined, array_ops.expand_dims(weight_sum, 1))
+      elif combiner == "sqrtn":
+        weight_sum = math_ops.unsorted_segment_sum(
+            math_ops.square(weights), segment_ids, num_segments)
+        combined = math_ops.div_no_nan(
+            combined, array_ops.expand_dims(math_ops.sqrt(weight_sum), 1))
+      combined = array_ops.reshape(
+          combined,
+          array_ops.concat([[num_segments], array_ops.shape(embeddings)[1:]],
+                           0))
+
+    outputs = array_ops.split(
+        combined, array_ops.stack(num_rows), num=len(sp_ids_list), name=name)
+    for output in outputs:
+      output.set_shape(
+          tensor_shape.TensorShape([None]).concatenate(
+              embeddings.get_shape()[1:]))
+    return outputs
+
+
 @tf_export("nn.safe_embedding_lookup_sparse")
 def safe_embedding_lookup_sparse(embedding_weights,
                                  sparse_ids,
@@ -560,28 +720,9 @@ def safe_embedding_lookup_sparse(embedding_weights,
   with ops.name_scope(name, 'embedding_lookup',
                       embedding_weights + [sparse_ids,
                                            sparse_weights]) as scope:
-    # Reshape higher-rank sparse ids and weights to linear segment ids.
     original_shape = sparse_ids.dense_shape
-    original_rank_dim = tensor_shape.dimension_value(
-        sparse_ids.dense_shape.get_shape()[0])
-    original_rank = (
-        array_ops.size(original_shape)
-        if original_rank_dim is None
-        else original_rank_dim)
-    sparse_ids = sparse_ops.sparse_reshape(sparse_ids, [
-        math_ops.reduce_prod(
-            array_ops.slice(original_shape, [0], [original_rank - 1])),
-        array_ops.gather(original_shape, original_rank - 1)])
-    if sparse_weights is not None:
-      sparse_weights = sparse_tensor.SparseTensor(
-          sparse_ids.indices,
-          sparse_weights.values, sparse_ids.dense_shape)
-
-    # Prune invalid ids and weights.
-    sparse_ids, sparse_weights = _prune_invalid_ids(sparse_ids, sparse_weights)
-    if combiner != 'sum':
-      sparse_ids, sparse_weights = _prune_invalid_weights(
-          sparse_ids, sparse_weights)
+    sparse_ids, sparse_weights = _reshape_and_prune_sparse_ids(
+        sparse_ids, sparse_weights, combiner)
 
     # Fill in dummy values for empty features, if necessary.
     sparse_ids, is_row_empty = sparse_ops.sparse_fill_empty_rows(sparse_ids,
@@ -611,19 +752,140 @@ def safe_embedding_lookup_sparse(embedding_weights,
                                result,
                                name=scope)
 
-    # Reshape back from linear ids back into higher-dimensional dense result.
-    final_result = array_ops.reshape(
-        result,
-        array_ops.concat([
-            array_ops.slice(
-                math_ops.cast(original_shape, dtypes.int32), [0],
-                [original_rank - 1]),
-            array_ops.slice(array_ops.shape(result), [1], [-1])
-        ], 0))
-    final_result.set_shape(tensor_shape.unknown_shape(
-        (tensor_shape.Dimension(original_rank_dim) - 1).value).concatenate(
-            result.get_shape()[1:]))
-    return final_result
+    return _reshape_embeddings(result, original_shape)
+
+
+def safe_embedding_lookup_sparse_multi(embedding_weights,
+                                       sparse_ids_list,
+                                       sparse_weights_list=None,
+                                       combiner='mean',
+                                       name=None,
+                                       partition_strategy='div',
+                                       max_norm=None):
+  """Computes `safe_embedding_lookup_sparse` for features sharing a table.
+
+  Invalid ids and weights are pruned from every feature as in
+  `safe_embedding_lookup_sparse`, and all features are then looked up with a
+  single `embedding_lookup_sparse_multi`, which looks up each distinct id once.
+  Entries without valid ids get the 0-vector. This is the lookup used for the
+  shared embedding columns of a feature layer.
+
+  Args:
+    embedding_weights: A list of `P` float `Tensor`s or values representing
+        partitioned embedding `Tensor`s, or a `PartitionedVariable`, as for
+        `safe_embedding_lookup_sparse`.
+    sparse_ids_list: A list of `SparseTensor`s of ids, each of shape
+        `[d_0, d_1, ..., d_n]` and in canonical row-major order.
+    sparse_weights_list: `None`, or a list of the same length as
+        `sparse_ids_list` whose entries are either `None` (all weights are 1.0)
+        or a `SparseTensor` of weights with the same indices as the matching
+        ids.
+    combiner: A string specifying how to combine embedding results for each
+        entry. Currently "mean", "sqrtn" and "sum" are supported, with "mean"
+        the default.
+    name: A name for this operation (optional).
+    partition_strategy: A string specifying the partitioning strategy.
+        Currently `"div"` and `"mod"` are supported. Default is `"div"`.
+    max_norm: If not `None`, all embeddings are l2-normalized to max_norm before
+        combining.
+
+  Returns:
+    A list with one dense `Tensor` per element of `sparse_ids_list`, equal to
+    what `safe_embedding_lookup_sparse` returns for that feature.
+
+  Raises:
+    ValueError: if `embedding_weights` is empty, or if `sparse_weights_list`
+      and `sparse_ids_list` have different lengths.
+  """
+  if embedding_weights is None:
+    raise ValueError('Missing embedding_weights %s.' % embedding_weights)
+  if isinstance(embedding_weights, variables.PartitionedVariable):
+    embedding_weights = list(embedding_weights)  # get underlying Variables.
+  if not isinstance(embedding_weights, list):
+    embedding_weights = [embedding_weights]
+  if len(embedding_weights) < 1:
+    raise ValueError('Missing embedding_weights %s.' % embedding_weights)
+  sparse_ids_list = list(sparse_ids_list)
+  if sparse_weights_list is None:
+    sparse_weights_list = [None] * len(sparse_ids_list)
+  sparse_weights_list = list(sparse_weights_list)
+  if len(sparse_weights_list) != len(sparse_ids_list):
+    raise ValueError('sparse_weights_list must have the same length as '
+                     'sparse_ids_list, got %d and %d.' %
+                     (len(sparse_weights_list), len(sparse_ids_list)))
+
+  with ops.name_scope(name, 'embedding_lookup_multi',
+                      embedding_weights + sparse_ids_list):
+    original_shapes = []
+    flat_ids_list = []
+    flat_weights_list = []
+    for sparse_ids, sparse_weights in zip(sparse_ids_list,
+                                          sparse_weights_list):
+      original_shapes.append(sparse_ids.dense_shape)
+      sparse_ids, sparse_weights = _reshape_and_prune_sparse_ids(
+          sparse_ids, sparse_weights, combiner)
+      flat_ids_list.append(sparse_ids)
+      flat_weights_list.append(sparse_weights)
+    results = embedding_lookup_sparse_multi(
+        embedding_weights,
+        flat_ids_list,
+        flat_weights_list,
+        partition_strategy=partition_strategy,
+        combiner=combiner,
+        max_norm=max_norm)
+    return [
+        _reshape_embeddings(result, original_shape)
+        for result, original_shape in zip(results, original_shapes)
+    ]
+
+
+def _reshape_and_prune_sparse_ids(sparse_ids, sparse_weights, combiner):
+  """Reshapes ids and weights to 2-D and prunes the invalid ones."""
+  # Reshape higher-rank sparse ids and weights to linear segment ids.
+  original_shape = sparse_ids.dense_shape
+  original_rank_dim = tensor_shape.dimension_value(
+      sparse_ids.dense_shape.get_shape()[0])
+  original_rank = (
+      array_ops.size(original_shape)
+      if original_rank_dim is None
+      else original_rank_dim)
+  sparse_ids = sparse_ops.sparse_reshape(sparse_ids, [
+      math_ops.reduce_prod(
+          array_ops.slice(original_shape, [0], [original_rank - 1])),
+      array_ops.gather(original_shape, original_rank - 1)])
+  if sparse_weights is not None:
+    sparse_weights = sparse_tensor.SparseTensor(
+        sparse_ids.indices,
+        sparse_weights.values, sparse_ids.dense_shape)
+
+  # Prune invalid ids and weights.
+  sparse_ids, sparse_weights = _prune_invalid_ids(sparse_ids, sparse_weights)
+  if combiner != 'sum':
+    sparse_ids, sparse_weights = _prune_invalid_weights(
+        sparse_ids, sparse_weights)
+  return sparse_ids, sparse_weights
+
+
+def _reshape_embeddings(result, original_shape):
+  """Reshapes embeddings of linear ids back to the shape of the ids."""
+  original_rank_dim = tensor_shape.dimension_value(
+      original_shape.get_shape()[0])
+  original_rank = (
+      array_ops.size(original_shape)
+      if original_rank_dim is None
+      else original_rank_dim)
+  final_result = array_ops.reshape(
+      result,
+      array_ops.concat([
+          array_ops.slice(
+              math_ops.cast(original_shape, dtypes.int32), [0],
+              [original_rank - 1]),
+          array_ops.slice(array_ops.shape(result), [1], [-1])
+      ], 0))
+  final_result.set_shape(tensor_shape.unknown_shape(
+      (tensor_shape.Dimension(original_rank_dim) - 1).value).concatenate(
+          result.get_shape()[1:]))
+  return final_result
 
 
 def _prune_invalid_ids(sparse_ids, sparse_weights):
@@ -0,0 +1,103 @@
+# Copyright 2018 The TensorFlow Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Benchmark for sparse embedding lookups of features sharing a table."""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import numpy as np
+
+from tensorflow.python.client import session
+from tensorflow.python.framework import constant_op
+from tensorflow.python.framework import ops
+from tensorflow.python.framework import sparse_tensor
+from tensorflow.python.ops import control_flow_ops
+from tensorflow.python.ops import embedding_ops
+from tensorflow.python.platform import test
+
+
+class EmbeddingLookupSparseBenchmark(test.Benchmark):
+  """Compares per-feature `embedding_lookup_sparse` with the fused lookup."""
+
+  VOCAB_SIZE = 100000
+  EMBEDDING_DIM = 32
+  BATCH_SIZE = 512
+  IDS_PER_ROW = 8
+
+  def _build(self, num_features, num_shards, weighted):
+    rng = np.random.RandomState(0)
+    params = [
+        constant_op.constant(
+            rng.rand(self.VOCAB_SIZE // num_shards,
+                     self.EMBEDDING_DIM).astype(np.float32))
+        for _ in range(num_shards)
+    ]
+    vocab_size = (self.VOCAB_SIZE // num_shards) * num_shards
+    indices = np.array(
+        [[row, col] for row in range(self.BATCH_SIZE)
+         for col in range(self.IDS_PER_ROW)], dtype=np.int64)
+    dense_shape = [self.BATCH_SIZE, self.IDS_PER_ROW]
+    sp_ids_list = []
+    sp_weights_list = []
+    for _ in range(num_features):
+      # Zipf-distributed ids, so that features share many of their ids.
+      ids = (rng.zipf(1.2, size=len(indices)) - 1) % vocab_size
+      sp_ids_list.append(
+          sparse_tensor.SparseTensor(indices, ids.astype(np.int64),
+                                     dense_shape))
+      sp_weights_list.append(
+          sparse_tensor.SparseTensor(
+              indices, rng.rand(len(indices)).astype(np.float32),
+              dense_shape) if weighted else None)
+    return params, sp_ids_list, sp_weights_list
+
+  def _run(self, num_features, num_shards, weighted, fused):
+    name = "embedding_lookup_sparse_%s_%d_features_%d_shards%s" % (
+        "fused" if fused else "per_feature", num_features, num_shards,
+        "_weighted" if weighted else "")
+    with ops.Graph().as_default() as g:
+      params, sp_ids_list, sp_weights_list = self._build(
+          num_features, num_shards, weighted)
+      num_ops_before = len(g.get_operations())
+      if fused:
+        outputs = embedding_ops.embedding_lookup_sparse_multi(
+            params, sp_ids_list, sp_weights_list, combiner="mean")
+      else:
+        outputs = [
+            embedding_ops.embedding_lookup_sparse(
+                params, sp_ids, sp_weights, combiner="mean")
+            for sp_ids, sp_weights in zip(sp_ids_list, sp_weights_list)
+        ]
+      num_lookup_ops = len(g.get_operations()) - num_ops_before
+      with session.Session() as sess:
+        self.run_op_benchmark(
+            sess,
+            control_flow_ops.group(*outputs),
+            burn_iters=5,
+            min_iters=50,
+            name=name,
+            extras={"num_lookup_ops": num_lookup_ops})
+
+  def benchmark_embedding_lookup_sparse(self):
+    for num_features in [1, 8, 32]:
+      for num_shards in [1, 16]:
+        for weighted in [False, True]:
+          for fused in [False, True]:
+            self._run(num_features, num_shards, weighted, fused)
+
+
+if __name__ == "__main__":
+  test.main()
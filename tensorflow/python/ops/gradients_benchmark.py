@@ -0,0 +1,82 @@
+# Copyright 2018 The TensorFlow Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Benchmark for the construction of gradients of large graphs."""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import time
+
+from tensorflow.python.framework import dtypes
+from tensorflow.python.framework import ops
+from tensorflow.python.ops import array_ops
+from tensorflow.python.ops import gradients_impl
+from tensorflow.python.ops import math_ops
+from tensorflow.python.platform import test
+
+
+class GradientsBenchmark(test.Benchmark):
+  """Measures the time to build `tf.gradients` of graphs with 10^5 ops."""
+
+  NUM_OPS = 100000
+  NUM_CALLS = 5
+
+  def _build_chain(self):
+    """Builds a deep chain of MatMul and Tanh ops with unused side outputs."""
+    x = array_ops.placeholder(dtypes.float32, [1, 8])
+    w = array_ops.placeholder(dtypes.float32, [8, 8])
+    intermediates = []
+    # Three ops per layer: the side output is not an ancestor of the loss.
+    for _ in range(self.NUM_OPS // 3):
+      x = math_ops.tanh(math_ops.matmul(x, w))
+      math_ops.square(x)
+      intermediates.append(x)
+    return math_ops.reduce_sum(x), w, intermediates
+
+  def _report(self, name, wall_times, num_ops):
+    self.report_benchmark(
+        name=name,
+        iters=len(wall_times),
+        wall_time=sum(wall_times) / len(wall_times),
+        extras={"first_call_wall_time": wall_times[0],
+                "num_forward_ops": num_ops})
+
+  def benchmark_repeated_gradients_of_same_ys(self):
+    """Gradients of the same loss with respect to different tensors."""
+    with ops.Graph().as_default() as g:
+      loss, _, intermediates = self._build_chain()
+      num_ops = len(g.get_operations())
+      step = len(intermediates) // self.NUM_CALLS
+      wall_times = []
+      for i in range(self.NUM_CALLS):
+        start_time = time.time()
+        gradients_impl.gradients(loss, intermediates[i * step])
+        wall_times.append(time.time() - start_time)
+    self._report("repeated_gradients_of_same_ys", wall_times, num_ops)
+
+  def benchmark_gradients_of_deep_chain(self):
+    """A single gradients call over the whole chain."""
+    with ops.Graph().as_default() as g:
+      loss, w, _ = self._build_chain()
+      num_ops = len(g.get_operations())
+      start_time = time.time()
+      gradients_impl.gradients(loss, w)
+      wall_times = [time.time() - start_time]
+    self._report("gradients_of_deep_chain", wall_times, num_ops)
+
+
+if __name__ == "__main__":
+  test.main()
@@ -117,7 +117,7 @@ ops.register_tensor_conversion_function(ops.IndexedSlices,
                                         _IndexedSlicesToTensor)
 
 
-def _MarkReachedOps(from_ops, reached_ops, func_graphs):
+def _MarkReachedOps(from_ops, reached_ops, func_graphs, index=None):
   """Mark all ops reached from "from_ops".
 
   Args:
@@ -125,6 +125,8 @@ def _MarkReachedOps(from_ops, reached_ops, func_graphs):
     reached_ops: set of Operations.
     func_graphs: list of FuncGraphs. This method will traverse through
       these functions if they capture from_ops or any reachable ops.
+    index: Optional `_ReachabilityIndex`. If set, only the ops of
+      `index.ancestors` are traversed.
   """
   queue = collections.deque()
   queue.extend(from_ops)
@@ -134,11 +136,80 @@ def _MarkReachedOps(from_ops, reached_ops, func_graphs):
       reached_ops.add(op)
       for output in op.outputs:
         if _IsBackpropagatable(output):
-          queue.extend(_Consumers(output, func_graphs))
+          if index is None:
+            queue.extend(_Consumers(output, func_graphs))
+          else:
+            queue.extend(index.consumers(output))
+
+
+class _ReachabilityIndex(object):
+  """The ops from which a list of ops can be reached, with their consumers.
+
+  Only the ancestors of `to_ops` can be between the `xs` and the `ys` of a
+  gradient computation, so the forward traversal from the `xs` can be
+  restricted to them. Indices are cached on the graph by
+  `_GetReachabilityIndex` so that computing the gradients of the same `ys`
+  with respect to different `xs` does not walk the whole graph again.
+
+  Ops created after the index cannot be ancestors of `to_ops` unless the
+  inputs of an existing op are updated, which `is_valid` detects.
+  """
+
+  def __init__(self, to_ops, func_graphs):
+    self._func_graphs = func_graphs
+    self.ancestors = set()
+    queue = collections.deque(to_ops)
+    while queue:
+      op = queue.popleft()
+      if op not in self.ancestors:
+        self.ancestors.add(op)
+        queue.extend(_AllInputOps(op))
+    # pylint: disable=protected-access
+    self._inputs_versions = {}
+    for graph in set(op.graph for op in self.ancestors):
+      graph._inputs_version_max_op_id = graph._last_id
+      self._inputs_versions[graph] = graph._inputs_version
+    # pylint: enable=protected-access
+    self._consumers = {}
+
+  def is_valid(self):
+    """Whether no input of the ops of the index has been updated since."""
+    return all(graph._inputs_version == version  # pylint: disable=protected-access
+               for graph, version in self._inputs_versions.items())
+
+  def consumers(self, t):
+    """Returns the consumers of `t` which are ancestors of `to_ops`."""
+    consumers = self._consumers.get(t)
+    if consumers is None:
+      consumers = [
+          op for op in _Consumers(t, self._func_graphs) if op in self.ancestors
+      ]
+      self._consumers[t] = consumers
+    return consumers
+
+
+# Maximum number of `_ReachabilityIndex` cached per graph.
+_MAX_REACHABILITY_INDICES = 8
+
+
+def _GetReachabilityIndex(graph, to_ops, func_graphs):
+  """Returns a cached `_ReachabilityIndex` for `to_ops`, or builds one."""
+  key = tuple(to_ops)
+  # pylint: disable=protected-access
+  with graph._lock:
+    indices = graph._reachability_indices
+    index = indices.pop(key, None)
+    if index is None or not index.is_valid():
+      index = _ReachabilityIndex(to_ops, func_graphs)
+    indices[key] = index
+    while len(indices) > _MAX_REACHABILITY_INDICES:
+      indices.popitem(last=False)
+  # pylint: enable=protected-access
+  return index
 
 
 def _PendingCount(to_ops, from_ops, colocate_gradients_with_ops, func_graphs,
-                  xs):
+                  xs, index=None):
   """Initialize the pending count for ops between two lists of Operations.
 
   'pending_count[op]' indicates the number of backprop inputs
@@ -153,6 +224,7 @@ def _PendingCount(to_ops, from_ops, colocate_gradients_with_ops, func_graphs,
       useful if to_ops occur in a function and from_ops are in an outer function
       or graph.
     xs: list of Tensors.
+    index: Optional `_ReachabilityIndex` of `to_ops`.
 
   Returns:
     A tuple containing: (1) the subset of to_ops reachable from from_ops by a
@@ -163,7 +235,7 @@ def _PendingCount(to_ops, from_ops, colocate_gradients_with_ops, func_graphs,
   """
   # Mark reachable ops from from_ops.
   reached_ops = set()
-  _MarkReachedOps(from_ops, reached_ops, func_graphs)
+  _MarkReachedOps(from_ops, reached_ops, func_graphs, index=index)
   # X in reached_ops iff X is reachable from from_ops by a path of zero or more
   # backpropagatable tensors.
 
@@ -521,6 +593,17 @@ def _NonEagerInputs(op, xs):
     return op.inputs
 
 
+def _AllInputOps(op):
+  """Returns the input ops of op, including the ops of captured inputs."""
+  input_ops = [t.op for t in op.inputs]
+  if _IsFunction(op.graph):
+    for t in op.inputs:
+      captured = _MaybeCaptured(t)
+      if captured is not t and not isinstance(captured, ops.EagerTensor):
+        input_ops.append(captured.op)
+  return input_ops
+
+
 def _Consumers(t, func_graphs):
   """Returns the consumers of t, crossing closure boundaries where necessary.
 
@@ -726,8 +809,10 @@ def _GradientsHelper(ys,
     to_ops = [t.op for t in ys]
     from_ops = [t.op for t in xs]
     stop_gradient_ops = [t.op for t in stop_gradients]
+    index = _GetReachabilityIndex(src_graph, to_ops, func_graphs)
     reachable_to_ops, pending_count, loop_state = _PendingCount(
-        to_ops, from_ops, colocate_gradients_with_ops, func_graphs, xs)
+        to_ops, from_ops, colocate_gradients_with_ops, func_graphs, xs,
+        index=index)
 
     # Iterate over the collected ops.
     #
@@ -1110,23 +1195,32 @@ def _AggregatedGrads(grads,
       if isinstance(out_grad, (ops.Tensor, ops.IndexedSlices)):
         assert control_flow_util.IsLoopSwitch(op)
         continue
-    # Grads have to be Tensors or IndexedSlices
-    if (isinstance(out_grad, collections.Sequence) and not all([
-        isinstance(g, (ops.Tensor, ops.IndexedSlices))
-        for g in out_grad
-        if g is not None
-    ])):
-      raise TypeError("gradients have to be either all Tensors "
-                      "or all IndexedSlices")
     # Aggregate multiple gradients, and convert [] to None.
     if out_grad:
       if len(out_grad) < 2:
-        used = "nop"
+        # Grads have to be Tensors or IndexedSlices
+        if (out_grad[0] is not None and
+            not isinstance(out_grad[0], (ops.Tensor, ops.IndexedSlices))):
+          raise TypeError("gradients have to be either all Tensors "
+                          "or all IndexedSlices")
         out_grads[i] = out_grad[0]
-      elif all([isinstance(g, ops.Tensor) for g in out_grad if g is not None]):
-        tensor_shape = _AccumulatorShape(out_grad)
+        continue
+      # Classify the gradients in a single pass over the list.
+      all_tensors = True
+      for g in out_grad:
+        if g is None or isinstance(g, ops.Tensor):
+          continue
+        if not isinstance(g, ops.IndexedSlices):
+          # Grads have to be Tensors or IndexedSlices
+          raise TypeError("gradients have to be either all Tensors "
+                          "or all IndexedSlices")
+        all_tensors = False
+      if all_tensors:
+        tensor_shape = None
         if (aggregation_method == AggregationMethod.EXPERIMENTAL_ACCUMULATE_N
-            and len(out_grad) > 2 and tensor_shape.is_fully_defined()):
+            and len(out_grad) > 2):
+          tensor_shape = _AccumulatorShape(out_grad)
+        if tensor_shape is not None and tensor_shape.is_fully_defined():
           # The benefit of using AccumulateN is that its inputs can be combined
           # in any order and this can allow the expression to be evaluated with
           # a smaller memory footprint.  When used with gpu_allocator_retry,
@@ -384,6 +384,36 @@ class GradientsTest(test_util.TensorFlowTestCase):
           ValueError, "Unknown value for unconnected_gradients: 'nonsense'"):
         gradients.gradients([y], [x], unconnected_gradients="nonsense")
 
+  def testReachabilityIndexReusedAcrossCalls(self):
+    with ops.Graph().as_default() as g:
+      x = constant(2.0)
+      y = x * 3.0
+      z = y * y
+      # Not an ancestor of `z`, must not be traversed.
+      unused = x * 5.0
+      dz_dx = gradients.gradients(z, x)[0]
+      self.assertEqual(1, len(g._reachability_indices))
+      index = list(g._reachability_indices.values())[0]
+      self.assertNotIn(unused.op, index.ancestors)
+      dz_dy = gradients.gradients(z, y)[0]
+      self.assertIs(index, list(g._reachability_indices.values())[0])
+      with self.cached_session() as sess:
+        self.assertAllClose([36.0, 12.0], sess.run([dz_dx, dz_dy]))
+
+  def testReachabilityIndexInvalidatedByInputUpdate(self):
+    with ops.Graph().as_default() as g:
+      x = constant(2.0)
+      w = constant(4.0)
+      y = array_ops.identity(x)
+      z = y * 3.0
+      self.assertIsNone(gradients.gradients(z, w)[0])
+      index = list(g._reachability_indices.values())[0]
+      y.op._update_input(0, w)
+      self.assertFalse(index.is_valid())
+      dz_dw = gradients.gradients(z, w)[0]
+      with self.cached_session():
+        self.assertAllClose(3.0, self.evaluate(dz_dw))
+
 
 class FunctionGradientsTest(test_util.TensorFlowTestCase):
 
@@ -19,14 +19,21 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
+import collections
+import heapq
 import os
+import threading
+import weakref
 
 from google.protobuf import message
 from google.protobuf import text_format
 
 from tensorflow.core.protobuf import meta_graph_pb2
 from tensorflow.core.protobuf import saved_model_pb2
+from tensorflow.python.framework import dtypes
 from tensorflow.python.framework import ops
+from tensorflow.python.framework import tensor_shape
+from tensorflow.python.framework import tensor_util
 from tensorflow.python.lib.io import file_io
 from tensorflow.python.ops import variables
 from tensorflow.python.platform import tf_logging
@@ -82,6 +89,123 @@ def _parse_saved_model(export_dir):
                    constants.SAVED_MODEL_FILENAME_PB))
 
 
+# Parsed `SavedModel` protos shared by the loaders created with
+# `cache_saved_model=True`, keyed by export directory. Each entry also records
+# the size and modification time of the file it was parsed from, so that
+# re-exports to the same directory are picked up.
+_SAVED_MODEL_CACHE = collections.OrderedDict()
+_SAVED_MODEL_CACHE_LOCK = threading.Lock()
+_MAX_CACHED_SAVED_MODELS = 64
+
+
+def _get_saved_model_file_stats(export_dir):
+  """Returns the (size, mtime) of the SavedModel file, or None if missing."""
+  for filename in (constants.SAVED_MODEL_FILENAME_PB,
+                   constants.SAVED_MODEL_FILENAME_PBTXT):
+    path = os.path.join(compat.as_bytes(export_dir), compat.as_bytes(filename))
+    if file_io.file_exists(path):
+      file_statistics = file_io.stat(path)
+      return file_statistics.length, file_statistics.mtime_nsec
+  return None
+
+
+def _parse_saved_model_cached(export_dir):
+  """Like `_parse_saved_model`, but reuses previously parsed protos.
+
+  Args:
+    export_dir: Directory containing the SavedModel file.
+
+  Returns:
+    A `SavedModel` protocol buffer, which may be shared with other loaders and
+    must not be modified.
+
+  Raises:
+    IOError: If the file does not exist, or cannot be successfully parsed.
+  """
+  key = compat.as_bytes(export_dir)
+  file_stats = _get_saved_model_file_stats(export_dir)
+  if file_stats is None:
+    return _parse_saved_model(export_dir)
+  with _SAVED_MODEL_CACHE_LOCK:
+    entry = _SAVED_MODEL_CACHE.pop(key, None)
+    if entry is not None and entry[0] == file_stats:
+      # Re-insert the entry to mark it as the most recently used one.
+      _SAVED_MODEL_CACHE[key] = entry
+      return entry[1]
+  # Parsing happens outside of the lock, so that different exports can be
+  # parsed concurrently.
+  saved_model = _parse_saved_model(export_dir)
+  with _SAVED_MODEL_CACHE_LOCK:
+    _SAVED_MODEL_CACHE[key] = (file_stats, saved_model)
+    while len(_SAVED_MODEL_CACHE) > _MAX_CACHED_SAVED_MODELS:
+      _SAVED_MODEL_CACHE.popitem(last=False)
+  return saved_model
+
+
+def _saveable_byte_size(saveable):
+  """Estimates the number of bytes restored for `saveable`."""
+  if isinstance(saveable, (list, tuple)):
+    return sum(_saveable_byte_size(x) for x in saveable)
+  try:
+    shape = saveable.get_shape()
+    dtype = saveable.dtype
+  except AttributeError:
+    # SaveableObjects do not expose their size.
+    return 0
+  if dtype == dtypes.resource:
+    shape = tensor_shape.TensorShape(saveable.op.get_attr("shape"))
+    dtype = dtypes.as_dtype(saveable.op.get_attr("dtype"))
+  if not shape.is_fully_defined():
+    return 0
+  return shape.num_elements() * dtype.base_dtype.size
+
+
+def _saver_names_to_saveables(graph, saver):
+  """Returns the checkpoint keys and the variables restored by `saver`.
+
+  The variables of a `Saver` built in this process are known. Those of a saver
+  imported from a `SaverDef` are recovered from its restore op, as the
+  variables assigned from the outputs of its `RestoreV2` ops.
+
+  Args:
+    graph: The graph of `saver`.
+    saver: A `tf.train.Saver`.
+
+  Returns:
+    A dict from checkpoint keys to variables, `SaveableObject`s or lists of
+    variable slices, or `None` if the restore op does not have the layout built
+    by `BaseSaverBuilder`.
+  """
+  var_list = saver._var_list  # pylint: disable=protected-access
+  if var_list is not None:
+    if isinstance(var_list, dict):
+      return var_list
+    return tf_saver.BaseSaverBuilder.OpListToDict(
+        var_list, convert_variable_to_tensor=False)
+  if saver.saver_def is None:
+    return None
+  names_to_saveables = {}
+  pending = [graph.get_operation_by_name(saver.saver_def.restore_op_name)]
+  while pending:
+    op = pending.pop()
+    if op.type == "NoOp":
+      pending.extend(op.control_inputs)
+      continue
+    if op.type not in ("Assign", "AssignVariableOp"):
+      return None
+    value = op.inputs[1]
+    while value.op.type == "Identity":
+      value = value.op.inputs[0]
+    if value.op.type != "RestoreV2":
+      return None
+    names = tensor_util.constant_value(value.op.inputs[1])
+    slices = tensor_util.constant_value(value.op.inputs[2])
+    if names is None or slices is None or slices[value.value_index]:
+      return None
+    names_to_saveables[compat.as_str(names[value.value_index])] = op.inputs[0]
+  return names_to_saveables
+
+
 def _get_asset_tensors(export_dir, meta_graph_def_to_load, import_scope=None):
   """Gets the asset tensors, if defined in the meta graph def to load.
 
@@ -180,7 +304,13 @@ def maybe_saved_model_directory(export_dir):
     "library as tf.compat.v1.saved_model.loader.load or "
     "tf.compat.v1.saved_model.load. There will be a new function for importing "
     "SavedModels in Tensorflow 2.0.")
-def load(sess, tags, export_dir, import_scope=None, **saver_kwargs):
+def load(sess,
+         tags,
+         export_dir,
+         import_scope=None,
+         num_restore_shards=None,
+         cache_saved_model=False,
+         **saver_kwargs):
   """Loads the model from a SavedModel as specified by tags.
 
   Args:
@@ -194,6 +324,12 @@ def load(sess, tags, export_dir, import_scope=None, **saver_kwargs):
         followed by '/' to all loaded tensor names. This scope is applied to
         tensor instances loaded into the passed session, but it is *not* written
         through to the static `MetaGraphDef` protocol buffer that is returned.
+    num_restore_shards: Optional number of restore ops that read the variables
+        concurrently. By default, the variables are restored by the Saver of
+        the SavedModel.
+    cache_saved_model: Whether to reuse the `SavedModel` protocol buffer parsed
+        by earlier loads of the same export in this process. The returned
+        `MetaGraphDef` is then shared, and must not be modified.
     **saver_kwargs: Optional keyword arguments passed through to Saver.
 
   Returns:
@@ -203,23 +339,32 @@ def load(sess, tags, export_dir, import_scope=None, **saver_kwargs):
   Raises:
     RuntimeError: MetaGraphDef associated with the tags cannot be found.
   """
-  loader = SavedModelLoader(export_dir)
-  return loader.load(sess, tags, import_scope, **saver_kwargs)
+  loader = SavedModelLoader(export_dir, cache_saved_model=cache_saved_model)
+  return loader.load(sess, tags, import_scope,
+                     num_restore_shards=num_restore_shards, **saver_kwargs)
 
 
 class SavedModelLoader(object):
   """Load graphs and restore variable values from a `SavedModel`."""
 
-  def __init__(self, export_dir):
+  def __init__(self, export_dir, cache_saved_model=False):
     """Creates a `SavedModelLoader`.
 
     Args:
       export_dir: Directory in which the SavedModel protocol buffer and
         variables to be loaded are located.
+      cache_saved_model: Whether to share the parsed `SavedModel` protocol
+        buffer with the other loaders of the same export that set this flag.
+        The protocol buffers returned by the loader must then not be modified.
     """
     self._export_dir = export_dir
     self._variables_path = saved_model_utils.get_variables_path(export_dir)
-    self._saved_model = _parse_saved_model(export_dir)
+    # The restore shards built for each saver, by number of shards.
+    self._restore_shard_saver_defs = weakref.WeakKeyDictionary()
+    if cache_saved_model:
+      self._saved_model = _parse_saved_model_cached(export_dir)
+    else:
+      self._saved_model = _parse_saved_model(export_dir)
 
   @property
   def export_dir(self):
@@ -287,7 +432,8 @@ class SavedModelLoader(object):
       return tf_saver._import_meta_graph_with_return_elements(  # pylint: disable=protected-access
           meta_graph_def, import_scope=import_scope, **saver_kwargs)
 
-  def restore_variables(self, sess, saver, import_scope=None):
+  def restore_variables(self, sess, saver, import_scope=None,
+                        num_restore_shards=None):
     """Restore SavedModel variable values into the session.
 
     Args:
@@ -299,6 +445,8 @@ class SavedModelLoader(object):
         followed by '/' to all loaded tensor names. This scope is applied to
         tensor instances loaded into the passed session, but it is *not* written
         through to the static `MetaGraphDef` protocol buffer that is returned.
+      num_restore_shards: Optional number of restore ops that read the
+        variables of `saver` concurrently.
 
     Raises:
       ValueError: if no saver was passed to the saver argument, and there are
@@ -310,13 +458,70 @@ class SavedModelLoader(object):
         tf_logging.info("The specified SavedModel has no variables; no "
                         "checkpoints were restored.")
       elif isinstance(saver, tf_saver.Saver):
-        saver.restore(sess, self._variables_path)
+        saver_defs = None
+        if num_restore_shards is not None and num_restore_shards > 1:
+          saver_defs = self._get_restore_shard_saver_defs(
+              sess.graph, saver, num_restore_shards)
+        if saver_defs:
+          sess.run([saver_def.restore_op_name for saver_def in saver_defs],
+                   {saver_def.filename_tensor_name: self._variables_path
+                    for saver_def in saver_defs})
+        else:
+          saver.restore(sess, self._variables_path)
       else:
         raise ValueError(
             "No tf.train.Saver object was passed to the function "
             "SavedModelLoader.restore_variables. Since there are variables in "
             "the graph, a saver is required.")
 
+  def _get_restore_shard_saver_defs(self, graph, saver, num_restore_shards):
+    """Returns the `SaverDef`s of one concurrent restore op per shard.
+
+    A single restore op reads its tensors one after the other, except for the
+    largest ones. Splitting the variables of `saver` in shards of similar sizes
+    lets the executor run several restore ops, each with its own checkpoint
+    reader, at the same time. The shards are built once per saver and number
+    of shards.
+
+    Args:
+      graph: The graph of `saver`.
+      saver: The `tf.train.Saver` whose variables are restored.
+      num_restore_shards: The number of restore ops.
+
+    Returns:
+      A list of `SaverDef`s, or `None` if the variables of `saver` are not
+      known, in which case `saver` restores them itself.
+    """
+    saver_defs_by_num_shards = self._restore_shard_saver_defs.setdefault(
+        saver, {})
+    if num_restore_shards in saver_defs_by_num_shards:
+      return saver_defs_by_num_shards[num_restore_shards]
+    names_to_saveables = _saver_names_to_saveables(graph, saver)
+    if names_to_saveables is None:
+      tf_logging.info("The variables restored by the saver are not known; "
+                      "restoring them without sharding.")
+      saver_defs = None
+    elif not names_to_saveables:
+      saver_defs = []
+    else:
+      num_shards = min(num_restore_shards, len(names_to_saveables))
+      shards = [{} for _ in range(num_shards)]
+      shard_sizes = [(0, i) for i in range(num_shards)]
+      # Assign the largest variables first, each to the smallest shard so far.
+      for name, saveable in sorted(
+          names_to_saveables.items(),
+          key=lambda item: (-_saveable_byte_size(item[1]), item[0])):
+        shard_size, i = heapq.heappop(shard_sizes)
+        shards[i][name] = saveable
+        heapq.heappush(shard_sizes,
+                       (shard_size + _saveable_byte_size(saveable), i))
+      saver_defs = [
+          tf_saver.Saver(var_list=shard, name="restore_shard").saver_def
+          for shard in shards
+      ]
+    saver_defs_by_num_shards[num_restore_shards] = saver_defs
+    return saver_defs
+
   def run_init_ops(self, sess, tags, import_scope=None):
     """Run initialization ops defined in the `MetaGraphDef`.
 
@@ -340,7 +545,8 @@ class SavedModelLoader(object):
       if main_op_tensor is not None:
         sess.run(fetches=[main_op_tensor], feed_dict=asset_tensors_dictionary)
 
-  def load(self, sess, tags, import_scope=None, **saver_kwargs):
+  def load(self, sess, tags, import_scope=None, num_restore_shards=None,
+           **saver_kwargs):
     """Load the MetaGraphDef graph and restore variable values into the session.
 
     Args:
@@ -350,6 +556,8 @@ class SavedModelLoader(object):
         followed by '/' to all loaded tensor names. This scope is applied to
         tensor instances loaded into the passed session, but it is *not* written
         through to the static `MetaGraphDef` protocol buffer that is returned.
+      num_restore_shards: Optional number of restore ops that read the
+        variables concurrently.
       **saver_kwargs: keyword arguments to pass to tf.train.import_meta_graph.
 
     Returns:
@@ -358,6 +566,6 @@ class SavedModelLoader(object):
     with sess.graph.as_default():
       saver, _ = self.load_graph(sess.graph, tags, import_scope,
                                  **saver_kwargs)
-      self.restore_variables(sess, saver, import_scope)
+      self.restore_variables(sess, saver, import_scope, num_restore_shards)
       self.run_init_ops(sess, tags, import_scope)
     return self.get_meta_graph_def_from_tags(tags)
@@ -131,6 +131,65 @@ class SavedModelLoaderTest(test.TestCase):
       self.assertEqual(5, sess.graph.get_tensor_by_name("baa/x:0").eval())
       self.assertEqual(7, sess.graph.get_tensor_by_name("baa/y:0").eval())
 
+  def test_load_with_restore_shards(self):
+    loader = loader_impl.SavedModelLoader(SAVED_MODEL_WITH_MAIN_OP)
+    with self.session(graph=ops.Graph()) as sess:
+      loader.load(sess, ["foo_graph"], num_restore_shards=2)
+      self.assertEqual(5, sess.graph.get_tensor_by_name("x:0").eval())
+      self.assertEqual(7, sess.graph.get_tensor_by_name("y:0").eval())
+
+    with self.session(graph=ops.Graph()) as sess:
+      saver, _ = loader.load_graph(
+          sess.graph, ["foo_graph"], import_scope="baz")
+      loader.restore_variables(sess, saver, import_scope="baz",
+                               num_restore_shards=4)
+      self.assertEqual(5, sess.graph.get_tensor_by_name("baz/x:0").eval())
+      self.assertEqual(11, sess.graph.get_tensor_by_name("baz/y:0").eval())
+
+  def test_load_with_restore_shards_and_custom_saver(self):
+    export_dir = _get_export_dir("saved_model_with_custom_saver")
+    with session.Session(graph=ops.Graph()) as sess:
+      x = variables.VariableV1(5, name="x")
+      y = variables.VariableV1(11, name="y")
+      variables.VariableV1(3, name="not_saved")
+      sess.run(variables.global_variables_initializer())
+      builder = saved_model_builder.SavedModelBuilder(export_dir)
+      builder.add_meta_graph_and_variables(
+          sess, ["foo_graph"],
+          saver=tf_saver.Saver({"renamed_x": x, "renamed_y": y}))
+      builder.save()
+
+    loader = loader_impl.SavedModelLoader(export_dir)
+    with self.session(graph=ops.Graph()) as sess:
+      saver, _ = loader.load_graph(
+          sess.graph, ["foo_graph"], import_scope="baz")
+      loader.restore_variables(sess, saver, import_scope="baz",
+                               num_restore_shards=2)
+      self.assertEqual(5, sess.graph.get_tensor_by_name("baz/x:0").eval())
+      self.assertEqual(11, sess.graph.get_tensor_by_name("baz/y:0").eval())
+
+      # The restore shards are built once.
+      num_ops = len(sess.graph.get_operations())
+      loader.restore_variables(sess, saver, import_scope="baz",
+                               num_restore_shards=2)
+      self.assertEqual(num_ops, len(sess.graph.get_operations()))
+
+  def test_cache_saved_model(self):
+    loader = loader_impl.SavedModelLoader(
+        SIMPLE_ADD_SAVED_MODEL, cache_saved_model=True)
+    loader2 = loader_impl.SavedModelLoader(
+        SIMPLE_ADD_SAVED_MODEL, cache_saved_model=True)
+    self.assertIs(loader.saved_model, loader2.saved_model)
+    self.assertIsNot(
+        loader.saved_model,
+        loader_impl.SavedModelLoader(SIMPLE_ADD_SAVED_MODEL).saved_model)
+
+    with self.session(graph=ops.Graph()) as sess:
+      loader_impl.load(sess, ["foo_graph"], SIMPLE_ADD_SAVED_MODEL,
+                       cache_saved_model=True)
+      self.assertEqual(5, sess.graph.get_tensor_by_name("x:0").eval())
+      self.assertEqual(11, sess.graph.get_tensor_by_name("y:0").eval())
+
   def test_restore_variables(self):
     loader = loader_impl.SavedModelLoader(SAVED_MODEL_WITH_MAIN_OP)
     with self.session(graph=ops.Graph()) as sess:
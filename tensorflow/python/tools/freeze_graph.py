@@ -88,7 +88,10 @@ def freeze_graph_with_def_protos(input_graph_def,
                                  input_meta_graph_def=None,
                                  input_saved_model_dir=None,
                                  saved_model_tags=None,
-                                 checkpoint_version=saver_pb2.SaverDef.V2):
+                                 checkpoint_version=saver_pb2.SaverDef.V2,
+                                 max_batch_bytes=None,
+                                 external_tensor_dir=None,
+                                 external_tensor_min_bytes=1 << 20):
   """Converts all variables in a graph and checkpoint into constants.
 
   Args:
@@ -116,6 +119,14 @@ def freeze_graph_with_def_protos(input_graph_def,
                       load, in string format (optional).
     checkpoint_version: Tensorflow variable file format (saver_pb2.SaverDef.V1
                         or saver_pb2.SaverDef.V2)
+    max_batch_bytes: Maximum total size in bytes of the variables fetched at
+                     once (optional, by default all variables are fetched
+                     together).
+    external_tensor_dir: Directory where large variable values are written
+                         and loaded from with ImmutableConst ops, instead of
+                         being stored in the output graph (optional).
+    external_tensor_min_bytes: Size in bytes from which variable values are
+                               written to `external_tensor_dir`.
 
   Returns:
     Location of the output_graph_def.
@@ -222,14 +233,20 @@ def freeze_graph_with_def_protos(input_graph_def,
           input_meta_graph_def.graph_def,
           output_node_names.replace(" ", "").split(","),
           variable_names_whitelist=variable_names_whitelist,
-          variable_names_blacklist=variable_names_blacklist)
+          variable_names_blacklist=variable_names_blacklist,
+          max_batch_bytes=max_batch_bytes,
+          external_tensor_dir=external_tensor_dir,
+          external_tensor_min_bytes=external_tensor_min_bytes)
     else:
       output_graph_def = graph_util.convert_variables_to_constants(
           sess,
           input_graph_def,
           output_node_names.replace(" ", "").split(","),
           variable_names_whitelist=variable_names_whitelist,
-          variable_names_blacklist=variable_names_blacklist)
+          variable_names_blacklist=variable_names_blacklist,
+          max_batch_bytes=max_batch_bytes,
+          external_tensor_dir=external_tensor_dir,
+          external_tensor_min_bytes=external_tensor_min_bytes)
 
   # Write GraphDef to file if output path has been given.
   if output_graph:
@@ -300,7 +317,10 @@ def freeze_graph(input_graph,
                  input_meta_graph=None,
                  input_saved_model_dir=None,
                  saved_model_tags=tag_constants.SERVING,
-                 checkpoint_version=saver_pb2.SaverDef.V2):
+                 checkpoint_version=saver_pb2.SaverDef.V2,
+                 max_batch_bytes=None,
+                 external_tensor_dir=None,
+                 external_tensor_min_bytes=1 << 20):
   """Converts all variables in a graph and checkpoint into constants.
 
   Args:
@@ -329,6 +349,14 @@ def freeze_graph(input_graph,
                       load, in string format.
     checkpoint_version: Tensorflow variable file format (saver_pb2.SaverDef.V1
                         or saver_pb2.SaverDef.V2).
+    max_batch_bytes: Maximum total size in bytes of the variables fetched at
+                     once (optional, by default all variables are fetched
+                     together).
+    external_tensor_dir: Directory where large variable values are written
+                         and loaded from with ImmutableConst ops, instead of
+                         being stored in the output graph (optional).
+    external_tensor_min_bytes: Size in bytes from which variable values are
+                               written to `external_tensor_dir`.
   Returns:
     String that is the location of frozen GraphDef.
   """
@@ -360,7 +388,10 @@ def freeze_graph(input_graph,
       input_meta_graph_def,
       input_saved_model_dir,
       saved_model_tags.replace(" ", "").split(","),
-      checkpoint_version=checkpoint_version)
+      checkpoint_version=checkpoint_version,
+      max_batch_bytes=max_batch_bytes,
+      external_tensor_dir=external_tensor_dir,
+      external_tensor_min_bytes=external_tensor_min_bytes)
 
 
 def main(unused_args, flags):
@@ -378,7 +409,10 @@ def main(unused_args, flags):
                flags.output_graph, flags.clear_devices, flags.initializer_nodes,
                flags.variable_names_whitelist, flags.variable_names_blacklist,
                flags.input_meta_graph, flags.input_saved_model_dir,
-               flags.saved_model_tags, checkpoint_version)
+               flags.saved_model_tags, checkpoint_version,
+               max_batch_bytes=flags.max_batch_bytes or None,
+               external_tensor_dir=flags.external_tensor_dir or None,
+               external_tensor_min_bytes=flags.external_tensor_min_bytes)
 
 def run_main():
   parser = argparse.ArgumentParser()
@@ -482,6 +516,31 @@ def run_main():
       separated by \',\'. For tag-set contains multiple tags, all tags \
       must be passed in.\
       """)
+  parser.add_argument(
+      "--max_batch_bytes",
+      type=int,
+      default=0,
+      help="""\
+      Maximum total size in bytes of the variables fetched at once. If 0, all \
+      variables are fetched together.\
+      """)
+  parser.add_argument(
+      "--external_tensor_dir",
+      type=str,
+      default="",
+      help="""\
+      Directory where large variable values are written as raw files that \
+      ImmutableConst ops memory-map, instead of storing them in the output \
+      graph.\
+      """)
+  parser.add_argument(
+      "--external_tensor_min_bytes",
+      type=int,
+      default=1 << 20,
+      help="""\
+      Size in bytes from which variable values are written to \
+      --external_tensor_dir.\
+      """)
   flags, unparsed = parser.parse_known_args()
 
   my_main = lambda unused_args: main(unused_args, flags)
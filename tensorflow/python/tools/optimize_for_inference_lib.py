@@ -54,10 +54,9 @@ import re
 import numpy as np
 
 from tensorflow.core.framework import attr_value_pb2
-from tensorflow.core.framework import graph_pb2
 from tensorflow.core.framework import node_def_pb2
 from tensorflow.python.framework import dtypes
-from tensorflow.python.framework import graph_util
+from tensorflow.python.framework import graph_util_impl
 from tensorflow.python.framework import tensor_util
 from tensorflow.python.platform import flags as flags_lib
 from tensorflow.python.platform import tf_logging
@@ -66,6 +65,10 @@ from tensorflow.python.tools import strip_unused_lib
 flags = flags_lib
 FLAGS = flags.FLAGS
 
+# pylint: disable=protected-access
+_IndexedGraphDef = graph_util_impl._IndexedGraphDef
+# pylint: enable=protected-access
+
 
 # Support folding two types of batch norm ops:
 # BatchNormWithGlobalNormalization and FusedBatchNorm.  The two types only
@@ -104,19 +107,20 @@ def optimize_for_inference(input_graph_def, input_node_names, output_node_names,
   Returns:
     An optimized version of the input graph.
   """
-  ensure_graph_is_valid(input_graph_def)
-  optimized_graph_def = input_graph_def
-  optimized_graph_def = strip_unused_lib.strip_unused(
-      optimized_graph_def, input_node_names, output_node_names,
+  # All the passes edit the same indexed view of the graph, so the nodes are
+  # only copied once, when the optimized graph is materialized at the end.
+  indexed_graph_def = _IndexedGraphDef(input_graph_def)
+  _ensure_graph_is_valid(indexed_graph_def)
+  strip_unused_lib._strip_unused(  # pylint: disable=protected-access
+      indexed_graph_def, input_node_names, output_node_names,
       placeholder_type_enum)
-  optimized_graph_def = graph_util.remove_training_nodes(
-      optimized_graph_def, output_node_names)
-  optimized_graph_def = fold_batch_norms(optimized_graph_def)
+  graph_util_impl._remove_training_nodes(  # pylint: disable=protected-access
+      indexed_graph_def, output_node_names)
+  _fold_batch_norms(indexed_graph_def)
   if not toco_compatible:
-    optimized_graph_def = fuse_resize_and_conv(optimized_graph_def,
-                                               output_node_names)
-  ensure_graph_is_valid(optimized_graph_def)
-  return optimized_graph_def
+    _fuse_resize_and_conv(indexed_graph_def, output_node_names)
+  _ensure_graph_is_valid(indexed_graph_def)
+  return indexed_graph_def.to_graph_def(include_library=False)
 
 
 def ensure_graph_is_valid(graph_def):
@@ -131,16 +135,16 @@ def ensure_graph_is_valid(graph_def):
   Raises:
     ValueError: If the graph is incorrectly constructed.
   """
-  node_map = {}
-  for node in graph_def.node:
-    if node.name not in node_map:
-      node_map[node.name] = node
-    else:
-      raise ValueError("Duplicate node names detected for ", node.name)
-  for node in graph_def.node:
+  _ensure_graph_is_valid(_IndexedGraphDef(graph_def))
+
+
+def _ensure_graph_is_valid(indexed_graph_def):
+  """Implements `ensure_graph_is_valid` on an `_IndexedGraphDef`."""
+  indexed_graph_def.check_unique_names()
+  for node in indexed_graph_def.nodes():
     for input_name in node.input:
       input_node_name = node_name_from_input(input_name)
-      if input_node_name not in node_map:
+      if input_node_name not in indexed_graph_def:
         raise ValueError("Input for ", node.name, " not found: ", input_name)
 
 
@@ -223,16 +227,18 @@ def fold_batch_norms(input_graph_def):
   Raises:
     ValueError: If the graph is badly formed with duplicate node names.
   """
-  input_node_map = {}
-  for node in input_graph_def.node:
-    if node.name not in input_node_map:
-      input_node_map[node.name] = node
-    else:
-      raise ValueError("Duplicate node names detected for ", node.name)
+  indexed_graph_def = _IndexedGraphDef(input_graph_def)
+  _fold_batch_norms(indexed_graph_def)
+  return indexed_graph_def.to_graph_def(include_library=False)
+
+
+def _fold_batch_norms(input_node_map):
+  """Implements `fold_batch_norms` in place on an `_IndexedGraphDef`."""
+  input_node_map.check_unique_names()
 
   nodes_to_skip = {}
   new_ops = []
-  for node in input_graph_def.node:
+  for node in input_node_map.nodes():
     if node.op not in ("BatchNormWithGlobalNormalization", "FusedBatchNorm"):
       continue
 
@@ -356,16 +362,10 @@ def fold_batch_norms(input_graph_def):
     bias_add_op.input.extend([new_conv_op.name, offset_op.name])
     new_ops.extend([scaled_weights_op, new_conv_op, offset_op, bias_add_op])
 
-  result_graph_def = graph_pb2.GraphDef()
-  for node in input_graph_def.node:
-    if node.name in nodes_to_skip:
-      continue
-    new_node = node_def_pb2.NodeDef()
-    new_node.CopyFrom(node)
-    result_graph_def.node.extend([new_node])
-
-  result_graph_def.node.extend(new_ops)
-  return result_graph_def
+  for name in nodes_to_skip:
+    input_node_map.remove(name)
+  for new_op in new_ops:
+    input_node_map.add(new_op)
 
 
 def fuse_resize_and_conv(input_graph_def, output_node_names):
@@ -387,24 +387,23 @@ def fuse_resize_and_conv(input_graph_def, output_node_names):
   Raises:
     ValueError: If the graph is badly formed with duplicate node names.
   """
+  indexed_graph_def = _IndexedGraphDef(input_graph_def)
+  _fuse_resize_and_conv(indexed_graph_def, output_node_names)
+  return indexed_graph_def.to_graph_def(include_library=False)
 
-  input_node_map = {}
-  for node in input_graph_def.node:
-    if node.name not in input_node_map:
-      input_node_map[node.name] = node
-    else:
-      raise ValueError("Duplicate node names detected for ", node.name)
+
+def _fuse_resize_and_conv(input_node_map, output_node_names):
+  """Implements `fuse_resize_and_conv` in place on an `_IndexedGraphDef`."""
+  input_node_map.check_unique_names()
 
   node_reference_count = collections.defaultdict(int)
-  for node in input_graph_def.node:
-    for input_name in node.input:
-      stripped_name = node_name_from_input(input_name)
-      node_reference_count[stripped_name] += 1
+  for name in input_node_map:
+    node_reference_count[name] = len(input_node_map.consumers(name))
   for output_name in output_node_names:
     node_reference_count[output_name] += 1
 
   new_ops = []
-  for node in input_graph_def.node:
+  for node in input_node_map.nodes():
 
     if node.op != "Conv2D":
       continue
@@ -473,13 +472,7 @@ def fuse_resize_and_conv(input_graph_def, output_node_names):
     fused_conv_op.attr["padding"].CopyFrom(conv_op.attr["padding"])
     new_ops.extend([fused_conv_op])
 
-  result_graph_def = graph_pb2.GraphDef()
-  for node in input_graph_def.node:
-    if node_reference_count[node.name] < 1:
-      continue
-    new_node = node_def_pb2.NodeDef()
-    new_node.CopyFrom(node)
-    result_graph_def.node.extend([new_node])
-
-  result_graph_def.node.extend(new_ops)
-  return result_graph_def
+  for name in [x for x in input_node_map if node_reference_count[x] < 1]:
+    input_node_map.remove(name)
+  for new_op in new_ops:
+    input_node_map.add(new_op)
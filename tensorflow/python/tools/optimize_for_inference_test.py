@@ -124,9 +124,13 @@ class OptimizeForInferenceTest(test.TestCase):
     self.set_attr_dtype(add_node, "T", dtypes.float32)
     expected_output.node.extend([add_node])
 
+    original_graph_def = graph_pb2.GraphDef()
+    original_graph_def.CopyFrom(graph_def)
     output = optimize_for_inference_lib.optimize_for_inference(
         graph_def, [], [add_name], dtypes.float32.as_datatype_enum)
     self.assertProtoEquals(expected_output, output)
+    # The passes edit a shared view of the graph, never the input itself.
+    self.assertProtoEquals(original_graph_def, graph_def)
 
   def testFoldBatchNorms(self):
     with self.cached_session() as sess:
@@ -27,6 +27,8 @@ import argparse
 import os
 import re
 import sys
+import threading
+import time
 import warnings
 
 import numpy as np
@@ -40,6 +42,7 @@ from tensorflow.python.debug.wrappers import local_cli_wrapper
 from tensorflow.python.framework import meta_graph as meta_graph_lib
 from tensorflow.python.framework import ops as ops_lib
 from tensorflow.python.lib.io import file_io
+from tensorflow.python.lib.io import tf_record
 from tensorflow.python.platform import app  # pylint: disable=unused-import
 from tensorflow.python.saved_model import loader
 from tensorflow.python.tools import saved_model_utils
@@ -366,6 +369,201 @@ def run_saved_model_with_feed_dict(saved_model_dir, tag_set, signature_def_key,
                                             output_full_path))
 
 
+def _make_benchmark_batches(input_tensor_key_feed_dict, input_tfrecords,
+                            batch_size, num_batches):
+  """Creates the feed values of the batches sent by the benchmark.
+
+  All inputs are sliced along their first dimension into batches of
+  `batch_size` rows, wrapping around at their end, so that the rows of the
+  inputs stay paired. Only the rows that fit in `num_batches` batches are used,
+  and records are only read from the TFRecord files until they are filled. No
+  more distinct batches are created than needed to cover all the rows once, so
+  that the benchmark cycles through a bounded pool of batches.
+
+  Args:
+    input_tensor_key_feed_dict: A dictionary that maps input keys to numpy
+        ndarrays or lists, whose first dimension is the example dimension.
+    input_tfrecords: A dictionary that maps input keys to file patterns of
+        TFRecord files of serialized tf.Examples.
+    batch_size: Number of rows of every batch.
+    num_batches: Maximum number of distinct batches.
+
+  Returns:
+    A list of dictionaries that map input keys to numpy ndarrays.
+
+  Raises:
+    ValueError: When an input is a scalar or empty, or when the inputs have
+        different numbers of rows.
+    RuntimeError: When a file pattern does not match any file.
+  """
+  max_rows = batch_size * num_batches
+  inputs = {}
+  for input_key, value in input_tensor_key_feed_dict.items():
+    inputs[input_key] = np.asarray(value)[:max_rows]
+  for input_key, file_pattern in input_tfrecords.items():
+    filenames = file_io.get_matching_files(file_pattern)
+    if not filenames:
+      raise RuntimeError('--input_tfrecords pattern %s does not match any '
+                         'file.' % file_pattern)
+    records = []
+    for filename in filenames:
+      for record in tf_record.tf_record_iterator(filename):
+        records.append(record)
+        if len(records) >= max_rows:
+          break
+      if len(records) >= max_rows:
+        break
+    inputs[input_key] = np.array(records, dtype=object)
+
+  num_rows = None
+  for input_key, value in sorted(inputs.items()):
+    if not value.ndim or not value.shape[0]:
+      raise ValueError(
+          'Input "%s" must have a non-empty first dimension to be split in '
+          'batches, but has shape %s.' % (input_key, value.shape))
+    if num_rows is None:
+      num_rows = value.shape[0]
+    elif value.shape[0] != num_rows:
+      raise ValueError(
+          'All inputs must have the same number of rows to be split in '
+          'batches, but input "%s" has %d rows instead of %d (rows beyond '
+          '%d are not used).' % (input_key, value.shape[0], num_rows,
+                                 max_rows))
+  if num_rows is None:
+    return [{}]
+  num_distinct_batches = min(-(-num_rows // batch_size), num_batches)
+
+  batches = []
+  row_offsets = np.arange(batch_size)
+  for batch_index in range(num_distinct_batches):
+    rows = (batch_index * batch_size + row_offsets) % num_rows
+    batches.append({
+        input_key: np.take(value, rows, axis=0)
+        for input_key, value in inputs.items()
+    })
+  return batches
+
+
+def benchmark_saved_model(saved_model_dir, tag_set, signature_def_key,
+                          input_tensor_key_feed_dict, input_tfrecords=None,
+                          batch_size=1, num_batches=100, warmup_batches=10,
+                          num_threads=1, worker=None):
+  """Measures the latency and throughput of a SignatureDef of a SavedModel.
+
+  Batches of inputs are first run sequentially to warm the session up. The
+  measured batches are then sent by `num_threads` threads that share the
+  session, each sending its next batch as soon as its previous one returned.
+
+  Args:
+    saved_model_dir: Directory containing the SavedModel to execute.
+    tag_set: Group of tag(s) of the MetaGraphDef with the SignatureDef map, in
+        string format, separated by ','. For tag-set contains multiple tags, all
+        tags must be passed in.
+    signature_def_key: A SignatureDef key string.
+    input_tensor_key_feed_dict: A dictionary maps input keys to numpy ndarrays,
+        which are split in batches along their first dimension.
+    input_tfrecords: A dictionary that maps input keys to file patterns of
+        TFRecord files of serialized tf.Examples.
+    batch_size: Number of examples of every batch.
+    num_batches: Number of measured batches.
+    warmup_batches: Number of batches run before the measurements.
+    num_threads: Number of threads sending batches concurrently.
+    worker: If provided, the session will be run on the worker.  Valid worker
+        specification is a bns or gRPC path.
+
+  Returns:
+    A dictionary with the wall time in seconds, the throughput in batches and
+    examples per second, and the mean and percentile latencies in seconds.
+
+  Raises:
+    ValueError: When any of the input tensor keys is not valid, or when
+        `batch_size`, `num_batches` or `num_threads` is not positive.
+  """
+  if batch_size < 1 or num_batches < 1 or num_threads < 1:
+    raise ValueError('batch_size, num_batches and num_threads must be '
+                     'positive.')
+  input_tfrecords = input_tfrecords or {}
+  meta_graph_def = saved_model_utils.get_meta_graph_def(saved_model_dir,
+                                                        tag_set)
+  inputs_tensor_info = _get_inputs_tensor_info_from_meta_graph_def(
+      meta_graph_def, signature_def_key)
+  for input_key_name in (list(input_tensor_key_feed_dict.keys()) +
+                         list(input_tfrecords.keys())):
+    if input_key_name not in inputs_tensor_info:
+      raise ValueError(
+          '"%s" is not a valid input key. Please choose from %s, or use '
+          '--show option.' %
+          (input_key_name, '"' + '", "'.join(inputs_tensor_info.keys()) + '"'))
+  outputs_tensor_info = _get_outputs_tensor_info_from_meta_graph_def(
+      meta_graph_def, signature_def_key)
+  output_tensor_names = [
+      outputs_tensor_info[tensor_key].name
+      for tensor_key in sorted(outputs_tensor_info.keys())
+  ]
+
+  # The batches are prepared up front, so that slicing and converting the
+  # inputs is not part of the measured latencies.
+  batches = [{
+      inputs_tensor_info[key].name: value for key, value in batch.items()
+  } for batch in _make_benchmark_batches(
+      input_tensor_key_feed_dict, input_tfrecords, batch_size,
+      num_batches + warmup_batches)]
+
+  with session.Session(worker, graph=ops_lib.Graph()) as sess:
+    loader.load(sess, tag_set.split(','), saved_model_dir)
+    for batch_index in range(warmup_batches):
+      sess.run(output_tensor_names,
+               feed_dict=batches[batch_index % len(batches)])
+
+    latencies = []
+    thread_errors = []
+    next_batch_index = [warmup_batches]
+    lock = threading.Lock()
+
+    def _send_batches():
+      thread_latencies = []
+      try:
+        while True:
+          with lock:
+            batch_index = next_batch_index[0]
+            if thread_errors or batch_index >= warmup_batches + num_batches:
+              break
+            next_batch_index[0] += 1
+          feed_dict = batches[batch_index % len(batches)]
+          start_time = time.time()
+          sess.run(output_tensor_names, feed_dict=feed_dict)
+          thread_latencies.append(time.time() - start_time)
+      except Exception as e:  # pylint: disable=broad-except
+        with lock:
+          thread_errors.append(e)
+      with lock:
+        latencies.extend(thread_latencies)
+
+    threads = [threading.Thread(target=_send_batches)
+               for _ in range(num_threads)]
+    start_time = time.time()
+    for thread in threads:
+      thread.start()
+    for thread in threads:
+      thread.join()
+    wall_time = time.time() - start_time
+
+  if thread_errors:
+    raise thread_errors[0]
+  percentiles = np.percentile(latencies, [50, 90, 95, 99])
+  return {
+      'wall_time': wall_time,
+      'batches_per_second': num_batches / wall_time,
+      'examples_per_second': num_batches * batch_size / wall_time,
+      'mean_latency': float(np.mean(latencies)),
+      'p50_latency': float(percentiles[0]),
+      'p90_latency': float(percentiles[1]),
+      'p95_latency': float(percentiles[2]),
+      'p99_latency': float(percentiles[3]),
+      'max_latency': float(np.max(latencies)),
+  }
+
+
 def preprocess_inputs_arg_string(inputs_str):
   """Parses input arg into dictionary that maps input to file/variable tuple.
 
@@ -474,6 +672,31 @@ def preprocess_input_examples_arg_string(input_examples_str):
   return input_dict
 
 
+def preprocess_input_tfrecords_arg_string(input_tfrecords_str):
+  """Parses input arg into dictionary that maps input keys to file patterns.
+
+  Args:
+    input_tfrecords_str: A string that specifies TFRecord files of serialized
+    tf.Example for input keys. Each input is separated by semicolon. For each
+    input key:
+        'input_key=<file_pattern>'
+
+  Returns:
+    A dictionary that maps input keys to file patterns.
+
+  Raises:
+    RuntimeError: An error when the given input string is in a bad format.
+  """
+  input_dict = {}
+  for input_raw in filter(bool, input_tfrecords_str.split(';')):
+    if '=' not in input_raw:
+      raise RuntimeError('--input_tfrecords "%s" format is incorrect. Please '
+                         'follow "<input_key>=<file_pattern>"' % input_raw)
+    input_key, file_pattern = input_raw.split('=', 1)
+    input_dict[input_key] = file_pattern
+  return input_dict
+
+
 def _create_example_string(example_dict):
   """Create a serialized tf.example from feature dictionary."""
   example = example_pb2.Example()
@@ -644,6 +867,40 @@ def run(args):
                                  init_tpu=args.init_tpu, tf_debug=args.tf_debug)
 
 
+def benchmark(args):
+  """Function triggered by benchmark command.
+
+  Args:
+    args: A namespace parsed from command line.
+
+  Raises:
+    AttributeError: An error when none of the input options is passed to
+    benchmark command.
+  """
+  if (not args.inputs and not args.input_exprs and not args.input_examples and
+      not args.input_tfrecords):
+    raise AttributeError(
+        'At least one of --inputs, --input_exprs, --input_examples or '
+        '--input_tfrecords must be required')
+  tensor_key_feed_dict = load_inputs_from_input_arg_string(
+      args.inputs, args.input_exprs, args.input_examples)
+  stats = benchmark_saved_model(
+      args.dir, args.tag_set, args.signature_def, tensor_key_feed_dict,
+      preprocess_input_tfrecords_arg_string(args.input_tfrecords),
+      batch_size=args.batch_size, num_batches=args.num_batches,
+      warmup_batches=args.warmup_batches, num_threads=args.num_threads,
+      worker=args.worker)
+  print('Ran %d batches of %d examples with %d thread(s) in %.3f s.' %
+        (args.num_batches, args.batch_size, args.num_threads,
+         stats['wall_time']))
+  print('Throughput: %.2f batches/s, %.2f examples/s' %
+        (stats['batches_per_second'], stats['examples_per_second']))
+  print('Latency (ms): mean %.3f, p50 %.3f, p90 %.3f, p95 %.3f, p99 %.3f, '
+        'max %.3f' % tuple(1000 * stats[key] for key in (
+            'mean_latency', 'p50_latency', 'p90_latency', 'p95_latency',
+            'p99_latency', 'max_latency')))
+
+
 def scan(args):
   """Function triggered by scan command.
 
@@ -792,6 +1049,85 @@ def create_parser():
            'This option should be only used if the worker is a TPU job.')
   parser_run.set_defaults(func=run)
 
+  # benchmark command
+  benchmark_msg = (
+      'Usage example:\n'
+      'To measure the latency and throughput of a SignatureDef with batches of'
+      ' 32 examples sent by 4 concurrent threads:\n'
+      '$saved_model_cli benchmark --dir /tmp/saved_model --tag_set serve \\\n'
+      '   --signature_def serving_default \\\n'
+      '   --inputs x=/tmp/x.npy --batch_size 32 --num_threads 4\n\n'
+      'Inputs are split in batches along their first dimension, and cycled'
+      ' through until --num_batches batches have been run.\n')
+  parser_benchmark = subparsers.add_parser(
+      'benchmark',
+      description=benchmark_msg,
+      formatter_class=argparse.RawTextHelpFormatter)
+  parser_benchmark.add_argument(
+      '--dir',
+      type=str,
+      required=True,
+      help='directory containing the SavedModel to benchmark')
+  parser_benchmark.add_argument(
+      '--tag_set',
+      type=str,
+      required=True,
+      help='tag-set of graph in SavedModel to load, separated by \',\'')
+  parser_benchmark.add_argument(
+      '--signature_def',
+      type=str,
+      required=True,
+      metavar='SIGNATURE_DEF_KEY',
+      help='key of SignatureDef to benchmark')
+  msg = ('Loading inputs from files, in the format of \'<input_key>=<filename>,'
+         ' or \'<input_key>=<filename>[<variable_name>]\', separated by \';\'.'
+         ' The file format can only be from .npy, .npz or pickle.')
+  parser_benchmark.add_argument('--inputs', type=str, default='', help=msg)
+  msg = ('Specifying inputs by python expressions, in the format of'
+         ' "<input_key>=\'<python expression>\'", separated by \';\'. '
+         'numpy module is available as \'np\'. '
+         'Will override duplicate input keys from --inputs option.')
+  parser_benchmark.add_argument('--input_exprs', type=str, default='',
+                                help=msg)
+  msg = (
+      'Specifying tf.Example inputs as list of dictionaries. For example: '
+      '<input_key>=[{feature0:value_list,feature1:value_list}]. Use ";" to '
+      'separate input keys. Will override duplicate input keys from --inputs '
+      'and --input_exprs option.')
+  parser_benchmark.add_argument('--input_examples', type=str, default='',
+                                help=msg)
+  msg = ('Streaming serialized tf.Example inputs from TFRecord files, in the '
+         'format of \'<input_key>=<file_pattern>\', separated by \';\'.')
+  parser_benchmark.add_argument('--input_tfrecords', type=str, default='',
+                                help=msg)
+  parser_benchmark.add_argument(
+      '--batch_size',
+      type=int,
+      default=1,
+      help='number of examples in every batch')
+  parser_benchmark.add_argument(
+      '--num_batches',
+      type=int,
+      default=100,
+      help='number of measured batches')
+  parser_benchmark.add_argument(
+      '--warmup_batches',
+      type=int,
+      default=10,
+      help='number of batches run before the measurements')
+  parser_benchmark.add_argument(
+      '--num_threads',
+      type=int,
+      default=1,
+      help='number of threads sending batches concurrently')
+  parser_benchmark.add_argument(
+      '--worker',
+      type=str,
+      default=None,
+      help='if specified, a Session will be run on the worker. '
+           'Valid worker specification is a bns or gRPC path.')
+  parser_benchmark.set_defaults(func=benchmark)
+
   # scan command
   scan_msg = ('Usage example:\n'
               'To scan for blacklisted ops in SavedModel:\n'
@@ -28,9 +28,11 @@ import sys
 import numpy as np
 from six import StringIO
 
+from tensorflow.core.example import example_pb2
 from tensorflow.core.framework import types_pb2
 from tensorflow.core.protobuf import meta_graph_pb2
 from tensorflow.python.debug.wrappers import local_cli_wrapper
+from tensorflow.python.lib.io import tf_record
 from tensorflow.python.platform import test
 from tensorflow.python.tools import saved_model_cli
 
@@ -525,6 +527,66 @@ signature_def['serving_default']:
     y_expected = np.array([[2.5], [3.0]])
     self.assertAllClose(y_expected, y_actual)
 
+  def testBenchmarkCommand(self):
+    self.parser = saved_model_cli.create_parser()
+    base_path = test.test_src_dir_path(SAVED_MODEL_PATH)
+    input_path = os.path.join(test.get_temp_dir(), 'testBenchmark_x.npy')
+    np.save(input_path, np.arange(5, dtype=np.float32).reshape([5, 1]))
+    args = self.parser.parse_args([
+        'benchmark', '--dir', base_path, '--tag_set', 'serve',
+        '--signature_def', 'serving_default', '--inputs', 'x=' + input_path,
+        '--batch_size', '2', '--num_batches', '6', '--warmup_batches', '1',
+        '--num_threads', '2'
+    ])
+    with captured_output() as (out, _):
+      saved_model_cli.benchmark(args)
+    output = out.getvalue().strip()
+    self.assertTrue('Ran 6 batches of 2 examples with 2 thread(s)' in output)
+    self.assertTrue('examples/s' in output)
+    self.assertTrue('p99' in output)
+
+  def testBenchmarkSavedModelInputTFRecords(self):
+    base_path = test.test_src_dir_path(SAVED_MODEL_PATH)
+    input_path = os.path.join(test.get_temp_dir(), 'testBenchmark.tfrecord')
+    with tf_record.TFRecordWriter(input_path) as writer:
+      for x in range(3):
+        example = example_pb2.Example()
+        example.features.feature['x'].float_list.value.append(x)
+        example.features.feature['x2'].float_list.value.append(x)
+        writer.write(example.SerializeToString())
+    stats = saved_model_cli.benchmark_saved_model(
+        base_path, 'serve', 'regress_x_to_y', {}, {'inputs': input_path},
+        batch_size=2, num_batches=4, warmup_batches=0, num_threads=3)
+    self.assertGreater(stats['examples_per_second'], 0)
+    self.assertLessEqual(stats['p50_latency'], stats['p99_latency'])
+    self.assertLessEqual(stats['p99_latency'], stats['max_latency'])
+    self.assertIsInstance(stats['p50_latency'], float)
+
+  def testBenchmarkBatches(self):
+    batches = saved_model_cli._make_benchmark_batches(
+        {'x': np.arange(5).reshape([5, 1])}, {}, batch_size=2, num_batches=10)
+    self.assertEqual(3, len(batches))
+    self.assertAllEqual([[4], [0]], batches[2]['x'])
+    with self.assertRaisesRegexp(ValueError, 'first dimension'):
+      saved_model_cli._make_benchmark_batches({'x': np.float32(1)}, {}, 1, 1)
+    with self.assertRaisesRegexp(ValueError, 'same number of rows'):
+      saved_model_cli._make_benchmark_batches(
+          {'x': np.arange(5), 'y': np.arange(3)}, {}, 1, 10)
+    # Rows that do not fit in num_batches batches are not used.
+    batches = saved_model_cli._make_benchmark_batches(
+        {'x': np.arange(5), 'y': np.arange(3)}, {}, batch_size=1, num_batches=2)
+    self.assertEqual(2, len(batches))
+
+  def testBenchmarkCommandNoInputsError(self):
+    self.parser = saved_model_cli.create_parser()
+    base_path = test.test_src_dir_path(SAVED_MODEL_PATH)
+    args = self.parser.parse_args([
+        'benchmark', '--dir', base_path, '--tag_set', 'serve',
+        '--signature_def', 'serving_default'
+    ])
+    with self.assertRaises(AttributeError):
+      saved_model_cli.benchmark(args)
+
   def testScanCommand(self):
     self.parser = saved_model_cli.create_parser()
     base_path = test.test_src_dir_path(SAVED_MODEL_PATH)
@@ -18,14 +18,13 @@
 from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
-import copy
 
 from google.protobuf import text_format
 
 from tensorflow.core.framework import attr_value_pb2
 from tensorflow.core.framework import graph_pb2
 from tensorflow.core.framework import node_def_pb2
-from tensorflow.python.framework import graph_util
+from tensorflow.python.framework import graph_util_impl
 from tensorflow.python.platform import gfile
 
 
@@ -48,6 +47,17 @@ def strip_unused(input_graph_def, input_node_names, output_node_names,
       of an operation.
     KeyError: If any element in `input_node_names` is not found in the graph.
   """
+  # pylint: disable=protected-access
+  indexed_graph_def = graph_util_impl._IndexedGraphDef(input_graph_def)
+  # pylint: enable=protected-access
+  _strip_unused(indexed_graph_def, input_node_names, output_node_names,
+                placeholder_type_enum)
+  return indexed_graph_def.to_graph_def(include_library=False)
+
+
+def _strip_unused(indexed_graph_def, input_node_names, output_node_names,
+                  placeholder_type_enum):
+  """Implements `strip_unused` in place on an `_IndexedGraphDef`."""
   for name in input_node_names:
     if ":" in name:
       raise ValueError("Name '%s' appears to refer to a Tensor, "
@@ -55,36 +65,33 @@ def strip_unused(input_graph_def, input_node_names, output_node_names,
 
   # Here we replace the nodes we're going to override as inputs with
   # placeholders so that any unused nodes that are inputs to them are
-  # automatically stripped out by extract_sub_graph().
+  # automatically stripped out by the reachability pass below.
   not_found = {name for name in input_node_names}
-  inputs_replaced_graph_def = graph_pb2.GraphDef()
-  for node in input_graph_def.node:
-    if node.name in input_node_names:
-      not_found.remove(node.name)
-      placeholder_node = node_def_pb2.NodeDef()
-      placeholder_node.op = "Placeholder"
-      placeholder_node.name = node.name
-      if isinstance(placeholder_type_enum, list):
-        input_node_index = input_node_names.index(node.name)
-        placeholder_node.attr["dtype"].CopyFrom(
-            attr_value_pb2.AttrValue(type=placeholder_type_enum[
-                input_node_index]))
-      else:
-        placeholder_node.attr["dtype"].CopyFrom(
-            attr_value_pb2.AttrValue(type=placeholder_type_enum))
-      if "_output_shapes" in node.attr:
-        placeholder_node.attr["_output_shapes"].CopyFrom(node.attr[
-            "_output_shapes"])
-      inputs_replaced_graph_def.node.extend([placeholder_node])
+  for name in input_node_names:
+    if name not in not_found or name not in indexed_graph_def:
+      continue
+    not_found.remove(name)
+    node = indexed_graph_def[name]
+    placeholder_node = node_def_pb2.NodeDef()
+    placeholder_node.op = "Placeholder"
+    placeholder_node.name = node.name
+    if isinstance(placeholder_type_enum, list):
+      input_node_index = input_node_names.index(node.name)
+      placeholder_node.attr["dtype"].CopyFrom(
+          attr_value_pb2.AttrValue(type=placeholder_type_enum[
+              input_node_index]))
     else:
-      inputs_replaced_graph_def.node.extend([copy.deepcopy(node)])
+      placeholder_node.attr["dtype"].CopyFrom(
+          attr_value_pb2.AttrValue(type=placeholder_type_enum))
+    if "_output_shapes" in node.attr:
+      placeholder_node.attr["_output_shapes"].CopyFrom(node.attr[
+          "_output_shapes"])
+    indexed_graph_def.replace(placeholder_node)
 
   if not_found:
     raise KeyError("The following input nodes were not found: %s\n" % not_found)
 
-  output_graph_def = graph_util.extract_sub_graph(inputs_replaced_graph_def,
-                                                  output_node_names)
-  return output_graph_def
+  indexed_graph_def.retain(indexed_graph_def.reachable_from(output_node_names))
 
 
 def strip_unused_from_files(input_graph, input_binary, output_graph,